@@ -10,6 +10,7 @@ Usage:
     uv run scripts/fin/fetch_ibkr_positions.py --port 7497       # TWS paper
     uv run scripts/fin/fetch_ibkr_positions.py --port 4001       # Gateway live
     uv run scripts/fin/fetch_ibkr_positions.py -o my_positions.csv
+    uv run scripts/fin/fetch_ibkr_positions.py --profile
 """
 
 import argparse
@@ -18,6 +19,7 @@ from datetime import datetime
 from pathlib import Path
 
 from fin.ibkr import PORTS, fetch_positions, enrich_with_prices, positions_to_dataframe
+from hedgeye.ds.profiling import Profiler, add_profile_argument
 
 
 def main() -> None:
@@ -49,7 +51,9 @@ def main() -> None:
         default=None,
         help="Output CSV path (default: output/ibkr_positions_YYYYMMDD_HHMMSS.csv)",
     )
+    add_profile_argument(parser)
     args = parser.parse_args()
+    profiler = Profiler.start("fetch_ibkr_positions", args.profile)
 
     # Determine output path
     if args.output:
@@ -63,20 +67,23 @@ def main() -> None:
     print(f"Connecting to IBKR at {args.host}:{args.port} ...")
 
     try:
-        positions = fetch_positions(
-            host=args.host,
-            port=args.port,
-            client_id=args.client_id,
-        )
+        with profiler.stage("fetch_positions"):
+            positions = fetch_positions(
+                host=args.host,
+                port=args.port,
+                client_id=args.client_id,
+            )
     except ConnectionError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
 
     print("Fetching market prices ...")
-    positions = enrich_with_prices(positions)
+    with profiler.stage("enrich_prices"):
+        positions = enrich_with_prices(positions)
 
-    df = positions_to_dataframe(positions)
-    df.to_csv(output_path, index=False)
+    with profiler.stage("save_csv"):
+        df = positions_to_dataframe(positions)
+        df.to_csv(output_path, index=False)
 
     print(f"\nFetched {len(positions)} positions")
     if not df.empty:
@@ -86,6 +93,7 @@ def main() -> None:
             total_value = df["market_value"].sum()
             print(f"\nTotal market value: ${total_value:,.2f}")
     print(f"\nSaved to: {output_path}")
+    profiler.print_report()
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ Usage:
     uv run scripts/fin/portfolio_report.py path/to/csv --detail all
     uv run scripts/fin/portfolio_report.py path/to/csv --nota
     uv run scripts/fin/portfolio_report.py path/to/csv --no-ibkr
+    uv run scripts/fin/portfolio_report.py path/to/csv --profile
 """
 
 import argparse
@@ -20,6 +21,7 @@ from pathlib import Path
 from fin.ds.fid.parser import parse_fidelity_csv
 from fin.ds.ibkr.manual import create_ibkr_positions
 from fin.portfolio import Portfolio
+from hedgeye.ds.profiling import Profiler, add_profile_argument
 
 
 # Symbols to ignore (delisted, $0 value, etc.)
@@ -49,6 +51,23 @@ IBKR_YF_MAP = {
 }
 
 
+
+def ibkr_yahoo_symbols() -> dict[str, str]:
+    """
+    Yahoo symbol of each IBKR equity.
+
+    IBKR_YF_MAP first, then the fin catalog's yahoo_symbol (if the catalog
+    database exists), via the shared symbol resolver.
+    """
+    # Imported here (pandas and sqlalchemy are slow to import)
+    from fin.catalog import DEFAULT_DB_PATH, TickerCatalog
+    from hedgeye.ds.symbol_resolver import SymbolResolver
+
+    catalog_map = TickerCatalog(str(DEFAULT_DB_PATH)).ticker_map() if DEFAULT_DB_PATH.exists() else None
+    resolver = SymbolResolver(yahoo_overrides=IBKR_YF_MAP, catalog_map=catalog_map)
+    return {t: info.yahoo for t, info in resolver.resolve_many(IBKR_EQUITIES).items() if info.yahoo}
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Categorize and report on portfolio positions"
@@ -78,6 +97,7 @@ def main() -> None:
         action="store_true",
         help="Exclude IBKR positions (Fidelity only)",
     )
+    add_profile_argument(parser)
     args = parser.parse_args()
 
     csv_path = Path(args.csv_file).expanduser()
@@ -85,47 +105,54 @@ def main() -> None:
         print(f"ERROR: File not found: {csv_path}", file=sys.stderr)
         sys.exit(1)
 
+    profiler = Profiler.start("portfolio_report", args.profile)
+
     # Load Fidelity positions
-    positions = parse_fidelity_csv(csv_path, ignore_symbols=IGNORE_SYMBOLS)
+    with profiler.stage("parse_fidelity"):
+        positions = parse_fidelity_csv(csv_path, ignore_symbols=IGNORE_SYMBOLS)
     print(f"Loaded {len(positions)} Fidelity positions")
 
     # Load IBKR positions
     if not args.no_ibkr:
         print("Fetching IBKR prices via yfinance...")
-        ibkr_positions = create_ibkr_positions(
-            equities=IBKR_EQUITIES,
-            bonds=IBKR_BONDS,
-            cash=IBKR_CASH,
-            yf_symbol_map=IBKR_YF_MAP,
-        )
+        with profiler.stage("ibkr_positions"):
+            ibkr_positions = create_ibkr_positions(
+                equities=IBKR_EQUITIES,
+                bonds=IBKR_BONDS,
+                cash=IBKR_CASH,
+                yf_symbol_map=ibkr_yahoo_symbols(),
+            )
         print(f"Loaded {len(ibkr_positions)} IBKR positions")
         positions.extend(ibkr_positions)
 
-    pf = Portfolio(positions)
+    with profiler.stage("report"):
+        pf = Portfolio(positions)
 
-    # Always show summary
-    print(pf.summary())
+        # Always show summary
+        print(pf.summary())
 
-    # Detail views
-    if args.detail is not None:
-        buckets = args.detail if args.detail else ["all"]
-        if "all" in buckets:
-            buckets = pf.buckets
-        for b in buckets:
-            print(pf.bucket_detail(b))
+        # Detail views
+        if args.detail is not None:
+            buckets = args.detail if args.detail else ["all"]
+            if "all" in buckets:
+                buckets = pf.buckets
+            for b in buckets:
+                print(pf.bucket_detail(b))
 
-    if args.nota:
-        print(pf.bucket_detail("NOTA"))
+        if args.nota:
+            print(pf.bucket_detail("NOTA"))
 
-    if args.shorts:
-        print(pf.shorts_detail())
+        if args.shorts:
+            print(pf.shorts_detail())
 
-    # Quick stats
-    total = pf.total_all()
-    shorts_val = sum(p.current_value for p in pf.shorts())
+        # Quick stats
+        total = pf.total_all()
+        shorts_val = sum(p.current_value for p in pf.shorts())
     print(f"\nShorts total: ${shorts_val:,.2f}")
     print(f"Portfolio total: ${total:,.2f}")
 
+    profiler.print_report()
+
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
-"""Download the Hedgeye ETF Holdings CSV and persist if changed."""
-from pathlib import Path
+"""
+Download the Hedgeye ETF Holdings CSV and persist if changed.
+
+Usage:
+    uv run python scripts/hedgeye/download_ham_etf_holdings.py
+    uv run python scripts/hedgeye/download_ham_etf_holdings.py --output-dir /tmp/ham
+"""
 
-from hedgeye.config_loader import load_config
-from hedgeye.ds.ham.ham_etf_holdings_downloader import download_etf_holdings
+import argparse
+from pathlib import Path
 
 
 def main():
-    cfg = load_config()
-    output_dir = Path(cfg["paths"]["ham_csv_dir"])
-    download_etf_holdings(output_dir)
+    parser = argparse.ArgumentParser(description="Download the HAM ETF Holdings CSV (saved only if changed)")
+    parser.add_argument("--output-dir", type=Path, default=None,
+                        help="Directory for ham_holdings_*.csv (default: paths.ham_csv_dir)")
+    args = parser.parse_args()
+
+    from hedgeye.config_loader import config_path
+    from hedgeye.ds.ham.ham_etf_holdings_downloader import download_etf_holdings
+
+    download_etf_holdings(args.output_dir or config_path("ham_csv_dir"))
 
 
 if __name__ == "__main__":
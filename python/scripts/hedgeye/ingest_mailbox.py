@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Ingest Hedgeye newsletters from exported mailboxes (mbox or Maildir).
+
+Streams each archive one message at a time, classifies messages by subject
+(Risk Range / ETF Pro weekly / Portfolio Solutions) and parses them in
+parallel straight into the usual CSV outputs - no .eml files are saved.
+Reports whose CSV already exists are skipped.
+
+Usage:
+    uv run python scripts/hedgeye/ingest_mailbox.py ~/Downloads/hedgeye.mbox
+    uv run python scripts/hedgeye/ingest_mailbox.py ~/Mail/Hedgeye --workers 4
+    uv run python scripts/hedgeye/ingest_mailbox.py archive.mbox --dry-run
+"""
+
+import argparse
+
+from hedgeye.ds.mailbox_ingest import ingest_mailbox
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Ingest Hedgeye emails from mbox/Maildir archives")
+    parser.add_argument("mailboxes", nargs="+", help="mbox files or Maildir directories")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parser processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-parse reports whose CSV output already exists")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only classify and list messages")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Show parser output for every message")
+    args = parser.parse_args()
+
+    for path in args.mailboxes:
+        ingest_mailbox(path, workers=args.workers, force=args.force,
+                       dry_run=args.dry_run, verbose=args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,28 @@
 #!/usr/bin/env python3
 """
-Run both RR and CR pipelines sequentially.
+Run both RR and CR pipelines.
 
 This script runs:
 1. Risk Range (RR) full pipeline
 2. Current Range (CR) full pipeline
 
-The RR pipeline must run first because CR depends on the combined RR data.
+Stages run through the incremental DAG runner (hedgeye.ds.pipeline_dag):
+RR, EP and PS parsing run concurrently, CR merging waits for the combined
+RR data, and stages whose inputs have not changed since their last run are
+skipped. With no new emails a rerun finishes in seconds.
 
 Usage:
     uv run python scripts/hedgeye/run_both_pipelines.py
+    uv run python scripts/hedgeye/run_both_pipelines.py --force        # rerun every stage
+    uv run python scripts/hedgeye/run_both_pipelines.py --dry-run      # show what would run
+    uv run python scripts/hedgeye/run_both_pipelines.py --profile      # profile each stage
 """
 
-from hedgeye.ds.rr.rr_pipeline import run_full_rr_pipeline
-from hedgeye.ds.ep.process_etf_pro_weekly import main as parse_ep
-from hedgeye.ds.ps.process_portfolio_solutions import main as parse_ps
-from hedgeye.ds.cr.cr_merge_ranges import main as merge_cr
-from hedgeye.ds.cr.cr_enrich_ranges import main as enrich_cr
-from hedgeye.ds.cr.cr_time_series_plotting import generate_all_cr_time_series_plots
+import argparse
+from typing import Optional
+
+from hedgeye.ds.pipeline_dag import run_pipeline_dag
+from hedgeye.ds.profiling import Profiler, add_profile_argument
 
 
 def run_both_pipelines(
@@ -25,7 +30,11 @@ def run_both_pipelines(
     rr_generate_plots: bool = True,
     cr_parse_emails: bool = True,
     cr_generate_plots: bool = True,
-    plot_days_back: int = 30
+    plot_days_back: int = 30,
+    force: bool = False,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    profile: Optional[str] = None
 ):
     """
     Run both RR and CR pipelines.
@@ -36,58 +45,36 @@ def run_both_pipelines(
         cr_parse_emails: Parse EP/PS emails (default: True)
         cr_generate_plots: Generate CR plots (default: True)
         plot_days_back: Days to look back for CR plots (default: 30)
+        force: Rerun stages even if their inputs are unchanged (default: False)
+        workers: Concurrent stage processes (default: one per stage; 1 = sequential)
+        dry_run: Only show which stages would run (default: False)
+        profile: Profile each stage: "cprofile" or "py-spy" (default: off)
+
+    Returns:
+        DagResult with per-stage outcomes
     """
     print("=" * 70)
     print("HEDGEYE FULL PIPELINE - RR + CR")
     print("=" * 70)
 
-    # ========== RR Pipeline ==========
-    print("\n" + "=" * 70)
-    print("RISK RANGE (RR) PIPELINE")
-    print("=" * 70)
-
-    run_full_rr_pipeline(
-        parse_emails=rr_parse_emails,
-        combine_data=True,
-        generate_basic_plots=False,
-        generate_enhanced_plots=rr_generate_plots
-    )
-
-    # ========== CR Pipeline ==========
-    print("\n" + "=" * 70)
-    print("CURRENT RANGE (CR) PIPELINE")
-    print("=" * 70)
-
-    if cr_parse_emails:
-        print("\n" + "=" * 70)
-        print("Step 1: Parsing ETF Pro Plus Weekly Emails")
-        print("=" * 70)
-        parse_ep()
-
-        print("\n" + "=" * 70)
-        print("Step 2: Parsing Portfolio Solutions Daily Emails")
-        print("=" * 70)
-        parse_ps()
-
-    print("\n" + "=" * 70)
-    print("Step 3: Merging Position Ranges")
-    print("=" * 70)
-    merge_cr()
-
-    print("\n" + "=" * 70)
-    print("Step 4: Enriching with Current Prices")
-    print("=" * 70)
-    enrich_cr()
-
-    if cr_generate_plots:
-        print("\n" + "=" * 70)
-        print("Step 5: Generating CR Time-Series Plots")
-        print("=" * 70)
-        generate_all_cr_time_series_plots(days_back=plot_days_back)
+    skip = []
+    if not rr_parse_emails:
+        skip.append("parse_rr")
+    if not rr_generate_plots:
+        skip.append("rr_plots")
+    if not cr_parse_emails:
+        skip += ["parse_ep", "parse_ps"]
+    if not cr_generate_plots:
+        skip.append("cr_plots")
+
+    result = run_pipeline_dag(force=force, workers=workers, dry_run=dry_run, skip=skip,
+                              plot_days_back=plot_days_back,
+                              report_name="run_both_pipelines",
+                              profiler=Profiler.start("run_both_pipelines", None if dry_run else profile))
 
     # ========== Summary ==========
     print("\n" + "=" * 70)
-    print("✅ FULL PIPELINE COMPLETE!")
+    print("✅ FULL PIPELINE COMPLETE!" if result.ok else "❌ PIPELINE FINISHED WITH FAILURES")
     print("=" * 70)
     print("\nOutputs:")
     print("  RR Data: ~/d/prod/hedgeye/rr/all/csv/combined_risk_range.csv")
@@ -95,11 +82,25 @@ def run_both_pipelines(
     print("  CR Data: ~/d/view/hedgeye/data/cr/position_ranges_enriched.csv")
     print("  CR Plots: ~/d/view/hedgeye/plots/cr_time_series/")
     print("=" * 70)
+    return result
 
 
 def main():
     """Main entry point."""
-    run_both_pipelines()
+    parser = argparse.ArgumentParser(description="Run the RR and CR pipelines (incremental)")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent stage processes (1 = sequential, live output)")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run")
+    parser.add_argument("--days-back", type=int, default=30, help="Days of history in CR plots")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    result = run_both_pipelines(plot_days_back=args.days_back, force=args.force,
+                                workers=args.workers, dry_run=args.dry_run,
+                                profile=args.profile)
+    if not result.ok:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -9,15 +9,21 @@ This script orchestrates the full CR pipeline:
 4. Enrich with current prices and proxy calculations
 5. Generate CR time-series plots
 
+Stages run through the incremental DAG runner (hedgeye.ds.pipeline_dag):
+EP and PS parsing run concurrently and up-to-date stages are skipped. The
+RR stages are not run; merging uses the existing combined RR data.
+
 Usage:
     uv run python scripts/hedgeye/run_cr_pipeline.py
+    uv run python scripts/hedgeye/run_cr_pipeline.py --force
+    uv run python scripts/hedgeye/run_cr_pipeline.py --profile
 """
 
-from hedgeye.ds.ep.process_etf_pro_weekly import main as parse_ep
-from hedgeye.ds.ps.process_portfolio_solutions import main as parse_ps
-from hedgeye.ds.cr.cr_merge_ranges import main as merge_cr
-from hedgeye.ds.cr.cr_enrich_ranges import main as enrich_cr
-from hedgeye.ds.cr.cr_time_series_plotting import generate_all_cr_time_series_plots
+import argparse
+from typing import Optional
+
+from hedgeye.ds.pipeline_dag import CR_STAGES, run_pipeline_dag
+from hedgeye.ds.profiling import Profiler, add_profile_argument
 
 
 def run_full_cr_pipeline(
@@ -25,7 +31,11 @@ def run_full_cr_pipeline(
     merge_data: bool = True,
     enrich_data: bool = True,
     generate_plots: bool = True,
-    plot_days_back: int = 30
+    plot_days_back: int = 30,
+    force: bool = False,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    profile: Optional[str] = None
 ):
     """
     Run the complete CR pipeline.
@@ -36,48 +46,55 @@ def run_full_cr_pipeline(
         enrich_data: Enrich with prices (default: True)
         generate_plots: Generate time-series plots (default: True)
         plot_days_back: Days to look back for plots (default: 30)
+        force: Rerun stages even if their inputs are unchanged (default: False)
+        workers: Concurrent stage processes (default: one per stage; 1 = sequential)
+        dry_run: Only show which stages would run (default: False)
+        profile: Profile each stage: "cprofile" or "py-spy" (default: off)
+
+    Returns:
+        DagResult with per-stage outcomes
     """
     print("=" * 70)
     print("Current Range (CR) Full Pipeline")
     print("=" * 70)
 
-    if parse_emails:
-        print("\n" + "=" * 70)
-        print("Step 1: Parsing ETF Pro Plus Weekly Emails")
-        print("=" * 70)
-        parse_ep()
-
-        print("\n" + "=" * 70)
-        print("Step 2: Parsing Portfolio Solutions Daily Emails")
-        print("=" * 70)
-        parse_ps()
-
-    if merge_data:
-        print("\n" + "=" * 70)
-        print("Step 3: Merging Position Ranges")
-        print("=" * 70)
-        merge_cr()
-
-    if enrich_data:
-        print("\n" + "=" * 70)
-        print("Step 4: Enriching with Current Prices")
-        print("=" * 70)
-        enrich_cr()
-
-    if generate_plots:
-        print("\n" + "=" * 70)
-        print("Step 5: Generating CR Time-Series Plots")
-        print("=" * 70)
-        generate_all_cr_time_series_plots(days_back=plot_days_back)
+    skip = ["parse_rr", "combine_rr"]
+    if not parse_emails:
+        skip += ["parse_ep", "parse_ps"]
+    if not merge_data:
+        skip.append("merge_cr")
+    if not enrich_data:
+        skip.append("enrich_cr")
+    if not generate_plots:
+        skip.append("cr_plots")
+
+    result = run_pipeline_dag(targets=CR_STAGES, force=force, workers=workers, dry_run=dry_run,
+                              skip=skip, plot_days_back=plot_days_back,
+                              report_name="run_cr_pipeline",
+                              profiler=Profiler.start("run_cr_pipeline", None if dry_run else profile))
 
     print("\n" + "=" * 70)
-    print("✅ Full CR Pipeline Complete!")
+    print("✅ Full CR Pipeline Complete!" if result.ok else "❌ CR Pipeline finished with failures")
     print("=" * 70)
+    return result
 
 
 def main():
     """Main entry point."""
-    run_full_cr_pipeline()
+    parser = argparse.ArgumentParser(description="Run the CR pipeline (incremental)")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent stage processes (1 = sequential, live output)")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run")
+    parser.add_argument("--days-back", type=int, default=30, help="Days of history in CR plots")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    result = run_full_cr_pipeline(plot_days_back=args.days_back, force=args.force,
+                                  workers=args.workers, dry_run=args.dry_run,
+                                  profile=args.profile)
+    if not result.ok:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Run the Hedgeye pipelines as a long-running daemon.
+
+Keeps config, RR/EP history, price caches and HTTP sessions warm in memory,
+watches the raw email directories, and brings the combined data, CR outputs
+and affected plots up to date within seconds of a new email landing. A local
+JSON control API (127.0.0.1 only) triggers runs and reports status; see
+hedgeye.ds.daemon.
+
+Usage:
+    uv run python scripts/hedgeye/run_daemon.py
+    uv run python scripts/hedgeye/run_daemon.py --port 8800 --settle 0.5
+    uv run python scripts/hedgeye/run_daemon.py --no-watch --no-initial-run
+
+    curl -s localhost:8765/status
+    curl -s -X POST localhost:8765/run -d '{"force": true}'
+    curl -s localhost:8765/report
+    curl -s -X POST localhost:8765/stop
+"""
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pipelines as a daemon with a local control API")
+    parser.add_argument("--port", type=int, default=None, help="Control API port (default: 8765 or daemon.port)")
+    parser.add_argument("--poll-interval", type=float, default=None,
+                        help="Seconds between raw directory checks when inotify is unavailable (default: 0.25)")
+    parser.add_argument("--settle", type=float, default=None,
+                        help="Seconds a new file must stay unchanged before it is processed (default: 0.25)")
+    parser.add_argument("--no-watch", action="store_true", help="Only run when asked through the API")
+    parser.add_argument("--no-initial-run", action="store_true", help="Do not run the pipeline at startup")
+    parser.add_argument("--days-back", type=int, default=30, help="Days of history in CR plots")
+    parser.add_argument("--start-date", default="2025-10-01", help="Earliest date in RR plots")
+    args = parser.parse_args()
+
+    from hedgeye.ds.daemon import PipelineDaemon
+
+    daemon = PipelineDaemon(port=args.port, poll_interval=args.poll_interval, settle_seconds=args.settle,
+                            watch=not args.no_watch, plot_days_back=args.days_back,
+                            rr_plot_start=args.start_date)
+    daemon.serve_forever(run_now=not args.no_initial_run)
+
+
+if __name__ == "__main__":
+    main()
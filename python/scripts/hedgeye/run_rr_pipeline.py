@@ -1,11 +1,38 @@
 #!/usr/bin/env python3
 """
 Run the complete Hedgeye Risk Range data pipeline.
+
+Parses new RR emails, rebuilds the combined data and trend timeline, and
+writes the status table and enhanced plots. Runs through the incremental DAG
+runner (hedgeye.ds.pipeline_dag), so stages with unchanged inputs are skipped.
+
+Usage:
+    uv run python scripts/hedgeye/run_rr_pipeline.py
+    uv run python scripts/hedgeye/run_rr_pipeline.py --force
+    uv run python scripts/hedgeye/run_rr_pipeline.py --profile
 """
-from hedgeye.ds.rr.rr_pipeline import run_full_rr_pipeline
+
+import argparse
+
+from hedgeye.ds.pipeline_dag import RR_STAGES, run_pipeline_dag
+from hedgeye.ds.profiling import Profiler, add_profile_argument
+
 
 def main():
-    run_full_rr_pipeline()
+    parser = argparse.ArgumentParser(description="Run the RR pipeline (incremental)")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run")
+    parser.add_argument("--start-date", default="2025-10-01", help="Earliest date in RR plots")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    result = run_pipeline_dag(targets=RR_STAGES, force=args.force, dry_run=args.dry_run,
+                              workers=1, rr_plot_start=args.start_date,
+                              report_name="run_rr_pipeline",
+                              profiler=Profiler.start("run_rr_pipeline", None if args.dry_run else args.profile))
+    if not result.ok:
+        raise SystemExit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the pipeline CLIs.
+
+Runs each CLI (mostly with --help, so nothing but imports and argparse
+happens) under `python -X importtime`, sums the import time of the
+program's top-level imports (interpreter startup excluded), and compares it
+with the CLI's budget.
+
+Budgets are relative: a multiple of the time `import pandas` takes in the
+same run (measured the same way), so they hold on fast and slow machines
+alike. --budget-scale adds headroom on noisy machines. A CLI over budget is
+reported, and fails the run only with --strict.
+
+The hard failure is structural: any repo module the CLI loaded (or the
+script itself) that imports a heavy dependency at module level that should
+only be imported at the point of use (matplotlib, yfinance, bs4, pytz,
+pyarrow). That check reads the modules' source, because pandas loads
+pyarrow and pytz itself and -X importtime cannot tell who asked for them.
+
+Each CLI (and the baseline) runs --repeat times and the fastest run counts
+(the first run also warms the bytecode cache).
+
+Usage:
+    uv run python scripts/hedgeye/testing/bench_import_time.py
+    uv run python scripts/hedgeye/testing/bench_import_time.py --repeat 5 --top 10
+    uv run python scripts/hedgeye/testing/bench_import_time.py --only run_rr_pipeline
+    uv run python scripts/hedgeye/testing/bench_import_time.py --budget-scale 1.5 --strict
+"""
+
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+PYTHON_ROOT = Path(__file__).resolve().parents[3]
+
+# Never imported just to start a CLI (imported lazily where they are used)
+LAZY_MODULES = ["matplotlib", "yfinance", "bs4", "pytz", "pyarrow"]
+
+REPO_PACKAGES = ("hedgeye", "fin", "sss", "shared", "ace")
+
+# What the budgets are relative to
+BASELINE_ARGV = ["-c", "import pandas"]
+
+# name: (argv after `python -X importtime`, budget as a multiple of the baseline)
+CLI_BUDGETS: Dict[str, Tuple[List[str], float]] = {
+    # CLIs must not pay for pandas just to start
+    "run_both_pipelines": (["scripts/hedgeye/run_both_pipelines.py", "--help"], 0.35),
+    "run_cr_pipeline": (["scripts/hedgeye/run_cr_pipeline.py", "--help"], 0.35),
+    "run_rr_pipeline": (["scripts/hedgeye/run_rr_pipeline.py", "--help"], 0.35),
+    "ingest_mailbox": (["scripts/hedgeye/ingest_mailbox.py", "--help"], 0.35),
+    "run_daemon": (["scripts/hedgeye/run_daemon.py", "--help"], 0.35),
+    "download_ham_etf_holdings": (["scripts/hedgeye/download_ham_etf_holdings.py", "--help"], 0.35),
+    "portfolio_report": (["scripts/fin/portfolio_report.py", "--help"], 0.35),
+    "fetch_ibkr_positions": (["scripts/fin/fetch_ibkr_positions.py", "--help"], 0.35),
+    # Parser modules run per email (pandas is expected, plotting/price libraries are not)
+    "parse_rr_eml": (["-c", "import hedgeye.ds.rr.parse_rr_eml"], 1.5),
+    "run_rr_parser": (["-c", "import hedgeye.ds.rr.run_rr_parser"], 1.5),
+    "process_etf_pro_weekly": (["-c", "import hedgeye.ds.ep.process_etf_pro_weekly"], 1.5),
+    "process_portfolio_solutions": (["-c", "import hedgeye.ds.ps.process_portfolio_solutions"], 1.5),
+    "rr_pipeline": (["-c", "import hedgeye.ds.rr.rr_pipeline"], 1.9),
+}
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int, Optional[int]]]:
+    """
+    Rows of `-X importtime` output.
+
+    A module's line follows the lines of the modules it imported, which are
+    indented one level deeper.
+
+    Returns:
+        (module, self us, cumulative us, depth, index of the importing row or
+        None for top-level imports), in output order
+    """
+    rows, open_rows = [], []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        depth = len(match.group(3))
+        index = len(rows)
+        rows.append([match.group(4), int(match.group(1)), int(match.group(2)), depth, None])
+        while open_rows and rows[open_rows[-1]][3] > depth:
+            rows[open_rows.pop()][4] = index
+        open_rows.append(index)
+    return [tuple(r) for r in rows]
+
+
+def program_imports(rows: List[tuple]) -> List[tuple]:
+    """Top-level imports made after interpreter startup (i.e. after site)."""
+    top = [r for r in rows if r[4] is None]
+    names = [r[0] for r in top]
+    return top[names.index("site") + 1:] if "site" in names else top
+
+
+def _module_level_imports(body: List[ast.stmt]) -> Iterator[str]:
+    """Modules imported when a module body runs (not in functions or `if TYPE_CHECKING:`)."""
+    for node in body:
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+        elif isinstance(node, ast.If):
+            if not (isinstance(node.test, ast.Name) and node.test.id == "TYPE_CHECKING"):
+                yield from _module_level_imports(node.body)
+            yield from _module_level_imports(node.orelse)
+        elif isinstance(node, ast.Try):
+            for block in [node.body, node.orelse, node.finalbody, *(h.body for h in node.handlers)]:
+                yield from _module_level_imports(block)
+        elif isinstance(node, ast.With):
+            yield from _module_level_imports(node.body)
+
+
+def _source_path(module: str) -> Optional[Path]:
+    base = PYTHON_ROOT / "src" / Path(*module.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.exists():
+            return path
+    return None
+
+
+def eager_lazy_imports(rows: List[tuple], script: Optional[str] = None) -> List[str]:
+    """
+    LAZY_MODULES imported at module level by a loaded repo module or the script.
+
+    Returns:
+        ["module (by importer)", ...]
+    """
+    sources: Dict[str, Path] = {}
+    for module, *_ in rows:
+        if module.split(".")[0] in REPO_PACKAGES:
+            path = _source_path(module)
+            if path:
+                sources[module] = path
+    if script:
+        sources["__main__"] = PYTHON_ROOT / script
+    found: Set[str] = set()
+    for module, path in sources.items():
+        tree = ast.parse(path.read_text(), filename=str(path))
+        for name in _module_level_imports(tree.body):
+            if name.split(".")[0] in LAZY_MODULES:
+                found.add(f"{name.split('.')[0]} (by {module})")
+    return sorted(found)
+
+
+def measure(argv: List[str]) -> Tuple[float, float, str]:
+    """
+    Run one CLI under -X importtime.
+
+    Returns:
+        (total import ms, wall ms, stderr)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PYTHON_ROOT / "src"), env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=PYTHON_ROOT, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise RuntimeError(f"exit {proc.returncode}: {errors[-1] if errors else ''}")
+    total = sum(r[2] for r in program_imports(parse_importtime(proc.stderr))) / 1000
+    return total, wall, proc.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import time against per-CLI budgets")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per CLI (fastest counts)")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest top-level imports per CLI")
+    parser.add_argument("--only", nargs="*", help="CLI names to check (default: all)")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget by this factor (headroom on noisy machines)")
+    parser.add_argument("--strict", action="store_true", help="Also fail when a CLI is over budget")
+    args = parser.parse_args()
+
+    repeat = max(1, args.repeat)
+    baseline = min(measure(BASELINE_ARGV)[0] for _ in range(repeat))
+    print(f"Baseline ({BASELINE_ARGV[-1]}): {baseline:.0f} ms; budget scale x{args.budget_scale:g}\n")
+
+    names = args.only or list(CLI_BUDGETS)
+    failures, over_budget = [], []
+    print(f"{'CLI':<30}{'import ms':>10}{'wall ms':>9}{'budget':>8}  result")
+    for name in names:
+        argv, factor = CLI_BUDGETS[name]
+        budget = factor * baseline * args.budget_scale
+        try:
+            runs = [measure(argv) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"{name:<30}{'':>10}{'':>9}{budget:>8.0f}  ❌ {e}")
+            failures.append(name)
+            continue
+        total, wall, stderr = min(runs, key=lambda r: r[0])
+        rows = parse_importtime(stderr)
+        loaded = eager_lazy_imports(rows, script=argv[0] if argv[0].endswith(".py") else None)
+        if loaded:
+            result = f"❌ imports {', '.join(loaded)}"
+            failures.append(name)
+        elif total > budget:
+            result = "❌ over budget" if args.strict else "⚠️  over budget"
+            over_budget.append(name)
+        else:
+            result = "✅"
+        print(f"{name:<30}{total:>10.0f}{wall:>9.0f}{budget:>8.0f}  {result}")
+        if args.top:
+            for module, _, cum, _, _ in sorted(program_imports(rows), key=lambda r: -r[2])[:args.top]:
+                print(f"    {cum / 1000:>8.1f} ms  {module}")
+
+    if over_budget:
+        print(f"\n⚠️  {len(over_budget)} CLI(s) over budget: {', '.join(over_budget)}")
+    if args.strict:
+        failures += over_budget
+    if failures:
+        print(f"\n❌ {len(failures)} CLI(s) failed: {', '.join(failures)}")
+        raise SystemExit(1)
+    print(f"\n✅ All {len(names)} CLIs import lazily" + ("" if over_budget else " and within budget"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the unified Risk Range parser.
+
+Builds a synthetic corpus of RR emails in all three variants (HTML
+newsletter, plain-text MIME body, pasted text), parses every message with
+hedgeye.ds.rr.parse_rr.parse_rr_email and checks the parsed rows against
+what was generated. Nothing is written to disk.
+
+Usage:
+    uv run python scripts/hedgeye/testing/bench_rr_parser.py
+    uv run python scripts/hedgeye/testing/bench_rr_parser.py --messages 500 --symbols 60
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from email.message import EmailMessage
+
+from hedgeye.ds.rr.parse_rr import (
+    FORMAT_HTML, FORMAT_PASTED, FORMAT_PLAIN, parse_rr_email,
+)
+
+TRENDS = ["Bullish", "Bearish", "Neutral"]
+
+
+def make_report(report_date: date, n_symbols: int, rng: random.Random) -> dict:
+    """Random report: rows of (symbol, description, trend, buy, sell, close) plus changes."""
+    rows = []
+    for i in range(n_symbols):
+        close = round(rng.uniform(5, 7000), 2)
+        width = close * rng.uniform(0.01, 0.08)
+        buy = round(close - width * rng.uniform(0.2, 0.8), 2)
+        rows.append((f"SYM{i:03d}", f"Synthetic Asset {i}", rng.choice(TRENDS),
+                     buy, round(buy + width, 2), close))
+    changes = [f"{rows[0][0]} changed from Bearish to Bullish",
+               f"{rows[1][0]} moved to the #OutBucket"]
+    return {"date": report_date, "rows": rows, "changes": changes}
+
+
+def render_html(report: dict) -> bytes:
+    d = report["date"]
+    body = [f'<div class="headline">RISK RANGE&trade; SIGNALS: {d:%B %-d, %Y}</div>',
+            "<p><strong>TREND CHANGE:</strong></p>"]
+    body += [f"<p>{line}</p>" for line in report["changes"]]
+    body.append('<table><tr><th>INDEX</th><th>BUY TRADE</th><th>SELL TRADE</th><th>PREV. CLOSE</th></tr>')
+    for sym, desc, trend, buy, sell, close in report["rows"]:
+        body.append(f"<tr>\n  <td>{sym} ({trend})<br><span>{desc}</span></td>\n"
+                    f"  <td>{buy:,.2f}</td><td>{sell:,.2f}</td><td>{close:,.2f}</td>\n</tr>")
+    body.append("</table>")
+    msg = EmailMessage()
+    msg["Subject"] = f"RISK RANGE™ SIGNALS: {d:%B %-d, %Y}".upper()
+    msg.set_content("This is an HTML email.")
+    msg.add_alternative("<html><body>" + "\n".join(body) + "</body></html>", subtype="html")
+    return msg.as_bytes()
+
+
+def render_plain(report: dict) -> bytes:
+    d = report["date"]
+    lines = [f"RISK RANGE™ SIGNALS: {d:%B %-d, %Y}", "TREND CHANGE:", *report["changes"],
+             "INDEX BUY TRADE SELL TRADE PREV. CLOSE"]
+    for sym, desc, trend, buy, sell, close in report["rows"]:
+        lines.append(f"{sym} {desc} ({trend}) {buy:,.2f} {sell:,.2f} {close:,.2f}")
+    msg = EmailMessage()
+    msg["Subject"] = "Risk Range Signals"
+    msg.set_content("\n".join(lines))
+    return msg.as_bytes()
+
+
+def render_pasted(report: dict) -> bytes:
+    d = report["date"]
+    lines = [f"RISK RANGE™ SIGNALS: {d:%B %-d, %Y}", f"{d:%m/%d/%Y} 07:58 AM EDT",
+             "TREND CHANGE:", *report["changes"], "INDEX BUY TRADE SELL TRADE PREV. CLOSE"]
+    for sym, desc, trend, buy, sell, close in report["rows"]:
+        lines += [f"{sym} ({trend})", f"{desc} {buy:,.2f} {sell:,.2f} {close:,.2f}"]
+    return "\n".join(lines).encode()
+
+
+RENDERERS = {FORMAT_HTML: render_html, FORMAT_PLAIN: render_plain, FORMAT_PASTED: render_pasted}
+
+
+def check(report: dict, parsed) -> None:
+    """Raise AssertionError if parsed output differs from the generated report."""
+    report_date, entries, changes = parsed
+    assert report_date == report["date"].isoformat(), report_date
+    assert len(entries) == len(report["rows"]), (len(entries), len(report["rows"]))
+    for entry, (sym, _, trend, buy, sell, close) in zip(entries, report["rows"]):
+        assert (entry.index, entry.trend.value, entry.buy_trade, entry.sell_trade, entry.prev_close) == \
+            (sym, trend.upper(), buy, sell, close), entry
+    assert len(changes) == len(report["changes"]), changes
+    assert entries[1].bucket.name == "OUT"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the unified RR parser")
+    parser.add_argument("--messages", type=int, default=200, help="Messages per format")
+    parser.add_argument("--symbols", type=int, default=45, help="Rows per message")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = date(2024, 1, 1)
+    reports = [make_report(start + timedelta(days=i), args.symbols, rng) for i in range(args.messages)]
+
+    print(f"📊 RR parser throughput: {args.messages} messages x {args.symbols} rows per format\n")
+    print(f"   {'format':<8} {'MB':>7} {'msgs/s':>9} {'rows/s':>10} {'MB/s':>7}")
+    for fmt, render in RENDERERS.items():
+        corpus = [render(r) for r in reports]
+        size_mb = sum(len(m) for m in corpus) / 1e6
+
+        t0 = time.perf_counter()
+        results = [parse_rr_email(m) for m in corpus]
+        elapsed = time.perf_counter() - t0
+
+        for report, parsed in zip(reports, results):
+            check(report, parsed)
+
+        n_rows = sum(len(r[1]) for r in results)
+        print(f"   {fmt:<8} {size_mb:>7.2f} {len(corpus) / elapsed:>9.0f} "
+              f"{n_rows / elapsed:>10.0f} {size_mb / elapsed:>7.1f}")
+
+    print("\n✅ All parsed reports match the generated corpus")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,12 @@ Usage:
 """
 
 import os
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from .country_codes import make_cid, parse_cid, exchange_to_country
@@ -29,6 +32,9 @@ from .models import Base, Entity, TickerAlias, get_engine, get_session, create_t
 # Default database location
 DEFAULT_DB_PATH = Path(__file__).parent.parent.parent.parent / "data" / "fin_catalog.db"
 
+# Rows per executemany in bulk_upsert_entities
+BULK_BATCH_SIZE = 5000
+
 
 class TickerCatalog:
     """
@@ -148,7 +154,34 @@ class TickerCatalog:
         """
         entity = self.lookup(ticker, exchange)
         return entity.cid if entity else None
-    
+
+    def ticker_map(self) -> dict[str, tuple[str, str | None]]:
+        """
+        Every ticker lookup() resolves, in one pass over the tables.
+
+        Keys are upper case, as lookup() normalizes them: cids ("AAPL.US"),
+        bare tickers of US entities and aliases. Precedence matches lookup():
+        cid, then .us ticker, then the first alias.
+
+        Returns:
+            {ticker: (cid, yahoo_symbol)}
+        """
+        entities = {
+            cid: yahoo for cid, yahoo in self.session.query(Entity.cid, Entity.yahoo_symbol)
+        }
+        ticker_map: dict[str, tuple[str, str | None]] = {}
+        aliases = self.session.query(TickerAlias.ticker, TickerAlias.entity_cid).order_by(TickerAlias.id)
+        for ticker, cid in aliases:
+            if cid in entities:
+                ticker_map.setdefault(ticker.upper(), (cid, entities[cid]))
+        for cid, yahoo in entities.items():
+            ticker, country = parse_cid(cid)
+            if country == "us":
+                ticker_map[ticker] = (cid, yahoo)
+        for cid, yahoo in entities.items():
+            ticker_map[cid.upper()] = (cid, yahoo)
+        return ticker_map
+
     # -------------------------------------------------------------------------
     # Search
     # -------------------------------------------------------------------------
@@ -253,7 +286,60 @@ class TickerCatalog:
         
         self.session.commit()
         return entity
-    
+
+    def bulk_upsert_entities(self, rows: Iterable[dict], batch_size: int = BULK_BATCH_SIZE) -> int:
+        """
+        Add or update many entities in one transaction.
+
+        Uses INSERT ... ON CONFLICT(cid) DO UPDATE, executed in batches of
+        rows with the same columns (executemany), instead of a SELECT and a
+        commit per entity as add_entity does. An existing entity gets the
+        row's values, except that a missing sector/industry/exchange keeps
+        the stored one (as in add_entity). Later rows win over earlier rows
+        with the same cid.
+
+        Args:
+            rows: Dicts of Entity fields. cid (already normalized, e.g.
+                "ARX.ca"), name and country are required
+            batch_size: Rows per executemany call
+
+        Returns:
+            Number of rows written
+        """
+        table = Entity.__table__
+        now = datetime.utcnow()
+        count = 0
+        batches: dict[tuple[str, ...], list[dict]] = {}
+
+        def flush(columns: tuple[str, ...]) -> None:
+            batch = batches.pop(columns)
+            stmt = sqlite_insert(table)
+            keep = {"sector", "industry", "exchange"}
+            updates = {
+                col: func.coalesce(stmt.excluded[col], table.c[col]) if col in keep else stmt.excluded[col]
+                for col in columns if col not in ("cid", "created_at")
+            }
+            updates["updated_at"] = now
+            self.session.execute(stmt.on_conflict_do_update(index_elements=[table.c.cid], set_=updates), batch)
+
+        try:
+            for row in rows:
+                columns = tuple(sorted(row))
+                batch = batches.setdefault(columns, [])
+                batch.append(row)
+                count += 1
+                if len(batch) >= batch_size:
+                    flush(columns)
+            for columns in list(batches):
+                flush(columns)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        # Entities loaded before the upsert are stale
+        self.session.expire_all()
+        return count
+
     def add_alias(
         self,
         ticker: str,
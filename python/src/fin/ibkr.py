@@ -19,11 +19,10 @@ Usage:
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import pandas as pd
-import yfinance as yf
-from ib_async import IB
+if TYPE_CHECKING:  # pandas, ib_async and yfinance are imported where used
+    import pandas as pd
 
 
 # Common port configurations
@@ -71,6 +70,8 @@ def fetch_positions(
     Raises:
         ConnectionError: If TWS/Gateway is not running or refuses connection.
     """
+    from ib_async import IB
+
     ib = IB()
     try:
         ib.connect(host, port, clientId=client_id, readonly=True)
@@ -111,6 +112,7 @@ def enrich_with_prices(positions: list[PortfolioPosition]) -> list[PortfolioPosi
     Returns:
         Same list with market_price and market_value populated where available.
     """
+    import yfinance as yf
     symbols = list({p.symbol for p in positions if p.sec_type == "STK"})
     if not symbols:
         return positions
@@ -136,7 +138,7 @@ def enrich_with_prices(positions: list[PortfolioPosition]) -> list[PortfolioPosi
     return positions
 
 
-def positions_to_dataframe(positions: list[PortfolioPosition]) -> pd.DataFrame:
+def positions_to_dataframe(positions: list[PortfolioPosition]) -> "pd.DataFrame":
     """
     Convert portfolio positions to a pandas DataFrame.
 
@@ -146,6 +148,7 @@ def positions_to_dataframe(positions: list[PortfolioPosition]) -> pd.DataFrame:
     Returns:
         DataFrame with all position fields plus a timestamp column.
     """
+    import pandas as pd
     if not positions:
         return pd.DataFrame(
             columns=[
@@ -1,6 +1,10 @@
 """
 Seed the fin catalog from FMP entity data.
 
+Each list is turned into entity rows with vectorized pandas (cid and
+country derivation) and written with TickerCatalog.bulk_upsert_entities
+in one transaction.
+
 Usage:
     python -m fin.seed_fmp                    # Seed all
     python -m fin.seed_fmp --stocks           # Seed only stocks
@@ -10,6 +14,7 @@ Usage:
 
 import argparse
 import os
+import time
 from pathlib import Path
 
 import pandas as pd
@@ -44,6 +49,59 @@ def load_exchange_country_map(fmp_dir: Path) -> dict[str, str]:
     return exchange_map
 
 
+def split_symbols(symbols: pd.Series, countries: pd.Series,
+                  suffix_map: dict[str, str] | None = None) -> tuple[pd.Series, pd.Series]:
+    """
+    Split exchange suffixes off FMP symbols ("BGP.NZ" -> "BGP", "nz").
+
+    A suffix in suffix_map gives its country; any other two-letter suffix
+    is taken as a country code; otherwise the given country stays.
+
+    Args:
+        symbols: FMP symbols
+        countries: Default country of each symbol (e.g. from its exchange)
+        suffix_map: Exchange suffix -> country (e.g. SUFFIX_TO_COUNTRY)
+
+    Returns:
+        (base symbols, countries)
+    """
+    has_suffix = symbols.str.contains(".", regex=False)
+    suffix = symbols.str.rsplit(".", n=1).str[-1].str.lower()
+    countries = countries.mask(has_suffix & (suffix.str.len() == 2), suffix)
+    if suffix_map:
+        mapped = suffix.map(suffix_map)
+        countries = countries.mask(has_suffix & mapped.notna(), mapped)
+    base = symbols.str.split(".", n=1).str[0].where(has_suffix, symbols)
+    return base, countries
+
+
+def make_cids(symbols: pd.Series, countries: pd.Series) -> pd.Series:
+    """Canonical IDs (as make_cid) for whole columns."""
+    countries = countries.fillna("").str.strip().str.lower().replace("", "us")
+    return symbols.str.strip().str.upper() + "." + countries
+
+
+def _read_entities(path: Path, limit: int = None) -> pd.DataFrame:
+    """An FMP entity list, stripped, without rows lacking a symbol or name."""
+    df = pd.read_csv(path, dtype=str)
+    if limit:
+        df = df.head(limit)
+    for col in ("symbol", "name"):
+        df[col] = df[col].fillna("").str.strip() if col in df.columns else ""
+    return df[(df["symbol"] != "") & (df["name"] != "")]
+
+
+def _upsert(catalog: TickerCatalog, entities: pd.DataFrame, label: str) -> int:
+    """Bulk upsert entity rows and report the rate."""
+    start = time.perf_counter()
+    entities = entities.astype(object).where(entities.notna(), None)  # NaN -> NULL
+    count = catalog.bulk_upsert_entities(entities.to_dict("records"))
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"✅ {label}: {count} upserted in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return count
+
+
 def seed_stocks(catalog: TickerCatalog, fmp_dir: Path, exchange_map: dict[str, str], limit: int = None):
     """Seed stocks from FMP stock-list-v3.csv."""
     stocks_file = fmp_dir / "stock-list-v3.csv"
@@ -52,70 +110,24 @@ def seed_stocks(catalog: TickerCatalog, fmp_dir: Path, exchange_map: dict[str, s
         return 0
     
     print(f"Loading stocks from {stocks_file}...")
-    df = pd.read_csv(stocks_file, dtype=str)
-    
-    if limit:
-        df = df.head(limit)
+    df = _read_entities(stocks_file, limit)
     
-    count = 0
-    errors = 0
+    exchange = df.get("exchangeShortName", pd.Series("", index=df.index)).fillna("").str.strip()
+    entity_type = df.get("type", pd.Series("stock", index=df.index)).fillna("stock").str.strip().str.lower()
     
-    for _, row in df.iterrows():
-        try:
-            symbol = row.get("symbol", "").strip()
-            name = row.get("name", "").strip()
-            exchange = row.get("exchangeShortName", "").strip()
-            entity_type = row.get("type", "stock").strip().lower()
-            
-            if not symbol or not name:
-                continue
-            
-            # Determine country from exchange
-            country = exchange_map.get(exchange.upper(), "us")
-            
-            # Handle symbols with exchange suffix (e.g., "BGP.NZ", "ARX.TO")
-            if "." in symbol:
-                parts = symbol.split(".")
-                base_symbol = parts[0]
-                suffix = parts[-1].lower()
-                # Map suffix to country using our mapping
-                if suffix in SUFFIX_TO_COUNTRY:
-                    country = SUFFIX_TO_COUNTRY[suffix]
-                elif len(suffix) == 2:
-                    # Assume it's already a country code
-                    country = suffix
-                symbol = base_symbol
-            
-            # Create cid
-            cid = f"{symbol.upper()}.{country}"
-            
-            # Determine asset class
-            asset_class = "stock"
-            if entity_type == "etf":
-                asset_class = "etf"
-            elif entity_type == "trust":
-                asset_class = "trust"
-            
-            # Add to catalog
-            catalog.add_entity(
-                cid=cid,
-                name=name,
-                asset_class=asset_class,
-                exchange=exchange,
-                fmp_symbol=row.get("symbol", "").strip(),
-            )
-            count += 1
-            
-            if count % 5000 == 0:
-                print(f"  ... {count} stocks processed")
-                
-        except Exception as e:
-            errors += 1
-            if errors <= 5:
-                print(f"  Error: {e}")
+    # Country from the exchange, overridden by a symbol suffix (e.g. "BGP.NZ", "ARX.TO")
+    countries = exchange.str.upper().map(exchange_map).fillna("us")
+    symbols, countries = split_symbols(df["symbol"], countries, SUFFIX_TO_COUNTRY)
     
-    print(f"✅ Stocks: {count} added, {errors} errors")
-    return count
+    entities = pd.DataFrame({
+        "cid": make_cids(symbols, countries),
+        "name": df["name"],
+        "asset_class": entity_type.where(entity_type.isin(["etf", "trust"]), "stock"),
+        "country": countries,
+        "exchange": exchange.replace("", None),
+        "fmp_symbol": df["symbol"],
+    })
+    return _upsert(catalog, entities, "Stocks")
 
 
 def seed_etfs(catalog: TickerCatalog, fmp_dir: Path, exchange_map: dict[str, str], limit: int = None):
@@ -126,42 +138,20 @@ def seed_etfs(catalog: TickerCatalog, fmp_dir: Path, exchange_map: dict[str, str
         return 0
     
     print(f"Loading ETFs from {etf_file}...")
-    df = pd.read_csv(etf_file, dtype=str)
-    
-    if limit:
-        df = df.head(limit)
+    df = _read_entities(etf_file, limit)
     
-    count = 0
+    # Most ETFs in stable list are US
+    symbols, countries = split_symbols(df["symbol"], pd.Series("us", index=df.index))
     
-    for _, row in df.iterrows():
-        symbol = row.get("symbol", "").strip()
-        name = row.get("name", "").strip()
-        
-        if not symbol or not name:
-            continue
-        
-        # Most ETFs in stable list are US
-        country = "us"
-        if "." in symbol:
-            parts = symbol.split(".")
-            symbol = parts[0]
-            suffix = parts[-1].lower()
-            if len(suffix) == 2:
-                country = suffix
-        
-        cid = f"{symbol.upper()}.{country}"
-        
-        catalog.add_entity(
-            cid=cid,
-            name=name,
-            asset_class="etf",
-            is_etf=True,
-            fmp_symbol=row.get("symbol", "").strip(),
-        )
-        count += 1
-    
-    print(f"✅ ETFs: {count} added")
-    return count
+    entities = pd.DataFrame({
+        "cid": make_cids(symbols, countries),
+        "name": df["name"],
+        "asset_class": "etf",
+        "country": countries,
+        "is_etf": True,
+        "fmp_symbol": df["symbol"],
+    })
+    return _upsert(catalog, entities, "ETFs")
 
 
 def seed_indexes(catalog: TickerCatalog, fmp_dir: Path, limit: int = None):
@@ -172,39 +162,19 @@ def seed_indexes(catalog: TickerCatalog, fmp_dir: Path, limit: int = None):
         return 0
     
     print(f"Loading indexes from {index_file}...")
-    df = pd.read_csv(index_file, dtype=str)
+    df = _read_entities(index_file, limit)
     
-    if limit:
-        df = df.head(limit)
-    
-    count = 0
-    
-    for _, row in df.iterrows():
-        symbol = row.get("symbol", "").strip()
-        name = row.get("name", "").strip()
-        
-        if not symbol or not name:
-            continue
-        
-        # Clean symbol (remove ^ prefix if present)
-        clean_symbol = symbol.lstrip("^")
-        
-        # Indexes are typically US unless specified
-        country = "us"
-        
-        cid = f"{clean_symbol.upper()}.{country}"
-        
-        catalog.add_entity(
-            cid=cid,
-            name=name,
-            asset_class="index",
-            is_index=True,
-            fmp_symbol=symbol,
-        )
-        count += 1
-    
-    print(f"✅ Indexes: {count} added")
-    return count
+    # Indexes are typically US unless specified; drop the ^ prefix from the cid
+    countries = pd.Series("us", index=df.index)
+    entities = pd.DataFrame({
+        "cid": make_cids(df["symbol"].str.lstrip("^"), countries),
+        "name": df["name"],
+        "asset_class": "index",
+        "country": countries,
+        "is_index": True,
+        "fmp_symbol": df["symbol"],
+    })
+    return _upsert(catalog, entities, "Indexes")
 
 
 def seed_commodities(catalog: TickerCatalog, fmp_dir: Path):
@@ -215,30 +185,18 @@ def seed_commodities(catalog: TickerCatalog, fmp_dir: Path):
         return 0
     
     print(f"Loading commodities from {comm_file}...")
-    df = pd.read_csv(comm_file, dtype=str)
-    
-    count = 0
+    df = _read_entities(comm_file)
     
-    for _, row in df.iterrows():
-        symbol = row.get("symbol", "").strip()
-        name = row.get("name", "").strip()
-        
-        if not symbol or not name:
-            continue
-        
-        # Commodities don't have a country per se, use "xx" for global
-        cid = f"{symbol.upper()}.xx"
-        
-        catalog.add_entity(
-            cid=cid,
-            name=name,
-            asset_class="commodity",
-            fmp_symbol=symbol,
-        )
-        count += 1
-    
-    print(f"✅ Commodities: {count} added")
-    return count
+    # Commodities don't have a country per se, use "xx" for global
+    countries = pd.Series("xx", index=df.index)
+    entities = pd.DataFrame({
+        "cid": make_cids(df["symbol"], countries),
+        "name": df["name"],
+        "asset_class": "commodity",
+        "country": countries,
+        "fmp_symbol": df["symbol"],
+    })
+    return _upsert(catalog, entities, "Commodities")
 
 
 def seed_all(catalog: TickerCatalog, fmp_dir: Path, limit: int = None):
@@ -1,8 +1,11 @@
+import copy
 import os
 import re
+import threading
 import yaml
 from dotenv import load_dotenv
 from pathlib import Path
+from typing import Any, Dict, Set
 
 
 def get_python_project_root() -> Path:
@@ -36,26 +39,24 @@ _python_root = get_python_project_root()
 load_dotenv(dotenv_path=_python_root / '.env')
 
 # Load project config from config/hedgeye.yaml
-def load_config():
-    """
-    Load configuration from hedgeye.yaml with variable substitution.
-    
-    Supports ${var_name} syntax in path values, where variables are defined
-    in the base_paths section. For example:
-    
-    base_paths:
-      prod_root: /Users/rk/d/downloads/hedgeye/prod
-      project_root: /Users/rk/gh/randykerber/syndicate/python
-    
-    paths:
-      ranges_dir: ${prod_root}/ranges
-      mapping_file: ${project_root}/config/hedgeye/data/p-to-r-mapping.yaml
-    
-    Will resolve to the substituted paths.
-    """
-    python_root = get_python_project_root()
-    config_path = python_root / "config" / "hedgeye.yaml"
-    
+#
+# The parsed config is cached and reloaded only when the file's mtime or size
+# changes, so load_config() is cheap to call from hot paths (price cache
+# lookups, per-ticker plots). get_config() returns the cached HedgeyeConfig
+# with paths pre-resolved to Path objects.
+
+_VAR_RE = re.compile(r'\$\{(\w+)\}')
+_config_lock = threading.Lock()
+_config_cache: Dict[str, Any] = {"key": None, "config": None}
+
+
+def get_config_path() -> Path:
+    """Path of config/hedgeye.yaml."""
+    return _python_root / "config" / "hedgeye.yaml"
+
+
+def _read_config(config_path: Path) -> Dict[str, Any]:
+    """Parse hedgeye.yaml and resolve ${var} substitutions in paths."""
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
     
@@ -63,20 +64,19 @@ def load_config():
     if "base_paths" in config and "paths" in config:
         base_paths = config["base_paths"]
         
+        def replace_var(match):
+            var_name = match.group(1)
+            if var_name in base_paths:
+                return str(base_paths[var_name])
+            else:
+                # Variable not found - return original
+                return match.group(0)
+        
         def resolve_vars(value):
             """Recursively resolve ${var} substitutions in strings."""
             if isinstance(value, str):
-                # Replace ${var_name} with value from base_paths
-                def replace_var(match):
-                    var_name = match.group(1)
-                    if var_name in base_paths:
-                        return str(base_paths[var_name])
-                    else:
-                        # Variable not found - return original
-                        return match.group(0)
-                
                 # Pattern: ${var_name} (no spaces allowed in var_name)
-                return re.sub(r'\$\{(\w+)\}', replace_var, value)
+                return _VAR_RE.sub(replace_var, value)
             elif isinstance(value, dict):
                 return {k: resolve_vars(v) for k, v in value.items()}
             elif isinstance(value, list):
@@ -88,3 +88,95 @@ def load_config():
         config["paths"] = resolve_vars(config["paths"])
     
     return config
+
+
+class HedgeyeConfig:
+    """
+    Parsed hedgeye.yaml (read-only; shared by all callers).
+
+    Attributes:
+        data: The config dict, as returned by load_config()
+        paths: Every string entry of the paths section as a Path
+        source: File the config was read from
+    """
+
+    def __init__(self, data: Dict[str, Any], source: Path):
+        self.data = data
+        self.source = source
+        self.paths: Dict[str, Path] = {
+            k: Path(v) for k, v in (data.get("paths") or {}).items() if isinstance(v, str)
+        }
+        self._created: Set[str] = set()
+
+    def path(self, key: str) -> Path:
+        """A paths entry as a Path (KeyError if not configured)."""
+        return self.paths[key]
+
+    def dir(self, key: str) -> Path:
+        """A paths entry as a directory, created on first use."""
+        path = self.paths[key]
+        if key not in self._created:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created.add(key)
+        return path
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """A top-level section (empty dict if missing). Do not modify it."""
+        return self.data.get(name) or {}
+
+
+def get_config() -> HedgeyeConfig:
+    """
+    The cached config, re-read if hedgeye.yaml changed since the last call.
+
+    Returns:
+        HedgeyeConfig shared by all callers
+    """
+    config_path = get_config_path()
+    st = config_path.stat()
+    key = (str(config_path), st.st_mtime_ns, st.st_size)
+    with _config_lock:
+        if _config_cache["key"] != key:
+            _config_cache["config"] = HedgeyeConfig(_read_config(config_path), config_path)
+            _config_cache["key"] = key
+        return _config_cache["config"]
+
+
+def clear_config_cache() -> None:
+    """Force the next get_config()/load_config() to re-read hedgeye.yaml."""
+    with _config_lock:
+        _config_cache["key"] = None
+        _config_cache["config"] = None
+
+
+def config_path(key: str) -> Path:
+    """Shorthand for get_config().path(key)."""
+    return get_config().path(key)
+
+
+def config_dir(key: str) -> Path:
+    """Shorthand for get_config().dir(key): the directory, created once per run."""
+    return get_config().dir(key)
+
+
+def load_config():
+    """
+    Load configuration from hedgeye.yaml with variable substitution.
+    
+    Supports ${var_name} syntax in path values, where variables are defined
+    in the base_paths section. For example:
+    
+    base_paths:
+      prod_root: /Users/rk/d/downloads/hedgeye/prod
+      project_root: /Users/rk/gh/randykerber/syndicate/python
+    
+    paths:
+      ranges_dir: ${prod_root}/ranges
+      mapping_file: ${project_root}/config/hedgeye/data/p-to-r-mapping.yaml
+    
+    Will resolve to the substituted paths.
+    
+    The file is parsed once and cached (see get_config()); each call returns
+    a copy, so callers may modify it.
+    """
+    return copy.deepcopy(get_config().data)
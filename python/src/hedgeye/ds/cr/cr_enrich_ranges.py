@@ -19,6 +19,7 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, List
 from hedgeye.config_loader import load_config
+from hedgeye.ds import metrics
 from hedgeye.ds.prices.fetch_prices import fetch_current_prices
 
 
@@ -177,6 +178,7 @@ def cr_save_enriched_data(df: pd.DataFrame, output_path: Path):
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_path, index=False)
     print(f"\n💾 Saved enriched data to: {output_path}")
+    metrics.count("rows", len(df))
     print(f"   Rows: {len(df)}")
     print(f"   Columns: {len(df.columns)}")
 
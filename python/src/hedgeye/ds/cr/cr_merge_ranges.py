@@ -15,11 +15,28 @@ Usage:
     uv run python -m hedgeye.cr_merge_ranges
 """
 
+import time
+
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from hedgeye.config_loader import load_config
+from hedgeye.ds import metrics
+from hedgeye.ds.dir_manifest import latest_file
+from hedgeye.ds.mapping_cache import get_p_to_r_mapping
+from hedgeye.ds.rr.rr_index import RRIndex, as_rr_index
+from hedgeye.ds.rr.rr_schema import apply_rr_schema, read_rr_csv
+
+# RR columns joined onto positions, renamed for the merged output
+RR_MERGE_COLUMNS = {
+    'index': 'r_sym',
+    'buy_trade': 'trade_low',
+    'sell_trade': 'trade_high',
+    'prev_close': 'rr_prev_close',
+    'date': 'rr_date',
+    'trend': 'rr_trend',
+}
 
 
 def get_latest_file(directory: Path, pattern: str) -> Optional[Path]:
@@ -27,6 +44,9 @@ def get_latest_file(directory: Path, pattern: str) -> Optional[Path]:
     Get the most recent file matching a pattern.
 
     Sorts by the date embedded in the filename (YYYY-MM-DD), not file mtime.
+    Patterns of the form "<prefix>*<suffix>" are looked up in the directory's
+    manifest (see dir_manifest), which only lists <prefix>YYYY-MM-DD<suffix>
+    names; other patterns fall back to listing the directory.
 
     Args:
         directory: Directory to search
@@ -37,6 +57,10 @@ def get_latest_file(directory: Path, pattern: str) -> Optional[Path]:
     """
     import re
 
+    prefix, star, suffix = pattern.partition("*")
+    if star and not any(c in prefix + suffix for c in "*?["):
+        return latest_file(directory, prefix, suffix)
+
     files = list(directory.glob(pattern))
     if not files:
         return None
@@ -79,10 +103,10 @@ def load_rr_data(csv_path: Path) -> pd.DataFrame:
     """
     Load Risk Range combined data.
 
-    Returns DataFrame with columns:
-    date, index, trend, buy_trade, sell_trade, prev_close, bucket, ...
+    Returns DataFrame with the canonical RR schema (see rr_schema):
+    date, index, trend, buy_trade, sell_trade, prev_close, bucket
     """
-    df = pd.read_csv(csv_path)
+    df = read_rr_csv(csv_path)
     print(f"  ✓ Loaded {len(df)} RR records")
     return df
 
@@ -92,7 +116,9 @@ def load_mapping_table(mapping_path: Path) -> pd.DataFrame:
     Load p_sym to r_sym mapping table from YAML or CSV file.
     
     Supports both YAML (preferred) and CSV formats for backward compatibility.
-    All access to the mapping file should go through this function.
+    All access to the mapping file should go through this function or
+    mapping_cache.get_p_to_r_mapping(), which it wraps: the file is compiled
+    once and cached (see mapping_cache).
 
     Args:
         mapping_path: Path to mapping file (.yaml or .csv)
@@ -101,68 +127,54 @@ def load_mapping_table(mapping_path: Path) -> pd.DataFrame:
         DataFrame with columns:
         p_sym, r_sym, mapping_type, proxy_type, confidence, notes, inverted
     """
-    import yaml
-    
     if not mapping_path.exists():
         raise FileNotFoundError(f"Mapping file not found: {mapping_path}")
-    
-    # Determine file type and load accordingly
-    if mapping_path.suffix.lower() in ['.yaml', '.yml']:
-        # Load from YAML
-        with open(mapping_path, 'r') as f:
-            yaml_data = yaml.safe_load(f)
-        
-        # Convert YAML structure to DataFrame
-        mappings = yaml_data.get('mappings', [])
-        if not mappings:
-            return pd.DataFrame(columns=['p_sym', 'r_sym', 'mapping_type', 'confidence', 'notes', 'proxy_type', 'inverted'])
-        
-        # Convert list of dicts to DataFrame
-        df = pd.DataFrame(mappings)
-        
-        # Ensure all expected columns exist
-        expected_cols = ['p_sym', 'r_sym', 'mapping_type', 'confidence', 'notes', 'proxy_type', 'inverted']
-        for col in expected_cols:
-            if col not in df.columns:
-                df[col] = None
-        
-        # Convert None/empty r_sym to empty string for consistency
-        df['r_sym'] = df['r_sym'].fillna('')
-        
-        # Ensure inverted is boolean
-        df['inverted'] = df['inverted'].fillna(False).astype(bool)
-        
-    else:
-        # Load from CSV (backward compatibility)
-        df = pd.read_csv(mapping_path)
-        # Fill NaN values for consistency
-        df['r_sym'] = df['r_sym'].fillna('')
-        if 'inverted' not in df.columns:
-            df['inverted'] = False
-        df['inverted'] = df['inverted'].fillna(False).astype(bool)
-    
+
+    df = get_p_to_r_mapping(mapping_path).frame.copy()
     print(f"  ✓ Loaded {len(df)} symbol mappings from {mapping_path.suffix}")
     return df
 
 
-def get_latest_rr_for_symbol(rr_df: pd.DataFrame, symbol: str) -> Optional[pd.Series]:
+def get_latest_rr_for_symbol(rr: Union[pd.DataFrame, RRIndex], symbol: str) -> Optional[pd.Series]:
     """
     Get the most recent RR data for a symbol.
 
     Args:
-        rr_df: Risk Range DataFrame
+        rr: RRIndex (O(1) lookup) or Risk Range DataFrame (indexed on the fly)
         symbol: Symbol to lookup (r_sym)
 
     Returns:
         Series with latest RR data, or None if not found
     """
-    symbol_data = rr_df[rr_df['index'] == symbol]
-    if symbol_data.empty:
+    rr_index = as_rr_index(rr)
+    symbol_data = rr_index.latest(symbol)
+    if symbol_data is None or symbol_data['index'] != symbol:
         return None
+    return symbol_data
 
-    # Sort by date and get latest
-    symbol_data = symbol_data.sort_values('date', ascending=False)
-    return symbol_data.iloc[0]
+
+def latest_rr_table(rr: Union[pd.DataFrame, RRIndex]) -> pd.DataFrame:
+    """
+    Latest RR row per symbol, as a join table.
+
+    A DataFrame is reduced with a single groupby/idxmax on date (the last
+    row in file order wins on ties, as in RRIndex.latest).
+
+    Args:
+        rr: RRIndex or Risk Range DataFrame
+
+    Returns:
+        DataFrame with one row per RR symbol ("index" column as plain str)
+    """
+    if isinstance(rr, RRIndex):
+        latest = rr.latest_frame()
+    else:
+        df = apply_rr_schema(rr.copy())
+        df = df[df['index'].notna() & df['date'].notna()].iloc[::-1]
+        latest = df.loc[df.groupby('index', observed=True)['date'].idxmax()]
+    latest = latest.reset_index(drop=True)
+    latest['index'] = latest['index'].astype(str)
+    return latest
 
 
 def fetch_current_prices(symbols: list) -> Dict[str, float]:
@@ -184,7 +196,7 @@ def fetch_current_prices(symbols: list) -> Dict[str, float]:
 def cr_merge_all_sources(
     epp_df: pd.DataFrame,
     ps_df: pd.DataFrame,
-    rr_df: pd.DataFrame,
+    rr_df: Union[pd.DataFrame, RRIndex],
     mapping_df: pd.DataFrame
 ) -> pd.DataFrame:
     """
@@ -200,6 +212,7 @@ def cr_merge_all_sources(
         Merged DataFrame with all raw data
     """
     print("\n=== Merging Data Sources ===")
+    merge_start = time.perf_counter()
 
     # Start with EPP as base (has LONG/SHORT and trend ranges)
     base_df = epp_df.copy()
@@ -224,33 +237,16 @@ def cr_merge_all_sources(
     )
     print(f"  • Added symbol mappings ({base_df['r_sym'].notna().sum()} with r_sym)")
 
-    # Add RR data for each r_sym
-    rr_data = []
-    for idx, row in base_df.iterrows():
-        r_sym = row.get('r_sym')
-        if pd.notna(r_sym):
-            rr_row = get_latest_rr_for_symbol(rr_df, r_sym)
-            if rr_row is not None:
-                rr_data.append({
-                    'p_sym': row['p_sym'],
-                    'trade_low': rr_row['buy_trade'],
-                    'trade_high': rr_row['sell_trade'],
-                    'rr_prev_close': rr_row['prev_close'],
-                    'rr_date': rr_row['date'],
-                    'rr_trend': rr_row['trend']
-                })
-
-    if rr_data:
-        rr_enriched = pd.DataFrame(rr_data)
-        base_df = base_df.merge(rr_enriched, on='p_sym', how='left')
-        print(f"  • Added RR trade ranges ({len(rr_data)} symbols with ranges)")
-    else:
-        # Add empty columns if no RR data
-        base_df['trade_low'] = None
-        base_df['trade_high'] = None
-        base_df['rr_prev_close'] = None
-        base_df['rr_date'] = None
-        base_df['rr_trend'] = None
+    # Add RR data: hash join on r_sym against the latest-RR-per-symbol table
+    start = time.perf_counter()
+    rr_latest = latest_rr_table(rr_df)[list(RR_MERGE_COLUMNS)].rename(columns=RR_MERGE_COLUMNS)
+    base_df = base_df.merge(rr_latest, on='r_sym', how='left')
+    # Plain strings (not a categorical), as the per-row lookup produced
+    if isinstance(base_df['rr_trend'].dtype, pd.CategoricalDtype):
+        base_df['rr_trend'] = base_df['rr_trend'].astype(base_df['rr_trend'].cat.categories.dtype)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"  • Added RR trade ranges ({base_df['trade_low'].notna().sum()} symbols with ranges, "
+          f"{len(rr_latest)} RR symbols, {elapsed_ms:.1f} ms)")
 
     # Placeholder for current prices (will implement later)
     base_df['p_current'] = None
@@ -268,7 +264,8 @@ def cr_merge_all_sources(
     cols = [c for c in cols if c in base_df.columns]
     result_df = base_df[cols]
 
-    print(f"\n  ✓ Merged {len(result_df)} total positions")
+    print(f"\n  ✓ Merged {len(result_df)} total positions "
+          f"in {(time.perf_counter() - merge_start) * 1000:.1f} ms")
 
     return result_df
 
@@ -278,6 +275,7 @@ def cr_save_merged_data(df: pd.DataFrame, output_path: Path):
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_path, index=False)
     print(f"\n💾 Saved merged data to: {output_path}")
+    metrics.count("rows", len(df))
     print(f"   Rows: {len(df)}")
     print(f"   Columns: {len(df.columns)}")
 
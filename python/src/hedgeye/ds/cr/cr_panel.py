@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Combo Ranges (CR) panel: every ticker's daily ranges in one long table.
+
+One row per (date, p_sym) over the last days_back calendar days, for all
+current EP tickers, computed in a single vectorized pass:
+
+    date, p_sym, r_sym, inverted,
+    trend_low, trend_high           EP weekly trend band (as-of the report in effect)
+    p_trade_low, p_trade_high       RR trade band translated to p_sym prices
+    price                           daily close (EP recent_price if no daily prices)
+    prev_close                      RR prev_close of r_sym that day
+    trend_pct_from_low/high         % distance of price from each band edge
+    p_trade_pct_from_low/high
+
+Translation (same as the per-ticker plotting code):
+    p_trade = price * (rr_trade / rr_prev_close)
+For inverted proxies (e.g. TLT vs UST30Y) the translated low/high are
+swapped: sell_trade → p_trade_low, buy_trade → p_trade_high.
+
+The panel is saved under ranges_base_dir/panel/ (Parquet when pyarrow is
+installed, CSV otherwise) so plots, reports and agents can read it without
+recomputing.
+
+Usage:
+    from hedgeye.ds.cr.cr_panel import build_cr_panel, save_cr_panel, load_cr_panel
+    panel = build_cr_panel(days_back=30)
+    save_cr_panel(panel)
+    spy = load_cr_panel(tickers=["SPY"])
+"""
+
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from hedgeye.config_loader import config_path, load_config
+from hedgeye.ds.ep.ep_history import EPHistory
+from hedgeye.ds.rr.rr_index import RRIndex
+from hedgeye.ds.rr.use_rr import load_all_risk_range_data
+
+# pandas imports pyarrow itself when reading/writing Parquet
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+PANEL_COLUMNS = [
+    'date', 'p_sym', 'r_sym', 'inverted',
+    'trend_low', 'trend_high', 'p_trade_low', 'p_trade_high', 'price', 'prev_close',
+    'trend_pct_from_low', 'trend_pct_from_high', 'p_trade_pct_from_low', 'p_trade_pct_from_high',
+]
+
+PANEL_BASENAME = "cr_panel"
+
+
+def get_cr_panel_path(config: Optional[dict] = None) -> Path:
+    """Default panel file (Parquet if pyarrow is available, else CSV)."""
+    config = config or load_config()
+    suffix = ".parquet" if PYARROW_AVAILABLE else ".csv"
+    return Path(config["paths"]["ranges_base_dir"]) / "panel" / f"{PANEL_BASENAME}{suffix}"
+
+
+def _mapping_table(mapping_df: pd.DataFrame) -> pd.DataFrame:
+    """One (p_sym, r_sym, inverted) row per p_sym; first mapping wins."""
+    if mapping_df is None or mapping_df.empty or 'p_sym' not in mapping_df.columns:
+        return pd.DataFrame({'p_sym': pd.Series(dtype=object), 'r_sym': pd.Series(dtype=object),
+                             'inverted': pd.Series(dtype=bool)})
+    mapping = mapping_df.drop_duplicates('p_sym', keep='first')
+    inverted = mapping['inverted'] if 'inverted' in mapping.columns else False
+    return pd.DataFrame({
+        'p_sym': mapping['p_sym'].to_numpy(),
+        'r_sym': mapping['r_sym'].to_numpy(),
+        'inverted': pd.Series(inverted, index=mapping.index).fillna(False).astype(bool).to_numpy(),
+    })
+
+
+def _rr_window(rr_index: RRIndex, r_syms: List[str], start: pd.Timestamp,
+               end: pd.Timestamp) -> pd.DataFrame:
+    """RR rows of the mapped symbols inside [start, end], keyed by the mapping's r_sym."""
+    resolved = {r: rr_index.resolve(r) for r in r_syms if isinstance(r, str) and r}
+    resolved = {r: name for r, name in resolved.items() if name is not None}
+    if not resolved:
+        return pd.DataFrame(columns=['r_sym', 'date', 'buy_trade', 'sell_trade', 'prev_close'])
+
+    frame = rr_index.frame
+    rows = frame[frame['index'].isin(list(set(resolved.values())))
+                 & (frame['date'] >= start) & (frame['date'] <= end)]
+    rows = rows[['index', 'date', 'buy_trade', 'sell_trade', 'prev_close']].copy()
+    rows['index'] = rows['index'].astype(str)
+    rows['date'] = rows['date'].dt.normalize()
+    rows = rows.drop_duplicates(['index', 'date'], keep='last')
+
+    # Several r_sym spellings may resolve to the same RR symbol
+    keys = pd.DataFrame({'r_sym': list(resolved), 'index': list(resolved.values())})
+    return keys.merge(rows, on='index').drop(columns='index')
+
+
+def _today_prices(p_syms: List[str], current_prices: Optional[Dict[str, float]]) -> pd.Series:
+    """Today's price per p_sym: current_prices first, then the enriched CSV's p_current."""
+    prices = pd.Series(current_prices or {}, dtype=float)
+    missing = [p for p in p_syms if p not in prices.index or not prices[p] > 0]
+    if missing:
+        enriched_path = config_path('ranges_base_dir') / 'enriched' / 'position_ranges_enriched.csv'
+        if enriched_path.exists():
+            enriched = pd.read_csv(enriched_path, usecols=['p_sym', 'p_current'])
+            enriched = enriched.drop_duplicates('p_sym').set_index('p_sym')['p_current']
+            enriched = pd.to_numeric(enriched, errors='coerce').reindex(missing).dropna()
+            prices = pd.concat([prices[prices > 0], enriched[enriched > 0]])
+    return prices[prices > 0]
+
+
+def build_cr_panel(days_back: int = 30,
+                   tickers: Optional[List[str]] = None,
+                   mapping_df: Optional[pd.DataFrame] = None,
+                   prices_df: Optional[pd.DataFrame] = None,
+                   current_prices: Optional[Dict[str, float]] = None,
+                   rr_index: Optional[RRIndex] = None,
+                   ep_history: Optional[EPHistory] = None) -> pd.DataFrame:
+    """
+    Compute the CR panel for all tickers in one pass.
+
+    Args:
+        days_back: Calendar days of history (window ends today)
+        tickers: p_syms to include (default: current EP portfolio)
+        mapping_df: p_sym → r_sym mapping (default: config p_to_r_mapping_file)
+        prices_df: Daily prices (ticker, date, price); fetched via the price cache if None
+        current_prices: Today's prices by ticker (fills today's row if missing)
+        rr_index: Prebuilt RRIndex (loads the window if None)
+        ep_history: Preloaded EP history (loads the window if None)
+
+    Returns:
+        DataFrame with PANEL_COLUMNS sorted by (p_sym, date)
+    """
+    end = pd.Timestamp(datetime.now().date())
+    start = end - pd.Timedelta(days=days_back)
+
+    if ep_history is None:
+        ep_history = EPHistory.load(start=start)
+    if tickers is None:
+        tickers = ep_history.latest_tickers()
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return pd.DataFrame(columns=PANEL_COLUMNS)
+
+    if mapping_df is None:
+        from hedgeye.ds.mapping_cache import get_p_to_r_mapping
+        mapping_path = config_path("p_to_r_mapping_file")
+        mapping_df = get_p_to_r_mapping(mapping_path).frame if mapping_path.exists() else pd.DataFrame()
+    if rr_index is None:
+        rr_index = RRIndex(load_all_risk_range_data(start=start))
+    if prices_df is None:
+        from hedgeye.ds.prices.price_cache import get_daily_prices
+        prices_df = get_daily_prices(tickers, start.to_pydatetime(), datetime.now(), use_cache=True)
+
+    # date x ticker grid
+    days = pd.date_range(start, end, freq='D')
+    panel = pd.DataFrame({
+        'date': np.tile(days.to_numpy(), len(tickers)),
+        'p_sym': np.repeat(np.array(tickers, dtype=object), len(days)),
+    })
+
+    # EP trend bands (as-of the weekly report in effect each day)
+    bands = ep_history.daily_bands(tickers, start=start, end=end)
+    bands = bands.rename(columns={'ticker': 'p_sym'})[['date', 'p_sym', 'trend_low', 'trend_high', 'recent_price']]
+    panel = panel.merge(bands, on=['date', 'p_sym'], how='left')
+
+    # Daily prices, plus today's price where the history has none yet
+    if prices_df is not None and not prices_df.empty:
+        prices = prices_df[prices_df['ticker'].isin(tickers)][['ticker', 'date', 'price']]
+        prices = prices.rename(columns={'ticker': 'p_sym'})
+        prices['date'] = pd.to_datetime(prices['date']).dt.normalize()
+        prices = prices.drop_duplicates(['p_sym', 'date'], keep='last')
+        panel = panel.merge(prices, on=['date', 'p_sym'], how='left')
+    else:
+        panel['price'] = np.nan
+    is_today = (panel['date'] == end).to_numpy()
+    missing_today = panel.loc[is_today & panel['price'].isna().to_numpy(), 'p_sym'].tolist()
+    if missing_today:
+        today = _today_prices(missing_today, current_prices)
+        fill = is_today & panel['price'].isna().to_numpy()
+        panel.loc[fill, 'price'] = panel.loc[fill, 'p_sym'].map(today)
+
+    # Tickers with no daily prices at all fall back to the EP weekly price
+    has_prices = panel['price'].notna().groupby(panel['p_sym']).transform('any')
+    panel['price'] = panel['price'].where(has_prices, panel['recent_price'])
+
+    # RR trade bands of the mapped proxy, translated to p_sym prices
+    mapping = _mapping_table(mapping_df)
+    panel = panel.merge(mapping, on='p_sym', how='left')
+    panel['inverted'] = panel['inverted'].fillna(False).astype(bool)
+    rr = _rr_window(rr_index, mapping.loc[mapping['p_sym'].isin(tickers), 'r_sym'].unique().tolist(),
+                    start, end)
+    panel = panel.merge(rr, on=['r_sym', 'date'], how='left')
+
+    prev_close = panel['prev_close'].to_numpy(dtype=float, na_value=np.nan)
+    price = panel['price'].to_numpy(dtype=float, na_value=np.nan)
+    valid = (prev_close > 0) & (price > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        buy = np.where(valid, price * panel['buy_trade'].to_numpy(dtype=float, na_value=np.nan) / prev_close, np.nan)
+        sell = np.where(valid, price * panel['sell_trade'].to_numpy(dtype=float, na_value=np.nan) / prev_close, np.nan)
+    inverted = panel['inverted'].to_numpy()
+    panel['p_trade_low'] = np.where(inverted, sell, buy)
+    panel['p_trade_high'] = np.where(inverted, buy, sell)
+
+    # % distance of price from each band edge (as in cr_enrich_ranges)
+    for col in ['trend_low', 'trend_high', 'p_trade_low', 'p_trade_high']:
+        edge = panel[col].to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pct = (price - edge) / edge * 100
+        name = col.replace('_low', '_pct_from_low').replace('_high', '_pct_from_high')
+        panel[name] = np.where(np.isfinite(pct), pct, np.nan)
+
+    return panel[PANEL_COLUMNS].sort_values(['p_sym', 'date'], kind='stable').reset_index(drop=True)
+
+
+def save_cr_panel(panel: pd.DataFrame, path: Optional[Path] = None) -> Path:
+    """Persist the panel (Parquet or CSV, by file suffix)."""
+    path = Path(path) if path is not None else get_cr_panel_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        panel.to_parquet(path, index=False)
+    else:
+        panel.to_csv(path, index=False)
+    print(f"💾 Saved CR panel ({panel['p_sym'].nunique()} tickers, {len(panel)} rows) to: {path}")
+    return path
+
+
+def load_cr_panel(path: Optional[Path] = None, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a saved panel.
+
+    Args:
+        path: Panel file (default: get_cr_panel_path(), falling back to the CSV copy)
+        tickers: Optional p_syms to keep
+
+    Returns:
+        Panel DataFrame (empty with PANEL_COLUMNS if no panel was saved)
+    """
+    if path is None:
+        path = get_cr_panel_path()
+        if not path.exists():
+            path = path.with_suffix(".csv")
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=PANEL_COLUMNS)
+
+    if path.suffix == ".parquet":
+        filters = [('p_sym', 'in', list(tickers))] if tickers else None
+        return pd.read_parquet(path, filters=filters)
+    panel = pd.read_csv(path, parse_dates=['date'])
+    if tickers:
+        panel = panel[panel['p_sym'].isin(tickers)].reset_index(drop=True)
+    return panel
@@ -7,29 +7,37 @@ Combines:
 2. ETF Pro Plus (EP) trend ranges over time (forward-filled from weekly to daily)
 3. Daily price history (fetched fresh from yfinance/FMP, no caching)
 
+The data for all tickers is computed once as a CR panel (see cr_panel);
+each plot is a slice of it.
+
 Usage:
     from hedgeye.cr_time_series_plotting import plot_cr_time_series
     plot_cr_time_series("AAAU", days_back=30)
 """
 
+import importlib.util
 import pandas as pd
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import TYPE_CHECKING, Optional, Dict, List, Any
 import numpy as np
 
-from hedgeye.config_loader import load_config
+from hedgeye.config_loader import config_path, load_config
 from hedgeye.ds.rr.use_rr import load_all_risk_range_data
+from hedgeye.ds.rr.rr_index import RRIndex
+from hedgeye.ds.ep.ep_history import EPHistory
+from hedgeye.ds.cr.cr_panel import build_cr_panel, save_cr_panel
 from hedgeye.ds.prices.price_cache import get_daily_prices
 from hedgeye.ds.cr.cr_merge_ranges import load_mapping_table, get_latest_file
+from hedgeye.ds.mapping_cache import get_p_to_r_mapping
+from hedgeye.ds.plots.render_engine import PlotJob, arrays_from_frame, render_jobs
+from hedgeye.ds.plots.renderers import draw_cr_time_series
+
+if TYPE_CHECKING:  # pyplot is imported when plotting (it is slow to import)
+    import matplotlib.pyplot as plt
 
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
+# Imported where used (yfinance is slow to import)
+YFINANCE_AVAILABLE = importlib.util.find_spec("yfinance") is not None
 
 
 def fetch_historical_daily_prices(p_sym: str, start_date: datetime, end_date: datetime, 
@@ -65,77 +73,40 @@ def fetch_historical_daily_prices(p_sym: str, start_date: datetime, end_date: da
     return prices_series
 
 
-def load_ep_time_series(p_sym: str, days_back: int = 30) -> pd.DataFrame:
+def load_ep_time_series(p_sym: str, days_back: int = 30,
+                        ep_history: Optional[EPHistory] = None) -> pd.DataFrame:
     """
     Load ETF Pro Plus trend range time series for a ticker.
     
-    EP data is weekly, so we forward-fill values to create daily time series.
+    EP data is weekly; each day takes the most recent report on or before it
+    (as-of join in EPHistory.daily_bands).
     
     Args:
         p_sym: Portfolio symbol (e.g., "BUXX")
         days_back: Number of days to look back
+        ep_history: Preloaded EP history (reads the EP CSVs if None)
         
     Returns:
         DataFrame with columns: date, trend_low, trend_high, recent_price
     """
-    config = load_config()
-    ep_csv_dir = Path(config["paths"]["etf_pro_csv_dir"])
-    
-    # Find all EP weekly CSV files
-    ep_files = sorted(ep_csv_dir.glob("etf_pro_weekly_*.csv"))
-    
-    if not ep_files:
-        print(f"⚠️  No EP weekly files found in {ep_csv_dir}")
-        return pd.DataFrame(columns=['date', 'trend_low', 'trend_high', 'recent_price'])
-    
-    # Load all files and filter for this ticker
-    ep_data = []
-    for file in ep_files:
-        df = pd.read_csv(file)
-        ticker_data = df[df['ticker'] == p_sym]
-        if not ticker_data.empty:
-            row = ticker_data.iloc[0]
-            ep_data.append({
-                'date': pd.to_datetime(row['report_date']),
-                'trend_low': row['trend_low'],
-                'trend_high': row['trend_high'],
-                'recent_price': row['recent_price']
-            })
-    
-    if not ep_data:
-        print(f"⚠️  No EP data found for {p_sym}")
-        return pd.DataFrame(columns=['date', 'trend_low', 'trend_high', 'recent_price'])
-    
-    # Create DataFrame and sort by date
-    ep_df = pd.DataFrame(ep_data)
-    ep_df = ep_df.sort_values('date').reset_index(drop=True)
-    
-    # Create daily date range
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-    daily_df = pd.DataFrame({'date': date_range})
-    
-    # Forward-fill EP weekly values to daily
-    # For each date in daily range, use the most recent EP value
-    daily_df['trend_low'] = None
-    daily_df['trend_high'] = None
-    daily_df['recent_price'] = None
-    
-    for idx, daily_date in enumerate(daily_df['date']):
-        # Find most recent EP value on or before this date
-        valid_ep = ep_df[ep_df['date'] <= daily_date]
-        if not valid_ep.empty:
-            latest_ep = valid_ep.iloc[-1]
-            daily_df.loc[idx, 'trend_low'] = latest_ep['trend_low']
-            daily_df.loc[idx, 'trend_high'] = latest_ep['trend_high']
-            daily_df.loc[idx, 'recent_price'] = latest_ep['recent_price']
-    
+    if ep_history is None:
+        ep_history = EPHistory.load(start=start_date)
+
+    if len(ep_history) == 0:
+        print(f"⚠️  No EP weekly files found")
+        return pd.DataFrame(columns=['date', 'trend_low', 'trend_high', 'recent_price'])
+
+    daily_df = ep_history.series(p_sym, start=start_date, end=end_date)
+    if daily_df.empty:
+        print(f"⚠️  No EP data found for {p_sym}")
     return daily_df
 
 
 def load_rr_time_series_with_translation(p_sym: str, mapping_df: pd.DataFrame, 
-                                        p_current_series: Optional[pd.Series] = None) -> pd.DataFrame:
+                                        p_current_series: Optional[pd.Series] = None,
+                                        rr_index: Optional[RRIndex] = None) -> pd.DataFrame:
     """
     Load Risk Range time series for a ticker, translated to p_sym coordinates.
     
@@ -143,6 +114,7 @@ def load_rr_time_series_with_translation(p_sym: str, mapping_df: pd.DataFrame,
         p_sym: Portfolio symbol (e.g., "AAAU")
         mapping_df: DataFrame with p_sym to r_sym mappings
         p_current_series: Series with date index and p_current values (for translation)
+        rr_index: Prebuilt RRIndex (loads all RR data if None)
         
     Returns:
         DataFrame with columns: date, p_trade_low, p_trade_high, prev_close
@@ -161,20 +133,16 @@ def load_rr_time_series_with_translation(p_sym: str, mapping_df: pd.DataFrame,
     r_sym = mapping_row['r_sym']
     is_inverted = mapping_row.get('inverted', False) if 'inverted' in mapping_row else False
     
-    # Load all RR data
-    rr_df = load_all_risk_range_data()
+    if rr_index is None:
+        rr_index = RRIndex(load_all_risk_range_data())
     
-    # Filter for r_sym
-    rr_symbol = rr_df[rr_df['index'] == r_sym].copy()
+    # Per-symbol slice, already sorted by date
+    rr_symbol = rr_index.series(r_sym).reset_index(drop=True)
     
     if rr_symbol.empty:
         print(f"⚠️  No RR data found for {r_sym} (proxy for {p_sym})")
         return pd.DataFrame(columns=['date', 'p_trade_low', 'p_trade_high', 'prev_close'])
     
-    # Convert date and sort
-    rr_symbol['date'] = pd.to_datetime(rr_symbol['date'])
-    rr_symbol = rr_symbol.sort_values('date').reset_index(drop=True)
-    
     # Translate trade ranges to p_sym coordinates
     # Formula: p_trade = p_current * (r_trade / r_current)
     # where r_current is the RR prev_close (proxy price for r_sym)
@@ -233,11 +201,74 @@ def load_rr_time_series_with_translation(p_sym: str, mapping_df: pd.DataFrame,
     return result
 
 
+CR_PLOT_COLUMNS = ['date', 'trend_low', 'trend_high', 'p_trade_low', 'p_trade_high', 'price']
+
+
+def build_cr_time_series_data(p_sym: str, days_back: int = 30,
+                              mapping_df: Optional[pd.DataFrame] = None,
+                              pre_fetched_prices: Optional[pd.DataFrame] = None,
+                              pre_fetched_current_prices: Optional[Dict[str, float]] = None,
+                              rr_index: Optional[RRIndex] = None,
+                              ep_history: Optional[EPHistory] = None,
+                              panel: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+    """
+    Assemble the daily combo ranges data for one ticker (no drawing).
+
+    Combines EP trend ranges, translated RR trade ranges and daily prices,
+    limited to the last days_back days. Reads the ticker's rows from a
+    prebuilt CR panel if given, otherwise computes a one-ticker panel.
+
+    Args:
+        p_sym: Portfolio symbol to plot
+        days_back: Number of days to look back
+        mapping_df: p_sym to r_sym mapping DataFrame (loads if None)
+        pre_fetched_prices: Optional DataFrame with pre-fetched prices (from get_daily_prices)
+        pre_fetched_current_prices: Optional dict of today's prices by ticker
+        rr_index: Prebuilt RRIndex (loads the plot window if None)
+        ep_history: Preloaded EP history (reads the EP CSVs if None)
+        panel: Prebuilt CR panel (see cr_panel.build_cr_panel)
+
+    Returns:
+        DataFrame with CR_PLOT_COLUMNS (plus extras), or None if there is no data
+    """
+    if panel is None:
+        if mapping_df is None:
+            mapping_path = config_path("p_to_r_mapping_file")
+            if mapping_path.exists():
+                mapping_df = load_mapping_table(mapping_path)
+            else:
+                print(f"⚠️  Mapping file not found: {mapping_path}")
+                mapping_df = pd.DataFrame()
+
+        # Fetch prices only if the pre-fetched set does not cover this ticker
+        if pre_fetched_prices is not None and not (pre_fetched_prices['ticker'] == p_sym).any():
+            print(f"  ⚠️  No pre-fetched prices for {p_sym}, fetching...")
+            pre_fetched_prices = None
+
+        panel = build_cr_panel(days_back=days_back, tickers=[p_sym], mapping_df=mapping_df,
+                               prices_df=pre_fetched_prices,
+                               current_prices=pre_fetched_current_prices,
+                               rr_index=rr_index, ep_history=ep_history)
+
+    merged_df = panel[panel['p_sym'] == p_sym]
+    has_data = merged_df[['trend_low', 'trend_high', 'prev_close']].notna().any().any()
+    if merged_df.empty or not has_data:
+        print(f"❌ No data found for {p_sym}")
+        return None
+
+    print(f"  ✓ {p_sym}: {merged_df['trend_low'].notna().sum()} days with trend range, "
+          f"{merged_df['p_trade_low'].notna().sum()} with trade range, "
+          f"{merged_df['price'].notna().sum()} with price")
+    return merged_df.reset_index(drop=True)
+
+
 def plot_cr_time_series(p_sym: str, days_back: int = 30,
                        mapping_df: Optional[pd.DataFrame] = None,
                        save_path: Optional[Path] = None,
                        pre_fetched_prices: Optional[pd.DataFrame] = None,
-                       pre_fetched_current_prices: Optional[Dict[str, float]] = None) -> plt.Figure:
+                       pre_fetched_current_prices: Optional[Dict[str, float]] = None,
+                       rr_index: Optional[RRIndex] = None,
+                       ep_history: Optional[EPHistory] = None) -> "plt.Figure":
     """
     Plot combo ranges time series for a single ticker.
 
@@ -252,234 +283,30 @@ def plot_cr_time_series(p_sym: str, days_back: int = 30,
         mapping_df: p_sym to r_sym mapping DataFrame (loads if None)
         save_path: Optional path to save figure
         pre_fetched_prices: Optional DataFrame with pre-fetched prices (from get_daily_prices)
+        rr_index: Prebuilt RRIndex (loads all RR data once if None)
+        ep_history: Preloaded EP history (reads the EP CSVs if None)
 
     Returns:
         matplotlib Figure object
     """
-    # Load mapping if not provided
-    if mapping_df is None:
-        config = load_config()
-        mapping_path = Path(config["paths"]["p_to_r_mapping_file"])
-        if mapping_path.exists():
-            mapping_df = pd.read_csv(mapping_path)
-        else:
-            print(f"⚠️  Mapping file not found: {mapping_path}")
-            mapping_df = pd.DataFrame()
-    
-    # Determine date range
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    
-    # Load EP time series (weekly trend ranges, forward-filled to daily)
-    print(f"Loading EP trend ranges for {p_sym}...")
-    ep_df = load_ep_time_series(p_sym, days_back=days_back)
-    
-    # Load RR time series (daily trade ranges)
-    print(f"Loading RR trade ranges for {p_sym}...")
-    rr_df = load_rr_time_series_with_translation(p_sym, mapping_df, p_current_series=None)
-
-    # Use pre-fetched prices if available, otherwise fetch
-    if pre_fetched_prices is not None and not pre_fetched_prices.empty:
-        # Extract prices for this ticker from pre-fetched DataFrame
-        ticker_prices = pre_fetched_prices[pre_fetched_prices['ticker'] == p_sym]
-        if not ticker_prices.empty:
-            daily_prices = ticker_prices.set_index('date')['price']
-            print(f"  ✓ Using {len(daily_prices)} pre-fetched prices for {p_sym}")
-        else:
-            print(f"  ⚠️  No pre-fetched prices for {p_sym}, fetching...")
-            daily_prices = fetch_historical_daily_prices(p_sym, start_date, end_date)
-    else:
-        # Fetch daily historical prices for the date range
-        print(f"Fetching daily prices for {p_sym}...")
-        daily_prices = fetch_historical_daily_prices(p_sym, start_date, end_date)
-    
-    # Check if today's price is missing and fetch it fresh (never use cache for today)
-    from hedgeye.ds.prices.fetch_prices import fetch_current_prices
-    
-    today = datetime.now().date()
-    today_timestamp = pd.Timestamp(today)
-    if not daily_prices.empty:
-        # Check if today's date is in the index
-        today_in_prices = today_timestamp in daily_prices.index
-    else:
-        today_in_prices = False
-    
-    if not today_in_prices:
-        # Use pre-fetched current price if available, otherwise fetch fresh
-        today_price = None
-        if pre_fetched_current_prices and p_sym in pre_fetched_current_prices:
-            today_price = pre_fetched_current_prices[p_sym]
-            print(f"  ✓ Using pre-fetched current price: ${today_price:.2f}")
-        else:
-            # Fallback: fetch fresh price for today (markets may be open)
-            try:
-                current_prices = fetch_current_prices([p_sym], use_cache=False)
-                if p_sym in current_prices:
-                    today_price = current_prices[p_sym]
-                    print(f"  ✓ Fetched fresh today's price: ${today_price:.2f}")
-            except Exception as e:
-                print(f"  ⚠️  Error fetching current price: {e}")
-
-        if today_price:
-            today_series = pd.Series([today_price], index=[pd.Timestamp(today)])
-            if daily_prices.empty:
-                daily_prices = today_series
-            else:
-                daily_prices = pd.concat([daily_prices, today_series])
-        else:
-            # Fallback to enriched data if fetch failed
-            config = load_config()
-            enriched_path = Path(config['paths']['ranges_base_dir']) / 'enriched' / 'position_ranges_enriched.csv'
-            if enriched_path.exists():
-                enriched_df = pd.read_csv(enriched_path, dtype=str)
-                p_row = enriched_df[enriched_df['p_sym'] == p_sym]
-                if not p_row.empty and p_row.iloc[0].get('p_current'):
-                    today_price = float(p_row.iloc[0]['p_current'])
-                    today_series = pd.Series([today_price], index=[pd.Timestamp(today)])
-                    if daily_prices.empty:
-                        daily_prices = today_series
-                    else:
-                        daily_prices = pd.concat([daily_prices, today_series])
-                    print(f"  ✓ Added today's price from enriched data (fallback): ${today_price:.2f}")
-    
-    # Create p_current series from daily prices (preferred) or EP weekly prices (fallback)
-    if not daily_prices.empty:
-        p_current_series = daily_prices
-        print(f"  Using {len(daily_prices)} daily prices from yfinance")
-    elif not ep_df.empty and 'recent_price' in ep_df.columns:
-        p_current_series = ep_df.set_index('date')['recent_price']
-        print(f"  Using {len(p_current_series)} weekly prices from EP (fallback)")
-    else:
-        p_current_series = None
-        print(f"  ⚠️  No price data available for translation")
-    
-    # Re-translate RR ranges using daily prices if available
-    if p_current_series is not None and not rr_df.empty:
-        print(f"Translating RR trade ranges using daily prices...")
-        rr_df = load_rr_time_series_with_translation(p_sym, mapping_df, p_current_series=p_current_series)
-    
-    # Merge EP and RR data by date
-    if not ep_df.empty and not rr_df.empty:
-        merged_df = pd.merge(ep_df, rr_df, on='date', how='outer', sort=True)
-    elif not ep_df.empty:
-        merged_df = ep_df.copy()
-        merged_df['p_trade_low'] = None
-        merged_df['p_trade_high'] = None
-        merged_df['prev_close'] = None
-    elif not rr_df.empty:
-        merged_df = rr_df.copy()
-        merged_df['trend_low'] = None
-        merged_df['trend_high'] = None
-        merged_df['recent_price'] = None
-    else:
-        print(f"❌ No data found for {p_sym}")
+    import matplotlib.pyplot as plt
+    merged_df = build_cr_time_series_data(
+        p_sym, days_back=days_back, mapping_df=mapping_df,
+        pre_fetched_prices=pre_fetched_prices,
+        pre_fetched_current_prices=pre_fetched_current_prices,
+        rr_index=rr_index,
+        ep_history=ep_history
+    )
+    if merged_df is None:
         return plt.figure()
-    
-    # Sort by date and ensure date is datetime
-    merged_df['date'] = pd.to_datetime(merged_df['date'])
-    merged_df = merged_df.sort_values('date').reset_index(drop=True)
-    
-    # Add daily prices to merged dataframe
-    if not daily_prices.empty:
-        # Merge daily prices by date
-        price_df = daily_prices.reset_index()
-        price_df.columns = ['date', 'price']
-        price_df['date'] = pd.to_datetime(price_df['date'])
-        
-        # Check if today's price is missing and try to add it
-        today = datetime.now().date()
-        if today not in price_df['date'].dt.date.values:
-            # Try to get today's price from enriched data or fetch fresh
-            try:
-                config = load_config()
-                enriched_path = Path(config['paths']['ranges_base_dir']) / 'enriched' / 'position_ranges_enriched.csv'
-                if enriched_path.exists():
-                    enriched_df = pd.read_csv(enriched_path, dtype=str)
-                    p_row = enriched_df[enriched_df['p_sym'] == p_sym]
-                    if not p_row.empty and p_row.iloc[0].get('p_current'):
-                        today_price = float(p_row.iloc[0]['p_current'])
-                        today_df = pd.DataFrame({
-                            'date': [pd.Timestamp(today)],
-                            'price': [today_price]
-                        })
-                        price_df = pd.concat([price_df, today_df], ignore_index=True)
-                        print(f"  ✓ Added today's price from enriched data: ${today_price:.2f}")
-            except Exception as e:
-                print(f"  ⚠️  Could not add today's price: {e}")
-        
-        merged_df = pd.merge(merged_df, price_df, on='date', how='outer', sort=True)
-    else:
-        # Fallback to EP recent_price if no daily prices
-        merged_df['price'] = merged_df['recent_price']
-    
-    # Sort again after merge
-    merged_df = merged_df.sort_values('date').reset_index(drop=True)
-    
-    # Convert numeric columns to float, handling any non-numeric values
-    for col in ['trend_low', 'trend_high', 'p_trade_low', 'p_trade_high', 'price', 'recent_price', 'prev_close']:
-        if col in merged_df.columns:
-            merged_df[col] = pd.to_numeric(merged_df[col], errors='coerce')
-    
-    # Filter to last N days
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    merged_df = merged_df[merged_df['date'] >= start_date]
-    
-    # Create figure
-    fig, ax = plt.subplots(figsize=(16, 10))
-    
-    # Plot trend ranges (from EP) - shaded area
-    trend_mask = merged_df['trend_low'].notna() & merged_df['trend_high'].notna()
-    if trend_mask.any():
-        trend_data = merged_df[trend_mask]
-        ax.fill_between(trend_data['date'], 
-                       trend_data['trend_low'], 
-                       trend_data['trend_high'],
-                       alpha=0.2, color='blue', label='Trend Range')
-        ax.plot(trend_data['date'], trend_data['trend_low'], 
-               color='blue', linestyle='--', linewidth=1.5, alpha=0.7, label='')
-        ax.plot(trend_data['date'], trend_data['trend_high'], 
-               color='blue', linestyle='--', linewidth=1.5, alpha=0.7, label='')
-    
-    # Plot trade ranges (from RR, translated) - shaded area
-    trade_mask = merged_df['p_trade_low'].notna() & merged_df['p_trade_high'].notna()
-    if trade_mask.any():
-        trade_data = merged_df[trade_mask]
-        ax.fill_between(trade_data['date'], 
-                       trade_data['p_trade_low'], 
-                       trade_data['p_trade_high'],
-                       alpha=0.2, color='green', label='Trade Range')
-        ax.plot(trade_data['date'], trade_data['p_trade_low'], 
-               color='green', linestyle='--', linewidth=1.5, alpha=0.7, label='')
-        ax.plot(trade_data['date'], trade_data['p_trade_high'], 
-               color='green', linestyle='--', linewidth=1.5, alpha=0.7, label='')
-    
-    # Plot price history
-    price_mask = merged_df['price'].notna()
-    if price_mask.any():
-        price_data = merged_df[price_mask]
-        ax.plot(price_data['date'], price_data['price'], 
-               color='black', linewidth=2, label='Price', marker='o', markersize=3)
-    
-    # Formatting
-    ax.set_title(f"Combo Ranges Time Series: {p_sym} (Last {days_back} Days)", 
-                fontsize=16, fontweight='bold')
-    ax.set_xlabel("Date", fontsize=12)
-    ax.set_ylabel("Price ($)", fontsize=12)
-    ax.legend(loc='best', fontsize=10)
-    ax.grid(True, alpha=0.3)
-    
-    # Format dates on x-axis
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=7))  # Weekly ticks
-    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-    
-    plt.tight_layout()
+
+    fig = draw_cr_time_series(arrays_from_frame(merged_df, CR_PLOT_COLUMNS),
+                              {'p_sym': p_sym, 'days_back': days_back})
     
     # Save if path provided
     if save_path:
         save_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
         print(f"💾 Saved plot to: {save_path}")
     
     return fig
@@ -494,6 +321,8 @@ def plot_cr_time_series_test(tickers: list, days_back: int = 30, output_dir: Opt
         days_back: Number of days to look back
         output_dir: Directory to save plots
     """
+    import matplotlib.pyplot as plt
+
     # Load mapping
     config = load_config()
     mapping_path = Path(config["paths"]["p_to_r_mapping_file"])
@@ -504,15 +333,19 @@ def plot_cr_time_series_test(tickers: list, days_back: int = 30, output_dir: Opt
         mapping_df = pd.DataFrame()
     
     print(f"🎨 Testing CR time-series plots for {len(tickers)} tickers: {tickers}")
+    start_date = datetime.now() - timedelta(days=days_back)
+    rr_index = RRIndex(load_all_risk_range_data(start=start_date))
+    ep_history = EPHistory.load(start=start_date)
     
     for ticker in tickers:
         print(f"\n  Plotting {ticker}...")
-        fig = plot_cr_time_series(ticker, days_back=days_back, mapping_df=mapping_df)
+        fig = plot_cr_time_series(ticker, days_back=days_back, mapping_df=mapping_df,
+                                  rr_index=rr_index, ep_history=ep_history)
         
         if output_dir:
             output_dir.mkdir(parents=True, exist_ok=True)
             save_path = output_dir / f"cr_timeseries_{ticker}.png"
-            plt.savefig(save_path, dpi=150, bbox_inches='tight')
+            fig.savefig(save_path, dpi=150, bbox_inches='tight')
             print(f"  💾 Saved: {save_path.name}")
         else:
             plt.show()
@@ -522,30 +355,22 @@ def plot_cr_time_series_test(tickers: list, days_back: int = 30, output_dir: Opt
     print(f"\n✅ Test plotting complete!")
 
 
-def get_all_ep_tickers() -> List[str]:
+def get_all_ep_tickers(ep_history: Optional[EPHistory] = None) -> List[str]:
     """
     Get all unique tickers from ALL EP weekly CSVs (historical).
     
     Note: This includes tickers that may have been removed from the portfolio.
     For current portfolio only, use get_current_ep_tickers().
     
+    Args:
+        ep_history: Preloaded EP history (reads the EP CSVs if None)
+    
     Returns:
         Sorted list of unique ticker symbols
     """
-    config = load_config()
-    ep_csv_dir = Path(config["paths"]["etf_pro_csv_dir"])
-    
-    ep_files = sorted(ep_csv_dir.glob("etf_pro_weekly_*.csv"))
-    if not ep_files:
-        return []
-    
-    all_tickers = set()
-    for file in ep_files:
-        df = pd.read_csv(file)
-        if 'ticker' in df.columns:
-            all_tickers.update(df['ticker'].unique())
-    
-    return sorted(list(all_tickers))
+    if ep_history is None:
+        ep_history = EPHistory.load()
+    return ep_history.tickers()
 
 
 def get_current_ep_tickers() -> List[str]:
@@ -598,20 +423,29 @@ def generate_all_cr_time_series_plots(
         output_dir = Path(config["paths"]["cr_plots_dir"])
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Load mapping table
+    # Load mapping table (compiled once; per-ticker lookups use its p_sym index)
     config = load_config()
     mapping_path = Path(config["paths"]["p_to_r_mapping_file"])
     if mapping_path.exists():
-        mapping_df = load_mapping_table(mapping_path)
+        p_to_r = get_p_to_r_mapping(mapping_path)
+        mapping_df = p_to_r.frame
     else:
         print(f"⚠️  Mapping file not found: {mapping_path}")
+        p_to_r = None
         mapping_df = pd.DataFrame()
     
+    # Read the EP weekly history once (plot window + the report in effect at its start)
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days_back)
+    ep_history = EPHistory.load(start=start_date)
+    
     # Get tickers from current EP portfolio (not historical)
-    all_tickers = get_current_ep_tickers()
+    all_tickers = ep_history.latest_tickers()
     if not all_tickers:
         print("❌ No tickers found in current EP portfolio")
         return {'total': 0, 'successful': 0, 'failed': 0, 'ep_only': 0, 'failed_list': []}
+    print(f"  ✓ Found {len(all_tickers)} tickers in current EP portfolio "
+          f"({ep_history.report_dates[-1].date()})")
     
     # Apply filter if provided
     if tickers_filter:
@@ -621,10 +455,7 @@ def generate_all_cr_time_series_plots(
     print(f"   Days back: {days_back}")
     print(f"   Output: {output_dir}")
     
-    # Determine date range and pre-fetch all prices
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    
+    # Pre-fetch all prices for the plot window
     print(f"\n💰 Pre-fetching historical prices for all tickers...")
     from hedgeye.ds.prices.price_cache import get_daily_prices
     all_prices_df = get_daily_prices(all_tickers, start_date, end_date, use_cache=True)
@@ -636,6 +467,16 @@ def generate_all_cr_time_series_plots(
     all_current_prices = fetch_current_prices(all_tickers, use_cache=False)
     print(f"   ✓ Pre-fetched current prices for {len(all_current_prices)} tickers")
     
+    # Index RR history once for all tickers (only the plot window is read)
+    rr_index = RRIndex(load_all_risk_range_data(start=start_date))
+
+    # All tickers' daily ranges in one vectorized pass, persisted for reports/agents
+    print(f"\n🧮 Building CR panel...")
+    panel = build_cr_panel(days_back=days_back, tickers=all_tickers, mapping_df=mapping_df,
+                           prices_df=all_prices_df, current_prices=all_current_prices,
+                           rr_index=rr_index, ep_history=ep_history)
+    save_cr_panel(panel)
+
     # Statistics tracking
     stats = {
         'total': len(all_tickers),
@@ -645,20 +486,25 @@ def generate_all_cr_time_series_plots(
         'failed_list': []
     }
     
-    # Process each ticker
-    print(f"\n🎨 Generating plots...")
+    def record_failure(ticker: str, error: str) -> None:
+        print(f"  ❌ Failed: {error}")
+        stats['failed'] += 1
+        stats['failed_list'].append({
+            'ticker': ticker,
+            'error': error
+        })
+
+    # Slice each ticker's plot data from the panel
+    print(f"\n🧮 Preparing plot data...")
+    jobs = []
+    has_rr_by_ticker = {}
     for i, ticker in enumerate(all_tickers, 1):
         print(f"\n[{i}/{len(all_tickers)}] {ticker}...")
         
         try:
-            # Check if has RR data
-            has_rr = False
-            if not mapping_df.empty and 'p_sym' in mapping_df.columns:
-                ticker_mapping = mapping_df[mapping_df['p_sym'] == ticker]
-                if not ticker_mapping.empty and pd.notna(ticker_mapping.iloc[0]['r_sym']):
-                    r_sym = ticker_mapping.iloc[0]['r_sym']
-                    if r_sym and r_sym != 'no_coverage':
-                        has_rr = True
+            # Check if has RR data: exact p_sym, as the panel joins the mapping
+            entry = p_to_r.resolve(ticker) if p_to_r is not None else None
+            has_rr = bool(entry and entry.r_sym and entry.r_sym != 'no_coverage')
             
             # Skip if require_rr_data and no RR
             if require_rr_data and not has_rr:
@@ -666,35 +512,43 @@ def generate_all_cr_time_series_plots(
                 stats['ep_only'] += 1
                 continue
             
-            # Generate plot
-            save_path = output_dir / f"cr_timeseries_{ticker}.png"
-            fig = plot_cr_time_series(
+            merged_df = build_cr_time_series_data(
                 ticker,
                 days_back=days_back,
                 mapping_df=mapping_df,
-                save_path=save_path,
-                pre_fetched_prices=all_prices_df,  # Use pre-fetched historical prices
-                pre_fetched_current_prices=all_current_prices  # Use pre-fetched current prices
+                panel=panel
             )
-            
-            plt.close(fig)
-            
-            # Track statistics
-            if not has_rr:
-                stats['ep_only'] += 1
-                print(f"  ✅ Saved (EP-only, no RR data)")
-            else:
-                print(f"  ✅ Saved (EP + RR)")
-            stats['successful'] += 1
+            if merged_df is None:
+                record_failure(ticker, "No EP or RR data")
+                continue
+
+            has_rr_by_ticker[ticker] = has_rr
+            jobs.append(PlotJob(
+                renderer='cr_time_series',
+                out_path=output_dir / f"cr_timeseries_{ticker}.png",
+                label=ticker,
+                arrays=arrays_from_frame(merged_df, CR_PLOT_COLUMNS),
+                meta={'p_sym': ticker, 'days_back': days_back},
+                savefig_kwargs={'dpi': 150, 'bbox_inches': 'tight'},
+            ))
             
         except Exception as e:
-            print(f"  ❌ Failed: {e}")
-            stats['failed'] += 1
-            stats['failed_list'].append({
-                'ticker': ticker,
-                'error': str(e)
-            })
+            record_failure(ticker, str(e))
             continue
+
+    # Draw and save all plots (parallel, headless)
+    print(f"\n🎨 Generating plots...")
+    result = render_jobs(jobs)
+
+    failed_labels = {item['label'] for item in result.failed_list}
+    for item in result.failed_list:
+        stats['failed'] += 1
+        stats['failed_list'].append({'ticker': item['label'], 'error': item['error']})
+    for job in jobs:
+        if job.label not in failed_labels and not has_rr_by_ticker[job.label]:
+            stats['ep_only'] += 1
+    stats['successful'] = result.successful
+    stats['cached'] = result.cached
     
     # Print summary
     print(f"\n{'='*70}")
@@ -704,6 +558,7 @@ def generate_all_cr_time_series_plots(
     print(f"  ✅ Successful: {stats['successful']}")
     print(f"     - With RR data: {stats['successful'] - stats['ep_only']}")
     print(f"     - EP-only: {stats['ep_only']}")
+    print(f"     - Unchanged (not re-rendered): {stats.get('cached', 0)}")
     print(f"  ❌ Failed: {stats['failed']}")
     print(f"  📁 Output: {output_dir}")
     
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Long-running pipeline daemon with warm in-memory state.
+
+One process keeps running the incremental pipeline DAG (see pipeline_dag):
+
+- Stages run in-process, so everything cached at module level stays warm
+  between runs: the parsed config, daily RR/EP CSVs and the price cache
+  (file_cache), rendered-plot manifests and the FMP HTTP session.
+- The raw email directories (RR, EP, PS) are watched (see watcher: inotify
+  on Linux, polling elsewhere). Once a new .eml has stopped changing for
+  `settle_seconds`, exactly the new files are handed to their parser and a
+  run is queued for what is downstream. Nothing else is re-parsed: the
+  parse stage's raw directory is only listed and stat'ed to update its
+  fingerprint (see parse_new_files). A reported file that the parser then
+  renames is not reported again. Unchanged stages are skipped, and only
+  plots whose data changed are re-rendered.
+- A small JSON control API on 127.0.0.1 triggers runs and reports status.
+
+Control API (default http://127.0.0.1:8765):
+    GET  /status   state, watched directories, queue, last run, cache stats
+    GET  /report   metrics report of the last run (404 before the first run)
+    POST /run      queue a run; optional JSON body {"targets": [...], "force": true}
+    POST /stop     finish the current run and exit
+
+Settings come from the optional `daemon` section of hedgeye.yaml
+(port, poll_interval, settle_seconds); arguments override it. poll_interval
+only matters where inotify is unavailable.
+
+Usage:
+    from hedgeye.ds.daemon import PipelineDaemon
+    PipelineDaemon(port=8765).serve_forever()
+
+    curl -s localhost:8765/status
+    curl -s -X POST localhost:8765/run -d '{"targets": ["merge_cr"]}'
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+from dataclasses import asdict
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from hedgeye.config_loader import get_config
+from hedgeye.ds import metrics
+from hedgeye.ds.file_cache import file_cache_stats
+from hedgeye.ds.dag_runner import DagResult
+from hedgeye.ds.pipeline_dag import CR_STAGES, PARSE_STAGES, RR_STAGES, parse_new_files, run_pipeline_dag
+from hedgeye.ds.watcher import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS, DirWatcher
+
+DEFAULT_PORT = 8765
+REPORT_NAME = "pipeline_daemon"
+
+
+class PipelineDaemon:
+    """
+    Runs the pipeline DAG on demand and whenever new raw emails land.
+
+    Attributes:
+        port: Control API port (bound to 127.0.0.1)
+        poll_interval: Seconds between directory checks (polling watcher only)
+        settle_seconds: How long new files must stay unchanged before they are parsed
+        watch: Watch the raw directories (False: runs only via the API)
+    """
+
+    def __init__(self, port: Optional[int] = None, poll_interval: Optional[float] = None,
+                 settle_seconds: Optional[float] = None, watch: bool = True,
+                 plot_days_back: int = 30, rr_plot_start: str = "2025-10-01",
+                 report_name: str = REPORT_NAME):
+        settings = get_config().section("daemon")
+        self.port = port if port is not None else int(settings.get("port", DEFAULT_PORT))
+        self.poll_interval = (poll_interval if poll_interval is not None
+                              else float(settings.get("poll_interval", DEFAULT_POLL_INTERVAL)))
+        self.settle_seconds = (settle_seconds if settle_seconds is not None
+                               else float(settings.get("settle_seconds", DEFAULT_SETTLE_SECONDS)))
+        self.watch = watch
+        self.plot_days_back = plot_days_back
+        self.rr_plot_start = rr_plot_start
+        self.report_name = report_name
+
+        self.started = datetime.now()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        # Queued run: None = nothing queued; targets None = all stages
+        self._queued: Optional[Dict[str, Any]] = None
+        self._running: Optional[Dict[str, Any]] = None
+        self._last_run: Optional[Dict[str, Any]] = None
+        self._last_report: Optional[Dict[str, Any]] = None
+        self._runs = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._watcher: Optional[DirWatcher] = None
+
+    # --- Queue ---
+
+    def request_run(self, reason: str, targets: Optional[List[str]] = None, force: bool = False,
+                    files: Optional[Dict[str, List[Path]]] = None) -> None:
+        """
+        Queue a run. Requests made while one is queued are merged into it.
+
+        Args:
+            reason: Shown in status and logs ("api", "watch", "startup")
+            targets: Stages to bring up to date (None: all)
+            force: Rerun stages even if up to date
+            files: Parse stage -> new raw files to parse before the run
+        """
+        with self._lock:
+            queued = self._queued or {"reasons": [], "targets": set(), "all": False,
+                                      "force": False, "files": {}, "queued": _now()}
+            queued["reasons"].append(reason)
+            if targets:
+                queued["targets"].update(targets)
+            else:
+                queued["all"] = True
+            queued["force"] = queued["force"] or force
+            for stage, paths in (files or {}).items():
+                queued["files"].setdefault(stage, []).extend(str(p) for p in paths)
+            self._queued = queued
+        self._wake.set()
+
+    def _take_queued(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            queued, self._queued = self._queued, None
+            return queued
+
+    # --- Runs ---
+
+    def run_once(self, targets: Optional[Set[str]] = None, force: bool = False,
+                 files: Optional[Dict[str, List[str]]] = None) -> DagResult:
+        """
+        Run the DAG in this process and record its report.
+
+        Args:
+            targets: Stages to bring up to date (None: all)
+            force: Rerun stages even if up to date
+            files: Parse stage -> new raw files, parsed first (see parse_new_files)
+        """
+        metrics.reset_metrics()
+        if files and not force:
+            parse_new_files({stage: [Path(p) for p in paths] for stage, paths in files.items()})
+        result = run_pipeline_dag(targets=sorted(targets) if targets else None, force=force,
+                                  workers=1, plot_days_back=self.plot_days_back,
+                                  rr_plot_start=self.rr_plot_start)
+        if any(o.status in ("ran", "failed") for o in result.outcomes):
+            metrics.print_metrics_summary()
+            # Runs can be seconds apart: number the reports
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = metrics.write_run_report(
+                self.report_name, metrics.get_metrics_dir() / f"{self.report_name}_{stamp}_{self._runs + 1:04d}.json")
+            print(f"📝 Run report: {report_path}")
+        with self._lock:
+            self._last_report = metrics.build_run_report(self.report_name)
+        return result
+
+    def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            queued = self._take_queued()
+            if queued is None or self._stop.is_set():
+                continue
+            targets = None if queued["all"] else queued["targets"]
+            started = time.perf_counter()
+            with self._lock:
+                self._running = {"started": _now(), "reasons": queued["reasons"],
+                                 "targets": sorted(targets) if targets else "all"}
+            print(f"\n🔁 Run {self._runs + 1} ({', '.join(sorted(set(queued['reasons'])))})")
+            record: Dict[str, Any] = {**self._running, "files": queued["files"]}
+            try:
+                result = self.run_once(targets, queued["force"], queued["files"])
+                record.update(ok=result.ok, stages=[asdict(o) for o in result.outcomes])
+            except Exception as e:
+                traceback.print_exc()
+                record.update(ok=False, error=f"{type(e).__name__}: {e}")
+            record["seconds"] = round(time.perf_counter() - started, 3)
+            record["finished"] = _now()
+            with self._lock:
+                self._runs += 1
+                self._running = None
+                self._last_run = record
+
+    # --- Watching ---
+
+    def watched_dirs(self) -> Dict[str, Path]:
+        """Parse stage -> raw email directory."""
+        paths = get_config().paths
+        return {stage: paths[key] for stage, (key, _) in PARSE_STAGES.items() if key in paths}
+
+    def _on_new_files(self, stage: str, files: List[Path]) -> None:
+        print(f"\n📥 {len(files)} new file(s) for {stage}: {', '.join(p.name for p in files[:5])}"
+              f"{' ...' if len(files) > 5 else ''}")
+        self.request_run("watch", files={stage: files})
+
+    # --- Control API ---
+
+    def status(self) -> Dict[str, Any]:
+        """Daemon state as a JSON-serializable dict."""
+        with self._lock:
+            queued = None
+            if self._queued is not None:
+                queued = {**self._queued, "targets": "all" if self._queued["all"]
+                          else sorted(self._queued["targets"])}
+                queued.pop("all")
+            return {
+                "pid": os.getpid(),
+                "started": self.started.isoformat(timespec="seconds"),
+                "port": self.port,
+                "state": "running" if self._running else "idle",
+                "runs": self._runs,
+                "running": self._running,
+                "queued": queued,
+                "last_run": self._last_run,
+                "watching": {stage: str(d) for stage, d in self.watched_dirs().items()} if self.watch else {},
+                "watcher": self._watcher.backend if self._watcher else None,
+                "file_cache": file_cache_stats(),
+            }
+
+    def last_report(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._last_report
+
+    def stop(self) -> None:
+        """Stop watching, finish the current run, and stop serving."""
+        self._stop.set()
+        self._wake.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def serve_forever(self, run_now: bool = True) -> None:
+        """
+        Start the watcher and run threads and serve the control API until stopped.
+
+        Args:
+            run_now: Queue a run at startup (brings outputs up to date and warms the caches)
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), _make_handler(self))
+        self._server.daemon_threads = True
+        runner = threading.Thread(target=self._run_loop, name="pipeline-runs")
+        runner.start()
+        if self.watch:
+            # Files already present are left to the startup run
+            self._watcher = DirWatcher(self.watched_dirs(), pattern="*.eml",
+                                       settle_seconds=self.settle_seconds,
+                                       poll_interval=self.poll_interval)
+            self._watcher.start(self._on_new_files)
+        print(f"🛰️  Pipeline daemon on http://127.0.0.1:{self.port} (pid {os.getpid()})")
+        for directory in self.watched_dirs().values() if self.watch else []:
+            print(f"   👀 {directory} ({self._watcher.backend})")
+        if run_now:
+            self.request_run("startup")
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping")
+        finally:
+            self.stop()
+            self._server.server_close()
+            runner.join()
+
+
+def _make_handler(daemon: PipelineDaemon) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "hedgeye-daemon"
+
+        def _send(self, status: HTTPStatus, payload: Any) -> None:
+            body = json.dumps(payload, indent=2, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> Dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            data = json.loads(self.rfile.read(length))
+            if not isinstance(data, dict):
+                raise ValueError("body must be a JSON object")
+            return data
+
+        def do_GET(self) -> None:
+            path = self.path.split("?")[0].rstrip("/")
+            if path in ("", "/status"):
+                self._send(HTTPStatus.OK, daemon.status())
+            elif path == "/report":
+                report = daemon.last_report()
+                if report is None:
+                    self._send(HTTPStatus.NOT_FOUND, {"error": "no run yet"})
+                else:
+                    self._send(HTTPStatus.OK, report)
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self) -> None:
+            path = self.path.split("?")[0].rstrip("/")
+            try:
+                body = self._body()
+            except ValueError as e:  # includes JSONDecodeError
+                self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+                return
+            if path == "/run":
+                targets = body.get("targets")
+                stages = RR_STAGES + CR_STAGES
+                if targets is not None and not (isinstance(targets, list)
+                                                and all(t in stages for t in targets)):
+                    self._send(HTTPStatus.BAD_REQUEST,
+                               {"error": f"targets must be a list of stage names: {stages}"})
+                    return
+                daemon.request_run("api", targets=targets, force=bool(body.get("force")))
+                self._send(HTTPStatus.ACCEPTED, {"queued": True})
+            elif path == "/stop":
+                self._send(HTTPStatus.ACCEPTED, {"stopping": True})
+                daemon.stop()
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"unknown path {self.path}"})
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # runs and watch events are logged; requests are not
+
+    return Handler
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Incremental DAG runner for pipeline stages.
+
+Each Stage declares the files it reads (inputs), the files it writes
+(outputs) and the stages it depends on. Before a stage runs, its inputs are
+fingerprinted: a sha256 over the path, size and mtime of every input file
+plus the stage's params. A stage is skipped when its fingerprint matches
+the one recorded for its last successful run (taken just before that run
+started, so an input that arrives while the stage runs is not recorded as
+handled) and all of its outputs exist. Since downstream stages read upstream outputs, a stage that rewrites
+its outputs invalidates everything below it, and nothing else.
+
+Stages whose dependencies are done run concurrently in worker processes
+(their printed output is captured and shown when the stage finishes).
+With workers=1 stages run in-process, one at a time, with live output.
+Every stage runs inside a metrics span named after it; spans recorded in a
+worker are sent back and merged into the parent's run report (see metrics).
+With a Profiler, each stage is also profiled where it runs (see profiling).
+
+State is one JSON file:
+    {"version": 1, "stages": {"merge_cr": {"fingerprint": "...", "finished": "...", "seconds": 1.2}}}
+
+Usage:
+    from hedgeye.ds.dag_runner import DagRunner, Stage
+    runner = DagRunner([
+        Stage("parse", parse_fn, inputs=[(raw_dir, "*.eml")], outputs=[csv_dir]),
+        Stage("combine", combine_fn, inputs=[(csv_dir, "*.csv")], outputs=[combined], deps=["parse"]),
+    ], state_path)
+    result = runner.run()
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from hedgeye.ds import metrics
+from hedgeye.ds.profiling import Profiler
+
+STATE_VERSION = 1
+
+# A file/directory path, or (directory, glob pattern)
+InputSpec = Union[str, Path, Tuple[Union[str, Path], str]]
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+
+    Attributes:
+        name: Unique stage name
+        func: Zero-argument callable (module-level function or functools.partial
+              of one, so it can be sent to a worker process)
+        inputs: Files/directories/(directory, pattern) globs the stage reads
+        outputs: Files/directories the stage writes (must exist to skip)
+        deps: Names of stages that must finish first
+        params: Extra values folded into the fingerprint (e.g. days_back, as-of date)
+        description: One-line label printed when the stage runs
+    """
+    name: str
+    func: Callable[[], Any]
+    inputs: Sequence[InputSpec] = ()
+    outputs: Sequence[Union[str, Path]] = ()
+    deps: Sequence[str] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    description: str = ""
+
+
+@dataclass
+class StageOutcome:
+    """Result of one stage in a run: ran, skipped, failed or blocked."""
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class DagResult:
+    """Per-stage outcomes of a DAG run, in completion order."""
+    outcomes: List[StageOutcome] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def names(self, status: str) -> List[str]:
+        return [o.name for o in self.outcomes if o.status == status]
+
+    @property
+    def ok(self) -> bool:
+        return not self.names("failed") and not self.names("blocked")
+
+
+def _iter_input_files(spec: InputSpec) -> Iterable[Path]:
+    """Files covered by one input spec (missing paths contribute nothing)."""
+    if isinstance(spec, tuple):
+        directory, pattern = spec
+        directory = Path(directory)
+        return (p for p in directory.glob(pattern) if p.is_file()) if directory.is_dir() else ()
+    path = Path(spec)
+    if path.is_dir():
+        return (p for p in path.iterdir() if p.is_file() and not p.name.startswith("."))
+    return (path,) if path.is_file() else ()
+
+
+def fingerprint_stage(stage: Stage, exclude: Collection[Path] = ()) -> str:
+    """
+    Fingerprint a stage's inputs (path, size, mtime of each file) and params.
+
+    Args:
+        stage: Stage to fingerprint
+        exclude: Input files to leave out (e.g. files that arrived since the last run)
+
+    Returns:
+        Hex sha256 digest
+    """
+    exclude = {Path(p) for p in exclude}
+    h = hashlib.sha256()
+    h.update(stage.name.encode())
+    for spec in stage.inputs:
+        h.update(f"\0{spec}".encode())
+        for path in sorted(_iter_input_files(spec)):
+            if path in exclude:
+                continue
+            st = path.stat()
+            h.update(f"{path}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    h.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _run_stage(name: str, func: Callable[[], Any], capture: bool,
+               profiler: Optional[Profiler] = None) -> Tuple[str, bool, float, str, Optional[str], List[dict]]:
+    """
+    Run one stage (in a worker process when capture=True), under the
+    profiler's stage() when one is given.
+
+    Returns:
+        (name, ok, seconds, captured output, error, metrics spans recorded in
+        the worker; empty when run in-process, where spans are recorded directly)
+    """
+    log = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    if capture:
+        metrics.reset_metrics()  # pool workers are reused across stages
+    redirect = contextlib.redirect_stdout(log) if capture else contextlib.nullcontext()
+    try:
+        profile = profiler.stage(name) if profiler is not None else contextlib.nullcontext()
+        with redirect, metrics.span(name, kind="stage"), profile:
+            func()
+    except BaseException as e:  # SystemExit from wrapped CLI mains counts as a failure
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        error = f"{type(e).__name__}: {e}"
+        log.write(traceback.format_exc())
+    spans = metrics.export_spans() if capture else []
+    return name, error is None, time.perf_counter() - start, log.getvalue(), error, spans
+
+
+class DagRunner:
+    """Runs a set of Stages in dependency order, skipping up-to-date ones."""
+
+    def __init__(self, stages: Sequence[Stage], state_path: Union[str, Path]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            unknown = [d for d in stage.deps if d not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {unknown}")
+        self.order = self._toposort()
+        self.state_path = Path(state_path)
+
+    def _toposort(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def select(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Targets plus everything upstream of them, in run order (default: all)."""
+        if targets is None:
+            return list(self.order)
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return [n for n in self.order if n in needed]
+
+    def load_state(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != STATE_VERSION:
+            return {}
+        return data.get("stages", {})
+
+    def _save_state(self, state: Dict[str, dict]) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": STATE_VERSION, "stages": state}, indent=2, sort_keys=True))
+        os.replace(tmp, self.state_path)
+
+    def is_current(self, name: str, state: Dict[str, dict], exclude: Collection[Path] = ()) -> bool:
+        """
+        True if the stage's inputs are unchanged and its outputs exist.
+
+        Input files in exclude are ignored, which asks whether the stage was
+        current before they arrived.
+        """
+        return self._matches(name, state, fingerprint_stage(self.stages[name], exclude))
+
+    def _matches(self, name: str, state: Dict[str, dict], fingerprint: str) -> bool:
+        """True if the stage's outputs exist and its recorded fingerprint is this one."""
+        if not all(Path(p).exists() for p in self.stages[name].outputs):
+            return False
+        return state.get(name, {}).get("fingerprint") == fingerprint
+
+    def mark_current(self, names: Iterable[str], fingerprints: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Record stages as up to date with their inputs.
+
+        For callers that did a stage's work themselves (e.g. parsed just the
+        new files of an otherwise current parse stage).
+
+        Args:
+            names: Stages to mark
+            fingerprints: Stage fingerprints taken before the work started (see
+                fingerprint_stage); a stage without one is fingerprinted now,
+                which also records inputs that arrived while it ran as handled
+        """
+        fingerprints = fingerprints or {}
+        state = self.load_state()
+        for name in names:
+            fingerprint = fingerprints.get(name)
+            state[name] = {
+                "fingerprint": fingerprint if fingerprint is not None else fingerprint_stage(self.stages[name]),
+                "finished": datetime.now().isoformat(timespec="seconds"),
+                "seconds": state.get(name, {}).get("seconds", 0.0),
+            }
+        self._save_state(state)
+
+    def run(self, targets: Optional[Iterable[str]] = None, force: bool = False,
+            workers: Optional[int] = None, dry_run: bool = False,
+            skip: Iterable[str] = (), profiler: Optional[Profiler] = None) -> DagResult:
+        """
+        Run the selected stages.
+
+        Args:
+            targets: Stages to bring up to date (default: all); upstream stages included
+            force: Run every selected stage even if it is up to date
+            skip: Stages to treat as done without checking or running them
+            workers: Concurrent stage processes (default: number of stages; 1 = in-process)
+            dry_run: Only report which stages would run
+            profiler: Profiler to profile each stage with
+
+        Returns:
+            DagResult with one outcome per selected stage
+        """
+        selected = self.select(targets)
+        skip = set(skip)
+        workers = max(1, workers or len(selected) or 1)
+        state = self.load_state()
+        result = DagResult()
+        start = time.perf_counter()
+
+        status: Dict[str, str] = {}
+        pending: Dict[Future, str] = {}
+        # Inputs as they were when each stage started (recorded on success)
+        fingerprints: Dict[str, str] = {}
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and not dry_run else None
+
+        def finish(name: str, ok: bool, seconds: float, log: str, error: Optional[str],
+                   spans: List[dict]) -> None:
+            metrics.merge_spans(spans)
+            if executor is not None and log.strip():
+                print(f"\n── {name} ──\n{log.rstrip()}")
+            if ok:
+                state[name] = {
+                    # Inputs as they were before the run: a file that arrived while the
+                    # stage ran makes it run again. (A stage that renames its own inputs
+                    # reruns once too; the parsers skip what they already parsed.)
+                    "fingerprint": fingerprints[name],
+                    "finished": datetime.now().isoformat(timespec="seconds"),
+                    "seconds": round(seconds, 3),
+                }
+                self._save_state(state)
+                status[name] = "ran"
+                print(f"✅ {name} ({seconds:.1f}s)")
+            else:
+                status[name] = "failed"
+                print(f"❌ {name} failed after {seconds:.1f}s: {error}")
+            result.outcomes.append(StageOutcome(name, status[name], seconds, error))
+
+        try:
+            while len(status) < len(selected):
+                progressed = False
+                for name in selected:
+                    if name in status or name in pending.values():
+                        continue
+                    deps = [d for d in self.stages[name].deps if d in selected]
+                    if any(status.get(d) in ("failed", "blocked") for d in deps):
+                        status[name] = "blocked"
+                        result.outcomes.append(StageOutcome(name, "blocked"))
+                        print(f"⛔ {name} blocked (upstream failed)")
+                        progressed = True
+                        continue
+                    if not all(status.get(d) in ("ran", "skipped") for d in deps):
+                        continue
+
+                    progressed = True
+                    if name in skip:
+                        status[name] = "skipped"
+                        result.outcomes.append(StageOutcome(name, "skipped"))
+                        print(f"⏭️  {name} not requested")
+                        continue
+
+                    fingerprints[name] = fingerprint_stage(self.stages[name])
+                    if not force and self._matches(name, state, fingerprints[name]):
+                        status[name] = "skipped"
+                        result.outcomes.append(StageOutcome(name, "skipped"))
+                        print(f"⏭️  {name} up to date")
+                    elif dry_run:
+                        status[name] = "ran"
+                        result.outcomes.append(StageOutcome(name, "would run"))
+                        print(f"🔎 {name} would run")
+                    elif executor is None:
+                        print(f"\n▶️  {name}: {self.stages[name].description or name}")
+                        finish(*_run_stage(name, self.stages[name].func, False, profiler))
+                    else:
+                        print(f"▶️  {name}: {self.stages[name].description or name}")
+                        future = executor.submit(_run_stage, name, self.stages[name].func, True, profiler)
+                        pending[future] = name
+
+                if pending and not progressed:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.pop(future)
+                        finish(*future.result())
+                elif not pending and not progressed:
+                    raise RuntimeError("DAG runner stalled (unsatisfiable dependencies)")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        result.seconds = time.perf_counter() - start
+        return result
+
+
+def print_dag_summary(result: DagResult) -> None:
+    """Print a one-line-per-stage summary of a run."""
+    print(f"\n📊 Pipeline summary ({result.seconds:.1f}s)")
+    icons = {"ran": "✅", "skipped": "⏭️ ", "failed": "❌", "blocked": "⛔", "would run": "🔎"}
+    for outcome in result.outcomes:
+        timing = f" {outcome.seconds:.1f}s" if outcome.status in ("ran", "failed") else ""
+        print(f"   {icons.get(outcome.status, '•')} {outcome.name:<16} {outcome.status}{timing}")
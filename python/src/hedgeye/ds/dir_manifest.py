@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Manifests of dated files in the pipeline's output directories.
+
+Most outputs are one file per report: risk_range_YYYY-MM-DD.csv,
+etf_pro_weekly_YYYY-MM-DD.csv, ps_daily_YYYY-MM-DD.csv,
+ham_holdings_YYYY-MM-DD_HHMM.csv. A DirManifest maps the key in the name
+(the report date) to the file, kept sorted, so "latest file", "file for a
+date" and "files in a date range" are lookups instead of a directory
+listing plus a regex over every name.
+
+- Writers call record_file() after writing a file. Writing a new file
+  changes the directory's mtime, which cannot tell this write from another
+  process's, so the directory is listed again then (once per write, not
+  once per read).
+- Readers call get_manifest(). The manifest is trusted while the
+  directory's mtime equals the one recorded with it (files were not added,
+  removed or renamed behind its back); otherwise the directory is listed
+  once and the manifest rebuilt.
+- Manifests stay in memory for the life of the process and are saved as
+  JSON under cache_dir/manifests (not in the directory itself, which would
+  change its mtime), so a new process does not list the directory either.
+
+Usage:
+    from hedgeye.ds.dir_manifest import get_manifest, latest_file, record_file
+    latest = latest_file(csv_dir, "etf_pro_weekly_")
+    window = get_manifest(csv_dir, "risk_range_").between("2025-10-01", "2025-10-31")
+    record_file(csv_dir / "ps_daily_2025-11-14.csv", "ps_daily_")
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from hedgeye.config_loader import get_config
+
+DATE_KEY = r"\d{4}-\d{2}-\d{2}"
+DATE_TIME_KEY = r"\d{4}-\d{2}-\d{2}_\d{4}"
+MANIFEST_VERSION = 1
+MANIFEST_SUBDIR = "manifests"
+
+PathLike = Union[str, Path]
+
+
+class DirManifest:
+    """
+    Files named <prefix><key><suffix> in one directory, by key.
+
+    Keys sort chronologically (they start with YYYY-MM-DD). Names that do not
+    match exactly, e.g. etf_pro_weekly_2025-11-09_enriched.csv, are not
+    listed.
+
+    Attributes:
+        directory: Directory the files live in
+        prefix: File name prefix, e.g. "risk_range_"
+        suffix: File name suffix, e.g. ".csv"
+        key_pattern: Regex of the key (default: a YYYY-MM-DD date)
+        dir_mtime_ns: Directory mtime the manifest is valid for
+    """
+
+    def __init__(self, directory: PathLike, prefix: str, suffix: str = ".csv",
+                 key_pattern: str = DATE_KEY):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.key_pattern = key_pattern
+        self.dir_mtime_ns: Optional[int] = None
+        self._name_re = re.compile(f"^{re.escape(prefix)}({key_pattern}){re.escape(suffix)}$")
+        self._keys: List[str] = []
+
+    def key_of(self, name: str) -> Optional[str]:
+        """The key in a file name, or None if the name does not belong to this manifest."""
+        match = self._name_re.match(name)
+        return match.group(1) if match else None
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{self.prefix}{key}{self.suffix}"
+
+    # --- Maintenance ---
+
+    def rebuild(self) -> None:
+        """List the directory and replace the manifest's contents."""
+        self.dir_mtime_ns = _dir_mtime(self.directory)
+        keys = []
+        if self.dir_mtime_ns is not None:
+            with os.scandir(self.directory) as entries:
+                keys = [key for key in map(self.key_of, (e.name for e in entries)) if key]
+        self._keys = sorted(keys)
+
+    def add(self, path: PathLike) -> bool:
+        """
+        Record a file written to the directory. Returns False if its name does not match.
+
+        Does not revalidate the manifest: other files may have appeared too.
+        """
+        key = self.key_of(Path(path).name)
+        if key is None:
+            return False
+        index = bisect.bisect_left(self._keys, key)
+        if index == len(self._keys) or self._keys[index] != key:
+            self._keys.insert(index, key)
+        return True
+
+    # --- Lookups ---
+
+    def keys(self) -> List[str]:
+        """All keys, oldest first."""
+        return list(self._keys)
+
+    def files(self) -> List[Path]:
+        """All files, oldest first."""
+        return [self.path(k) for k in self._keys]
+
+    def latest(self) -> Optional[Path]:
+        return self.path(self._keys[-1]) if self._keys else None
+
+    def get(self, key: str) -> Optional[Path]:
+        """The file for a key (e.g. a report date), or None."""
+        return self.path(key) if key in self else None
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Path]:
+        """
+        Files whose key's date part is in [start, end], oldest first.
+
+        Args:
+            start: Earliest YYYY-MM-DD (inclusive); None = no limit
+            end: Latest YYYY-MM-DD (inclusive); None = no limit
+        """
+        lo = bisect.bisect_left(self._keys, start) if start else 0
+        hi = bisect.bisect_right(self._keys, f"{end}\uffff") if end else len(self._keys)
+        return [self.path(k) for k in self._keys[lo:hi]]
+
+    def __contains__(self, key: str) -> bool:
+        index = bisect.bisect_left(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # --- Persistence ---
+
+    def to_dict(self) -> Dict:
+        return {"version": MANIFEST_VERSION, "directory": str(self.directory), "prefix": self.prefix,
+                "suffix": self.suffix, "key_pattern": self.key_pattern,
+                "dir_mtime_ns": self.dir_mtime_ns, "keys": self._keys}
+
+    def load_dict(self, data: Dict) -> bool:
+        """Take keys and mtime from a saved manifest. Returns False if it is for something else."""
+        expected = self.to_dict()
+        if any(data.get(k) != expected[k] for k in ("version", "directory", "prefix", "suffix", "key_pattern")):
+            return False
+        self.dir_mtime_ns = data.get("dir_mtime_ns")
+        self._keys = sorted(data.get("keys") or [])
+        return True
+
+
+# (directory, prefix, suffix, key pattern) -> manifest
+_manifests: Dict[Tuple[str, str, str, str], DirManifest] = {}
+_lock = threading.Lock()
+
+
+def _dir_mtime(directory: Path) -> Optional[int]:
+    try:
+        return directory.stat().st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _manifest_file(manifest: DirManifest) -> Optional[Path]:
+    """Where a manifest is saved (None if no cache_dir is configured)."""
+    cache_dir = get_config().paths.get("cache_dir")
+    if cache_dir is None:
+        return None
+    digest = hashlib.sha1(f"{manifest.directory.resolve()}|{manifest.suffix}|{manifest.key_pattern}"
+                          .encode()).hexdigest()[:12]
+    return cache_dir / MANIFEST_SUBDIR / f"{manifest.prefix}{digest}.json"
+
+
+def _save(manifest: DirManifest) -> None:
+    path = _manifest_file(manifest)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest.to_dict()))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️  Could not save manifest {path}: {e}")
+
+
+def _load(manifest: DirManifest) -> bool:
+    path = _manifest_file(manifest)
+    if path is None:
+        return False
+    try:
+        return manifest.load_dict(json.loads(path.read_text()))
+    except (OSError, ValueError):
+        return False
+
+
+def _cached(directory: PathLike, prefix: str, suffix: str, key_pattern: str) -> DirManifest:
+    """The process-wide manifest object (loaded from disk on first use, not validated)."""
+    key = (str(Path(directory)), prefix, suffix, key_pattern)
+    manifest = _manifests.get(key)
+    if manifest is None:
+        manifest = DirManifest(directory, prefix, suffix, key_pattern)
+        if not _load(manifest):
+            manifest.dir_mtime_ns = -1  # force a listing
+        _manifests[key] = manifest
+    return manifest
+
+
+def get_manifest(directory: PathLike, prefix: str, suffix: str = ".csv",
+                 key_pattern: str = DATE_KEY) -> DirManifest:
+    """
+    Up-to-date manifest of a directory's <prefix><key><suffix> files.
+
+    Costs one stat of the directory when nothing changed since the manifest
+    was last built or recorded to.
+
+    Returns:
+        DirManifest shared by all callers (do not modify it)
+    """
+    with _lock:
+        manifest = _cached(directory, prefix, suffix, key_pattern)
+        if manifest.dir_mtime_ns != _dir_mtime(manifest.directory):
+            manifest.rebuild()
+            _save(manifest)
+        return manifest
+
+
+def record_file(path: PathLike, prefix: str, suffix: str = ".csv", key_pattern: str = DATE_KEY) -> None:
+    """
+    Add a file just written to its directory's manifest.
+
+    If the directory changed since the manifest was validated (always the
+    case when the file is new), it is listed again, so files other
+    processes added meanwhile are picked up too; a file rewritten in place
+    is just added.
+    """
+    path = Path(path)
+    with _lock:
+        manifest = _cached(path.parent, prefix, suffix, key_pattern)
+        if manifest.key_of(path.name) is None:
+            return
+        if manifest.dir_mtime_ns != _dir_mtime(manifest.directory):
+            manifest.rebuild()
+        else:
+            manifest.add(path)
+        _save(manifest)
+
+
+def latest_file(directory: PathLike, prefix: str, suffix: str = ".csv",
+                key_pattern: str = DATE_KEY) -> Optional[Path]:
+    """
+    The file with the newest key, or None if there is none.
+
+    Args:
+        directory: Directory to look in
+        prefix: File name prefix, e.g. "etf_pro_weekly_"
+        suffix: File name suffix (default ".csv")
+        key_pattern: Regex of the key (default: YYYY-MM-DD)
+    """
+    manifest = get_manifest(directory, prefix, suffix, key_pattern)
+    latest = manifest.latest()
+    if latest is not None and not latest.exists():
+        with _lock:
+            manifest.rebuild()
+            _save(manifest)
+        latest = manifest.latest()
+    return latest
+
+
+def clear_manifests() -> None:
+    """Drop the in-memory manifests (saved ones are revalidated on next use)."""
+    with _lock:
+        _manifests.clear()
@@ -9,6 +9,7 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, Optional
 from hedgeye.config_loader import load_config
+from hedgeye.ds.dir_manifest import latest_file
 from hedgeye.ds.fmp.price_fetcher import get_prices_for_symbols
 
 
@@ -17,17 +18,8 @@ def get_latest_etf_pro_file() -> Optional[Path]:
     config = load_config()
     csv_dir = Path(config["paths"]["etf_pro_csv_dir"])
 
-    if not csv_dir.exists():
-        return None
-
-    # Only get base CSV files (not enriched versions)
-    csv_files = [f for f in csv_dir.glob("etf_pro_weekly_*.csv")
-                 if "_enriched" not in f.name]
-    if not csv_files:
-        return None
-
-    # Sort by filename (which includes date) and get latest
-    return sorted(csv_files)[-1]
+    # Base CSV files only: the manifest does not list *_enriched.csv
+    return latest_file(csv_dir, "etf_pro_weekly_")
 
 
 def enrich_with_prices(df: pd.DataFrame) -> pd.DataFrame:
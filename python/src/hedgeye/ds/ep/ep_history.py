@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+History store for ETF Pro Plus (EP) weekly reports.
+
+All etf_pro_weekly_YYYY-MM-DD.csv snapshots are read once into one table
+indexed by (ticker, report_date). Weekly values are turned into daily trend
+bands with a vectorized as-of join (pd.merge_asof): each day takes the report
+published on or before it, and each ticker the row of that report (no band on
+days when the report in effect does not list the ticker).
+
+Only base weekly files are read (etf_pro_weekly_<date>_enriched.csv copies
+are skipped). When a start date is given, files older than the last report
+before the start are not read at all.
+
+Usage:
+    from hedgeye.ds.ep.ep_history import EPHistory
+
+    ep = EPHistory.load(start="2025-10-01")
+    ep.latest_tickers()                              # current portfolio
+    bands = ep.daily_bands(["BUXX", "AAAU"], start="2025-10-01")
+    buxx = ep.series("BUXX", start="2025-10-01")     # date, trend_low, trend_high, recent_price
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from hedgeye.config_loader import config_path
+from hedgeye.ds.dir_manifest import get_manifest
+from hedgeye.ds.file_cache import read_cached
+
+DateLike = Union[str, datetime, pd.Timestamp, np.datetime64]
+
+EP_FILE_PREFIX = "etf_pro_weekly_"
+
+VALUE_COLUMNS = ["trend_low", "trend_high", "recent_price"]
+HISTORY_COLUMNS = ["ticker", "report_date", "position_type", "description",
+                   "date_added", *VALUE_COLUMNS, "asset_class"]
+BAND_COLUMNS = ["date", "ticker", *VALUE_COLUMNS, "report_date"]
+
+
+def list_ep_files(csv_dir: Union[str, Path], start: Optional[DateLike] = None,
+                  end: Optional[DateLike] = None) -> List[Path]:
+    """
+    Base EP weekly CSVs needed to answer as-of queries in [start, end].
+
+    Keeps every report dated within the window plus the last report before
+    start (it is still in effect on start).
+
+    Returns:
+        Paths sorted by report date
+    """
+    manifest = get_manifest(csv_dir, EP_FILE_PREFIX)
+    dated = [(pd.Timestamp(key), manifest.path(key)) for key in manifest.keys()]
+
+    if end is not None:
+        end = pd.Timestamp(end)
+        dated = [(d, p) for d, p in dated if d <= end]
+    if start is not None:
+        start = pd.Timestamp(start)
+        before = [i for i, (d, _) in enumerate(dated) if d <= start]
+        if before:
+            dated = dated[before[-1]:]
+    return [p for _, p in dated]
+
+
+class EPHistory:
+    """
+    Read-only EP weekly history.
+
+    Attributes:
+        frame: One row per (ticker, report_date), sorted, with that MultiIndex
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Build the store from concatenated weekly rows.
+
+        Args:
+            frame: Rows with at least ticker, report_date and VALUE_COLUMNS
+        """
+        df = frame.copy()
+        df["report_date"] = pd.to_datetime(df["report_date"])
+        for col in VALUE_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        # A ticker listed twice in one report: the first row wins
+        df = df.drop_duplicates(["ticker", "report_date"], keep="first")
+        self.frame = df.set_index(["ticker", "report_date"]).sort_index()
+
+    @classmethod
+    def load(cls, csv_dir: Optional[Union[str, Path]] = None, start: Optional[DateLike] = None,
+             end: Optional[DateLike] = None) -> "EPHistory":
+        """
+        Read the EP weekly CSVs once.
+
+        Args:
+            csv_dir: EP CSV directory (default: config paths.etf_pro_csv_dir)
+            start: Earliest date that will be queried (older reports are pruned)
+            end: Latest date that will be queried
+
+        Returns:
+            EPHistory (empty if there are no files)
+        """
+        if csv_dir is None:
+            csv_dir = config_path("etf_pro_csv_dir")
+        files = list_ep_files(csv_dir, start, end)
+        frames = [read_cached(f, pd.read_csv) for f in files]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return cls(pd.DataFrame(columns=HISTORY_COLUMNS))
+        return cls(pd.concat(frames, ignore_index=True))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.frame.index.get_level_values("ticker")
+
+    @property
+    def report_dates(self) -> pd.DatetimeIndex:
+        """Distinct report dates, ascending."""
+        return self.frame.index.get_level_values("report_date").unique().sort_values()
+
+    def tickers(self) -> List[str]:
+        """All tickers ever listed (including ones since removed)."""
+        return sorted(self.frame.index.get_level_values("ticker").unique())
+
+    def snapshot(self, as_of: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Rows of the report in effect on a date (default: the latest report).
+
+        Returns:
+            DataFrame with a ticker column, or empty if no report precedes as_of
+        """
+        dates = self.report_dates
+        if as_of is not None:
+            dates = dates[dates <= pd.Timestamp(as_of)]
+        if dates.empty:
+            return self.frame.reset_index().iloc[0:0]
+        return self.frame.xs(dates[-1], level="report_date").reset_index()
+
+    def latest_tickers(self) -> List[str]:
+        """Tickers in the latest report (the current EP portfolio)."""
+        return sorted(self.snapshot()["ticker"].unique())
+
+    def daily_bands(self, tickers: Optional[Iterable[str]] = None,
+                    start: Optional[DateLike] = None,
+                    end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Daily trend bands via an as-of join of weekly reports onto a day grid.
+
+        Args:
+            tickers: Tickers to include (default: all)
+            start: First day (default: earliest report)
+            end: Last day (default: now)
+
+        Returns:
+            Long DataFrame with BAND_COLUMNS sorted by (ticker, date), one row
+            per day for each ticker with EP history. report_date is the report
+            in effect that day; values are NaN when that report does not
+            list the ticker (or before the first report).
+        """
+        history = self.frame.reset_index()
+        if tickers is not None:
+            history = history[history["ticker"].isin(list(tickers))]
+        if history.empty:
+            return pd.DataFrame(columns=BAND_COLUMNS)
+
+        start = pd.Timestamp(start) if start is not None else self.report_dates[0]
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.now())
+        days = pd.DataFrame({"date": pd.date_range(start=start, end=end, freq="D")})
+
+        # Report in effect on each day (as-of join), then that report's row per ticker
+        reports = pd.DataFrame({"report_date": self.report_dates})
+        effective = pd.merge_asof(days, reports, left_on="date", right_on="report_date",
+                                  direction="backward")
+        names = history["ticker"].unique()
+        grid = pd.DataFrame({
+            "ticker": np.repeat(names, len(effective)),
+            "date": np.tile(effective["date"].to_numpy(), len(names)),
+            "report_date": np.tile(effective["report_date"].to_numpy(), len(names)),
+        })
+        bands = grid.merge(history[["ticker", "report_date", *VALUE_COLUMNS]],
+                           on=["ticker", "report_date"], how="left")
+        return bands[BAND_COLUMNS]
+
+    def series(self, ticker: str, start: Optional[DateLike] = None,
+               end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Daily trend band for one ticker.
+
+        Returns:
+            DataFrame with columns date, trend_low, trend_high, recent_price
+            (empty if the ticker has no EP history)
+        """
+        bands = self.daily_bands([ticker], start=start, end=end)
+        return bands[["date", *VALUE_COLUMNS]]
@@ -10,10 +10,12 @@ import quopri
 import re
 from datetime import datetime
 from email import message_from_file
+from email.message import Message
 from pathlib import Path
 from typing import List, NamedTuple, Tuple
 
-from bs4 import BeautifulSoup
+from hedgeye.ds.dir_manifest import record_file
+from hedgeye.ds.record_batch import RecordBatch
 
 
 class EtfProPosition(NamedTuple):
@@ -28,6 +30,21 @@ class EtfProPosition(NamedTuple):
     asset_class: str
 
 
+EP_CSV_COLUMNS = ["report_date", "position_type", "ticker", "description", "date_added",
+                  "recent_price", "trend_low", "trend_high", "asset_class"]
+
+EP_POSITION_FIELDS = {
+    "position_type": "category",
+    "ticker": "object",
+    "description": "object",
+    "date_added": "object",
+    "recent_price": "float64",
+    "trend_low": "float64",
+    "trend_high": "float64",
+    "asset_class": "category",
+}
+
+
 def standardize_date(date_str: str) -> str:
     """Convert M/D/YYYY to YYYY-MM-DD format"""
     dt = datetime.strptime(date_str, "%m/%d/%Y")
@@ -51,8 +68,18 @@ def parse_eml(filepath: str) -> Tuple[str, List[EtfProPosition]]:
     with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
         msg = message_from_file(f)
 
+    return parse_message(msg)
+
+
+def parse_message(msg: Message) -> Tuple[str, List[EtfProPosition]]:
+    """
+    Parse an already-loaded ETF Pro Plus weekly email.
+
+    Returns:
+        (report_date, positions)
+    """
     # Extract report date from email Date header
-    date_str = msg.get('Date', '')
+    date_str = str(msg.get('Date', ''))
     # Parse date from format like: "Sun, 9 Nov 2025 15:39:04 -0500 (EST)"
     dt = datetime.strptime(date_str.split(',')[1].strip().split(' -')[0], "%d %b %Y %H:%M:%S")
     report_date = dt.strftime("%Y-%m-%d")
@@ -70,7 +97,8 @@ def parse_eml(filepath: str) -> Tuple[str, List[EtfProPosition]]:
     if not html_body:
         raise ValueError("No HTML body found in email")
 
-    # Parse HTML with BeautifulSoup
+    # Parse HTML with BeautifulSoup (imported here: bs4 is slow to import)
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_body, 'html.parser')
     
     # Find the ETF Pro table
@@ -161,18 +189,11 @@ def save_outputs(report_date: str, positions: List[EtfProPosition], output_dir:
         output_dir = config["paths"]["etf_pro_csv_dir"]
 
     output_path = Path(output_dir) / f"etf_pro_weekly_{report_date}.csv"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Write CSV
-    with open(output_path, 'w') as f:
-        # Header
-        f.write("report_date,position_type,ticker,description,date_added,recent_price,trend_low,trend_high,asset_class\n")
-
-        # Data rows
-        for pos in positions:
-            f.write(f"{report_date},{pos.position_type},{pos.ticker},{pos.description},"
-                   f"{pos.date_added},{pos.recent_price},{pos.trend_low},{pos.trend_high},"
-                   f'"{pos.asset_class}"\n')
+
+    # One bulk write from columns instead of one f-string per position
+    batch = RecordBatch.from_records(positions, EP_POSITION_FIELDS).with_column("report_date", report_date)
+    batch.write_csv(output_path, EP_CSV_COLUMNS)
+    record_file(output_path, "etf_pro_weekly_")
 
     print(f"✅ Saved {len(positions)} positions to {output_path}")
 
@@ -16,7 +16,10 @@ Usage:
 
 import re
 from pathlib import Path
-from hedgeye.config_loader import load_config
+from typing import Iterable, Optional, Tuple
+from hedgeye.config_loader import config_dir, load_config
+from hedgeye.ds import metrics
+from hedgeye.ds.dir_manifest import get_manifest
 from hedgeye.ds.ep.parse_etf_pro_weekly import parse_eml, save_outputs
 
 
@@ -37,9 +40,7 @@ def is_already_processed(eml_filename: str, csv_dir: Path) -> bool:
     # Standard format: etf_pro_weekly_YYYY-MM-DD.eml
     match = re.match(r'etf_pro_weekly_(\d{4}-\d{2}-\d{2})\.eml', eml_filename)
     if match:
-        date = match.group(1)
-        csv_path = csv_dir / f"etf_pro_weekly_{date}.csv"
-        return csv_path.exists()
+        return match.group(1) in get_manifest(csv_dir, "etf_pro_weekly_")
 
     # If filename doesn't match standard format, need to parse to check
     # For now, assume not processed
@@ -96,6 +97,8 @@ def process_single_email(eml_path: Path, csv_dir: Path) -> bool:
 
         # Save to CSV
         save_outputs(report_date, positions, str(csv_dir))
+        metrics.count("files")
+        metrics.count("rows", len(positions))
         print(f"  💾 Saved: etf_pro_weekly_{report_date}.csv")
 
         return True
@@ -105,6 +108,7 @@ def process_single_email(eml_path: Path, csv_dir: Path) -> bool:
         return False
 
 
+@metrics.span("ep.parse")
 def main():
     """Process all unprocessed ETF Pro Plus weekly emails"""
     config = load_config()
@@ -121,16 +125,31 @@ def main():
         return
 
     print(f"📂 Found {len(eml_files)} email files")
+    process_files(eml_files, csv_dir)
+
+
+def process_files(eml_files: Iterable[Path], csv_dir: Optional[Path] = None) -> Tuple[int, int]:
+    """
+    Process the given ETF Pro Plus emails, skipping ones already processed.
+
+    Args:
+        eml_files: .eml paths (e.g. new files reported by a directory watcher)
+        csv_dir: Output directory (default: config paths.etf_pro_csv_dir)
+
+    Returns:
+        (succeeded, failed) counts
+    """
+    csv_dir = csv_dir or config_dir("etf_pro_csv_dir")
 
     # Filter to unprocessed emails only
     unprocessed = [
-        eml for eml in eml_files
+        eml for eml in map(Path, eml_files)
         if not is_already_processed(eml.name, csv_dir)
     ]
 
     if not unprocessed:
         print("✅ All emails already processed")
-        return
+        return 0, 0
 
     print(f"🆕 {len(unprocessed)} unprocessed emails to handle")
 
@@ -150,6 +169,7 @@ def main():
     if fail_count > 0:
         print(f"❌ Failed: {fail_count}")
     print(f"{'='*60}")
+    return success_count, fail_count
 
 
 if __name__ == "__main__":
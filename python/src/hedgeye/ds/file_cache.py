@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+In-process cache of parsed data files.
+
+read_cached(path, loader) returns loader(path), reusing the previous result
+while the file's mtime and size are unchanged. A one-shot script gains
+nothing from it, but a long-running process (the pipeline daemon) re-reads
+only the daily CSVs that are new or changed since its last run instead of
+the whole history.
+
+Cached values are shared: callers must not modify them in place (or pass
+copy=True for DataFrames they are going to modify).
+
+Usage:
+    from hedgeye.ds.file_cache import read_cached
+    df = read_cached(path, read_rr_csv)
+    df = read_cached(path, pd.read_csv, copy=True)
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+MAX_ENTRIES = 4096
+
+# (loader, resolved path) -> (mtime_ns, size, value); least recently used first
+_entries: "OrderedDict[Tuple[Any, str], Tuple[int, int, Any]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def read_cached(path: Union[str, Path], loader: Callable[[Path], Any], copy: bool = False) -> Any:
+    """
+    loader(path), cached until the file changes.
+
+    Args:
+        path: File to read
+        loader: Function parsing the file (part of the cache key)
+        copy: Return value.copy() instead of the shared cached value
+
+    Returns:
+        The parsed value
+    """
+    path = Path(path)
+    st = path.stat()
+    key = (loader, str(path.resolve()))
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            value = entry[2]
+            return value.copy() if copy else value
+
+    value = loader(path)
+    with _lock:
+        _stats["misses"] += 1
+        _entries[key] = (st.st_mtime_ns, st.st_size, value)
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return value.copy() if copy else value
+
+
+def clear_file_cache() -> None:
+    """Drop every cached file."""
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0)
+
+
+def file_cache_stats() -> Dict[str, int]:
+    """Entries held, and hits/misses since the last clear."""
+    with _lock:
+        return {"entries": len(_entries), **_stats}
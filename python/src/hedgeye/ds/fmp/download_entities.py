@@ -16,15 +16,8 @@ import argparse
 import requests
 import pandas as pd
 import os
-from pathlib import Path
-from hedgeye.config_loader import load_config
+from hedgeye.config_loader import config_dir, config_path
 
-# Load configuration
-config = load_config()
-FMP_DATA_BASE_DIR = Path(config["paths"]["fmp_data_base_dir"])
-FMP_DATA_BASE_DIR.mkdir(parents=True, exist_ok=True)
-
-FMP_API_KEY = os.getenv("FMP_API_KEY")
 BASE_URL = "https://financialmodelingprep.com"
 
 # Define all available entities
@@ -50,7 +43,7 @@ ENTITIES = {
 
 def download_entity(version: str, entity_name: str, endpoint: str, filename: str):
     """Download a single entity"""
-    url = f"{BASE_URL}/{version}/{endpoint}?apikey={FMP_API_KEY}"
+    url = f"{BASE_URL}/{version}/{endpoint}?apikey={os.getenv('FMP_API_KEY')}"
     print(f"Downloading {entity_name} from {version}...")
     
     try:
@@ -59,7 +52,7 @@ def download_entity(version: str, entity_name: str, endpoint: str, filename: str
             data = response.json()
             if data and len(data) > 0:
                 df = pd.DataFrame(data)
-                output_file = FMP_DATA_BASE_DIR / filename
+                output_file = config_dir("fmp_data_base_dir") / filename
                 df.to_csv(output_file, index=False)
                 print(f"✅ {filename}: {len(data)} rows")
                 return True, len(data)
@@ -109,7 +102,7 @@ def main():
     args = parser.parse_args()
     
     print("FMP Entity Downloader")
-    print(f"Output directory: {FMP_DATA_BASE_DIR}")
+    print(f"Output directory: {config_path('fmp_data_base_dir')}")
     
     if args.entity:
         # Download specific entity from all available versions
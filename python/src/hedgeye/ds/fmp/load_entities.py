@@ -3,12 +3,7 @@
 # Functions to load FMP entity data from CSV files.
 
 import pandas as pd
-from pathlib import Path
-from hedgeye.config_loader import load_config
-
-# Load configuration
-config = load_config()
-FMP_DATA_BASE_DIR = Path(config["paths"]["fmp_data_base_dir"])
+from hedgeye.config_loader import config_path
 
 def load_fmp_entities(entity_name: str):
     """
@@ -25,7 +20,7 @@ def load_fmp_entities(entity_name: str):
         etfs = load_fmp_entities("etfs")
         cryptocurrencies = load_fmp_entities("cryptocurrencies")
     """
-    csv_file = FMP_DATA_BASE_DIR / f"{entity_name}.csv"
+    csv_file = config_path("fmp_data_base_dir") / f"{entity_name}.csv"
     if csv_file.exists():
         return pd.read_csv(csv_file)
     else:
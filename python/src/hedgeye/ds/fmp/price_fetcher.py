@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import os
 from pathlib import Path
+from hedgeye.ds import metrics
 from hedgeye.ds.yf.yahoo_fallback import get_yahoo_price, is_yahoo_fallback_symbol
 
 class FMPPriceFetcher:
@@ -83,6 +84,7 @@ class FMPPriceFetcher:
                 # Treasury rates use stable endpoint
                 url = "https://financialmodelingprep.com/stable/treasury-rates"
             
+            metrics.count("net_requests")
             response = self.session.get(url, params=params)
             response.raise_for_status()
             
@@ -164,6 +166,7 @@ class FMPPriceFetcher:
                 url = "https://financialmodelingprep.com/stable/treasury-rates"
                 # For treasury, we'll get current rates (historical treasury rates might not be available)
             
+            metrics.count("net_requests")
             response = self.session.get(url, params=params)
             response.raise_for_status()
             
@@ -300,6 +303,22 @@ class FMPPriceFetcher:
             
         return None
 
+_fetchers: Dict[Optional[str], FMPPriceFetcher] = {}
+
+
+def get_fetcher(api_key: Optional[str] = None) -> FMPPriceFetcher:
+    """
+    Process-wide FMPPriceFetcher per API key.
+
+    Reusing one fetcher reuses its requests.Session, so HTTP connections to
+    FMP stay open across calls (and across runs in the pipeline daemon).
+    """
+    fetcher = _fetchers.get(api_key)
+    if fetcher is None:
+        fetcher = _fetchers[api_key] = FMPPriceFetcher(api_key)
+    return fetcher
+
+
 # Convenience functions
 def get_latest_price(symbol: str, etype: str, api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
@@ -309,7 +328,7 @@ def get_latest_price(symbol: str, etype: str, api_key: Optional[str] = None) ->
         price = get_latest_price('AAPL', 'stocks')
         print(f"AAPL current price: ${price['price']}")
     """
-    fetcher = FMPPriceFetcher(api_key)
+    fetcher = get_fetcher(api_key)
     return fetcher.get_latest_price(symbol, etype)
 
 def get_historical_price(symbol: str, etype: str, date: str, api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -320,9 +339,10 @@ def get_historical_price(symbol: str, etype: str, date: str, api_key: Optional[s
         price = get_historical_price('AAPL', 'stocks', '2025-06-20')
         print(f"AAPL price on 2025-06-20: ${price['price']}")
     """
-    fetcher = FMPPriceFetcher(api_key)
+    fetcher = get_fetcher(api_key)
     return fetcher.get_historical_price(symbol, etype, date)
 
+@metrics.span("prices.fmp")
 def get_prices_for_symbols(symbols_df: pd.DataFrame, latest: bool = True, date: Optional[str] = None) -> pd.DataFrame:
     """
     Get prices for multiple symbols from mapping DataFrame.
@@ -335,7 +355,7 @@ def get_prices_for_symbols(symbols_df: pd.DataFrame, latest: bool = True, date:
     Returns:
         DataFrame with price information
     """
-    fetcher = FMPPriceFetcher()
+    fetcher = get_fetcher()
     results = []
     
     for _, row in symbols_df.iterrows():
@@ -351,6 +371,7 @@ def get_prices_for_symbols(symbols_df: pd.DataFrame, latest: bool = True, date:
             price_data = fetcher.get_historical_price(fmp_symbol, etype, date)
         
         if price_data:
+            metrics.count("rows")
             results.append({
                 'he_symbol': he_symbol,
                 'fmp_symbol': fmp_symbol,
@@ -6,6 +6,8 @@ from zoneinfo import ZoneInfo
 
 import requests
 
+from hedgeye.ds.dir_manifest import DATE_TIME_KEY, latest_file, record_file
+
 ETF_HOLDINGS_URL = "https://hedgeye.s3.us-east-1.amazonaws.com/ham/ETF_Holdings.csv"
 MOUNTAIN = ZoneInfo("America/Denver")
 
@@ -30,8 +32,7 @@ def _parse_last_modified(response: requests.Response):
 
 
 def _latest_saved(output_dir: Path) -> Path | None:
-    files = sorted(output_dir.glob("ham_holdings_*.csv"), key=lambda p: p.name)
-    return files[-1] if files else None
+    return latest_file(output_dir, "ham_holdings_", key_pattern=DATE_TIME_KEY)
 
 
 def download_etf_holdings(output_dir: Path) -> None:
@@ -65,6 +66,7 @@ def download_etf_holdings(output_dir: Path) -> None:
     dest = output_dir / f"ham_holdings_{date_str}_{time_str}.csv"
     dest.write_bytes(content)
     os.utime(dest, (mtime, mtime))
+    record_file(dest, "ham_holdings_", key_pattern=DATE_TIME_KEY)
 
     row_count = content.count(b"\n")
     print(f"Saved {dest.name} ({row_count} rows)  [{pub_mt.strftime('%Y-%m-%d %H:%M %Z')}]")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Bulk ingestion of Hedgeye newsletters from mbox / Maildir archives.
+
+Streams a mailbox one message at a time, classifies each message by subject
+and hands the raw message bytes to the matching parser in a worker process.
+No intermediate .eml copies are written; outputs go to the same CSV/markdown
+locations as the per-file pipelines:
+
+    Risk Range           "RISK RANGE™ SIGNALS: ..."          → csv_output_dir
+    ETF Pro Plus weekly  "ETF PRO PLUS - New Weekly Report"  → etf_pro_csv_dir
+    Portfolio Solutions  "Portfolio Solutions: ... (M/D/Y)"  → portfolio_solutions_csv_dir
+
+Memory stays bounded by the number of in-flight messages (2 x workers), not
+by archive size: only headers are parsed in the main process, and a new
+message is read only after an earlier one has finished.
+
+Messages whose report date can be read from the headers and whose output
+already exists are skipped without being parsed (unless force=True).
+
+Usage:
+    from hedgeye.ds.mailbox_ingest import ingest_mailbox
+    stats = ingest_mailbox("~/Downloads/hedgeye.mbox", workers=4)
+"""
+
+import contextlib
+import io
+import mailbox
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from email import policy
+from email.parser import BytesHeaderParser, BytesParser
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from hedgeye.config_loader import load_config
+
+KIND_RR = "rr"
+KIND_EP = "ep"
+KIND_PS = "ps"
+
+KIND_LABELS = {
+    KIND_RR: "Risk Range",
+    KIND_EP: "ETF Pro weekly",
+    KIND_PS: "Portfolio Solutions",
+}
+
+_EP_SUBJECT = re.compile(r"ETF\s+PRO\b.*\bWEEKLY", re.IGNORECASE)
+_PS_SUBJECT = re.compile(r"PORTFOLIO\s+SOLUTIONS", re.IGNORECASE)
+_RR_SUBJECT_DATE = re.compile(r"([A-Za-z]+ \d{1,2}, \d{4})")
+_PS_SUBJECT_DATE = re.compile(r"\((\d{1,2})[/_](\d{1,2})[/_](\d{4})\)")
+
+
+def classify_subject(subject: str, rr_prefix: str = "RISK RANGE") -> Optional[str]:
+    """
+    Classify a newsletter by its subject line.
+
+    Args:
+        subject: Decoded Subject header
+        rr_prefix: Risk Range subject prefix (config parsing.filename_prefix)
+
+    Returns:
+        KIND_RR, KIND_EP, KIND_PS, or None for unrelated messages
+    """
+    subject = (subject or "").strip()
+    if subject.upper().startswith(rr_prefix.upper()):
+        return KIND_RR
+    if _EP_SUBJECT.search(subject):
+        return KIND_EP
+    if _PS_SUBJECT.search(subject):
+        return KIND_PS
+    return None
+
+
+def report_date_hint(kind: str, subject: str, date_header: str) -> Optional[str]:
+    """
+    Report date (YYYY-MM-DD) derivable from headers alone, if any.
+
+    Mirrors the parsers: RR uses the date in the subject (same as the headline),
+    EP uses the Date header, PS uses the "(M/D/YYYY)" suffix of the subject.
+    """
+    try:
+        if kind == KIND_RR:
+            m = _RR_SUBJECT_DATE.search(subject)
+            if m:
+                return datetime.strptime(m.group(1).title(), "%B %d, %Y").strftime("%Y-%m-%d")
+        elif kind == KIND_EP:
+            if date_header:
+                return parsedate_to_datetime(date_header).strftime("%Y-%m-%d")
+        elif kind == KIND_PS:
+            m = _PS_SUBJECT_DATE.search(subject)
+            if m:
+                month, day, year = m.groups()
+                return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def get_output_dirs(config: Optional[dict] = None) -> Dict[str, Path]:
+    """CSV output directory for each message kind."""
+    config = config or load_config()
+    paths = config["paths"]
+    return {
+        KIND_RR: Path(paths["csv_output_dir"]),
+        KIND_EP: Path(paths["etf_pro_csv_dir"]),
+        KIND_PS: Path(paths["portfolio_solutions_csv_dir"]),
+    }
+
+
+def output_path(kind: str, report_date: str, output_dirs: Dict[str, Path]) -> Path:
+    """CSV written for a report (used to detect already-processed reports)."""
+    prefix = {KIND_RR: "risk_range", KIND_EP: "etf_pro_weekly", KIND_PS: "ps_daily"}[kind]
+    return output_dirs[kind] / f"{prefix}_{report_date}.csv"
+
+
+def open_mailbox(path: Union[str, Path]) -> mailbox.Mailbox:
+    """Open a Maildir (directory with cur/new) or an mbox file read-only."""
+    path = Path(path).expanduser()
+    if path.is_dir():
+        if not (path / "cur").is_dir() and not (path / "new").is_dir():
+            raise ValueError(f"{path} is a directory but not a Maildir (no cur/ or new/)")
+        return mailbox.Maildir(str(path), factory=None, create=False)
+    if not path.exists():
+        raise FileNotFoundError(path)
+    return mailbox.mbox(str(path), factory=None, create=False)
+
+
+def iter_message_bytes(box: mailbox.Mailbox) -> Iterator[bytes]:
+    """Yield raw messages one at a time (never the whole archive)."""
+    for key in box.iterkeys():
+        try:
+            yield box.get_bytes(key)
+        except (KeyError, OSError):
+            continue  # Maildir message moved/deleted while iterating
+
+
+def _ingest_message(kind: str, data: bytes, output_dirs: Dict[str, Path],
+                    force: bool) -> Tuple[str, Optional[str], str, str]:
+    """
+    Parse one message and save its outputs (runs in a worker process).
+
+    Returns:
+        (kind, report_date, status, log) with status "processed", "skipped"
+        or "failed"; log is the captured parser output
+    """
+    log = io.StringIO()
+    report_date = None
+    try:
+        with contextlib.redirect_stdout(log):
+            if kind == KIND_RR:
+                from hedgeye.ds.rr.parse_rr import parse_rr_batch
+                from hedgeye.ds.rr.parse_rr_eml import save_batch_outputs
+                batch = parse_rr_batch(data)
+                report_date = batch.report_date
+                if not force and output_path(kind, report_date, output_dirs).exists():
+                    return kind, report_date, "skipped", log.getvalue()
+                save_batch_outputs(batch)
+
+            elif kind == KIND_EP:
+                from hedgeye.ds.ep.parse_etf_pro_weekly import parse_message, save_outputs
+                msg = BytesParser(policy=policy.default).parsebytes(data)
+                report_date, positions = parse_message(msg)
+                if not force and output_path(kind, report_date, output_dirs).exists():
+                    return kind, report_date, "skipped", log.getvalue()
+                save_outputs(report_date, positions, str(output_dirs[kind]))
+
+            elif kind == KIND_PS:
+                from hedgeye.ds.ps.process_portfolio_solutions import (
+                    extract_date_from_subject, parse_message, process_html,
+                )
+                msg = BytesParser(policy=policy.default).parsebytes(data)
+                html_content, subject, _ = parse_message(msg)
+                if not html_content:
+                    raise ValueError("Could not extract HTML content")
+                report_date = extract_date_from_subject(str(subject))
+                if not force and output_path(kind, report_date, output_dirs).exists():
+                    return kind, report_date, "skipped", log.getvalue()
+                output_dirs[kind].mkdir(parents=True, exist_ok=True)
+                if not process_html(html_content, report_date, output_dirs[kind]):
+                    return kind, report_date, "failed", log.getvalue()
+
+            else:
+                raise ValueError(f"Unknown message kind: {kind}")
+
+    except Exception as e:
+        return kind, report_date, "failed", log.getvalue() + f"  ❌ Error: {e}\n"
+
+    return kind, report_date, "processed", log.getvalue()
+
+
+def ingest_mailbox(path: Union[str, Path], workers: Optional[int] = None,
+                   force: bool = False, dry_run: bool = False,
+                   verbose: bool = False) -> Dict[str, int]:
+    """
+    Stream an mbox/Maildir archive through the RR, EP and PS parsers.
+
+    Args:
+        path: mbox file or Maildir directory
+        workers: Parser processes (default: CPU count; 1 = parse in-process)
+        force: Re-parse reports whose CSV output already exists
+        dry_run: Classify and count messages without parsing or writing
+        verbose: Print each parser's output
+
+    Returns:
+        Counts: messages, ignored, processed, skipped, failed, plus one
+        count per kind (rr/ep/ps)
+    """
+    config = load_config()
+    rr_prefix = config.get("parsing", {}).get("filename_prefix", "RISK RANGE")
+    output_dirs = get_output_dirs(config)
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    stats = {"messages": 0, "ignored": 0, "processed": 0, "skipped": 0, "failed": 0,
+             KIND_RR: 0, KIND_EP: 0, KIND_PS: 0}
+    header_parser = BytesHeaderParser(policy=policy.default)
+
+    def record(result: Tuple[str, Optional[str], str, str]) -> None:
+        kind, report_date, status, log = result
+        stats[status] += 1
+        icon = {"processed": "✅", "skipped": "⏭️", "failed": "❌"}[status]
+        if status != "skipped" or verbose:
+            print(f"{icon} {KIND_LABELS[kind]} {report_date or '(unknown date)'}: {status}")
+        if log and (verbose or status == "failed"):
+            print(log.rstrip())
+
+    box = open_mailbox(path)
+    print(f"📬 Ingesting {path} ({'Maildir' if isinstance(box, mailbox.Maildir) else 'mbox'}, "
+          f"{workers} worker{'s' if workers != 1 else ''})")
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and not dry_run else None
+    pending: set[Future] = set()
+    try:
+        for data in iter_message_bytes(box):
+            stats["messages"] += 1
+            headers = header_parser.parsebytes(data)
+            subject = str(headers.get("subject", ""))
+            kind = classify_subject(subject, rr_prefix)
+            if kind is None:
+                stats["ignored"] += 1
+                continue
+            stats[kind] += 1
+
+            hint = report_date_hint(kind, subject, str(headers.get("date", "")))
+            if hint and not force and output_path(kind, hint, output_dirs).exists():
+                record((kind, hint, "skipped", ""))
+                continue
+            if dry_run:
+                print(f"🔎 {KIND_LABELS[kind]} {hint or '(date from body)'}: {subject}")
+                continue
+
+            if executor is None:
+                record(_ingest_message(kind, data, output_dirs, force))
+                continue
+
+            # Bound in-flight messages so memory does not grow with the archive
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+            pending.add(executor.submit(_ingest_message, kind, data, output_dirs, force))
+
+        for future in pending:
+            record(future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        box.close()
+
+    print(f"\n📊 {stats['messages']} messages: {stats[KIND_RR]} RR, {stats[KIND_EP]} EP, "
+          f"{stats[KIND_PS]} PS, {stats['ignored']} ignored")
+    print(f"   ✅ Processed: {stats['processed']}  ⏭️ Skipped: {stats['skipped']}  "
+          f"❌ Failed: {stats['failed']}")
+    return stats
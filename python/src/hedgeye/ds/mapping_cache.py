@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Compiled symbol mapping tables.
+
+The p-to-r mapping (p-to-r-mapping.yaml: portfolio symbol -> RR proxy) and
+the Hedgeye-to-FMP mapping (he_to_fmp.csv) are read by many stages, some
+of them once per ticker. Each table is compiled once into a CompiledMapping
+(the table as a DataFrame plus a dict index on its key column) and:
+
+- pickled to cache_dir/mappings, so other processes skip the YAML/CSV
+  parse. The pickle is reused while the source's mtime and size are
+  unchanged, or, if those changed, while its sha256 is (e.g. after a touch
+  or a checkout that rewrote the same content);
+- kept in memory (see file_cache), so repeated calls in one process cost a
+  stat of the source file.
+
+Per-ticker code should call resolve()/resolve_many() rather than filter
+the DataFrame.
+
+Usage:
+    from hedgeye.ds.mapping_cache import get_he_to_fmp_mapping, get_p_to_r_mapping
+    p_to_r = get_p_to_r_mapping()
+    p_to_r.resolve("AAAU")         # PToR(r_sym='GOLD', proxy_type='tight', inverted=False)
+    get_he_to_fmp_mapping().resolve_many(["SPX", "GOLD"])   # {symbol: FmpSymbol(etype, fmp_symbol)}
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Union
+
+import pandas as pd
+
+from hedgeye.config_loader import config_path, get_config
+from hedgeye.ds.file_cache import read_cached
+
+COMPILED_VERSION = 1
+CACHE_SUBDIR = "mappings"
+
+P_TO_R_COLUMNS = ['p_sym', 'r_sym', 'mapping_type', 'confidence', 'notes', 'proxy_type', 'inverted']
+HE_TO_FMP_COLUMNS = ['he_symbol', 'fmp_etype', 'fmp_symbol']
+
+
+class PToR(NamedTuple):
+    """RR proxy of a portfolio symbol (r_sym is "" when there is none)."""
+    r_sym: str
+    proxy_type: Optional[str]
+    inverted: bool
+
+
+class FmpSymbol(NamedTuple):
+    """FMP entity type ("stocks", "etfs", "indexes", ...) and symbol of a Hedgeye symbol."""
+    etype: str
+    fmp_symbol: str
+
+
+class CompiledMapping:
+    """
+    A mapping table and a dict index on its key column.
+
+    Attributes:
+        frame: The table (shared: do not modify it in place)
+        by_key: Key -> entry; the first row wins for duplicate keys
+        source: File the table was compiled from
+    """
+
+    def __init__(self, frame: pd.DataFrame, by_key: Dict[str, tuple], source: Path):
+        self.frame = frame
+        self.by_key = by_key
+        self.source = source
+
+    def resolve(self, key: str) -> Optional[Any]:
+        return self.by_key.get(key)
+
+    def resolve_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Entries of the keys that are mapped (unmapped keys are left out)."""
+        by_key = self.by_key
+        return {k: by_key[k] for k in keys if k in by_key}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.by_key
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+
+# --- Building ---
+
+def _na_to_none(value: Any) -> Any:
+    return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+
+
+def build_p_to_r_mapping(mapping_path: Path) -> CompiledMapping:
+    """Parse the p-to-r mapping (YAML, or CSV for older files) into a CompiledMapping."""
+    if mapping_path.suffix.lower() in ['.yaml', '.yml']:
+        import yaml
+
+        with open(mapping_path, 'r') as f:
+            mappings = (yaml.safe_load(f) or {}).get('mappings', [])
+        df = pd.DataFrame(mappings) if mappings else pd.DataFrame(columns=P_TO_R_COLUMNS)
+        for col in P_TO_R_COLUMNS:
+            if col not in df.columns:
+                df[col] = None
+    else:
+        df = pd.read_csv(mapping_path)
+        if 'inverted' not in df.columns:
+            df['inverted'] = False
+    df['r_sym'] = df['r_sym'].fillna('')
+    df['inverted'] = df['inverted'].fillna(False).astype(bool)
+
+    proxy_type = df['proxy_type'] if 'proxy_type' in df.columns else pd.Series(None, index=df.index)
+    by_key: Dict[str, PToR] = {}
+    for p_sym, r_sym, proxy, inverted in zip(df['p_sym'], df['r_sym'], proxy_type, df['inverted']):
+        if _na_to_none(p_sym) is not None and p_sym not in by_key:
+            by_key[p_sym] = PToR(str(r_sym), _na_to_none(proxy), bool(inverted))
+    return CompiledMapping(df, by_key, mapping_path)
+
+
+def build_he_to_fmp_mapping(mapping_path: Path) -> CompiledMapping:
+    """Parse he_to_fmp.csv into a CompiledMapping."""
+    df = pd.read_csv(mapping_path)
+    by_key: Dict[str, FmpSymbol] = {}
+    for he_symbol, etype, fmp_symbol in zip(df['he_symbol'], df['fmp_etype'], df['fmp_symbol']):
+        if _na_to_none(he_symbol) is not None and he_symbol not in by_key:
+            by_key[he_symbol] = FmpSymbol(_na_to_none(etype), _na_to_none(fmp_symbol))
+    return CompiledMapping(df, by_key, mapping_path)
+
+
+# --- On-disk cache ---
+
+def _cache_file(source: Path, kind: str) -> Optional[Path]:
+    cache_dir = get_config().paths.get("cache_dir")
+    if cache_dir is None:
+        return None
+    digest = hashlib.sha1(str(source.resolve()).encode()).hexdigest()[:12]
+    return cache_dir / CACHE_SUBDIR / f"{kind}_{digest}.pkl"
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _load_or_compile(source: Path, kind: str, builder: Callable[[Path], CompiledMapping]) -> CompiledMapping:
+    """The compiled table from the pickle cache if it is still valid, else built and saved."""
+    st = source.stat()
+    cache_file = _cache_file(source, kind)
+    digest = None
+    cached = None
+    if cache_file is not None and cache_file.exists():
+        try:
+            cached = pickle.loads(cache_file.read_bytes())
+        except Exception as e:  # truncated or written by an incompatible version
+            print(f"⚠️  Ignoring unreadable mapping cache {cache_file.name}: {e}")
+    if (isinstance(cached, dict) and cached.get("version") == COMPILED_VERSION
+            and cached.get("source") == str(source.resolve())):
+        if (cached["mtime_ns"], cached["size"]) == (st.st_mtime_ns, st.st_size):
+            return cached["value"]
+        digest = _sha256(source)
+        if digest == cached["sha256"]:
+            value = cached["value"]
+            _save(cache_file, source, st, digest, value)
+            return value
+
+    value = builder(source)
+    if cache_file is not None:
+        _save(cache_file, source, st, digest or _sha256(source), value)
+    return value
+
+
+def _save(cache_file: Path, source: Path, st: os.stat_result, digest: str, value: CompiledMapping) -> None:
+    data = {"version": COMPILED_VERSION, "source": str(source.resolve()), "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size, "sha256": digest, "value": value}
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"⚠️  Could not save mapping cache {cache_file}: {e}")
+
+
+# Module-level loaders: read_cached keys its in-memory cache on the loader
+def _compiled_p_to_r(path: Path) -> CompiledMapping:
+    return _load_or_compile(path, "p_to_r", build_p_to_r_mapping)
+
+
+def _compiled_he_to_fmp(path: Path) -> CompiledMapping:
+    return _load_or_compile(path, "he_to_fmp", build_he_to_fmp_mapping)
+
+
+# --- Public API ---
+
+def get_p_to_r_mapping(mapping_path: Optional[Union[str, Path]] = None) -> CompiledMapping:
+    """
+    The compiled p_sym -> PToR(r_sym, proxy_type, inverted) mapping.
+
+    Args:
+        mapping_path: Mapping file (default: config paths.p_to_r_mapping_file)
+
+    Raises:
+        FileNotFoundError: If the mapping file does not exist
+    """
+    return read_cached(Path(mapping_path or config_path("p_to_r_mapping_file")), _compiled_p_to_r)
+
+
+def get_he_to_fmp_mapping(mapping_path: Optional[Union[str, Path]] = None) -> CompiledMapping:
+    """
+    The compiled he_symbol -> FmpSymbol(etype, fmp_symbol) mapping.
+
+    Args:
+        mapping_path: Mapping file (default: config paths.fmp_mapping_file)
+
+    Raises:
+        FileNotFoundError: If the mapping file does not exist
+    """
+    return read_cached(Path(mapping_path or config_path("fmp_mapping_file")), _compiled_he_to_fmp)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Lightweight spans and counters for pipeline run reports.
+
+A span times one unit of work: wall time, CPU time, and the process's peak
+RSS when it ends. Spans nest (a stage span around a parser span around a
+price fetch); counters recorded inside a span are added to it and to every
+enclosing span, so a stage's totals include its children.
+
+Standard counters (shown in the summary table; any other name is allowed):
+    rows          rows parsed, merged or written
+    net_requests  HTTP / yfinance calls made
+    cache_hits    values served from a local cache
+    cache_misses  values that had to be fetched
+
+Spans from DAG worker processes are exported with export_spans() and merged
+into the parent run with merge_spans(), so one report covers the whole run.
+
+The JSON report goes to <repo>/data/logs/metrics/<run name>_<timestamp>.json:
+    {"version": 1, "run": "...", "started": "...", "argv": [...], "seconds": 12.3,
+     "totals": {"rows": 1234, ...},
+     "spans": [{"name": "...", "path": "a/b", "depth": 1, "wall_s": ..., "cpu_s": ...,
+                "peak_rss_mb": ..., "counters": {...}, "attrs": {...}, "ok": true}, ...]}
+
+Usage:
+    from hedgeye.ds import metrics
+
+    with metrics.span("merge_cr") as s:
+        df = merge(...)
+        s.count("rows", len(df))
+
+    @metrics.span("prices.daily")
+    def get_daily_prices(...):
+        metrics.count("cache_hits", len(cached))
+
+    metrics.print_metrics_summary()
+    metrics.write_run_report("run_both_pipelines")
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+REPORT_VERSION = 1
+SUMMARY_COUNTERS = ["rows", "net_requests", "cache_hits", "cache_misses"]
+
+
+@dataclass
+class SpanRecord:
+    """
+    One timed unit of work.
+
+    Attributes:
+        name: Span name (e.g. "parse_rr", "prices.daily")
+        path: Names of the enclosing spans and this one, joined by "/"
+        depth: Nesting level (0 = top level)
+        started: Start time (ISO, seconds)
+        wall_s: Elapsed wall-clock seconds
+        cpu_s: CPU seconds used by the process during the span
+        peak_rss_mb: Process peak resident set size at the end of the span
+        counters: Counts recorded in this span and its children
+        attrs: Free-form labels passed to span()
+        ok: False if the span exited with an exception
+    """
+    name: str
+    path: str
+    depth: int
+    started: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    counters: Dict[str, int] = field(default_factory=dict)
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    ok: bool = True
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add to a counter of this span and of every enclosing span."""
+        count(name, n)
+
+
+# Open spans of the current thread/context, innermost last
+_stack: contextvars.ContextVar[Tuple[SpanRecord, ...]] = contextvars.ContextVar("metrics_stack", default=())
+_lock = threading.Lock()
+_spans: List[SpanRecord] = []
+_run_started = datetime.now()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[SpanRecord]:
+    """
+    Time a block (or, as a decorator, every call of a function).
+
+    Args:
+        name: Span name
+        **attrs: Labels stored with the span (must be JSON-serializable)
+
+    Yields:
+        The SpanRecord, whose count() adds to its counters
+    """
+    parents = _stack.get()
+    record = SpanRecord(
+        name=name,
+        path="/".join([p.name for p in parents] + [name]),
+        depth=len(parents),
+        started=datetime.now().isoformat(timespec="seconds"),
+        attrs=dict(attrs),
+    )
+    token = _stack.set(parents + (record,))
+    with _lock:
+        _spans.append(record)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    except BaseException:
+        record.ok = False
+        raise
+    finally:
+        record.wall_s = round(time.perf_counter() - wall, 4)
+        record.cpu_s = round(time.process_time() - cpu, 4)
+        record.peak_rss_mb = peak_rss_mb()
+        _stack.reset(token)
+
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Add n to a counter of the innermost open span and all enclosing spans.
+
+    Outside any span this is a no-op, so library code can count unconditionally.
+    """
+    if not n:
+        return
+    with _lock:
+        for record in _stack.get():
+            record.counters[name] = record.counters.get(name, 0) + int(n)
+
+
+def reset_metrics() -> None:
+    """Drop recorded spans and restart the run clock (e.g. per worker task)."""
+    global _run_started
+    with _lock:
+        _spans.clear()
+        _run_started = datetime.now()
+
+
+def get_spans() -> List[SpanRecord]:
+    """Recorded spans, in the order they started."""
+    with _lock:
+        return list(_spans)
+
+
+def export_spans() -> List[dict]:
+    """Recorded spans as plain dicts (picklable, for returning from a worker)."""
+    return [asdict(r) for r in get_spans()]
+
+
+def merge_spans(records: List[dict]) -> None:
+    """Add spans exported by a worker process to this process's run."""
+    with _lock:
+        _spans.extend(SpanRecord(**r) for r in records)
+
+
+def run_totals(spans: Optional[List[SpanRecord]] = None) -> Dict[str, int]:
+    """Counter totals over top-level spans (children are already rolled up)."""
+    totals: Dict[str, int] = {}
+    for record in spans if spans is not None else get_spans():
+        if record.depth == 0:
+            for name, n in record.counters.items():
+                totals[name] = totals.get(name, 0) + n
+    return totals
+
+
+def get_metrics_dir() -> Path:
+    """<repo root>/data/logs/metrics (the repo root holds python/ and data/)."""
+    from hedgeye.config_loader import get_python_project_root
+    return get_python_project_root().parent / "data" / "logs" / "metrics"
+
+
+def build_run_report(run_name: str) -> Dict[str, Any]:
+    """The run report as a JSON-serializable dict."""
+    spans = get_spans()
+    return {
+        "version": REPORT_VERSION,
+        "run": run_name,
+        "started": _run_started.isoformat(timespec="seconds"),
+        "argv": sys.argv,
+        "pid": os.getpid(),
+        "seconds": round((datetime.now() - _run_started).total_seconds(), 3),
+        "peak_rss_mb": max((r.peak_rss_mb for r in spans if r.peak_rss_mb is not None), default=None),
+        "totals": run_totals(spans),
+        "spans": [asdict(r) for r in spans],
+    }
+
+
+def write_run_report(run_name: str, path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Write the JSON run report.
+
+    Args:
+        run_name: Report label (usually the script name)
+        path: Output file (default: get_metrics_dir()/<run_name>_<timestamp>.json)
+
+    Returns:
+        Path of the written report
+    """
+    report = build_run_report(run_name)
+    if path is None:
+        stamp = _run_started.strftime("%Y%m%d_%H%M%S")
+        path = get_metrics_dir() / f"{run_name}_{stamp}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, default=str))
+    return path
+
+
+def print_metrics_summary(spans: Optional[List[SpanRecord]] = None) -> None:
+    """Print one row per span: timings, peak RSS and the standard counters."""
+    spans = spans if spans is not None else get_spans()
+    if not spans:
+        return
+    headers = ["wall s", "cpu s", "rss MB", "rows", "net", "hits", "misses"]
+    width = max(24, max(len(r.name) + 2 * r.depth for r in spans) + 1)
+    print("\n⏱️  Run metrics")
+    print(f"   {'span':<{width}}" + "".join(f"{h:>9}" for h in headers))
+    for r in spans:
+        label = ("  " * r.depth + r.name + ("" if r.ok else " ❌"))[:width]
+        rss = f"{r.peak_rss_mb:.0f}" if r.peak_rss_mb is not None else "-"
+        cells = [f"{r.wall_s:.2f}", f"{r.cpu_s:.2f}", rss]
+        cells += [str(r.counters[c]) if c in r.counters else "-" for c in SUMMARY_COUNTERS]
+        print(f"   {label:<{width}}" + "".join(f"{c:>9}" for c in cells))
+    totals = run_totals(spans)
+    if totals:
+        print("   totals: " + ", ".join(f"{k}={v}" for k, v in sorted(totals.items())))
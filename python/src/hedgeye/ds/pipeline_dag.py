@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+The Hedgeye RR/EP/PS/CR pipelines as one incremental DAG.
+
+    parse_rr ──► combine_rr ──► rr_plots
+                     │
+    parse_ep ────────┼──► merge_cr ──► enrich_cr ──► cr_plots
+    parse_ps ────────┘
+
+- parse_*   inputs: raw .eml directory          outputs: daily CSV directory
+- combine_rr  inputs: daily RR CSVs              outputs: combined_risk_range.csv, trend timeline
+- merge_cr    inputs: combined RR, EP/PS CSVs, p-to-r mapping
+- enrich_cr, rr_plots, cr_plots also depend on live prices; their fingerprint
+  includes today's date, so they rerun at most once a day without new data
+
+The three parsers have no dependencies on each other and run concurrently.
+A run with no new emails skips every stage (see dag_runner). Each stage,
+and the parsers, merges and price fetches inside it, is recorded as a metrics
+span; with report_name set, a run report is written to data/logs/metrics.
+A Profiler (--profile in the scripts) profiles every stage that runs.
+
+parse_new_files() parses just the emails a directory watcher reported
+(see watcher and daemon) and marks those parse stages current, so the
+following DAG run does not list the raw directories again.
+
+Usage:
+    from hedgeye.ds.pipeline_dag import run_pipeline_dag
+    run_pipeline_dag()                             # everything that is out of date
+    run_pipeline_dag(targets=["merge_cr"])         # merge_cr and its upstream stages
+    run_pipeline_dag(force=True, workers=1)        # rerun all, sequentially
+    parse_new_files({"parse_rr": [new_eml]})       # then run_pipeline_dag()
+"""
+
+import importlib
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from hedgeye.config_loader import load_config
+from hedgeye.ds import metrics
+from hedgeye.ds.dag_runner import DagResult, DagRunner, Stage, fingerprint_stage, print_dag_summary
+from hedgeye.ds.profiling import Profiler
+
+STATE_FILE = "pipeline_dag_state.json"
+
+RR_STAGES = ["parse_rr", "combine_rr", "rr_plots"]
+CR_STAGES = ["parse_ep", "parse_ps", "merge_cr", "enrich_cr", "cr_plots"]
+
+# Parse stage -> (raw email directory key, module with process_files(eml_files))
+PARSE_STAGES = {
+    "parse_rr": ("raw_eml_dir", "hedgeye.ds.rr.run_rr_parser"),
+    "parse_ep": ("etf_pro_raw_eml_dir", "hedgeye.ds.ep.process_etf_pro_weekly"),
+    "parse_ps": ("portfolio_solutions_raw_eml_dir", "hedgeye.ds.ps.process_portfolio_solutions"),
+}
+
+
+# Stage functions: module-level so they can run in worker processes
+
+def _parse_rr() -> None:
+    from hedgeye.ds.rr.run_rr_parser import process_all_unprocessed
+    process_all_unprocessed()
+
+
+def _parse_ep() -> None:
+    from hedgeye.ds.ep.process_etf_pro_weekly import main as parse_ep
+    parse_ep()
+
+
+def _parse_ps() -> None:
+    from hedgeye.ds.ps.process_portfolio_solutions import main as parse_ps
+    parse_ps()
+
+
+def _combine_rr() -> None:
+    from hedgeye.ds.rr.rr_pipeline import run_rr_combine_step, run_rr_timeline_step
+    run_rr_combine_step()
+    run_rr_timeline_step()
+
+
+def _rr_plots(start_date: str) -> None:
+    from hedgeye.ds.rr.rr_pipeline import run_rr_enhanced_plots_step
+    run_rr_enhanced_plots_step(start_date=start_date)
+
+
+def _merge_cr() -> None:
+    from hedgeye.ds.cr.cr_merge_ranges import main as merge_cr
+    merge_cr()
+
+
+def _enrich_cr() -> None:
+    from hedgeye.ds.cr.cr_enrich_ranges import main as enrich_cr
+    enrich_cr()
+
+
+def _cr_plots(days_back: int) -> None:
+    from hedgeye.ds.cr.cr_time_series_plotting import generate_all_cr_time_series_plots
+    generate_all_cr_time_series_plots(days_back=days_back)
+
+
+def build_pipeline_stages(config: Optional[dict] = None, plot_days_back: int = 30,
+                          rr_plot_start: str = "2025-10-01") -> List[Stage]:
+    """
+    Declare every pipeline stage with its inputs, outputs and dependencies.
+
+    Args:
+        config: Loaded config (default: load_config())
+        plot_days_back: Days of history in CR plots
+        rr_plot_start: Earliest date in RR plots
+
+    Returns:
+        Stages in a valid run order
+    """
+    config = config or load_config()
+    paths = {k: Path(v) for k, v in config["paths"].items()}
+    combined = paths["combined_csv_output_dir"] / "combined_risk_range.csv"
+    ranges_dir = paths["ranges_base_dir"]
+    base_csv = ranges_dir / "base" / "position_ranges_base.csv"
+    enriched_csv = ranges_dir / "enriched" / "position_ranges_enriched.csv"
+    today = date.today().isoformat()
+
+    return [
+        Stage("parse_rr", _parse_rr,
+              inputs=[(paths["raw_eml_dir"], "*.eml")],
+              outputs=[paths["csv_output_dir"]],
+              description="Parse Risk Range emails"),
+        Stage("parse_ep", _parse_ep,
+              inputs=[(paths["etf_pro_raw_eml_dir"], "*.eml")],
+              outputs=[paths["etf_pro_csv_dir"]],
+              description="Parse ETF Pro Plus weekly emails"),
+        Stage("parse_ps", _parse_ps,
+              inputs=[(paths["portfolio_solutions_raw_eml_dir"], "*.eml")],
+              outputs=[paths["portfolio_solutions_csv_dir"]],
+              description="Parse Portfolio Solutions emails"),
+        Stage("combine_rr", _combine_rr,
+              inputs=[(paths["csv_output_dir"], "*.csv")],
+              outputs=[combined],
+              deps=["parse_rr"],
+              description="Combine daily RR CSVs and update the trend timeline"),
+        Stage("rr_plots", partial(_rr_plots, rr_plot_start),
+              inputs=[combined],
+              outputs=[paths["plots_output_dir"]],
+              deps=["combine_rr"],
+              params={"start_date": rr_plot_start, "as_of": today},
+              description="RR status and enhanced plots (latest FMP prices)"),
+        Stage("merge_cr", _merge_cr,
+              inputs=[combined, (paths["etf_pro_csv_dir"], "etf_pro_weekly_*.csv"),
+                      (paths["portfolio_solutions_csv_dir"], "ps_daily_*.csv"),
+                      paths["p_to_r_mapping_file"]],
+              outputs=[base_csv],
+              deps=["combine_rr", "parse_ep", "parse_ps"],
+              description="Merge EP, PS and RR position ranges"),
+        Stage("enrich_cr", _enrich_cr,
+              inputs=[base_csv],
+              outputs=[enriched_csv],
+              deps=["merge_cr"],
+              params={"as_of": today},
+              description="Enrich position ranges with current prices"),
+        Stage("cr_plots", partial(_cr_plots, plot_days_back),
+              inputs=[combined, (paths["etf_pro_csv_dir"], "etf_pro_weekly_*.csv"),
+                      paths["p_to_r_mapping_file"], enriched_csv],
+              outputs=[paths["cr_plots_dir"]],
+              deps=["enrich_cr"],
+              params={"days_back": plot_days_back, "as_of": today},
+              description="CR panel and time-series plots"),
+    ]
+
+
+def get_pipeline_runner(config: Optional[dict] = None, **stage_options) -> DagRunner:
+    """DagRunner over all pipeline stages, with state in cache_dir."""
+    config = config or load_config()
+    state_path = Path(config["paths"]["cache_dir"]) / STATE_FILE
+    return DagRunner(build_pipeline_stages(config, **stage_options), state_path)
+
+
+def parse_new_files(new_files: Dict[str, List[Path]],
+                    runner: Optional[DagRunner] = None) -> List[str]:
+    """
+    Parse just the given new emails.
+
+    A parse stage that was up to date before its new files arrived is marked
+    current afterwards, so the next DAG run skips it and runs only what is
+    downstream of the new CSVs. A stage that was already out of date is left
+    for the DAG run to process in full. The fingerprint recorded is the one
+    taken before parsing, so an email that lands meanwhile still makes the
+    next DAG run parse. Checking and fingerprinting list and stat the stage's
+    raw directory (twice per stage), but no other email is read.
+
+    Args:
+        new_files: Parse stage name (see PARSE_STAGES) -> new .eml files
+        runner: Pipeline runner (default: get_pipeline_runner())
+
+    Returns:
+        Names of the parse stages marked current
+    """
+    runner = runner or get_pipeline_runner()
+    state = runner.load_state()
+    current, fingerprints = [], {}
+    for name, files in new_files.items():
+        was_current = runner.is_current(name, state, exclude=files)
+        if was_current:
+            fingerprints[name] = fingerprint_stage(runner.stages[name])
+        module = importlib.import_module(PARSE_STAGES[name][1])
+        try:
+            with metrics.span(name, kind="stage"):
+                module.process_files(files)
+        except Exception as e:
+            print(f"❌ {name} failed on new files: {e}")
+            continue
+        if was_current:
+            current.append(name)
+    if current:
+        runner.mark_current(current, fingerprints)
+    return current
+
+
+def run_pipeline_dag(targets: Optional[Iterable[str]] = None, force: bool = False,
+                     workers: Optional[int] = None, dry_run: bool = False,
+                     skip: Iterable[str] = (), plot_days_back: int = 30,
+                     rr_plot_start: str = "2025-10-01",
+                     report_name: Optional[str] = None,
+                     profiler: Optional[Profiler] = None) -> DagResult:
+    """
+    Bring the selected pipeline stages up to date.
+
+    Args:
+        targets: Stage names to run, with their upstream stages (default: all)
+        force: Rerun stages even if their inputs are unchanged
+        workers: Concurrent stage processes (default: one per stage; 1 = sequential)
+        dry_run: Only report which stages would run
+        skip: Stages to leave alone (treated as done)
+        plot_days_back: Days of history in CR plots
+        rr_plot_start: Earliest date in RR plots
+        report_name: If set, print the metrics summary and write a JSON run
+            report named after it (not for dry runs)
+        profiler: Profile each stage that runs, then print its hot functions
+
+    Returns:
+        DagResult with per-stage outcomes
+    """
+    runner = get_pipeline_runner(plot_days_back=plot_days_back, rr_plot_start=rr_plot_start)
+    result = runner.run(targets=targets, force=force, workers=workers, dry_run=dry_run, skip=skip,
+                        profiler=profiler)
+    print_dag_summary(result)
+    if profiler is not None:
+        profiler.print_report()
+    if report_name and not dry_run:
+        metrics.print_metrics_summary()
+        print(f"📝 Run report: {metrics.write_run_report(report_name)}")
+    return result
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for rendered plots.
+
+Each PlotJob gets a fingerprint: a sha256 over its renderer name, input
+arrays (dtype, shape and bytes), metadata, savefig arguments and the plotting
+code version. Each output directory keeps a manifest mapping PNG file names to
+the fingerprint they were rendered from:
+
+    <plots dir>/.plot_manifest.json
+    {"version": 1, "plots": {"SPX.png": "3f2a...", ...}}
+
+A job whose PNG exists and whose fingerprint matches the manifest is skipped.
+
+Usage:
+    from hedgeye.ds.plots.plot_cache import PlotManifest, fingerprint_job
+    manifest = PlotManifest.load(output_dir)
+    if manifest.is_current(job.out_path, fingerprint_job(job)): ...
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+MANIFEST_NAME = ".plot_manifest.json"
+MANIFEST_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def plot_code_version() -> str:
+    """
+    Version tag for the drawing code.
+
+    Changes whenever renderers.py is edited or matplotlib is upgraded, so
+    every plot is re-rendered after a styling change.
+    """
+    import matplotlib
+    from hedgeye.ds.plots import renderers
+
+    source = Path(renderers.__file__).read_bytes()
+    return hashlib.sha256(source + matplotlib.__version__.encode()).hexdigest()[:16]
+
+
+def fingerprint_job(job) -> str:
+    """
+    Fingerprint a PlotJob's inputs.
+
+    Args:
+        job: PlotJob (renderer, arrays, meta, savefig_kwargs)
+
+    Returns:
+        Hex sha256 digest
+    """
+    h = hashlib.sha256()
+    h.update(plot_code_version().encode())
+    h.update(job.renderer.encode())
+    for key in sorted(job.arrays):
+        arr = np.ascontiguousarray(job.arrays[key])
+        h.update(f"{key}|{arr.dtype.str}|{arr.shape}".encode())
+        h.update(arr.tobytes())
+    h.update(json.dumps(job.meta, sort_keys=True, default=str).encode())
+    h.update(json.dumps(job.savefig_kwargs, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class PlotManifest:
+    """PNG file name -> fingerprint map for one output directory."""
+
+    def __init__(self, directory: Path, plots: Dict[str, str]):
+        self.directory = Path(directory)
+        self.plots = plots
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "PlotManifest":
+        """Load the manifest for a directory (empty if missing or unreadable)."""
+        path = Path(directory) / MANIFEST_NAME
+        plots: Dict[str, str] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if data.get("version") == MANIFEST_VERSION:
+                    plots = dict(data.get("plots", {}))
+            except (OSError, ValueError):
+                plots = {}
+        return cls(Path(directory), plots)
+
+    def is_current(self, out_path: Union[str, Path], fingerprint: str) -> bool:
+        """True if out_path exists and was rendered from this fingerprint."""
+        out_path = Path(out_path)
+        return self.plots.get(out_path.name) == fingerprint and out_path.exists()
+
+    def record(self, out_path: Union[str, Path], fingerprint: str) -> None:
+        self.plots[Path(out_path).name] = fingerprint
+
+    def forget(self, out_path: Union[str, Path]) -> None:
+        self.plots.pop(Path(out_path).name, None)
+
+    def save(self) -> None:
+        """Write the manifest atomically, dropping entries whose PNG is gone."""
+        self.plots = {
+            name: fp for name, fp in self.plots.items()
+            if (self.directory / name).exists()
+        }
+        path = self.directory / MANIFEST_NAME
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(
+            {"version": MANIFEST_VERSION, "plots": dict(sorted(self.plots.items()))},
+            indent=1
+        ))
+        tmp_path.replace(path)
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Parallel, headless rendering of RR and CR plots.
+
+Plot generation is split in two:
+1. The caller precomputes each plot's data in the parent process (loading,
+   price lookups, range translation) and wraps it in a PlotJob: a few numpy
+   arrays plus scalar metadata.
+2. render_jobs() draws and saves the PNGs on a process pool using the Agg
+   backend.
+
+All job arrays are packed into a single shared memory block; jobs sent to
+workers carry only (offset, dtype, shape) descriptors, so nothing bigger than
+a few hundred bytes is pickled per plot. Worker memory stays bounded: workers
+import only the renderers module, close every figure after saving, and are
+replaced after about `max_tasks_per_worker` plots.
+
+Small batches (or render_workers <= 1) are drawn in-process instead. Jobs
+whose inputs are unchanged since their PNG was written are skipped (see
+plot_cache).
+
+Config (hedgeye.yaml, optional):
+    plotting:
+      render_workers: 4           # default: min(cpu_count, 8)
+      max_tasks_per_worker: 50
+
+Usage:
+    from hedgeye.ds.plots.render_engine import PlotJob, render_jobs
+    jobs = [PlotJob("rr_basic", out_path, label="SPX", arrays={...}, meta={...})]
+    result = render_jobs(jobs)
+    print(result.successful, result.failed)
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from hedgeye.ds.plots.plot_cache import PlotManifest, fingerprint_job
+
+# Below this many jobs, spinning up a pool costs more than it saves
+MIN_PARALLEL_JOBS = 4
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_TASKS_PER_WORKER = 50
+
+# (key, dtype string, shape, byte offset) for each array of a job
+ArraySpec = Tuple[str, str, Tuple[int, ...], int]
+
+
+@dataclass
+class PlotJob:
+    """
+    One plot to render.
+
+    Attributes:
+        renderer: Name of a function in renderers.RENDERERS
+        out_path: PNG path to write
+        label: Name used in progress and failure messages
+        arrays: Numeric data for the renderer (datetime64 / float64)
+        meta: Small scalar metadata for the renderer (title, symbol, ...)
+        savefig_kwargs: Extra arguments for Figure.savefig (dpi, bbox_inches)
+    """
+    renderer: str
+    out_path: Path
+    label: str
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+    savefig_kwargs: Dict[str, Any] = field(default_factory=lambda: {"dpi": 150})
+
+
+@dataclass
+class RenderResult:
+    """
+    Counts and failures from a render_jobs() call.
+
+    successful includes plots skipped because their cached PNG was current
+    (also counted in cached).
+    """
+    successful: int = 0
+    failed: int = 0
+    cached: int = 0
+    failed_list: List[Dict[str, str]] = field(default_factory=list)
+    saved: List[str] = field(default_factory=list)
+
+
+def _use_agg() -> None:
+    """Select the headless Agg backend (must run before pyplot is imported)."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _draw_and_save(renderer: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any],
+                   out_path: str, savefig_kwargs: Dict[str, Any]) -> None:
+    """Draw one figure, save it and release it."""
+    import matplotlib.pyplot as plt
+    from hedgeye.ds.plots.renderers import RENDERERS
+
+    fig = RENDERERS[renderer](arrays, meta)
+    try:
+        fig.savefig(out_path, **savefig_kwargs)
+    finally:
+        plt.close(fig)
+
+
+# ---------------------------------------------------------------------------
+# Shared memory packing
+# ---------------------------------------------------------------------------
+
+def _pack_arrays(jobs: List[PlotJob]) -> Tuple[Optional[shared_memory.SharedMemory], List[List[ArraySpec]]]:
+    """
+    Copy every job's arrays into one shared memory block.
+
+    Returns:
+        (shared memory block or None if there is no data, per-job array specs)
+    """
+    specs: List[List[ArraySpec]] = []
+    total = 0
+    for job in jobs:
+        job_specs = []
+        for key, arr in job.arrays.items():
+            arr = np.ascontiguousarray(arr)
+            job.arrays[key] = arr
+            total = (total + 7) & ~7  # keep every array 8-byte aligned
+            job_specs.append((key, arr.dtype.str, arr.shape, total))
+            total += arr.nbytes
+        specs.append(job_specs)
+
+    if total == 0:
+        return None, specs
+
+    shm = shared_memory.SharedMemory(create=True, size=total)
+    for job, job_specs in zip(jobs, specs):
+        for key, dtype, shape, offset in job_specs:
+            arr = job.arrays[key]
+            view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            view[...] = arr
+            del view
+    return shm, specs
+
+
+# Per-worker attachment to the parent's shared memory block
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _worker_init(shm_name: Optional[str]) -> None:
+    """Process pool initializer: headless backend + attach shared data."""
+    global _worker_shm
+    _use_agg()
+    if shm_name is not None:
+        _worker_shm = shared_memory.SharedMemory(name=shm_name)
+
+
+def _worker_render(renderer: str, specs: List[ArraySpec], meta: Dict[str, Any],
+                   out_path: str, savefig_kwargs: Dict[str, Any]) -> str:
+    """Render one job inside a worker process."""
+    arrays = {}
+    for key, dtype, shape, offset in specs:
+        view = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf, offset=offset)
+        arrays[key] = view.copy()  # small; avoids holding exports on the block
+        del view
+    _draw_and_save(renderer, arrays, meta, out_path, savefig_kwargs)
+    return out_path
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def get_render_settings() -> Tuple[int, int]:
+    """
+    Read worker settings from the plotting section of hedgeye.yaml.
+
+    Returns:
+        (render_workers, max_tasks_per_worker)
+    """
+    from hedgeye.config_loader import get_config
+
+    plotting = get_config().section("plotting")
+    workers = plotting.get("render_workers", min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS))
+    max_tasks = plotting.get("max_tasks_per_worker", DEFAULT_MAX_TASKS_PER_WORKER)
+    return int(workers), int(max_tasks)
+
+
+def arrays_from_frame(df, columns: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Extract plot arrays from a DataFrame.
+
+    'date' becomes datetime64[ns]; every other column becomes float64 with
+    NaN for missing values.
+    """
+    arrays = {}
+    for col in columns:
+        if col == "date":
+            arrays[col] = df[col].to_numpy(dtype="datetime64[ns]")
+        else:
+            arrays[col] = df[col].to_numpy(dtype="float64", na_value=np.nan)
+    return arrays
+
+
+def _render_serial(jobs: List[PlotJob], result: RenderResult) -> None:
+    """Render jobs in the current process."""
+    for job in jobs:
+        try:
+            _draw_and_save(job.renderer, job.arrays, job.meta, str(job.out_path), job.savefig_kwargs)
+            print(f"✅ Saved: {job.out_path}")
+            result.successful += 1
+            result.saved.append(str(job.out_path))
+        except Exception as e:
+            print(f"❌ Failed to create plot for {job.label}: {e}")
+            result.failed += 1
+            result.failed_list.append({"label": job.label, "error": str(e)})
+
+
+def _render_parallel(jobs: List[PlotJob], result: RenderResult,
+                     workers: int, max_tasks: int) -> None:
+    """
+    Render jobs on spawn-based process pools fed from shared memory.
+
+    Workers are recycled by running jobs in waves of workers * max_tasks,
+    each on a fresh pool. (ProcessPoolExecutor's own max_tasks_per_child can
+    deadlock on some Python versions when a recycled worker is replaced.)
+    """
+    shm, specs = _pack_arrays(jobs)
+    ctx = multiprocessing.get_context("spawn")
+    wave_size = workers * max_tasks if max_tasks else len(jobs)
+    try:
+        for wave_start in range(0, len(jobs), wave_size):
+            wave = range(wave_start, min(wave_start + wave_size, len(jobs)))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=ctx,
+                initializer=_worker_init,
+                initargs=(shm.name if shm is not None else None,),
+            ) as pool:
+                futures = {
+                    pool.submit(_worker_render, jobs[i].renderer, specs[i], jobs[i].meta,
+                                str(jobs[i].out_path), jobs[i].savefig_kwargs): jobs[i]
+                    for i in wave
+                }
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        future.result()
+                        print(f"✅ Saved: {job.out_path}")
+                        result.successful += 1
+                        result.saved.append(str(job.out_path))
+                    except Exception as e:
+                        print(f"❌ Failed to create plot for {job.label}: {e}")
+                        result.failed += 1
+                        result.failed_list.append({"label": job.label, "error": str(e)})
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+def render_jobs(jobs: List[PlotJob], workers: Optional[int] = None,
+                max_tasks_per_worker: Optional[int] = None,
+                use_cache: bool = True) -> RenderResult:
+    """
+    Render plot jobs to PNG files, in parallel when worthwhile.
+
+    Args:
+        jobs: Precomputed plot jobs
+        workers: Worker processes (default: plotting.render_workers from config)
+        max_tasks_per_worker: Plots per worker before it is replaced
+            (default: plotting.max_tasks_per_worker from config)
+        use_cache: Skip jobs whose PNG was already rendered from identical
+            inputs (see plot_cache); set False to force re-rendering
+
+    Returns:
+        RenderResult with success/failure counts
+    """
+    result = RenderResult()
+    if not jobs:
+        return result
+
+    for job in jobs:
+        Path(job.out_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # Drop jobs whose PNG is current
+    manifests: Dict[Path, PlotManifest] = {}
+    fingerprints: Dict[str, str] = {}
+    if use_cache:
+        pending = []
+        for job in jobs:
+            directory = Path(job.out_path).parent
+            if directory not in manifests:
+                manifests[directory] = PlotManifest.load(directory)
+            fingerprint = fingerprint_job(job)
+            if manifests[directory].is_current(job.out_path, fingerprint):
+                result.cached += 1
+                result.successful += 1
+            else:
+                fingerprints[str(job.out_path)] = fingerprint
+                pending.append(job)
+        if result.cached:
+            print(f"♻️  {result.cached} plots unchanged since last render (skipped)")
+        jobs = pending
+
+    if jobs:
+        if workers is None or max_tasks_per_worker is None:
+            cfg_workers, cfg_max_tasks = get_render_settings()
+            workers = cfg_workers if workers is None else workers
+            max_tasks_per_worker = cfg_max_tasks if max_tasks_per_worker is None else max_tasks_per_worker
+
+        workers = max(1, min(workers, len(jobs)))
+
+        if workers <= 1 or len(jobs) < MIN_PARALLEL_JOBS:
+            _render_serial(jobs, result)
+        else:
+            print(f"🎨 Rendering {len(jobs)} plots on {workers} worker processes...")
+            _render_parallel(jobs, result, workers, max_tasks_per_worker)
+
+    if use_cache:
+        saved = set(result.saved)
+        for job in jobs:
+            out_path = str(job.out_path)
+            manifest = manifests[Path(out_path).parent]
+            if out_path in saved:
+                manifest.record(out_path, fingerprints[out_path])
+            else:
+                manifest.forget(out_path)
+        for manifest in manifests.values():
+            manifest.save()
+
+    return result
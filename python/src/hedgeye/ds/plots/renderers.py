@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Pure drawing functions for RR and CR plots.
+
+Each renderer takes precomputed numpy arrays plus a small dict of scalar
+metadata and returns a matplotlib Figure. Renderers never load files or fetch
+prices, so they can run in render-engine worker processes (which import only
+this module) as well as interactively.
+
+Arrays:
+    Dates are datetime64 arrays; price arrays are float64 with NaN for gaps.
+
+Usage:
+    from hedgeye.ds.plots.renderers import draw_rr_basic
+    fig = draw_rr_basic(arrays, {"title": "Risk Range Time Series: SPX"})
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict
+
+import numpy as np
+
+if TYPE_CHECKING:  # pyplot is imported when drawing (it is slow to import)
+    import matplotlib.pyplot as plt
+
+Arrays = Dict[str, np.ndarray]
+Renderer = Callable[[Arrays, Dict[str, Any]], "plt.Figure"]
+
+
+def draw_rr_basic(arrays: Arrays, meta: Dict[str, Any]) -> "plt.Figure":
+    """
+    Simple risk range plot: prev close with buy/sell trade levels.
+
+    Args:
+        arrays: date, prev_close, buy_trade, sell_trade
+        meta: title
+    """
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.plot(arrays["date"], arrays["prev_close"], label="Prev Close", color="black")
+    ax.plot(arrays["date"], arrays["buy_trade"], label="Buy Trade", color="green")
+    ax.plot(arrays["date"], arrays["sell_trade"], label="Sell Trade", color="red")
+
+    ax.set_title(meta["title"])
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price")
+    ax.legend()
+
+    return fig
+
+
+def draw_rr_enhanced(arrays: Arrays, meta: Dict[str, Any]) -> "plt.Figure":
+    """
+    Risk range plot with the latest market price and in-range status.
+
+    Args:
+        arrays: date, prev_close, buy_trade, sell_trade
+        meta: display_symbol, latest_price (float or None), latest_date
+    """
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    dates = arrays["date"]
+    prev_close = arrays["prev_close"]
+    buy_trade = arrays["buy_trade"]
+    sell_trade = arrays["sell_trade"]
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    ax.plot(dates, prev_close, label="Prev Close", color="black", linewidth=2)
+    ax.plot(dates, buy_trade, label="Buy Trade", color="green", linewidth=1.5, linestyle="--")
+    ax.plot(dates, sell_trade, label="Sell Trade", color="red", linewidth=1.5, linestyle="--")
+
+    latest_price = meta.get("latest_price")
+    if latest_price is not None:
+        latest_date = meta["latest_date"]
+
+        ax.scatter(latest_date, latest_price,
+                   color="blue", s=100, zorder=5,
+                   label=f"Latest Price: ${latest_price:.2f}")
+
+        # Connect latest price to most recent prev_close
+        if len(dates) > 0:
+            ax.plot([dates[-1], latest_date], [prev_close[-1], latest_price],
+                    color="blue", linewidth=2, alpha=0.7)
+
+        ax.annotate(f"${latest_price:.2f}",
+                    xy=(latest_date, latest_price),
+                    xytext=(10, 10), textcoords="offset points",
+                    bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.7),
+                    fontsize=10, fontweight="bold")
+
+        # Show if price is in risk range
+        if len(dates) > 0:
+            if latest_price <= buy_trade[-1]:
+                status = "🟢 AT/BELOW BUY RANGE"
+                status_color = "green"
+            elif latest_price >= sell_trade[-1]:
+                status = "🔴 AT/ABOVE SELL RANGE"
+                status_color = "red"
+            else:
+                status = "🟡 IN RANGE"
+                status_color = "orange"
+
+            ax.text(0.02, 0.98, status, transform=ax.transAxes,
+                    fontsize=12, fontweight="bold", color=status_color,
+                    verticalalignment="top",
+                    bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+
+    ax.set_title(f"Risk Range Time Series: {meta['display_symbol']}", fontsize=16, fontweight="bold")
+    ax.set_xlabel("Date", fontsize=12)
+    ax.set_ylabel("Price", fontsize=12)
+    ax.legend(loc="upper left")
+    ax.grid(True, alpha=0.3)
+
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=1))
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+
+    fig.tight_layout()
+    return fig
+
+
+def _fill_band(ax, dates: np.ndarray, low: np.ndarray, high: np.ndarray,
+               color: str, label: str) -> None:
+    """Shade a low/high band on the dates where both bounds are known."""
+    mask = ~np.isnan(low) & ~np.isnan(high)
+    if not mask.any():
+        return
+    ax.fill_between(dates[mask], low[mask], high[mask], alpha=0.2, color=color, label=label)
+    ax.plot(dates[mask], low[mask], color=color, linestyle='--', linewidth=1.5, alpha=0.7, label='')
+    ax.plot(dates[mask], high[mask], color=color, linestyle='--', linewidth=1.5, alpha=0.7, label='')
+
+
+def draw_cr_time_series(arrays: Arrays, meta: Dict[str, Any]) -> "plt.Figure":
+    """
+    Combo ranges plot: EP trend band, translated RR trade band and price.
+
+    Args:
+        arrays: date, trend_low, trend_high, p_trade_low, p_trade_high, price
+        meta: p_sym, days_back
+    """
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    dates = arrays["date"]
+
+    fig, ax = plt.subplots(figsize=(16, 10))
+
+    _fill_band(ax, dates, arrays["trend_low"], arrays["trend_high"], 'blue', 'Trend Range')
+    _fill_band(ax, dates, arrays["p_trade_low"], arrays["p_trade_high"], 'green', 'Trade Range')
+
+    price = arrays["price"]
+    price_mask = ~np.isnan(price)
+    if price_mask.any():
+        ax.plot(dates[price_mask], price[price_mask],
+                color='black', linewidth=2, label='Price', marker='o', markersize=3)
+
+    ax.set_title(f"Combo Ranges Time Series: {meta['p_sym']} (Last {meta['days_back']} Days)",
+                 fontsize=16, fontweight='bold')
+    ax.set_xlabel("Date", fontsize=12)
+    ax.set_ylabel("Price ($)", fontsize=12)
+    ax.legend(loc='best', fontsize=10)
+    ax.grid(True, alpha=0.3)
+
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    # Weekly ticks. (WeekdayLocator(interval=7) steps 7 days *and* requires a
+    # Monday, so dateutil scans to year 9999 whenever the range starts mid-week:
+    # seconds per plot, usually with no ticks at all.)
+    ax.xaxis.set_major_locator(mdates.WeekdayLocator(byweekday=mdates.MO))
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+    fig.tight_layout()
+    return fig
+
+
+# Renderer names used in PlotJob.renderer
+RENDERERS: Dict[str, Renderer] = {
+    "rr_basic": draw_rr_basic,
+    "rr_enhanced": draw_rr_enhanced,
+    "cr_time_series": draw_cr_time_series,
+}
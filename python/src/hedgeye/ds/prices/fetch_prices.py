@@ -11,6 +11,7 @@ Usage:
     prices = fetch_current_prices(['AAAU', 'QQQ', 'GOLD'])
 """
 
+import importlib.util
 import os
 import json
 import requests
@@ -18,28 +19,24 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List
-from hedgeye.config_loader import load_config
-from hedgeye.ds.fmp.price_fetcher import FMPPriceFetcher
+from hedgeye.config_loader import config_dir, config_path
+from hedgeye.ds import metrics
+from hedgeye.ds.fmp.price_fetcher import get_fetcher
+from hedgeye.ds.mapping_cache import get_he_to_fmp_mapping
+from hedgeye.ds.symbol_resolver import get_symbol_resolver
 from hedgeye.ds.prices.price_utils import (
     should_cache_today,
 )
 
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
+# Imported where used (yfinance is slow to import)
+YFINANCE_AVAILABLE = importlib.util.find_spec("yfinance") is not None
 
 
 def get_cache_path() -> Path:
     """Get path to daily price cache file."""
-    config = load_config()
-    cache_dir = Path(config["paths"]["cache_dir"])
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
     # Use today's date in cache filename
     today = datetime.now().strftime("%Y-%m-%d")
-    return cache_dir / f"prices_{today}.json"
+    return config_dir("cache_dir") / f"prices_{today}.json"
 
 
 def load_price_cache(include_today: bool = None) -> Dict[str, float]:
@@ -81,15 +78,14 @@ def save_price_cache(prices: Dict[str, float]):
 
 
 def load_he_to_fmp_mapping() -> pd.DataFrame:
-    """Load the Hedgeye to FMP symbol mappings."""
-    config = load_config()
-    fmp_path = Path(config["paths"]["fmp_mapping_file"])
+    """Load the Hedgeye to FMP symbol mappings (compiled once, see mapping_cache)."""
+    fmp_path = config_path("fmp_mapping_file")
 
     if not fmp_path.exists():
         print(f"  ⚠️  FMP mapping file not found: {fmp_path}")
         return pd.DataFrame(columns=['he_symbol', 'fmp_etype', 'fmp_symbol'])
 
-    return pd.read_csv(fmp_path)
+    return get_he_to_fmp_mapping(fmp_path).frame.copy()
 
 
 def fetch_from_fmp_with_mapping(symbols: List[str]) -> Dict[str, float]:
@@ -102,27 +98,23 @@ def fetch_from_fmp_with_mapping(symbols: List[str]) -> Dict[str, float]:
     Returns:
         Dictionary mapping symbol to current price
     """
-    # Load mapping
-    mapping_df = load_he_to_fmp_mapping()
-
-    if mapping_df.empty:
+    fmp_path = config_path("fmp_mapping_file")
+    if not fmp_path.exists():
+        print(f"  ⚠️  FMP mapping file not found: {fmp_path}")
         return {}
 
-    # Filter to requested symbols
-    symbols_to_fetch = mapping_df[mapping_df['he_symbol'].isin(symbols)]
+    # Requested symbols that are mapped (exact or canonical form, see symbol_resolver)
+    resolved = get_symbol_resolver().resolve_many(symbols)
+    symbols_to_fetch = {s: info.fmp for s, info in resolved.items() if info.fmp is not None}
 
-    if symbols_to_fetch.empty:
+    if not symbols_to_fetch:
         return {}
 
-    # Fetch prices using FMPPriceFetcher
-    fetcher = FMPPriceFetcher()
+    # Fetch prices using the shared FMPPriceFetcher (pooled connections)
+    fetcher = get_fetcher()
     prices = {}
 
-    for _, row in symbols_to_fetch.iterrows():
-        he_symbol = row['he_symbol']
-        fmp_symbol = row['fmp_symbol']
-        etype = row['fmp_etype']
-
+    for he_symbol, (etype, fmp_symbol) in symbols_to_fetch.items():
         try:
             price_data = fetcher.get_latest_price(fmp_symbol, etype)
             if price_data and 'price' in price_data:
@@ -162,6 +154,7 @@ def fetch_from_fmp(symbols: List[str]) -> Dict[str, float]:
         params = {'apikey': api_key}
 
         try:
+            metrics.count("net_requests")
             response = requests.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
@@ -192,12 +185,15 @@ def fetch_from_yfinance(symbols: List[str]) -> Dict[str, float]:
     if not YFINANCE_AVAILABLE:
         print("  ⚠️  yfinance not installed - pip install yfinance")
         return {}
+    import yfinance as yf
 
     prices = {}
+    resolver = get_symbol_resolver()
 
     for symbol in symbols:
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(resolver.yahoo(symbol) or symbol)
+            metrics.count("net_requests")
             # Get most recent price
             hist = ticker.history(period="1d")
             if not hist.empty:
@@ -209,6 +205,7 @@ def fetch_from_yfinance(symbols: List[str]) -> Dict[str, float]:
     return prices
 
 
+@metrics.span("prices.current")
 def fetch_current_prices(symbols: List[str], use_cache: bool = True) -> Dict[str, float]:
     """
     Fetch current prices for a list of symbols.
@@ -239,6 +236,8 @@ def fetch_current_prices(symbols: List[str], use_cache: bool = True) -> Dict[str
 
     # Identify symbols not in cache
     symbols_to_fetch = [s for s in symbols if s not in cached_prices]
+    metrics.count("cache_hits", len(symbols) - len(symbols_to_fetch))
+    metrics.count("cache_misses", len(symbols_to_fetch))
 
     if symbols_to_fetch:
         print(f"  📊 Fetching prices for {len(symbols_to_fetch)} symbols...")
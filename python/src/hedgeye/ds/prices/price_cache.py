@@ -18,8 +18,9 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List
-import yfinance as yf
-from hedgeye.config_loader import load_config
+from hedgeye.config_loader import config_dir
+from hedgeye.ds import metrics
+from hedgeye.ds.file_cache import read_cached
 from hedgeye.ds.prices.price_utils import (
     should_cache_today,
 )
@@ -27,10 +28,7 @@ from hedgeye.ds.prices.price_utils import (
 
 def get_cache_path() -> Path:
     """Get path to price cache CSV file."""
-    config = load_config()
-    cache_dir = Path(config["paths"]["cache_dir"])
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir / "daily_prices_cache.csv"
+    return config_dir("cache_dir") / "daily_prices_cache.csv"
 
 
 def get_today_date() -> datetime:
@@ -38,13 +36,17 @@ def get_today_date() -> datetime:
     return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
 
+def _read_cache_csv(cache_path: Path) -> pd.DataFrame:
+    df = pd.read_csv(cache_path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
 def load_cache() -> pd.DataFrame:
-    """Load price cache from CSV."""
+    """Load price cache from CSV (kept in memory until the file changes)."""
     cache_path = get_cache_path()
     if cache_path.exists():
-        df = pd.read_csv(cache_path)
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+        return read_cached(cache_path, _read_cache_csv, copy=True)
     return pd.DataFrame(columns=['date', 'ticker', 'price'])
 
 
@@ -69,11 +71,13 @@ def fetch_prices_from_yfinance_batch(tickers: List[str], start_date: datetime, e
     Returns:
         DataFrame with columns: date, ticker, price
     """
+    import yfinance as yf
     results = []
 
     try:
         # Batch download with threading (much faster!)
         print(f"  ⚡ Batch fetching {len(tickers)} tickers...")
+        metrics.count("net_requests")
         data = yf.download(
             tickers,
             start=start_date,
@@ -162,11 +166,13 @@ def fetch_prices_from_yfinance_sequential(tickers: List[str], start_date: dateti
     Returns:
         DataFrame with columns: date, ticker, price
     """
+    import yfinance as yf
     results = []
 
     for ticker in tickers:
         try:
             yf_ticker = yf.Ticker(ticker)
+            metrics.count("net_requests")
             hist = yf_ticker.history(start=start_date, end=end_date)
 
             if hist.empty:
@@ -202,6 +208,7 @@ def fetch_prices_from_yfinance_sequential(tickers: List[str], start_date: dateti
 fetch_prices_from_yfinance = fetch_prices_from_yfinance_batch
 
 
+@metrics.span("prices.daily")
 def get_daily_prices(tickers: List[str], start_date: datetime, end_date: datetime, 
                      use_cache: bool = True) -> pd.DataFrame:
     """
@@ -253,10 +260,13 @@ def get_daily_prices(tickers: List[str], start_date: datetime, end_date: datetim
             missing = merged[merged['price'].isna()][['date', 'ticker']].copy()
             
             print(f"  Cache: {len(cached)} prices found, {len(missing)} missing")
+            metrics.count("cache_hits", len(cached))
+            metrics.count("cache_misses", len(missing))
         else:
             cached = pd.DataFrame(columns=['date', 'ticker', 'price'])
             missing = needed.copy()
             print(f"  Cache: empty, fetching {len(missing)} prices")
+            metrics.count("cache_misses", len(missing))
     else:
         cached = pd.DataFrame(columns=['date', 'ticker', 'price'])
         missing = needed
@@ -10,7 +10,6 @@ This module provides common logic for:
 
 from datetime import datetime
 from typing import Optional
-import pytz
 
 
 def is_market_closed_et(check_date: Optional[datetime] = None) -> bool:
@@ -31,6 +30,7 @@ def is_market_closed_et(check_date: Optional[datetime] = None) -> bool:
     Returns:
         True if markets are closed (safe to cache), False otherwise
     """
+    import pytz
     et_tz = pytz.timezone('US/Eastern')
     if check_date is None:
         now_et = datetime.now(et_tz)
@@ -60,6 +60,8 @@ def is_weekend_date(date: datetime) -> bool:
     Returns:
         True if weekend, False otherwise
     """
+    import pytz
+
     # Convert to ET for consistency
     et_tz = pytz.timezone('US/Eastern')
     if date.tzinfo is None:
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Per-stage profiling for pipeline scripts (--profile).
+
+Each stage is profiled with cProfile. With --profile py-spy, a py-spy
+flame graph of the stage is also recorded (py-spy must be on PATH and
+allowed to attach to the process). Output goes to a timestamped directory
+next to the logs:
+
+    <repo>/data/logs/profiles/<script>_<YYYYmmdd_HHMMSS>/
+        <stage>.prof    cProfile stats (snakeviz / pstats)
+        <stage>.txt     pstats listing, sorted by cumulative time
+        <stage>.svg     py-spy flame graph (--profile py-spy only)
+
+After the run the hottest functions of every stage are printed. Stages
+run by the DAG runner are profiled inside their worker process.
+
+Usage:
+    from hedgeye.ds.profiling import Profiler, add_profile_argument
+
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profiler = Profiler.start("portfolio_report", args.profile)  # disabled if None
+
+    with profiler.stage("parse_fidelity"):
+        positions = parse_fidelity_csv(path)
+    profiler.print_report()
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import re
+import shutil
+import signal
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+PROFILE_MODES = ["cprofile", "py-spy"]
+TOP_FUNCTIONS = 15
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """Add --profile [cprofile|py-spy] to a script's argument parser."""
+    parser.add_argument(
+        "--profile", nargs="?", const="cprofile", default=None, choices=PROFILE_MODES,
+        help="Profile each stage into data/logs/profiles/ and print the hot functions "
+             "(py-spy: also record a flame graph)",
+    )
+
+
+def get_profiles_dir() -> Path:
+    """<repo root>/data/logs/profiles (the repo root holds python/ and data/)."""
+    from hedgeye.config_loader import get_python_project_root
+    return get_python_project_root().parent / "data" / "logs" / "profiles"
+
+
+def _stage_filename(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+@contextlib.contextmanager
+def _py_spy(pid: int, svg_path: Path) -> Iterator[None]:
+    """Record a py-spy flame graph of a process for the duration of the block."""
+    exe = shutil.which("py-spy")
+    if exe is None:
+        print("  ⚠️  py-spy not found on PATH - cProfile only")
+        yield
+        return
+    proc = subprocess.Popen(
+        [exe, "record", "--pid", str(pid), "--output", str(svg_path),
+         "--format", "flamegraph", "--nonblocking"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        yield
+    finally:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGINT)  # py-spy writes the graph on SIGINT
+        try:
+            _, err = proc.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            _, err = proc.communicate()
+        if not svg_path.exists():
+            detail = err.decode(errors="replace").strip().splitlines()[-1:] if err else []
+            print(f"  ⚠️  py-spy wrote no flame graph{': ' + detail[0] if detail else ''}")
+
+
+@dataclass
+class Profiler:
+    """
+    Profiles named stages into one output directory.
+
+    Attributes:
+        out_dir: Directory for this run's profiles (None = profiling disabled)
+        mode: "cprofile" or "py-spy"
+    """
+    out_dir: Optional[Path] = None
+    mode: str = "cprofile"
+
+    @classmethod
+    def start(cls, script_name: str, mode: Optional[str]) -> "Profiler":
+        """
+        Profiler for one script run.
+
+        Args:
+            script_name: Prefix of the output directory
+            mode: Value of --profile (None disables profiling)
+
+        Returns:
+            Profiler writing to get_profiles_dir()/<script_name>_<timestamp>
+        """
+        if mode is None:
+            return cls()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out_dir = get_profiles_dir() / f"{script_name}_{stamp}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        print(f"🔬 Profiling ({mode}) into {out_dir}")
+        return cls(out_dir, mode)
+
+    @property
+    def enabled(self) -> bool:
+        return self.out_dir is not None
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile a block as one stage (no-op when disabled)."""
+        if not self.enabled:
+            yield
+            return
+        base = self.out_dir / _stage_filename(name)
+        spy = (_py_spy(os.getpid(), base.with_suffix(".svg")) if self.mode == "py-spy"
+               else contextlib.nullcontext())
+        prof = cProfile.Profile()
+        try:
+            with spy:
+                prof.enable()
+                try:
+                    yield
+                finally:
+                    prof.disable()
+        finally:  # a failing stage is still worth profiling
+            prof.dump_stats(base.with_suffix(".prof"))
+            listing = io.StringIO()
+            pstats.Stats(prof, stream=listing).sort_stats("cumulative").print_stats(60)
+            base.with_suffix(".txt").write_text(listing.getvalue())
+
+    def stage_files(self) -> List[Path]:
+        """.prof files written so far (including by worker processes), oldest first."""
+        if not self.enabled:
+            return []
+        return sorted(self.out_dir.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+
+    def print_report(self, top: int = TOP_FUNCTIONS) -> None:
+        """Print the hottest functions of every profiled stage."""
+        if not self.enabled:
+            return
+        for path in self.stage_files():
+            print_hot_functions(path, title=path.stem, top=top)
+        print(f"\n🔬 Profiles: {self.out_dir}")
+
+
+def hot_functions(stats: pstats.Stats, top: int = TOP_FUNCTIONS) -> List[Tuple[int, float, float, str]]:
+    """
+    Functions with the most self time.
+
+    Returns:
+        (calls, self seconds, cumulative seconds, "file:line(function)") tuples
+    """
+    rows = []
+    for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        where = func if filename == "~" else f"{Path(filename).name}:{line}({func})"
+        rows.append((ncalls, tottime, cumtime, where))
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return rows[:top]
+
+
+def print_hot_functions(prof_path: Path, title: Optional[str] = None, top: int = TOP_FUNCTIONS) -> None:
+    """Print the top functions by self time from a .prof file."""
+    stats = pstats.Stats(str(prof_path), stream=io.StringIO())
+    print(f"\n🔥 {title or prof_path.stem}: top {top} by self time ({stats.total_tt:.2f}s profiled)")
+    print(f"   {'calls':>9} {'self s':>8} {'cum s':>8}  function")
+    for ncalls, tottime, cumtime, where in hot_functions(stats, top):
+        print(f"   {ncalls:>9} {tottime:>8.3f} {cumtime:>8.3f}  {where}")
@@ -19,11 +19,17 @@ import re
 from pathlib import Path
 from datetime import datetime
 from email import policy
+from email.message import EmailMessage
 from email.parser import BytesParser
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
 import pandas as pd
 
-from hedgeye.config_loader import load_config
+from hedgeye.config_loader import config_dir, load_config
+from hedgeye.ds.dir_manifest import get_manifest, record_file
+from hedgeye.ds import metrics
+
+if TYPE_CHECKING:  # bs4 is imported when parsing (it is slow to import)
+    from bs4 import BeautifulSoup
 
 
 def parse_eml_file(eml_path: Path) -> tuple[str, str, str]:
@@ -36,6 +42,16 @@ def parse_eml_file(eml_path: Path) -> tuple[str, str, str]:
     with open(eml_path, 'rb') as f:
         msg = BytesParser(policy=policy.default).parse(f)
 
+    return parse_message(msg)
+
+
+def parse_message(msg: EmailMessage) -> tuple[str, str, str]:
+    """
+    Extract HTML content from an already-loaded email message.
+
+    Returns:
+        Tuple of (html_content, subject, date_str)
+    """
     subject = msg.get('subject', 'Unknown')
     date_str = msg.get('date', '')
 
@@ -70,7 +86,7 @@ def extract_date_from_subject(subject: str) -> str:
     return datetime.now().strftime('%Y-%m-%d')
 
 
-def parse_portfolio_rankings_table(soup: BeautifulSoup) -> list[dict]:
+def parse_portfolio_rankings_table(soup: "BeautifulSoup") -> list[dict]:
     """
     Parse Portfolio Solutions rankings from comma-separated list with <abbr> tags.
 
@@ -136,23 +152,20 @@ def is_already_processed(eml_filename: str, csv_dir: Path) -> bool:
     # Try standard format first: ps_daily_YYYY-MM-DD.eml
     match = re.match(r'ps_daily_(\d{4}-\d{2}-\d{2})\.eml', eml_filename)
     if match:
-        date = match.group(1)
-        csv_path = csv_dir / f"ps_daily_{date}.csv"
-        return csv_path.exists()
+        return match.group(1) in get_manifest(csv_dir, "ps_daily_")
 
     # Try original format: (MM_DD_YYYY) or (MM/DD/YYYY)
     match = re.search(r'\((\d{1,2})[/_](\d{1,2})[/_](\d{4})\)', eml_filename)
     if match:
         month, day, year = match.groups()
         date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-        csv_path = csv_dir / f"ps_daily_{date}.csv"
-        return csv_path.exists()
+        return date in get_manifest(csv_dir, "ps_daily_")
 
     # Can't determine date from filename
     return False
 
 
-def extract_keiths_commentary(soup: BeautifulSoup) -> str:
+def extract_keiths_commentary(soup: "BeautifulSoup") -> str:
     """
     Extract Keith's daily commentary/moves from the email.
 
@@ -261,6 +274,7 @@ def save_to_csv(rankings: list[dict], report_date: str, csv_dir: Path) -> Path:
     # Save to CSV
     csv_path = csv_dir / f"ps_daily_{report_date}.csv"
     df.to_csv(csv_path, index=False)
+    record_file(csv_path, "ps_daily_")
 
     return csv_path
 
@@ -287,6 +301,18 @@ def process_single_email(eml_path: Path, csv_dir: Path) -> bool:
     # Rename file if needed
     eml_path = rename_if_needed(eml_path, report_date)
 
+    return process_html(html_content, report_date, csv_dir)
+
+
+def process_html(html_content: str, report_date: str, csv_dir: Path) -> bool:
+    """
+    Extract rankings and commentary from a Portfolio Solutions email body and save them.
+
+    Returns:
+        True if processing succeeded, False otherwise
+    """
+    from bs4 import BeautifulSoup
+
     # Parse HTML
     soup = BeautifulSoup(html_content, 'html.parser')
 
@@ -308,10 +334,13 @@ def process_single_email(eml_path: Path, csv_dir: Path) -> bool:
 
     md_path = save_commentary(commentary, report_date, csv_dir)
     print(f"  💾 Saved commentary: {md_path.name}")
+    metrics.count("files")
+    metrics.count("rows", len(rankings))
 
     return True
 
 
+@metrics.span("ps.parse")
 def main():
     """Process all unprocessed Portfolio Solutions emails"""
     config = load_config()
@@ -328,16 +357,31 @@ def main():
         return
 
     print(f"📂 Found {len(eml_files)} email files")
+    process_files(eml_files, csv_dir)
+
+
+def process_files(eml_files: Iterable[Path], csv_dir: Optional[Path] = None) -> Tuple[int, int]:
+    """
+    Process the given Portfolio Solutions emails, skipping ones already processed.
+
+    Args:
+        eml_files: .eml paths (e.g. new files reported by a directory watcher)
+        csv_dir: Output directory (default: config paths.portfolio_solutions_csv_dir)
+
+    Returns:
+        (succeeded, failed) counts
+    """
+    csv_dir = csv_dir or config_dir("portfolio_solutions_csv_dir")
 
     # Filter to unprocessed emails only
     unprocessed = [
-        eml for eml in eml_files
+        eml for eml in map(Path, eml_files)
         if not is_already_processed(eml.name, csv_dir)
     ]
 
     if not unprocessed:
         print("✅ All emails already processed")
-        return
+        return 0, 0
 
     print(f"🆕 {len(unprocessed)} unprocessed emails to handle")
 
@@ -361,6 +405,7 @@ def main():
     if fail_count > 0:
         print(f"❌ Failed: {fail_count}")
     print(f"{'='*60}")
+    return success_count, fail_count
 
 
 if __name__ == '__main__':
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Struct-of-arrays container for parsed records.
+
+A RecordBatch holds one report's parse output column by column: numeric
+fields as numpy arrays, repeated strings (symbols, trends, buckets, position
+types) as dictionary-encoded columns (small int codes + a category tuple).
+Compared to one dataclass/NamedTuple per row this is a handful of
+allocations per batch, and the columns go straight to:
+- pandas:  to_pandas() wraps the arrays without copying (codes become
+           Categoricals via from_codes)
+- Arrow:   to_arrow() (categoricals become dictionary arrays; needs pyarrow)
+- disk:    write_csv() / write_parquet() in one bulk call
+
+Usage:
+    from hedgeye.ds.record_batch import RecordBatch
+    batch = RecordBatch.from_records(entries, {"index": "category", "buy_trade": "float64"})
+    batch.write_csv(path)
+"""
+
+import csv
+import importlib.util
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Imported where used (pyarrow is slow to import and most batches only go to CSV)
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class DictColumn(NamedTuple):
+    """Dictionary-encoded column: codes index into categories (-1 = missing)."""
+    codes: np.ndarray
+    categories: tuple
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def to_pandas(self) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.codes, categories=list(self.categories))
+
+
+Column = Union[np.ndarray, DictColumn]
+
+# Field spec: dtype name, CategoricalDtype, or (dtype, converter) where the
+# converter maps each raw attribute value (e.g. an Enum to its .name)
+FieldSpec = Union[str, pd.CategoricalDtype, tuple]
+
+
+class RecordBatch:
+    """Named, equal-length columns (numpy arrays or DictColumns)."""
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Dict[str, Column]):
+        lengths = {len(col) for col in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {lengths}")
+        self.columns = columns
+
+    @classmethod
+    def from_records(cls, records: Sequence[Any], fields: Dict[str, FieldSpec]) -> "RecordBatch":
+        """
+        Build columns from attribute-style records (dataclasses, NamedTuples).
+
+        Args:
+            records: Sequence of records
+            fields: Column name → dtype, CategoricalDtype or (dtype, converter)
+
+        Returns:
+            RecordBatch with one column per field
+        """
+        columns = {}
+        for name, spec in fields.items():
+            convert: Optional[Callable[[Any], Any]] = None
+            if isinstance(spec, tuple):
+                spec, convert = spec
+            values = map(attrgetter(name), records)
+            if convert is not None:
+                values = map(convert, values)
+            columns[name] = _make_column(values, spec, len(records))
+        return cls(columns)
+
+    @classmethod
+    def from_columns(cls, data: Dict[str, Iterable[Any]], fields: Dict[str, FieldSpec]) -> "RecordBatch":
+        """Build a batch from per-column value sequences (e.g. parser output)."""
+        columns = {}
+        for name, spec in fields.items():
+            values = data[name]
+            if isinstance(spec, tuple):
+                spec, convert = spec
+                values = map(convert, values)
+            values = list(values)
+            columns[name] = _make_column(values, spec, len(values))
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def with_column(self, name: str, value: Any) -> "RecordBatch":
+        """Add a column, broadcasting a scalar to the batch length."""
+        if np.ndim(value) == 0:
+            value = DictColumn(np.zeros(len(self), dtype=np.int8), (value,))
+        return RecordBatch({**self.columns, name: value})
+
+    def iter_rows(self, columns: Optional[List[str]] = None) -> Iterator[tuple]:
+        """Row tuples of plain Python values (missing values as "")."""
+        names = columns or self.names
+        return zip(*(_plain_values(self.columns[name]) for name in names))
+
+    def to_pandas(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """DataFrame view of the batch (numeric arrays are not copied)."""
+        names = columns or self.names
+        data = {}
+        for name in names:
+            col = self.columns[name]
+            data[name] = col.to_pandas() if isinstance(col, DictColumn) else col
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self, columns: Optional[List[str]] = None) -> "pa.Table":
+        """pyarrow Table; categoricals become dictionary-encoded arrays."""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for to_arrow(); install with: uv add pyarrow")
+        import pyarrow as pa
+
+        names = columns or self.names
+        arrays = []
+        for name in names:
+            col = self.columns[name]
+            if isinstance(col, DictColumn):
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(col.codes, mask=col.codes < 0),
+                    pa.array(list(col.categories), type=pa.string()),
+                ))
+            else:
+                arrays.append(pa.array(col, from_pandas=True))
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def write_csv(self, path: Union[str, Path], columns: Optional[List[str]] = None) -> Path:
+        """Write the batch as CSV in one call (missing values as empty fields)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        names = columns or self.names
+        # csv.writer over decoded rows: far cheaper than DataFrame.to_csv for
+        # the small (tens of rows) daily files this is used for
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(self.iter_rows(names))
+        return path
+
+    def write_parquet(self, path: Union[str, Path], columns: Optional[List[str]] = None) -> Path:
+        """Write the batch as Parquet (needs pyarrow)."""
+        table = self.to_arrow(columns)
+        import pyarrow.parquet as pq
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, path)
+        return path
+
+
+def _encode(values: Iterable[Any], categories: Optional[Sequence[Any]], count: int) -> DictColumn:
+    """Dictionary-encode values; None/NaN → -1. Fixed categories reject unknowns."""
+    fixed = categories is not None
+    lookup = {c: i for i, c in enumerate(categories)} if fixed else {}
+    codes = np.empty(count, dtype=np.int8 if fixed and len(lookup) < 128 else np.int32)
+    for i, value in enumerate(values):
+        if value is None or value != value:
+            codes[i] = -1
+            continue
+        code = lookup.get(value)
+        if code is None:
+            if fixed:
+                raise ValueError(f"{value!r} is not one of {list(categories)}")
+            code = lookup[value] = len(lookup)
+        codes[i] = code
+    return DictColumn(codes, tuple(lookup))
+
+
+def _plain_values(col: Column) -> list:
+    """Python values of a column (missing → "")."""
+    if isinstance(col, DictColumn):
+        lookup = col.categories + ("",)  # code -1 → ""
+        return [lookup[c] for c in col.codes.tolist()]
+    if col.dtype.kind == "f":
+        return ["" if v != v else v for v in col.tolist()]
+    return ["" if v is None else v for v in col.tolist()]
+
+
+def _make_column(values: Iterable[Any], spec: Union[str, pd.CategoricalDtype], count: int) -> Column:
+    """Materialize one column from an iterator of values."""
+    if isinstance(spec, pd.CategoricalDtype):
+        return _encode(values, list(spec.categories), count)
+    if spec == "category":
+        return _encode(values, None, count)
+    dtype = np.dtype(spec)
+    if dtype.kind in "fiub":
+        return np.fromiter(values, dtype=dtype, count=count)
+    arr = np.empty(count, dtype=object)
+    arr[:] = list(values)
+    return arr
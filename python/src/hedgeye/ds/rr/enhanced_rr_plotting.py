@@ -6,27 +6,31 @@ Extends risk range plots with current market prices.
 
 import pandas as pd
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
 
-from hedgeye.config_loader import load_config
-from hedgeye.ds.rr.use_rr import load_all_risk_range_data
-from hedgeye.ds.rr.symbol_canonicalization import get_canonical_symbol_for_plotting, canonicalize_symbol
+from hedgeye.config_loader import config_path, get_config, load_config
+from hedgeye.ds.rr.use_rr import load_all_risk_range_data, RR_PLOT_COLUMNS
+from hedgeye.ds.rr.rr_index import RRIndex, as_rr_index
+from hedgeye.ds.rr.rr_status import compute_rr_status
 from hedgeye.ds.fmp.price_fetcher import get_prices_for_symbols
+from hedgeye.ds.mapping_cache import get_he_to_fmp_mapping
+from hedgeye.ds.symbol_resolver import get_symbol_resolver
+from hedgeye.ds.plots.render_engine import PlotJob, arrays_from_frame, render_jobs
+from hedgeye.ds.plots.renderers import draw_rr_enhanced
+
+if TYPE_CHECKING:  # pyplot is imported when plotting (it is slow to import)
+    import matplotlib.pyplot as plt
+
 
 def load_symbol_mappings() -> pd.DataFrame:
-    """Load the Hedgeye to FMP symbol mappings."""
-    from hedgeye.config_loader import load_config
-    
-    config = load_config()
-    fmp_path = Path(config["paths"]["fmp_mapping_file"])
+    """Load the Hedgeye to FMP symbol mappings (compiled once, see mapping_cache)."""
+    fmp_path = config_path("fmp_mapping_file")
     
     if not fmp_path.exists():
         raise FileNotFoundError(f"FMP mapping file not found: {fmp_path}")
         
-    return pd.read_csv(fmp_path)
+    return get_he_to_fmp_mapping(fmp_path).frame.copy()
 
 def get_latest_fmp_prices() -> pd.DataFrame:
     """Get latest prices for all mapped symbols."""
@@ -40,119 +44,70 @@ def get_latest_fmp_prices() -> pd.DataFrame:
         print(f"Error fetching latest prices: {e}")
         return pd.DataFrame()
 
-def display_rr_with_latest_price(df: pd.DataFrame, index_symbol: str, 
-                                latest_prices: Optional[pd.DataFrame] = None) -> plt.Figure:
+def _lookup_latest_price(latest_prices: Optional[pd.DataFrame], index_symbol: str) -> Optional[float]:
+    """Find the latest FMP price for a symbol, trying exact then canonical form."""
+    if latest_prices is None or latest_prices.empty:
+        return None
+    latest_price_row = latest_prices[latest_prices["he_symbol"] == index_symbol]
+    if latest_price_row.empty:
+        canonical_symbol = get_symbol_resolver().canonical(index_symbol)
+        latest_price_row = latest_prices[latest_prices["he_symbol"] == canonical_symbol]
+    if latest_price_row.empty:
+        return None
+    return float(latest_price_row.iloc[0]["price"])
+
+def build_enhanced_plot_data(rr_index: RRIndex, index_symbol: str,
+                             latest_prices: Optional[pd.DataFrame] = None) -> Optional[Tuple[Dict, Dict]]:
+    """
+    Precompute the arrays and metadata for one enhanced plot.
+
+    Args:
+        rr_index: Indexed Hedgeye risk range data
+        index_symbol: Symbol to plot (case/naming variations are resolved)
+        latest_prices: DataFrame with latest FMP prices (optional)
+
+    Returns:
+        (arrays, meta) for renderers.draw_rr_enhanced, or None if the symbol has no data
+    """
+    actual_symbol = rr_index.resolve(index_symbol)
+    if actual_symbol is None:
+        return None
+
+    arrays = arrays_from_frame(rr_index.series(actual_symbol), RR_PLOT_COLUMNS)
+    meta = {
+        "display_symbol": get_symbol_resolver().canonical(actual_symbol),  # Use canonical form for display
+        "latest_price": _lookup_latest_price(latest_prices, index_symbol),
+        # Plotted at today's date (not the current time) so an unchanged
+        # quote yields an identical plot, which the plot cache can skip
+        "latest_date": pd.Timestamp.now().normalize(),
+    }
+    return arrays, meta
+
+def display_rr_with_latest_price(df: Union[pd.DataFrame, RRIndex], index_symbol: str, 
+                                latest_prices: Optional[pd.DataFrame] = None) -> "plt.Figure":
     """
     Enhanced risk range plot that includes latest FMP price as additional data point.
     
     Args:
-        df: Hedgeye risk range data
+        df: Hedgeye risk range data (or a prebuilt RRIndex when plotting many symbols)
         index_symbol: Symbol to plot (e.g., 'AAPL', 'SPX')
         latest_prices: DataFrame with latest FMP prices (optional)
         
     Returns:
         matplotlib Figure object
     """
-    # Get symbol data - handle case variations
-    actual_symbol = get_canonical_symbol_for_plotting(df, index_symbol, 'index')
-    
-    if actual_symbol is None:
+    import matplotlib.pyplot as plt
+    plot_data = build_enhanced_plot_data(as_rr_index(df), index_symbol, latest_prices)
+    if plot_data is None:
         print(f"No Hedgeye data found for symbol: {index_symbol}")
         return plt.figure()
-    
-    symbol_df = df[df["index"] == actual_symbol].copy()
-    display_symbol = canonicalize_symbol(actual_symbol)  # Use canonical form for display
-    
-    # Prepare data
-    symbol_df["date"] = pd.to_datetime(symbol_df["date"])
-    symbol_df.sort_values("date", inplace=True)
-    
-    # Create figure
-    fig, ax = plt.subplots(figsize=(14, 8))
-    
-    # Plot original risk range data
-    ax.plot(symbol_df["date"], symbol_df["prev_close"], 
-            label="Prev Close", color="black", linewidth=2)
-    ax.plot(symbol_df["date"], symbol_df["buy_trade"], 
-            label="Buy Trade", color="green", linewidth=1.5, linestyle="--")
-    ax.plot(symbol_df["date"], symbol_df["sell_trade"], 
-            label="Sell Trade", color="red", linewidth=1.5, linestyle="--")
-    
-    # Add latest FMP price if available - handle symbol variations
-    if latest_prices is not None and not latest_prices.empty:
-        # Try exact match first, then canonical form
-        latest_price_row = latest_prices[latest_prices["he_symbol"] == index_symbol]
-        if latest_price_row.empty:
-            # Try with canonical form of the symbol
-            canonical_symbol = canonicalize_symbol(index_symbol)
-            latest_price_row = latest_prices[latest_prices["he_symbol"] == canonical_symbol]
-        
-        if not latest_price_row.empty:
-            latest_price = latest_price_row.iloc[0]
-            
-            # Use current date/time for latest price
-            latest_date = datetime.now()
-            
-            # Add latest price point
-            ax.scatter(latest_date, latest_price["price"], 
-                      color="blue", s=100, zorder=5, 
-                      label=f"Latest Price: ${latest_price['price']:.2f}")
-            
-            # Connect latest price to most recent prev_close
-            if len(symbol_df) > 0:
-                last_date = symbol_df["date"].iloc[-1]
-                last_close = symbol_df["prev_close"].iloc[-1]
-                
-                ax.plot([last_date, latest_date], [last_close, latest_price["price"]], 
-                       color="blue", linewidth=2, alpha=0.7)
-            
-            # Add price annotation
-            ax.annotate(f"${latest_price['price']:.2f}", 
-                       xy=(latest_date, latest_price["price"]),
-                       xytext=(10, 10), textcoords="offset points",
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.7),
-                       fontsize=10, fontweight="bold")
-            
-            # Show if price is in risk range
-            if len(symbol_df) > 0:
-                latest_buy = symbol_df["buy_trade"].iloc[-1]
-                latest_sell = symbol_df["sell_trade"].iloc[-1]
-                current_price = latest_price["price"]
-                
-                if current_price <= latest_buy:
-                    status = "🟢 AT/BELOW BUY RANGE"
-                    status_color = "green"
-                elif current_price >= latest_sell:
-                    status = "🔴 AT/ABOVE SELL RANGE"
-                    status_color = "red"
-                else:
-                    status = "🟡 IN RANGE"
-                    status_color = "orange"
-                
-                ax.text(0.02, 0.98, status, transform=ax.transAxes, 
-                       fontsize=12, fontweight="bold", color=status_color,
-                       verticalalignment="top",
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
-    
-    # Format the plot
-    ax.set_title(f"Risk Range Time Series: {display_symbol}", fontsize=16, fontweight="bold")
-    ax.set_xlabel("Date", fontsize=12)
-    ax.set_ylabel("Price", fontsize=12)
-    ax.legend(loc="upper left")
-    ax.grid(True, alpha=0.3)
-    
-    # Format dates on x-axis
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=1))
-    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-    
-    plt.tight_layout()
-    return fig
+    return draw_rr_enhanced(*plot_data)
 
 def generate_enhanced_plots(df: Optional[pd.DataFrame] = None, 
                           include_latest_prices: bool = True,
                           symbols_to_plot: Optional[list] = None,
-                          start_date: str = "2025-10-01"):
+                          start_date: str = "2025-10-01",
+                          latest_prices: Optional[pd.DataFrame] = None):
     """
     Generate enhanced plots for all symbols with latest FMP prices.
     
@@ -162,16 +117,16 @@ def generate_enhanced_plots(df: Optional[pd.DataFrame] = None,
         symbols_to_plot: List of specific symbols to plot (plots all if None)
         start_date: Earliest date to include in plots (default: 2025-10-01).
                     Data before this date is excluded. Set to None to include all data.
+        latest_prices: Already-fetched latest prices (fetched here if None)
     """
-    config = load_config()
+    config = get_config().data
     
-    # Load data if not provided
+    # Load data if not provided (only the plot window is read)
     if df is None:
-        df = load_all_risk_range_data()
+        df = load_all_risk_range_data(start=start_date, symbols=symbols_to_plot)
     
     # Apply date filter to exclude data before start_date
     if start_date is not None:
-        df["date"] = pd.to_datetime(df["date"])
         cutoff = pd.to_datetime(start_date)
         original_count = len(df)
         df = df[df["date"] >= cutoff].copy()
@@ -180,8 +135,9 @@ def generate_enhanced_plots(df: Optional[pd.DataFrame] = None,
             print(f"📅 Filtered out {filtered_count} records before {start_date}")
     
     # Get latest prices if requested
-    latest_prices = None
-    if include_latest_prices:
+    if not include_latest_prices:
+        latest_prices = None
+    elif latest_prices is None:
         print("Fetching latest FMP prices...")
         latest_prices = get_latest_fmp_prices()
         
@@ -196,8 +152,7 @@ def generate_enhanced_plots(df: Optional[pd.DataFrame] = None,
         cutoff_date = datetime.now() - timedelta(days=max_days)
 
         # Get most recent date for each symbol
-        df["date"] = pd.to_datetime(df["date"])
-        recent_symbols = df.groupby("index")["date"].max()
+        recent_symbols = df.groupby("index", observed=True)["date"].max()
         recent_symbols = recent_symbols[recent_symbols >= cutoff_date].index.tolist()
 
         symbols = sorted(recent_symbols)
@@ -221,31 +176,40 @@ def generate_enhanced_plots(df: Optional[pd.DataFrame] = None,
                     print(f"🗑️  Removed stale plot: {plot_symbol}.png")
     
     print(f"Generating {len(symbols)} enhanced plots...")
-    
-    successful_plots = 0
-    failed_plots = 0
-    
+
+    rr_index = RRIndex(df)
+
+    # Precompute every plot's data here; workers only draw and save
+    jobs = []
+    failed = []  # (symbol, reason): one bad symbol must not stop the others
     for sym in symbols:
         try:
-            fig = display_rr_with_latest_price(df, sym, latest_prices)
-            
-            # Save plot
-            safe_symbol = sym.replace("/", "-").replace("^", "")
-            out_path = output_dir / f"{safe_symbol}.png"
-            
-            fig.savefig(out_path, dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            
-            print(f"✅ Saved: {out_path}")
-            successful_plots += 1
-            
+            plot_data = build_enhanced_plot_data(rr_index, sym, latest_prices)
         except Exception as e:
-            print(f"❌ Failed to create plot for {sym}: {e}")
-            failed_plots += 1
+            failed.append((sym, e))
+            continue
+        if plot_data is None:
+            failed.append((sym, "no Hedgeye data"))
+            continue
+        arrays, meta = plot_data
+        safe_symbol = sym.replace("/", "-").replace("^", "")
+        jobs.append(PlotJob(
+            renderer="rr_enhanced",
+            out_path=output_dir / f"{safe_symbol}.png",
+            label=sym,
+            arrays=arrays,
+            meta=meta,
+            savefig_kwargs={"dpi": 150, "bbox_inches": "tight"},
+        ))
+
+    result = render_jobs(jobs)
+    for sym, reason in failed:
+        print(f"❌ Failed to create plot for {sym}: {reason}")
     
     print(f"\n📊 Plot generation complete:")
-    print(f"   ✅ Successful: {successful_plots}")
-    print(f"   ❌ Failed: {failed_plots}")
+    print(f"   ✅ Successful: {result.successful}")
+    print(f"   ♻️  Unchanged (not re-rendered): {result.cached}")
+    print(f"   ❌ Failed: {result.failed + len(failed)}")
     print(f"   📁 Output directory: {output_dir}")
 
 def create_summary_dashboard(df: Optional[pd.DataFrame] = None, 
@@ -253,40 +217,15 @@ def create_summary_dashboard(df: Optional[pd.DataFrame] = None,
     """
     Create a summary dashboard showing multiple symbols and their risk range status.
     """
+    import matplotlib.pyplot as plt
     if df is None:
         df = load_all_risk_range_data()
     
     if latest_prices is None:
         latest_prices = get_latest_fmp_prices()
     
-    # Get most recent risk range data for each symbol
-    latest_rr = df.loc[df.groupby("index")["date"].idxmax()].copy()
-    
-    # Merge with FMP prices
-    summary = latest_rr.merge(
-        latest_prices, 
-        left_on="index", 
-        right_on="he_symbol", 
-        how="left"
-    )
-    
-    # Calculate risk range status
-    def get_status(row):
-        if pd.isna(row["price"]):
-            return "No Price Data"
-        
-        current_price = row["price"]
-        buy_level = row["buy_trade"]
-        sell_level = row["sell_trade"]
-        
-        if current_price <= buy_level:
-            return "BUY RANGE"
-        elif current_price >= sell_level:
-            return "SELL RANGE"
-        else:
-            return "IN RANGE"
-    
-    summary["status"] = summary.apply(get_status, axis=1)
+    # Latest risk range row per symbol joined with prices, with status
+    summary = compute_rr_status(df, latest_prices)
     
     # Create dashboard plot
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
@@ -318,7 +257,7 @@ def create_summary_dashboard(df: Optional[pd.DataFrame] = None,
         ax3.tick_params(axis='x', rotation=45)
     
     # 4. Recent activity (symbols with data in last 7 days)
-    recent_data = df[pd.to_datetime(df["date"]) >= (datetime.now() - timedelta(days=7))]
+    recent_data = df[df["date"] >= (datetime.now() - timedelta(days=7))]
     recent_symbols = recent_data["index"].value_counts().head(10)
     ax4.barh(recent_symbols.index, recent_symbols.values)
     ax4.set_title("Most Active Symbols (Last 7 Days)")
@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
-from decimal import Decimal
 
 
 class Trend(str, Enum):
@@ -15,18 +14,20 @@ class Bucket(str, Enum):
     OUT = "out"
 
 
-@dataclass
+# slots=True: no per-instance __dict__, so a parsed report costs a fraction
+# of the memory of regular dataclass instances (see also rr_batch.RRDayBatch)
+@dataclass(slots=True)
 class RiskRangeEntry:
     date: str  # ISO format date string: YYYY-MM-DD
     index: str
     trend: Trend
-    buy_trade: Decimal
-    sell_trade: Decimal
-    prev_close: Decimal
+    buy_trade: float
+    sell_trade: float
+    prev_close: float
     bucket: Bucket = Bucket.IN
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeEvent:
     date: str  # ISO format date string
     index: str
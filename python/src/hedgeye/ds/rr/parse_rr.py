@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Unified Risk Range (RR) email parser.
+
+One entry point for every RR variant we receive:
+- html:   the newsletter as delivered (MIME message with a text/html part)
+- plain:  a MIME message with only a text/plain body
+- pasted: plain text copied out of a mail client (no MIME headers)
+
+The format is detected from the MIME structure. HTML is flattened to text
+lines with a handful of compiled regexes (table cells become tab-separated,
+block elements become line breaks), then all formats go through the same
+single-pass line scan, which picks up the report date, change events and
+table rows:
+
+    SPX (Bullish)<TAB>6,650<TAB>6,900<TAB>6,812      html table row
+    SPX S&P 500 (Bullish) 6,650 6,900 6,812          plain body row
+    SPX (Bullish)                                     pasted row,
+    S&P 500 6,650 6,900 6,812                           split over two lines
+
+Symbols are canonicalized and prices are floats. Entries for symbols moved to
+the #OutBucket in the same report get bucket OUT.
+
+Usage:
+    from hedgeye.ds.rr.parse_rr import parse_rr_email
+    report_date, entries, changes = parse_rr_email("risk_range_2025-11-28.eml")
+    batch = parse_rr_batch(raw_bytes)   # columns instead of one object per row
+"""
+
+import html as html_lib
+import re
+from datetime import datetime
+from email import policy
+from email.header import decode_header, make_header
+from email.message import Message
+from email.parser import BytesParser
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+
+from hedgeye.ds.rr.models import Bucket, ChangeEvent, RiskRangeEntry, Trend
+from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+
+if TYPE_CHECKING:  # rr_batch imports pandas, which the parser itself does not need
+    from hedgeye.ds.rr.rr_batch import RRDayBatch
+
+FORMAT_HTML = "html"
+FORMAT_PLAIN = "plain"
+FORMAT_PASTED = "pasted"
+
+ParseResult = Tuple[str, List[RiskRangeEntry], List[ChangeEvent]]
+RawScan = Tuple[str, list, list]
+
+# --- HTML flattening ---
+_QP_SOFT_BREAK = re.compile(r"=\r?\n")
+_SCRIPT_STYLE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.S | re.I)
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_WHITESPACE = re.compile(r"\s+")
+_CELL_END = re.compile(r"</t[dh]\s*>", re.I)
+_BLOCK_TAG = re.compile(
+    r"<br\s*/?>|</?(?:p|div|tr|table|tbody|thead|li|ul|ol|h[1-6]|center|blockquote)\b[^>]*>",
+    re.I,
+)
+_ANY_TAG = re.compile(r"<[^>]+>")
+_HEADLINE = re.compile(
+    r"<div[^>]*class=[\"'][^\"']*\bheadline\b[^\"']*[\"'][^>]*>(.*?)</div>", re.S | re.I
+)
+
+# --- Line scan ---
+_NUM = r"-?[\d,]*\.?\d+"
+_SYM = r"[A-Za-z0-9./]+"
+_MONTH_DATE = re.compile(r"\b([A-Za-z]+\.? \d{1,2}, \d{4})\b")
+_NUMERIC_DATE = re.compile(r"\b(\d{2}/\d{2}/\d{4})\b")
+# "SPX (Bullish)" at the start of a table cell
+_TICKER_CELL = re.compile(rf"^({_SYM}) \((\w+)\)")
+# "SPX [description] (Bullish) 6,650 6,900 6,812" on one line
+_ROW_LINE = re.compile(rf"^({_SYM})\b.*?\((\w+)\)\s+({_NUM})\s+({_NUM})\s+({_NUM})$")
+# Pasted: "SPX (Bullish)" alone, numbers on the next line
+_SYMBOL_LINE = re.compile(rf"^({_SYM})\s*\((\w+)\)$")
+_NUMBERS_TAIL = re.compile(rf"(?:^|\s)({_NUM})\s+({_NUM})\s+({_NUM})$")
+_CHANGE = re.compile(
+    rf"^(?P<sym>{_SYM})\s+(?:"
+    r"changed from\s+(?P<trend_from>\w+)\s+to\s+(?P<trend_to>\w+)(?P<in_out>\s+in the #OutBucket)?"
+    r"|(?P<moved_out>moved to the #OutBucket)"
+    r"|(?P<added_back>added back to Risk Ranges)"
+    r")",
+    re.I,
+)
+
+
+def parse_date(date_str: str) -> Optional[str]:
+    """'November 28, 2025' / 'Nov 28, 2025' / '11/28/2025' → '2025-11-28' (None if invalid)."""
+    date_str = date_str.replace(".", "").title()
+    for fmt in ("%B %d, %Y", "%b %d, %Y", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def _find_date(text: str) -> Optional[str]:
+    """First valid month-name date in text, else first MM/DD/YYYY date."""
+    for pattern in (_MONTH_DATE, _NUMERIC_DATE):
+        for match in pattern.finditer(text):
+            parsed = parse_date(match.group(1))
+            if parsed:
+                return parsed
+    return None
+
+
+def _to_float(value: str) -> float:
+    return float(value.replace(",", ""))
+
+
+def _to_trend(value: str) -> Optional[Trend]:
+    try:
+        return Trend(value.upper())
+    except ValueError:
+        return None
+
+
+def html_to_lines(html: str) -> Iterator[str]:
+    """Flatten HTML to text lines; table cells are separated by tabs."""
+    if "=3D" in html:  # body was quoted-printable encoded twice
+        html = _QP_SOFT_BREAK.sub("", html).replace("=3D", "=").replace("=E2=84=A2", "™")
+    html = _COMMENT.sub("", _SCRIPT_STYLE.sub("", html))
+    html = _WHITESPACE.sub(" ", html)
+    html = _CELL_END.sub("\t", html)
+    html = _BLOCK_TAG.sub("\n", html)
+    text = html_lib.unescape(_ANY_TAG.sub("", html)).replace("\xa0", " ")
+    for line in text.split("\n"):
+        line = line.strip()
+        if line:
+            yield line
+
+
+def text_to_lines(text: str) -> Iterator[str]:
+    """Non-empty stripped lines of a plain-text body."""
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _scan(lines: Iterator[str], report_date: Optional[str] = None) -> RawScan:
+    """
+    Single pass over text lines collecting the date, change events and rows.
+
+    Returns:
+        (report_date, rows, events) as plain tuples with canonical symbols;
+        rows are (index, trend, buy, sell, prev_close, bucket), events are
+        (index, trend_from, trend_to, bucket_from, bucket_to)
+
+    Raises:
+        ValueError: If no report date can be found
+    """
+    rows = []      # (symbol, trend, buy, sell, prev_close)
+    events = []    # (symbol, trend_from, trend_to, bucket_from, bucket_to)
+    pending_symbol = None
+
+    for line in lines:
+        if report_date is None:
+            report_date = _find_date(line)
+
+        # Pasted format: numbers on the line after "SYM (Trend)"
+        if pending_symbol is not None:
+            symbol, trend = pending_symbol
+            pending_symbol = None
+            nums = _NUMBERS_TAIL.search(line)
+            if nums:
+                try:
+                    rows.append((symbol, trend, *map(_to_float, nums.groups())))
+                    continue
+                except ValueError:
+                    pass
+
+        if "\t" in line:
+            cells = [c.strip() for c in line.split("\t") if c.strip()]
+            if len(cells) == 4:
+                ticker = _TICKER_CELL.match(cells[0])
+                trend = ticker and _to_trend(ticker.group(2))
+                if trend:
+                    try:
+                        rows.append((ticker.group(1), trend, *map(_to_float, cells[1:])))
+                        continue
+                    except ValueError:
+                        pass
+            line = " ".join(cells)
+
+        row = _ROW_LINE.match(line)
+        if row:
+            trend = _to_trend(row.group(2))
+            if trend:
+                rows.append((row.group(1), trend, *map(_to_float, row.groups()[2:])))
+                continue
+
+        single = _SYMBOL_LINE.match(line)
+        if single:
+            trend = _to_trend(single.group(2))
+            if trend:
+                pending_symbol = (single.group(1), trend)
+                continue
+
+        if "TREND CHANGE" in line.upper():
+            continue
+        change = _CHANGE.match(line)
+        if change:
+            if change.group("moved_out"):
+                events.append((change.group("sym"), None, None, Bucket.IN, Bucket.OUT))
+            elif change.group("added_back"):
+                events.append((change.group("sym"), None, None, Bucket.OUT, Bucket.IN))
+            else:
+                trend_from = _to_trend(change.group("trend_from"))
+                trend_to = _to_trend(change.group("trend_to"))
+                if trend_from and trend_to:
+                    bucket = Bucket.OUT if change.group("in_out") else None
+                    events.append((change.group("sym"), trend_from, trend_to, bucket, bucket))
+
+    if not report_date:
+        raise ValueError("Could not find report date")
+
+    canonical = {sym: canonicalize_symbol(sym) for sym in {r[0] for r in rows} | {e[0] for e in events}}
+
+    events = [(canonical[e[0]], *e[1:]) for e in events]
+    out_bucket = {e[0] for e in events if e[4] == Bucket.OUT}
+    rows = [
+        (index, trend, buy, sell, prev_close, Bucket.OUT if index in out_bucket else Bucket.IN)
+        for index, trend, buy, sell, prev_close in ((canonical[r[0]], *r[1:]) for r in rows)
+    ]
+    return report_date, rows, events
+
+
+def _to_models(report_date: str, rows: list, events: list) -> ParseResult:
+    """Raw scan output → (report_date, RiskRangeEntry list, ChangeEvent list)."""
+    entries = [
+        RiskRangeEntry(date=report_date, index=index, trend=trend, buy_trade=buy,
+                       sell_trade=sell, prev_close=prev_close, bucket=bucket)
+        for index, trend, buy, sell, prev_close, bucket in rows
+    ]
+    changes = [
+        ChangeEvent(date=report_date, index=index, trend_from=t_from, trend_to=t_to,
+                    bucket_from=b_from, bucket_to=b_to, notes=None)
+        for index, t_from, t_to, b_from, b_to in events
+    ]
+    return report_date, entries, changes
+
+
+def scan_lines(lines: Iterator[str], report_date: Optional[str] = None) -> ParseResult:
+    """
+    Single pass over text lines collecting the date, change events and rows.
+
+    Args:
+        lines: Lines from html_to_lines() or text_to_lines()
+        report_date: Known report date (e.g. from an HTML headline); when None
+            the first date found in the lines is used
+
+    Returns:
+        (report_date, entries, changes)
+
+    Raises:
+        ValueError: If no report date can be found
+    """
+    return _to_models(*_scan(lines, report_date))
+
+
+def _part_text(part: Message) -> str:
+    """Decoded text of a MIME part (works for both email policies)."""
+    if hasattr(part, "get_content"):
+        return part.get_content()
+    payload = part.get_payload(decode=True) or b""
+    return payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+
+
+def detect_format(msg: Message) -> str:
+    """FORMAT_HTML, FORMAT_PLAIN or FORMAT_PASTED from the MIME structure."""
+    if "Content-Type" not in msg and "MIME-Version" not in msg:
+        return FORMAT_PASTED
+    for part in msg.walk():
+        if part.get_content_type() == "text/html":
+            return FORMAT_HTML
+    return FORMAT_PLAIN
+
+
+def _message_lines(msg: Message, fmt: str) -> Tuple[Optional[str], Iterator[str]]:
+    """(headline date or None, body lines) for a MIME message."""
+    if fmt == FORMAT_HTML:
+        html = "".join(_part_text(p) for p in msg.walk() if p.get_content_type() == "text/html")
+        headline = _HEADLINE.search(html)
+        headline_date = _find_date(_ANY_TAG.sub(" ", headline.group(1))) if headline else None
+        return headline_date, html_to_lines(html)
+    if fmt == FORMAT_PLAIN:
+        body = next((p for p in msg.walk() if p.get_content_type() == "text/plain"), None)
+        return None, text_to_lines(_part_text(body) if body is not None else "")
+    return None, text_to_lines(msg.as_string())
+
+
+def _scan_message(msg: Message) -> RawScan:
+    fmt = detect_format(msg)
+    report_date, lines = _message_lines(msg, fmt)
+    try:
+        return _scan(lines, report_date)
+    except ValueError:
+        # Fall back to the Subject header ("RISK RANGE™ SIGNALS: NOVEMBER 28, 2025")
+        subject_date = _find_date(str(make_header(decode_header(str(msg.get("Subject", ""))))))
+        if not subject_date:
+            raise
+        return _scan(_message_lines(msg, fmt)[1], subject_date)
+
+
+def _scan_bytes(data: bytes) -> RawScan:
+    # compat32 keeps headers as raw strings; the structured header objects of
+    # policy.default cost more than the whole body scan
+    msg = BytesParser(policy=policy.compat32).parsebytes(data)
+    if detect_format(msg) == FORMAT_PASTED:
+        return _scan(text_to_lines(data.decode("utf-8", errors="replace")))
+    return _scan_message(msg)
+
+
+def _scan_source(source: Union[str, Path, bytes, Message]) -> RawScan:
+    if isinstance(source, Message):
+        return _scan_message(source)
+    if isinstance(source, (bytes, bytearray)):
+        return _scan_bytes(bytes(source))
+    return _scan_bytes(Path(source).read_bytes())
+
+
+def parse_rr_message(msg: Message) -> ParseResult:
+    """Parse an RR email that is already loaded as a Message."""
+    return _to_models(*_scan_message(msg))
+
+
+def parse_rr_bytes(data: bytes) -> ParseResult:
+    """Parse an RR email (MIME message or pasted text) from raw bytes."""
+    return _to_models(*_scan_bytes(data))
+
+
+def parse_rr_email(source: Union[str, Path, bytes, Message]) -> ParseResult:
+    """
+    Parse any RR email variant.
+
+    Args:
+        source: Path to an .eml/.txt file, raw bytes, or a parsed Message
+
+    Returns:
+        (report_date, entries, changes) with report_date as YYYY-MM-DD
+
+    Raises:
+        ValueError: If no report date can be found
+    """
+    return _to_models(*_scan_source(source))
+
+
+def parse_rr_batch(source: Union[str, Path, bytes, Message]) -> "RRDayBatch":
+    """
+    Parse any RR email variant straight into columns (no per-row objects).
+
+    Args:
+        source: Path to an .eml/.txt file, raw bytes, or a parsed Message
+
+    Returns:
+        RRDayBatch with the report's entries and change events
+    """
+    from hedgeye.ds.rr.rr_batch import RRDayBatch
+    return RRDayBatch.from_rows(*_scan_source(source))
@@ -1,35 +1,12 @@
 import re
-from decimal import Decimal
 from typing import List, Tuple
-from email import policy
-from email.parser import BytesParser
 
 from hedgeye.ds.rr.models import RiskRangeEntry, ChangeEvent, Trend, Bucket
+from hedgeye.ds.rr.parse_rr import parse_rr_email
 
 
 def parse_eml(filepath: str) -> Tuple[str, List[RiskRangeEntry], List[ChangeEvent]]:
-    with open(filepath, "rb") as f:
-        msg = BytesParser(policy=policy.default).parse(f)
-
-    body = msg.get_body(preferencelist=('plain')).get_content()
-
-    lines = body.splitlines()
-    lines = [line.strip() for line in lines if line.strip()]
-
-    date_line = next(line for line in lines if re.search(r'\w+ \d{1,2}, \d{4}', line))
-
-    match = re.search(r'(\w+ \d{1,2}, \d{4})', date_line)
-    report_date = match.group(1)
-
-    change_events = extract_change_events(lines, report_date)
-
-    print("Scanning lines for table start...")
-    for i, line in enumerate(lines):
-        print(f"{i:02}: {repr(line)}")
-
-    risk_range_entries = extract_risk_range_entries(lines, report_date)
-
-    return report_date, risk_range_entries, change_events
+    return parse_rr_email(filepath)
 
 
 def parse_date_line(line: str) -> str:
@@ -114,9 +91,9 @@ def extract_risk_range_entries(lines: List[str], date: str) -> List[RiskRangeEnt
                     date=date,
                     index=index,
                     trend=trend,
-                    buy_trade=Decimal(buy.replace(",", "")),
-                    sell_trade=Decimal(sell.replace(",", "")),
-                    prev_close=Decimal(close.replace(",", "")),
+                    buy_trade=float(buy.replace(",", "")),
+                    sell_trade=float(sell.replace(",", "")),
+                    prev_close=float(close.replace(",", "")),
                     bucket=Bucket.IN
                 ))
             else:
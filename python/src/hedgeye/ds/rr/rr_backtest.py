@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Vectorized backtest of Risk Range (RR) band-touch signals.
+
+All symbols are laid out as a (symbol x date) panel; every rule is a whole-
+array NumPy expression over that panel, so a parameter sweep has no per-day
+or per-symbol Python loops.
+
+Timing convention (one row per RR report date t):
+- buy_trade[t], sell_trade[t] and trend[t] are published on date t
+- close[t] is the prev_close of the same symbol's next report (the close of
+  date t when the symbol is reported daily)
+- Long entry on t:  close[t] <= buy_trade[t] * (1 + tolerance)
+- Short entry on t: close[t] >= sell_trade[t] * (1 - tolerance)
+- Exit after holding_period of the symbol's own report dates:
+  return = close[t+h] / close[t] - 1 (sign flipped for shorts), where t+h is
+  the symbol's h-th report after t. A trade is a hit when its return is > 0.
+
+Trend filters:
+- "none":       take every long and short signal
+- "with_trend": longs only when trend is BULLISH, shorts only when BEARISH
+- "long_only":  longs only, any trend
+- "short_only": shorts only, any trend
+
+Usage:
+    from hedgeye.ds.rr.rr_backtest import run_rr_backtest
+    result = run_rr_backtest(rr_df, tolerances=[0, 0.005, 0.01],
+                             trend_filters=["none", "with_trend"],
+                             holding_periods=[1, 5, 10])
+    print(result.summary)
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+from hedgeye.ds.rr.models import Trend
+from hedgeye.ds.rr.rr_index import RRIndex, as_rr_index
+
+TREND_FILTERS = ("none", "with_trend", "long_only", "short_only")
+
+PARAM_COLUMNS = ["tolerance", "trend_filter", "holding_period"]
+
+
+@dataclass
+class RRPanel:
+    """
+    RR history as aligned (symbol x date) arrays.
+
+    Missing report dates for a symbol are NaN (prices) / -1 (trend) and
+    False in reported.
+    """
+    symbols: np.ndarray
+    dates: np.ndarray
+    buy: np.ndarray
+    sell: np.ndarray
+    close: np.ndarray
+    trend: np.ndarray  # Trend category codes
+    reported: np.ndarray
+
+
+@dataclass
+class BacktestResult:
+    """
+    Backtest output.
+
+    Attributes:
+        per_symbol: One row per (parameter set, symbol)
+        summary: One row per parameter set, aggregated over all symbols
+        elapsed: Seconds spent evaluating the sweep
+    """
+    per_symbol: pd.DataFrame
+    summary: pd.DataFrame
+    elapsed: float
+
+
+def build_rr_panel(rr: Union[pd.DataFrame, RRIndex]) -> RRPanel:
+    """
+    Pivot RR history into a (symbol x date) panel.
+
+    close[t] is the prev_close of the symbol's next report (see module
+    docstring). A symbol reported twice on one date keeps the last row.
+    """
+    frame = as_rr_index(rr).frame  # sorted by (symbol, date)
+    frame = frame.drop_duplicates(["index", "date"], keep="last")
+    close_next = frame.groupby("index", observed=True)["prev_close"].shift(-1)
+
+    symbol_codes = frame["index"].cat.codes.to_numpy()
+    symbols = frame["index"].cat.categories.to_numpy()
+    used = np.unique(symbol_codes)
+    row_of = np.full(len(symbols), -1)
+    row_of[used] = np.arange(len(used))
+
+    dates, col = np.unique(frame["date"].to_numpy(), return_inverse=True)
+    row = row_of[symbol_codes]
+
+    shape = (len(used), len(dates))
+    buy = np.full(shape, np.nan)
+    sell = np.full(shape, np.nan)
+    close = np.full(shape, np.nan)
+    trend = np.full(shape, -1, dtype=np.int8)
+    reported = np.zeros(shape, dtype=bool)
+
+    buy[row, col] = frame["buy_trade"].to_numpy()
+    sell[row, col] = frame["sell_trade"].to_numpy()
+    close[row, col] = close_next.to_numpy()
+    trend[row, col] = frame["trend"].cat.codes.to_numpy()
+    reported[row, col] = True
+
+    return RRPanel(symbols=symbols[used], dates=dates, buy=buy, sell=sell,
+                   close=close, trend=trend, reported=reported)
+
+
+def _forward_returns(panel: RRPanel, holding_period: int) -> np.ndarray:
+    """
+    close[t + h] / close[t] - 1, where t + h is the symbol's h-th report after t.
+
+    NaN where the symbol has fewer than h later reports.
+    """
+    # Per row: the symbol's report dates first, in date order, then the gaps
+    order = np.argsort(~panel.reported, axis=1, kind="stable")
+    close = np.take_along_axis(panel.close, order, axis=1)
+
+    fwd = np.full(close.shape, np.nan)
+    if holding_period < close.shape[1]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fwd[:, :-holding_period] = close[:, holding_period:] / close[:, :-holding_period] - 1
+
+    # Back to date columns
+    out = np.empty_like(fwd)
+    np.put_along_axis(out, order, fwd, axis=1)
+    return out
+
+
+def run_rr_backtest(rr: Union[pd.DataFrame, RRIndex, RRPanel],
+                    tolerances: Iterable[float] = (0.0,),
+                    trend_filters: Iterable[str] = ("none",),
+                    holding_periods: Iterable[int] = (5,)) -> BacktestResult:
+    """
+    Evaluate band-touch rules for every combination of parameters.
+
+    Args:
+        rr: RR history (DataFrame, RRIndex or a prebuilt RRPanel)
+        tolerances: Fractions by which a close may miss a band and still
+            count as a touch (0.01 = within 1%)
+        trend_filters: Values from TREND_FILTERS
+        holding_periods: Holding periods in RR report dates (>= 1)
+
+    Returns:
+        BacktestResult with per-symbol and aggregate statistics
+    """
+    panel = rr if isinstance(rr, RRPanel) else build_rr_panel(rr)
+    tolerances = np.asarray(list(tolerances), dtype=float)
+    trend_filters = list(trend_filters)
+    holding_periods = [int(h) for h in holding_periods]
+
+    unknown = [f for f in trend_filters if f not in TREND_FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown trend filters {unknown}; expected one of {TREND_FILTERS}")
+    if any(h < 1 for h in holding_periods):
+        raise ValueError("holding_periods must be >= 1")
+
+    start = time.perf_counter()
+
+    trend_codes = {t.name: i for i, t in enumerate(Trend)}
+    bullish = panel.trend == trend_codes["BULLISH"]
+    bearish = panel.trend == trend_codes["BEARISH"]
+
+    # (tolerance x symbol x date) signal masks; NaN comparisons are False
+    tol = tolerances[:, None, None]
+    with np.errstate(invalid="ignore"):
+        long_touch = panel.close[None] <= panel.buy[None] * (1 + tol)
+        short_touch = panel.close[None] >= panel.sell[None] * (1 - tol)
+
+    filter_masks = {
+        "none": (np.True_, np.True_),
+        "with_trend": (bullish[None], bearish[None]),
+        "long_only": (np.True_, np.False_),
+        "short_only": (np.False_, np.True_),
+    }
+
+    per_symbol_frames: List[pd.DataFrame] = []
+    summary_rows = []
+    n_symbols = len(panel.symbols)
+
+    for holding_period in holding_periods:
+        fwd = _forward_returns(panel, holding_period)[None]
+        valid = ~np.isnan(fwd)
+
+        for trend_filter in trend_filters:
+            long_ok, short_ok = filter_masks[trend_filter]
+            longs = long_touch & long_ok & valid
+            shorts = short_touch & short_ok & valid
+
+            # Trade returns on the panel, 0 where there is no trade
+            returns = np.where(longs, fwd, 0.0) + np.where(shorts, -fwd, 0.0)
+            trades = longs.astype(np.int32) + shorts
+            hits = (longs & (fwd > 0)).astype(np.int32) + (shorts & (fwd < 0))
+
+            n_trades = trades.sum(axis=2)          # (tolerance x symbol)
+            n_hits = hits.sum(axis=2)
+            total_return = returns.sum(axis=2)
+            n_long = longs.sum(axis=2)
+            n_short = shorts.sum(axis=2)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                hit_rate = n_hits / n_trades
+                mean_return = total_return / n_trades
+
+            per_symbol_frames.append(pd.DataFrame({
+                "tolerance": np.repeat(tolerances, n_symbols),
+                "trend_filter": trend_filter,
+                "holding_period": holding_period,
+                "symbol": np.tile(panel.symbols, len(tolerances)),
+                "trades": n_trades.ravel(),
+                "longs": n_long.ravel(),
+                "shorts": n_short.ravel(),
+                "hit_rate": hit_rate.ravel(),
+                "mean_return": mean_return.ravel(),
+                "total_return": total_return.ravel(),
+            }))
+
+            agg_trades = n_trades.sum(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                agg_hit = n_hits.sum(axis=1) / agg_trades
+                agg_mean = total_return.sum(axis=1) / agg_trades
+            for i, tolerance in enumerate(tolerances):
+                summary_rows.append({
+                    "tolerance": tolerance,
+                    "trend_filter": trend_filter,
+                    "holding_period": holding_period,
+                    "symbols_traded": int((n_trades[i] > 0).sum()),
+                    "trades": int(agg_trades[i]),
+                    "longs": int(n_long[i].sum()),
+                    "shorts": int(n_short[i].sum()),
+                    "hit_rate": agg_hit[i],
+                    "mean_return": agg_mean[i],
+                })
+
+    per_symbol = pd.concat(per_symbol_frames, ignore_index=True) if per_symbol_frames else pd.DataFrame()
+    summary = pd.DataFrame(summary_rows)
+    if not summary.empty:
+        summary = summary.sort_values(PARAM_COLUMNS).reset_index(drop=True)
+
+    elapsed = time.perf_counter() - start
+    return BacktestResult(per_symbol=per_symbol, summary=summary, elapsed=elapsed)
+
+
+if __name__ == "__main__":
+    from hedgeye.ds.rr.use_rr import load_all_risk_range_data
+
+    panel = build_rr_panel(load_all_risk_range_data())
+    tolerances = [0.0, 0.0025, 0.005, 0.01]
+    holding_periods = [1, 3, 5, 10]
+    result = run_rr_backtest(panel, tolerances=tolerances,
+                             trend_filters=TREND_FILTERS,
+                             holding_periods=holding_periods)
+    n_sets = len(tolerances) * len(TREND_FILTERS) * len(holding_periods)
+    print(f"📈 Backtested {n_sets} parameter sets over {len(panel.symbols)} symbols "
+          f"x {len(panel.dates)} dates in {result.elapsed:.2f}s")
+    print(result.summary.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
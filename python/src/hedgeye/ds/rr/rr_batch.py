@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Column batches for one Risk Range (RR) report.
+
+RRDayBatch holds a report's entries and change events as RecordBatches
+(symbols, trends and buckets as categoricals, prices as float64 arrays) and
+writes the daily files in bulk:
+
+    risk_range_YYYY-MM-DD.csv      date,index,trend,buy_trade,sell_trade,prev_close,bucket
+    change_events_YYYY-MM-DD.csv   date,index,trend_from,trend_to,bucket_from,bucket_to,notes
+
+Enum columns hold the enum .name (BULLISH, IN, ...), matching the files
+written by parse_rr_eml.save_outputs and the categories in rr_schema.
+
+Usage:
+    from hedgeye.ds.rr.parse_rr import parse_rr_batch
+    batch = parse_rr_batch(eml_bytes)
+    batch.write_csv(csv_dir)
+    df = batch.to_frame()          # canonical RR schema
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Union
+
+import pandas as pd
+
+from hedgeye.ds.record_batch import RecordBatch
+from hedgeye.ds.rr.models import ChangeEvent, RiskRangeEntry
+from hedgeye.ds.rr.rr_schema import BUCKET_DTYPE, TREND_DTYPE, apply_rr_schema
+
+ENTRY_COLUMNS = ["date", "index", "trend", "buy_trade", "sell_trade", "prev_close", "bucket"]
+CHANGE_COLUMNS = ["date", "index", "trend_from", "trend_to", "bucket_from", "bucket_to", "notes"]
+
+
+def _enum_name(value):
+    return value.name if value is not None else None
+
+
+ENTRY_FIELDS = {
+    "index": "category",
+    "trend": (TREND_DTYPE, _enum_name),
+    "buy_trade": "float64",
+    "sell_trade": "float64",
+    "prev_close": "float64",
+    "bucket": (BUCKET_DTYPE, _enum_name),
+}
+
+CHANGE_FIELDS = {
+    "index": "category",
+    "trend_from": (TREND_DTYPE, _enum_name),
+    "trend_to": (TREND_DTYPE, _enum_name),
+    "bucket_from": (BUCKET_DTYPE, _enum_name),
+    "bucket_to": (BUCKET_DTYPE, _enum_name),
+    "notes": "object",
+}
+
+
+@dataclass(slots=True)
+class RRDayBatch:
+    """Entries and change events of one RR report, stored as columns."""
+    report_date: str
+    entries: RecordBatch
+    changes: RecordBatch
+
+    @classmethod
+    def from_models(cls, report_date: str, entries: List[RiskRangeEntry],
+                    changes: List[ChangeEvent]) -> "RRDayBatch":
+        """Build from parsed RiskRangeEntry / ChangeEvent lists."""
+        return cls(
+            report_date=report_date,
+            entries=RecordBatch.from_records(entries, ENTRY_FIELDS).with_column("date", report_date),
+            changes=RecordBatch.from_records(changes, CHANGE_FIELDS).with_column("date", report_date),
+        )
+
+    @classmethod
+    def from_rows(cls, report_date: str, rows: list, events: list) -> "RRDayBatch":
+        """
+        Build from parser tuples without creating per-row objects.
+
+        Args:
+            rows: (index, trend, buy, sell, prev_close, bucket) tuples
+            events: (index, trend_from, trend_to, bucket_from, bucket_to) tuples
+        """
+        entry_cols = dict(zip(list(ENTRY_FIELDS), zip(*rows))) if rows else \
+            {name: () for name in ENTRY_FIELDS}
+        event_names = [n for n in CHANGE_FIELDS if n != "notes"]
+        change_cols = dict(zip(event_names, zip(*events))) if events else \
+            {name: () for name in event_names}
+        change_cols["notes"] = [None] * len(events)
+        return cls(
+            report_date=report_date,
+            entries=RecordBatch.from_columns(entry_cols, ENTRY_FIELDS).with_column("date", report_date),
+            changes=RecordBatch.from_columns(change_cols, CHANGE_FIELDS).with_column("date", report_date),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Entries as a DataFrame in the canonical RR schema (see rr_schema)."""
+        return apply_rr_schema(self.entries.to_pandas(ENTRY_COLUMNS))
+
+    def changes_frame(self) -> pd.DataFrame:
+        return self.changes.to_pandas(CHANGE_COLUMNS)
+
+    def write_csv(self, csv_dir: Union[str, Path]) -> List[Path]:
+        """Write risk_range_<date>.csv and change_events_<date>.csv in bulk."""
+        csv_dir = Path(csv_dir)
+        return [
+            self.entries.write_csv(csv_dir / f"risk_range_{self.report_date}.csv", ENTRY_COLUMNS),
+            self.changes.write_csv(csv_dir / f"change_events_{self.report_date}.csv", CHANGE_COLUMNS),
+        ]
+
+    def write_parquet(self, output_dir: Union[str, Path]) -> List[Path]:
+        """Write the same two tables as Parquet (needs pyarrow)."""
+        output_dir = Path(output_dir)
+        return [
+            self.entries.write_parquet(output_dir / f"risk_range_{self.report_date}.parquet", ENTRY_COLUMNS),
+            self.changes.write_parquet(output_dir / f"change_events_{self.report_date}.parquet", CHANGE_COLUMNS),
+        ]
+
+    def write_markdown(self, md_path: Union[str, Path]) -> Path:
+        """Write the human-readable markdown summary of the report."""
+        md_path = Path(md_path)
+        md_path.parent.mkdir(parents=True, exist_ok=True)
+
+        lines = [
+            f"## Risk Range Entries — {self.report_date}\n\n",
+            "| Index | Trend | Buy | Sell | Prev Close | Bucket |\n",
+            "|-------|--------|------|------|-------------|--------|\n",
+        ]
+        lines += [f"| {index} | {trend} | {buy} | {sell} | {close} | {bucket} |\n"
+                  for index, trend, buy, sell, close, bucket in self.entries.iter_rows(list(ENTRY_FIELDS))]
+        lines += [
+            f"\n## Change Events — {self.report_date}\n\n",
+            "| Index | Trend From | Trend To | Bucket From | Bucket To | Notes |\n",
+            "|--------|-------------|----------|--------------|-------------|--------|\n",
+        ]
+        lines += [f"| {index} | {t_from} | {t_to} | {b_from} | {b_to} | {notes} |\n"
+                  for index, t_from, t_to, b_from, b_to, notes in self.changes.iter_rows(list(CHANGE_FIELDS))]
+        md_path.write_text("".join(lines))
+        return md_path
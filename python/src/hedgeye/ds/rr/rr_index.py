@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Per-symbol index over Risk Range (RR) history.
+
+The RR frame is sorted once by (symbol, date); each symbol then owns a
+contiguous slice of rows. Lookups never scan or re-sort the full frame:
+- latest(symbol): O(1)
+- as_of(symbol, date): O(log n) binary search within the symbol's slice
+- series(symbol, start, end): O(log n) + size of the result
+
+Usage:
+    from hedgeye.ds.rr.rr_index import RRIndex
+
+    rr_index = RRIndex(load_all_risk_range_data())
+    row = rr_index.latest("SPX")
+    window = rr_index.series("SPX", start="2025-10-01")
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from hedgeye.ds.rr.rr_schema import apply_rr_schema
+from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+
+DateLike = Union[str, datetime, pd.Timestamp, np.datetime64]
+
+
+class RRIndex:
+    """
+    Read-only index of RR rows, grouped by symbol and sorted by date.
+
+    Attributes:
+        frame: The sorted RR DataFrame backing the index (do not mutate)
+    """
+
+    def __init__(self, rr_df: pd.DataFrame):
+        """
+        Build the index.
+
+        Args:
+            rr_df: RR DataFrame (any row order); coerced to the RR schema
+        """
+        df = apply_rr_schema(rr_df.copy())
+        df = df[df["index"].notna()]
+
+        codes = df["index"].cat.codes.to_numpy()
+        dates = df["date"].to_numpy()
+        order = np.lexsort((dates, codes))  # stable: same-date rows keep file order
+
+        self.frame = df.iloc[order].reset_index(drop=True)
+        self._dates = self.frame["date"].to_numpy()
+
+        codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(codes)] if len(codes) else np.array([], dtype=int)
+        categories = self.frame["index"].cat.categories
+
+        self._slices: Dict[str, Tuple[int, int]] = {
+            categories[codes[s]]: (int(s), int(e)) for s, e in zip(starts, ends)
+        }
+        self._canonical: Dict[str, str] = {}
+        for symbol in self._slices:
+            self._canonical.setdefault(canonicalize_symbol(symbol), symbol)
+
+        self._latest = self.frame.iloc[ends - 1].reset_index(drop=True) if len(ends) else self.frame.iloc[0:0]
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.resolve(symbol) is not None
+
+    def symbols(self) -> List[str]:
+        """Return all symbols in the index, sorted."""
+        return sorted(self._slices)
+
+    def resolve(self, symbol: str) -> Optional[str]:
+        """
+        Find the symbol as stored in the index, handling case/naming variations.
+
+        Tries an exact match first, then any stored symbol with the same
+        canonical form (e.g. 'Bitcoin' -> 'BITCOIN').
+        """
+        if symbol in self._slices:
+            return symbol
+        return self._canonical.get(canonicalize_symbol(symbol))
+
+    def _bounds(self, symbol: str) -> Optional[Tuple[int, int]]:
+        stored = self.resolve(symbol)
+        return self._slices.get(stored) if stored is not None else None
+
+    def latest(self, symbol: str) -> Optional[pd.Series]:
+        """
+        Get the most recent RR row for a symbol.
+
+        Returns:
+            Series with the latest row, or None if the symbol is unknown
+        """
+        bounds = self._bounds(symbol)
+        if bounds is None:
+            return None
+        return self.frame.iloc[bounds[1] - 1]
+
+    def latest_frame(self) -> pd.DataFrame:
+        """Return one row per symbol: the most recent RR entry."""
+        return self._latest
+
+    def as_of(self, symbol: str, date: DateLike) -> Optional[pd.Series]:
+        """
+        Get the RR row in effect on a date (latest row on or before it).
+
+        Returns:
+            Series with the row, or None if no row exists on or before date
+        """
+        bounds = self._bounds(symbol)
+        if bounds is None:
+            return None
+        start, end = bounds
+        pos = start + np.searchsorted(self._dates[start:end], np.datetime64(pd.Timestamp(date)), side="right")
+        if pos == start:
+            return None
+        return self.frame.iloc[pos - 1]
+
+    def series(self, symbol: str, start: Optional[DateLike] = None,
+               end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Get a symbol's RR rows between start and end (inclusive), sorted by date.
+
+        Args:
+            symbol: Symbol to look up
+            start: Earliest date to include (None = from the beginning)
+            end: Latest date to include (None = to the end)
+
+        Returns:
+            DataFrame slice (empty if the symbol is unknown)
+        """
+        bounds = self._bounds(symbol)
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        lo, hi = bounds
+        dates = self._dates[lo:hi]
+        if start is not None:
+            lo_off = np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left")
+        else:
+            lo_off = 0
+        if end is not None:
+            hi_off = np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right")
+        else:
+            hi_off = len(dates)
+        return self.frame.iloc[lo + lo_off:lo + hi_off]
+
+
+def as_rr_index(rr: Union[pd.DataFrame, RRIndex]) -> RRIndex:
+    """Return rr unchanged if it is already an RRIndex, otherwise index it."""
+    if isinstance(rr, RRIndex):
+        return rr
+    return RRIndex(rr)
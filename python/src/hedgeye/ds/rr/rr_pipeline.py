@@ -4,17 +4,22 @@ Core pipeline orchestration functions for Hedgeye Risk Range™ data processing.
 
 This module provides composable pipeline functions that can be run independently
 or as part of the full pipeline. All core pipeline logic is centralized here.
+Each step runs in a metrics span ("rr.<step>", see hedgeye.ds.metrics).
 """
 
 import pandas as pd
 from typing import Optional
 
+from hedgeye.ds import metrics
 from hedgeye.ds.rr.run_rr_parser import main as run_parser_main
 from hedgeye.ds.rr.use_rr import load_all_risk_range_data, save_combined_risk_range_df, generate_all_plots
-from hedgeye.ds.rr.enhanced_rr_plotting import generate_enhanced_plots
-from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+from hedgeye.ds.rr.enhanced_rr_plotting import generate_enhanced_plots, get_latest_fmp_prices
+from hedgeye.ds.rr.rr_status import compute_rr_status, save_rr_status, print_rr_status_summary
+from hedgeye.ds.rr.rr_schema import canonicalize_rr_symbols
+from hedgeye.ds.rr.trend_timeline import TrendTimeline, update_trend_timeline
 
 
+@metrics.span("rr.parse")
 def run_rr_parsing_step(file_path: Optional[str] = None) -> None:
     """
     Run the email parsing step of the Risk Range pipeline.
@@ -33,6 +38,7 @@ def run_rr_parsing_step(file_path: Optional[str] = None) -> None:
     print("✅ Email parsing completed")
 
 
+@metrics.span("rr.combine")
 def run_rr_combine_step() -> pd.DataFrame:
     """
     Run the Risk Range data combination step with symbol canonicalization.
@@ -44,15 +50,29 @@ def run_rr_combine_step() -> pd.DataFrame:
     df = load_all_risk_range_data()
     
     print("=== Step: Applying symbol canonicalization ===")
-    df['index'] = df['index'].apply(canonicalize_symbol)
+    df = canonicalize_rr_symbols(df)
     
     print("=== Step: Saving combined dataframe ===")
     save_combined_risk_range_df(df)
+    metrics.count("rows", len(df))
     
     print(f"✅ Combined {len(df)} records from {df['index'].nunique()} symbols")
     return df
 
 
+@metrics.span("rr.timeline")
+def run_rr_timeline_step() -> TrendTimeline:
+    """
+    Update the materialized trend/bucket timeline from new daily CSVs.
+    
+    Returns:
+        TrendTimeline for state-at-date and recent-flip queries
+    """
+    print("=== Step: Updating trend timeline ===")
+    return update_trend_timeline()
+
+
+@metrics.span("rr.basic_plots")
 def run_rr_basic_plots_step(df: Optional[pd.DataFrame] = None) -> None:
     """
     Run basic Risk Range plotting step.
@@ -63,48 +83,87 @@ def run_rr_basic_plots_step(df: Optional[pd.DataFrame] = None) -> None:
     print("=== Step: Generating basic plots ===")
     if df is None:
         df = load_all_risk_range_data()
-        df['index'] = df['index'].apply(canonicalize_symbol)
+        df = canonicalize_rr_symbols(df)
     
     generate_all_plots(df)
     print("✅ Basic plotting completed")
 
 
+@metrics.span("rr.status")
+def run_rr_status_step(df: Optional[pd.DataFrame] = None,
+                       latest_prices: Optional[pd.DataFrame] = None,
+                       run_starts: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Compute and save the Risk Range status table (no plotting).
+    
+    Args:
+        df: Optional DataFrame. If None, loads combined data.
+        latest_prices: Optional latest FMP prices. If None, fetches them.
+        run_starts: Optional current trend run starts per symbol. If None,
+                    derived from df (which must then hold full history).
+        
+    Returns:
+        Status DataFrame (one row per symbol)
+    """
+    print("=== Step: Computing Risk Range status ===")
+    if df is None:
+        df = load_all_risk_range_data()
+        df = canonicalize_rr_symbols(df)
+    if latest_prices is None:
+        latest_prices = get_latest_fmp_prices()
+    
+    status_df = compute_rr_status(df, latest_prices, run_starts=run_starts)
+    output_path = save_rr_status(status_df)
+    print_rr_status_summary(status_df)
+    metrics.count("rows", len(status_df))
+    print(f"✅ Status for {len(status_df)} symbols saved to {output_path}")
+    return status_df
+
+
+@metrics.span("rr.enhanced_plots")
 def run_rr_enhanced_plots_step(df: Optional[pd.DataFrame] = None, 
                                start_date: str = "2025-10-01",
                                **kwargs) -> None:
     """
     Run enhanced Risk Range plotting step with FMP price integration.
     
+    Also writes the status table, reusing the same latest prices.
+    
     Args:
-        df: Optional DataFrame. If None, loads combined data.
+        df: Optional DataFrame. If None, loads only data from start_date on
+            and takes trend run starts from the trend timeline.
         start_date: Earliest date to include in plots (default: 2025-10-01).
                     RR data has a gap from end of June to October, so we exclude earlier data.
         **kwargs: Additional options for enhanced plotting
     """
     print("=== Generating Enhanced Risk Range Plots ===")
     
+    run_starts = None
     if df is None:
-        df = load_all_risk_range_data()
-        df['index'] = df['index'].apply(canonicalize_symbol)
+        timeline = TrendTimeline.load()
+        if timeline.intervals.empty:
+            # No timeline yet: status needs full history for trend run starts
+            df = load_all_risk_range_data()
+        else:
+            df = load_all_risk_range_data(start=start_date)
+            current = timeline.current("trend")
+            run_starts = pd.Series(current["start_date"].to_numpy(), index=current["symbol"].to_numpy())
+        df = canonicalize_rr_symbols(df)
+    
+    print("Fetching latest FMP prices...")
+    latest_prices = get_latest_fmp_prices()
+    
+    run_rr_status_step(df, latest_prices, run_starts=run_starts)
     
     # Generate plots for all symbols with latest prices
     print(f"\nGenerating all plots with latest FMP prices (data from {start_date} onwards)...")
-    generate_enhanced_plots(df, include_latest_prices=True, start_date=start_date, **kwargs)
-
-    # Option 3: Create summary dashboard (DISABLED - not useful currently)
-    # TODO: Redesign high-utility dashboard later
-    # print("\n3. Creating summary dashboard...")
-    # summary = create_summary_dashboard()
-    #
-    # if summary is not None and not summary.empty:
-    #     print("\nRisk Range Status Summary:")
-    #     status_summary = summary['status'].value_counts()
-    #     for status, count in status_summary.items():
-    #         print(f"  {status}: {count} symbols")
+    generate_enhanced_plots(df, include_latest_prices=True, start_date=start_date,
+                            latest_prices=latest_prices, **kwargs)
 
     print("\n✅ Enhanced plotting complete!")
 
 
+@metrics.span("rr.pipeline")
 def run_full_rr_pipeline(
     parse_emails: bool = True,
     combine_data: bool = True, 
@@ -137,6 +196,7 @@ def run_full_rr_pipeline(
     
     if combine_data:
         df = run_rr_combine_step()
+        run_rr_timeline_step()
     
     if generate_basic_plots:
         run_rr_basic_plots_step(df)
@@ -149,7 +209,7 @@ def run_full_rr_pipeline(
     # Return final dataframe (load if not already loaded)
     if df is None:
         df = load_all_risk_range_data()
-        df['index'] = df['index'].apply(canonicalize_symbol)
+        df = canonicalize_rr_symbols(df)
     
     return df
 
@@ -168,10 +228,6 @@ def run_rr_data_pipeline() -> pd.DataFrame:
 def run_rr_plotting_pipeline(df: Optional[pd.DataFrame] = None, 
                             start_date: str = "2025-10-01") -> None:
     """Run just the Risk Range plotting pipeline (enhanced plots only)."""
-    if df is None:
-        df = load_all_risk_range_data()
-        df['index'] = df['index'].apply(canonicalize_symbol)
-    
     run_rr_enhanced_plots_step(df, start_date=start_date)
 
 
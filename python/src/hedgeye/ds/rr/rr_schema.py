@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Canonical column schema for Risk Range (RR) data.
+
+Every RR frame handed to downstream code (merge, plotting, status) goes through
+apply_rr_schema() so that:
+- date is datetime64 (never re-parsed downstream)
+- index, trend and bucket are categoricals (one small int code per row)
+- buy_trade, sell_trade, prev_close are float64
+
+Prices stay float64: float32 only keeps ~7 significant digits, which is not
+enough for levels like BITCOIN (100000.00) or SPX to the cent.
+
+Usage:
+    from hedgeye.ds.rr.rr_schema import read_rr_csv, apply_rr_schema
+    df = read_rr_csv(path)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Union
+
+import pandas as pd
+
+from hedgeye.ds.rr.models import Trend
+
+RR_COLUMNS: List[str] = [
+    "date", "index", "trend", "buy_trade", "sell_trade", "prev_close", "bucket"
+]
+
+RR_PRICE_COLUMNS: List[str] = ["buy_trade", "sell_trade", "prev_close"]
+
+# Values as written by parse_rr_eml.save_outputs (enum .name)
+TREND_DTYPE = pd.CategoricalDtype([t.name for t in Trend])
+BUCKET_DTYPE = pd.CategoricalDtype(["IN", "OUT"])
+
+# dtypes passed straight to pd.read_csv (date handled via parse_dates)
+RR_CSV_DTYPES: Dict[str, Union[str, pd.CategoricalDtype]] = {
+    "index": "category",
+    "trend": TREND_DTYPE,
+    "bucket": BUCKET_DTYPE,
+    "buy_trade": "float64",
+    "sell_trade": "float64",
+    "prev_close": "float64",
+}
+
+
+def apply_rr_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce an RR DataFrame to the canonical schema.
+
+    Cheap when the frame already conforms (no re-parsing, no copies of
+    categorical columns). Unknown extra columns are kept as-is.
+
+    Args:
+        df: DataFrame with at least the RR_COLUMNS
+
+    Returns:
+        DataFrame with canonical dtypes
+    """
+    missing = [c for c in RR_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"RR data is missing columns: {missing}")
+
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"])
+
+    if not isinstance(df["index"].dtype, pd.CategoricalDtype):
+        df["index"] = df["index"].astype("category")
+
+    if df["trend"].dtype != TREND_DTYPE:
+        df["trend"] = df["trend"].astype(str).str.upper().astype(TREND_DTYPE)
+
+    if df["bucket"].dtype != BUCKET_DTYPE:
+        df["bucket"] = df["bucket"].fillna("IN").astype(str).str.upper().astype(BUCKET_DTYPE)
+
+    for col in RR_PRICE_COLUMNS:
+        if df[col].dtype != "float64":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+
+    return df
+
+
+def empty_rr_frame() -> pd.DataFrame:
+    """Return an empty DataFrame that conforms to the RR schema."""
+    df = pd.DataFrame({col: pd.Series(dtype="object") for col in RR_COLUMNS})
+    return apply_rr_schema(df)
+
+
+def read_rr_csv(csv_path: Path) -> pd.DataFrame:
+    """
+    Read an RR CSV (daily or combined) directly into the canonical schema.
+
+    Args:
+        csv_path: Path to risk_range_*.csv or combined_risk_range.csv
+
+    Returns:
+        DataFrame with canonical dtypes
+    """
+    df = pd.read_csv(csv_path, dtype=RR_CSV_DTYPES, parse_dates=["date"])
+    return apply_rr_schema(df)
+
+
+def concat_rr_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate RR frames, keeping categorical columns categorical.
+
+    pd.concat falls back to object dtype when category sets differ, so the
+    symbol categories are unioned first.
+    """
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return empty_rr_frame()
+
+    symbols = pd.api.types.union_categoricals(
+        [f["index"].astype("category") for f in frames]
+    ).categories
+    symbol_dtype = pd.CategoricalDtype(symbols)
+    frames = [f.assign(index=f["index"].astype(symbol_dtype)) for f in frames]
+
+    return apply_rr_schema(pd.concat(frames, ignore_index=True))
+
+
+def canonicalize_rr_symbols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply symbol canonicalization to the 'index' column.
+
+    Canonicalization runs once per distinct symbol (not once per row), and
+    the result stays categorical.
+    """
+    from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+
+    symbols = df["index"].astype("category")
+    mapping = {sym: canonicalize_symbol(sym) for sym in symbols.cat.categories}
+    df["index"] = symbols.astype(object).map(mapping).astype("category")
+    return df
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Vectorized Risk Range (RR) status for all symbols at once.
+
+Joins the latest RR row per symbol with the latest quotes and computes, in a
+single pass over whole columns:
+- status: BUY RANGE (price <= buy_trade), SELL RANGE (price >= sell_trade),
+  IN RANGE, or No Price Data
+- pct_to_buy / pct_to_sell: % distance from price to each band, relative to
+  price (negative = price is beyond that band)
+- range_width_pct: (sell_trade - buy_trade) as % of price
+- days_since_trend_change: days between the latest RR date and the first
+  date of the current trend run
+
+This is the "what's actionable today" view; it needs no plotting.
+
+Usage:
+    from hedgeye.ds.rr.rr_status import compute_rr_status, save_rr_status
+    status_df = compute_rr_status(rr_df, latest_prices)
+    save_rr_status(status_df)
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from hedgeye.config_loader import config_path
+from hedgeye.ds.rr.rr_index import RRIndex, as_rr_index
+from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+
+STATUS_BUY = "BUY RANGE"
+STATUS_SELL = "SELL RANGE"
+STATUS_IN = "IN RANGE"
+STATUS_NO_PRICE = "No Price Data"
+
+STATUS_DTYPE = pd.CategoricalDtype([STATUS_BUY, STATUS_IN, STATUS_SELL, STATUS_NO_PRICE])
+
+STATUS_COLUMNS = [
+    "symbol", "date", "trend", "buy_trade", "sell_trade", "prev_close", "price",
+    "status", "pct_to_buy", "pct_to_sell", "range_width_pct",
+    "trend_since", "days_since_trend_change",
+]
+
+
+def trend_run_starts(rr: Union[pd.DataFrame, RRIndex]) -> pd.Series:
+    """
+    First date of the current (latest) trend run for each symbol.
+
+    A run starts on a symbol's first row and on every row whose trend differs
+    from the previous row of the same symbol.
+
+    Returns:
+        Series indexed by symbol with the run start date
+    """
+    frame = as_rr_index(rr).frame  # sorted by (symbol, date)
+    codes = frame["index"].cat.codes.to_numpy()
+    trends = frame["trend"].cat.codes.to_numpy()
+
+    new_run = np.ones(len(frame), dtype=bool)
+    new_run[1:] = (codes[1:] != codes[:-1]) | (trends[1:] != trends[:-1])
+
+    starts = frame.loc[new_run, ["index", "date"]]
+    return starts.groupby("index", observed=True)["date"].max()
+
+
+def _quote_lookup(latest_prices: Optional[pd.DataFrame]) -> pd.Series:
+    """Map he_symbol (and its canonical form) to price."""
+    if latest_prices is None or latest_prices.empty:
+        return pd.Series(dtype="float64")
+    quotes = latest_prices.dropna(subset=["price"]).drop_duplicates("he_symbol")
+    prices = pd.Series(quotes["price"].astype("float64").to_numpy(),
+                       index=quotes["he_symbol"].astype(str))
+    canonical = prices.copy()
+    canonical.index = [canonicalize_symbol(s) for s in prices.index]
+    # Exact symbols win over canonical aliases
+    return pd.concat([prices, canonical[~canonical.index.isin(prices.index)]]) \
+             .groupby(level=0).first()
+
+
+def compute_rr_status(rr: Union[pd.DataFrame, RRIndex],
+                      latest_prices: Optional[pd.DataFrame] = None,
+                      run_starts: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Compute RR status for every symbol.
+
+    Args:
+        rr: RR history (DataFrame or RRIndex)
+        latest_prices: Quotes with he_symbol and price columns (e.g. from
+            enhanced_rr_plotting.get_latest_fmp_prices); None = no quotes
+        run_starts: Current trend run start per symbol (e.g. from the trend
+            timeline); None = derive from rr, which then needs full history
+
+    Returns:
+        DataFrame with STATUS_COLUMNS, one row per symbol, sorted by symbol
+    """
+    rr_index = as_rr_index(rr)
+    latest = rr_index.latest_frame()
+
+    status_df = pd.DataFrame({
+        "symbol": latest["index"].astype(str).to_numpy(),
+        "date": latest["date"].to_numpy(),
+        "trend": latest["trend"].array,
+        "buy_trade": latest["buy_trade"].to_numpy(),
+        "sell_trade": latest["sell_trade"].to_numpy(),
+        "prev_close": latest["prev_close"].to_numpy(),
+    })
+
+    # Quotes: exact symbol first, then canonical form
+    quotes = _quote_lookup(latest_prices)
+    price = status_df["symbol"].map(quotes)
+    missing = price.isna()
+    if missing.any():
+        canonical = status_df.loc[missing, "symbol"].map(canonicalize_symbol)
+        price[missing] = canonical.map(quotes)
+    status_df["price"] = price.astype("float64")
+
+    p = status_df["price"].to_numpy()
+    buy = status_df["buy_trade"].to_numpy()
+    sell = status_df["sell_trade"].to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        status_df["pct_to_buy"] = (p - buy) / p * 100
+        status_df["pct_to_sell"] = (sell - p) / p * 100
+        status_df["range_width_pct"] = (sell - buy) / p * 100
+
+    status = np.select(
+        [np.isnan(p), p <= buy, p >= sell],
+        [STATUS_NO_PRICE, STATUS_BUY, STATUS_SELL],
+        default=STATUS_IN,
+    )
+    status_df["status"] = pd.Categorical(status, dtype=STATUS_DTYPE)
+
+    if run_starts is None:
+        run_starts = trend_run_starts(rr_index)
+    status_df["trend_since"] = status_df["symbol"].map(run_starts)
+    status_df["days_since_trend_change"] = (status_df["date"] - status_df["trend_since"]).dt.days
+
+    return status_df[STATUS_COLUMNS].sort_values("symbol").reset_index(drop=True)
+
+
+def get_rr_status_path() -> Path:
+    """Default location of the status table (next to combined_risk_range.csv)."""
+    return config_path("combined_csv_output_dir") / "rr_status.csv"
+
+
+def save_rr_status(status_df: pd.DataFrame, output_path: Optional[Path] = None) -> Path:
+    """
+    Write the status table as CSV.
+
+    Args:
+        status_df: Output of compute_rr_status()
+        output_path: Destination (default: get_rr_status_path())
+
+    Returns:
+        Path written
+    """
+    output_path = Path(output_path) if output_path else get_rr_status_path()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    status_df.to_csv(output_path, index=False, float_format="%.4f", date_format="%Y-%m-%d")
+    return output_path
+
+
+def print_rr_status_summary(status_df: pd.DataFrame, top_n: int = 10) -> None:
+    """Print status counts and the symbols closest to a band."""
+    print("\nRisk Range Status Summary:")
+    for status, count in status_df["status"].value_counts(sort=False).items():
+        if count:
+            print(f"  {status}: {count} symbols")
+
+    priced = status_df[status_df["status"] != STATUS_NO_PRICE]
+    if priced.empty:
+        return
+
+    edge = np.minimum(priced["pct_to_buy"].abs(), priced["pct_to_sell"].abs())
+    nearest = priced.assign(edge_pct=edge).nsmallest(top_n, "edge_pct")
+    print(f"\n  Closest to a band (top {len(nearest)}):")
+    for row in nearest.itertuples(index=False):
+        print(f"    {row.symbol:<10} {row.status:<11} price={row.price:.2f} "
+              f"buy={row.buy_trade:.2f} ({row.pct_to_buy:+.2f}%) "
+              f"sell={row.sell_trade:.2f} ({row.pct_to_sell:+.2f}%) "
+              f"trend={row.trend} for {row.days_since_trend_change}d")
@@ -1,17 +1,17 @@
 import re
 import sys
 from pathlib import Path
+from typing import Iterable
 from hedgeye.ds.rr.parse_rr_eml import parse_eml, save_outputs
-from hedgeye.config_loader import load_config
+from hedgeye.config_loader import config_path
+from hedgeye.ds import metrics
+from hedgeye.ds.dir_manifest import get_manifest
 
-# Load config
-config = load_config()
-RAW_EML_DIR = config["paths"]["raw_eml_dir"]
-CSV_OUTPUT_DIR = config["paths"]["csv_output_dir"]
+RR_EML_RE = re.compile(r"risk_range_(\d{4}-\d{2}-\d{2})\.eml")
 
 def rename_non_standard_files():
     """Rename files that don't match risk_range_YYYY-MM-DD.eml pattern"""
-    raw_dir = Path(RAW_EML_DIR)
+    raw_dir = config_path("raw_eml_dir")
     for eml_file in raw_dir.glob("*.eml"):
         # Skip if already in correct format
         if re.match(r"risk_range_\d{4}-\d{2}-\d{2}\.eml", eml_file.name):
@@ -34,23 +34,47 @@ def process_single_file(file_path: str):
     save_outputs(report_date, entries, changes)
     print(f"✅ Processed single file: {Path(file_path).name}")
 
-def process_all_unprocessed():
-    # First, rename any files that don't match the standard format
-    rename_non_standard_files()
+def process_files(eml_files: Iterable[Path]) -> int:
+    """
+    Parse the given RR emails unless their daily CSV already exists.
 
-    raw_dir = Path(RAW_EML_DIR)
-    for eml_file in raw_dir.glob("risk_range_*.eml"):
+    Files named risk_range_YYYY-MM-DD.eml are checked by name, without
+    parsing; other names are parsed and renamed to the standard form.
+
+    Returns:
+        Number of emails parsed and saved
+    """
+    csv_dir = config_path("csv_output_dir")
+    processed = 0
+    for eml_file in map(Path, eml_files):
+        match = RR_EML_RE.fullmatch(eml_file.name)
+        if match and match.group(1) in get_manifest(csv_dir, "risk_range_"):
+            print(f"⏭️ Skipped (already exists): {eml_file.name}")
+            continue
         try:
-            report_date, _, _ = parse_eml(str(eml_file))
-            out_csv = Path(CSV_OUTPUT_DIR) / f"risk_range_{report_date}.csv"
-            if not out_csv.exists():
-                report_date, entries, changes = parse_eml(str(eml_file))
-                save_outputs(report_date, entries, changes)
-                print(f"✅ Processed: {eml_file.name}")
-            else:
+            report_date, entries, changes = parse_eml(str(eml_file))
+            if not match:
+                new_path = eml_file.parent / f"risk_range_{report_date}.eml"
+                eml_file.rename(new_path)
+                print(f"📝 Renamed: {eml_file.name} → {new_path.name}")
+                eml_file = new_path
+            if report_date in get_manifest(csv_dir, "risk_range_"):
                 print(f"⏭️ Skipped (already exists): {eml_file.name}")
+                continue
+            save_outputs(report_date, entries, changes)
+            metrics.count("files")
+            metrics.count("rows", len(entries))
+            print(f"✅ Processed: {eml_file.name}")
+            processed += 1
         except Exception as e:
             print(f"❌ Error processing {eml_file.name}: {e}")
+    return processed
+
+@metrics.span("rr.parse_emails")
+def process_all_unprocessed():
+    # First, rename any files that don't match the standard format
+    rename_non_standard_files()
+    process_files(sorted(config_path("raw_eml_dir").glob("risk_range_*.eml")))
 
 def main():
     if len(sys.argv) > 1:
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Materialized trend/bucket timeline for Risk Range (RR) symbols.
+
+Per symbol, every run of an unchanged trend (BULLISH/BEARISH/NEUTRAL) or
+bucket (IN/OUT) becomes one interval row:
+
+    symbol, kind, state, start_date, end_date, last_seen
+
+- kind is "trend" or "bucket"
+- end_date is the start of the next interval (exclusive); NaT while current
+- last_seen is the last report date that confirmed the state
+
+The timeline is built from the daily change_events_*.csv files and the daily
+risk_range_*.csv entries, and updated incrementally: only report dates newer
+than the last update are read, and only the open interval of each symbol is
+extended or closed. The state file records which daily files were read,
+with each file's (mtime_ns, size) signature; a file dated on or before the
+last update that is not among them (a late email, a re-parse that produced a
+missing day, a backfill), or whose signature changed since (a re-parse that
+rewrote the day), triggers a full rebuild.
+
+Stored next to combined_risk_range.csv:
+    trend_timeline.csv          interval rows
+    trend_timeline_state.json   last report date included, signatures of the files read
+
+Usage:
+    from hedgeye.ds.rr.trend_timeline import update_trend_timeline, TrendTimeline
+    timeline = update_trend_timeline()
+    timeline.state_at("SPX", "2025-10-15")      # 'BULLISH'
+    timeline.current_run("SPX")                  # state, since, days
+    timeline.flips("2025-11-10", "2025-11-14")   # symbols that changed trend
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from hedgeye.config_loader import config_path
+from hedgeye.ds.dir_manifest import get_manifest
+from hedgeye.ds.rr.rr_schema import read_rr_csv, concat_rr_frames, canonicalize_rr_symbols
+from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+
+DateLike = Union[str, datetime, pd.Timestamp, np.datetime64]
+
+KINDS = ("trend", "bucket")
+
+TIMELINE_COLUMNS = ["symbol", "kind", "state", "start_date", "end_date", "last_seen"]
+
+TIMELINE_FILE = "trend_timeline.csv"
+STATE_FILE = "trend_timeline_state.json"
+
+# Daily file prefixes the timeline is built from
+SOURCE_PREFIXES = ("risk_range", "change_events")
+
+
+# Same-day observations: the RR table wins over a change-event line
+_SOURCE_PRIORITY = {"change_event": 0, "rr": 1}
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+def _dated_files(csv_dir: Path, prefix: str, after: Optional[pd.Timestamp] = None) -> List[Tuple[pd.Timestamp, Path]]:
+    """<prefix>_YYYY-MM-DD.csv files (from the directory's manifest), optionally only those dated after a date."""
+    manifest = get_manifest(csv_dir, f"{prefix}_")
+    files = [(pd.Timestamp(key), manifest.path(key)) for key in manifest.keys()]
+    return [(d, p) for d, p in files if after is None or d > after]
+
+
+def _file_signatures(csv_dir: Path) -> Dict[str, Dict[str, List[int]]]:
+    """
+    [mtime_ns, size] of the daily files, per prefix and report date (YYYY-MM-DD).
+
+    A file removed since the directory was listed is left out.
+    """
+    signatures: Dict[str, Dict[str, List[int]]] = {}
+    for prefix in SOURCE_PREFIXES:
+        manifest = get_manifest(csv_dir, f"{prefix}_")
+        signatures[prefix] = {}
+        for key in manifest.keys():
+            try:
+                st = os.stat(manifest.path(key))
+            except FileNotFoundError:
+                continue
+            signatures[prefix][key] = [st.st_mtime_ns, st.st_size]
+    return signatures
+
+
+def _observations_from_rr(rr_df: pd.DataFrame) -> pd.DataFrame:
+    """One trend and one bucket observation per RR row."""
+    if rr_df.empty:
+        return pd.DataFrame(columns=["symbol", "kind", "state", "date", "source"])
+    symbol = rr_df["index"].astype(str).to_numpy()
+    date = rr_df["date"].to_numpy()
+    return pd.concat([
+        pd.DataFrame({"symbol": symbol, "kind": "trend",
+                      "state": rr_df["trend"].astype(str).to_numpy(), "date": date, "source": "rr"}),
+        pd.DataFrame({"symbol": symbol, "kind": "bucket",
+                      "state": rr_df["bucket"].astype(str).to_numpy(), "date": date, "source": "rr"}),
+    ], ignore_index=True)
+
+
+def _observations_from_events(events: pd.DataFrame) -> pd.DataFrame:
+    """Trend/bucket observations from change-event rows (the 'to' side)."""
+    frames = []
+    if events.empty:
+        return pd.DataFrame(columns=["symbol", "kind", "state", "date", "source"])
+    symbols = events["index"].astype(str).map(canonicalize_symbol)
+    for kind, col in (("trend", "trend_to"), ("bucket", "bucket_to")):
+        mask = events[col].notna() & (events[col].astype(str) != "")
+        if mask.any():
+            frames.append(pd.DataFrame({
+                "symbol": symbols[mask].to_numpy(),
+                "kind": kind,
+                "state": events.loc[mask, col].astype(str).str.upper().to_numpy(),
+                "date": pd.to_datetime(events.loc[mask, "date"]).to_numpy(),
+                "source": "change_event",
+            }))
+    if not frames:
+        return pd.DataFrame(columns=["symbol", "kind", "state", "date", "source"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_observations(csv_dir: Path, after: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Read trend/bucket observations from the daily RR and change-event CSVs.
+
+    Args:
+        csv_dir: Directory holding risk_range_*.csv and change_events_*.csv
+        after: Only read files dated after this report date (None = all)
+
+    Returns:
+        DataFrame with symbol, kind, state, date, source
+    """
+    rr_files = _dated_files(csv_dir, "risk_range", after)
+    event_files = _dated_files(csv_dir, "change_events", after)
+
+    rr_df = concat_rr_frames([read_rr_csv(p) for _, p in rr_files])
+    rr_df = canonicalize_rr_symbols(rr_df) if not rr_df.empty else rr_df
+
+    event_frames = [pd.read_csv(p, dtype=str, keep_default_na=False) for _, p in event_files]
+    events = pd.concat(event_frames, ignore_index=True) if event_frames else pd.DataFrame()
+
+    return pd.concat([_observations_from_rr(rr_df), _observations_from_events(events)],
+                     ignore_index=True)
+
+
+def build_intervals(observations: pd.DataFrame) -> pd.DataFrame:
+    """
+    Collapse observations into state intervals (vectorized run detection).
+
+    Args:
+        observations: symbol, kind, state, date[, source] rows in any order
+
+    Returns:
+        DataFrame with TIMELINE_COLUMNS, sorted by kind, symbol, start_date
+    """
+    if observations.empty:
+        return empty_timeline()
+
+    obs = observations.copy()
+    obs["date"] = pd.to_datetime(obs["date"])
+    obs["_priority"] = obs.get("source", pd.Series("rr", index=obs.index)).map(_SOURCE_PRIORITY).fillna(1)
+    obs = obs.sort_values(["kind", "symbol", "date", "_priority"], kind="stable")
+    obs = obs.drop_duplicates(["kind", "symbol", "date"], keep="last").reset_index(drop=True)
+
+    new_key = obs["kind"].ne(obs["kind"].shift()) | obs["symbol"].ne(obs["symbol"].shift())
+    new_run = new_key | obs["state"].ne(obs["state"].shift())
+    run_id = new_run.cumsum()
+
+    runs = obs.groupby(run_id, sort=False).agg(
+        symbol=("symbol", "first"),
+        kind=("kind", "first"),
+        state=("state", "first"),
+        start_date=("date", "first"),
+        last_seen=("date", "last"),
+    ).reset_index(drop=True)
+
+    # end_date = next run's start within the same symbol/kind
+    same_key_next = (runs["kind"].eq(runs["kind"].shift(-1)) &
+                     runs["symbol"].eq(runs["symbol"].shift(-1)))
+    runs["end_date"] = runs["start_date"].shift(-1).where(same_key_next)
+
+    return runs[TIMELINE_COLUMNS]
+
+
+def empty_timeline() -> pd.DataFrame:
+    """Return an empty timeline frame."""
+    return pd.DataFrame({
+        "symbol": pd.Series(dtype=str), "kind": pd.Series(dtype=str), "state": pd.Series(dtype=str),
+        "start_date": pd.Series(dtype="datetime64[ns]"), "end_date": pd.Series(dtype="datetime64[ns]"),
+        "last_seen": pd.Series(dtype="datetime64[ns]"),
+    })
+
+
+# ---------------------------------------------------------------------------
+# Persistence + incremental update
+# ---------------------------------------------------------------------------
+
+def get_timeline_dir() -> Path:
+    return config_path("combined_csv_output_dir")
+
+
+def load_timeline(timeline_dir: Optional[Path] = None) -> Tuple[pd.DataFrame, Optional[pd.Timestamp]]:
+    """
+    Load the stored timeline.
+
+    Returns:
+        (intervals, last report date included) — empty/None if never built
+    """
+    timeline_dir = Path(timeline_dir) if timeline_dir else get_timeline_dir()
+    timeline_path = timeline_dir / TIMELINE_FILE
+    state_path = timeline_dir / STATE_FILE
+    if not timeline_path.exists() or not state_path.exists():
+        return empty_timeline(), None
+
+    intervals = pd.read_csv(timeline_path, dtype=str,
+                            parse_dates=["start_date", "end_date", "last_seen"])
+    state = json.loads(state_path.read_text())
+    last_date = pd.Timestamp(state["last_date"]) if state.get("last_date") else None
+    return intervals[TIMELINE_COLUMNS], last_date
+
+
+def load_ingested(timeline_dir: Optional[Path] = None) -> Optional[Dict[str, Dict[str, List[int]]]]:
+    """
+    Signatures of the daily files the stored timeline was built from.
+
+    Returns:
+        {prefix: {YYYY-MM-DD: [mtime_ns, size]}}, or None if not recorded
+        (never built, or built before the state file recorded signatures)
+    """
+    timeline_dir = Path(timeline_dir) if timeline_dir else get_timeline_dir()
+    state_path = timeline_dir / STATE_FILE
+    if not state_path.exists():
+        return None
+    ingested = json.loads(state_path.read_text()).get("ingested")
+    if not isinstance(ingested, dict) or not all(isinstance(v, dict) for v in ingested.values()):
+        return None
+    return ingested
+
+
+def save_timeline(intervals: pd.DataFrame, last_date: Optional[pd.Timestamp],
+                  timeline_dir: Optional[Path] = None,
+                  ingested: Optional[Dict[str, Dict[str, List[int]]]] = None) -> Path:
+    """Write timeline CSV and state file (ingested: signatures of the files read, see _file_signatures)."""
+    timeline_dir = Path(timeline_dir) if timeline_dir else get_timeline_dir()
+    timeline_dir.mkdir(parents=True, exist_ok=True)
+    timeline_path = timeline_dir / TIMELINE_FILE
+    intervals.to_csv(timeline_path, index=False, date_format="%Y-%m-%d")
+    (timeline_dir / STATE_FILE).write_text(json.dumps({
+        "last_date": last_date.strftime("%Y-%m-%d") if last_date is not None else None,
+        "ingested": ingested,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    }, indent=2))
+    return timeline_path
+
+
+def _missed_files(signatures: Dict[str, Dict[str, List[int]]],
+                  ingested: Optional[Dict[str, Dict[str, List[int]]]],
+                  last_date: pd.Timestamp) -> Optional[List[str]]:
+    """
+    Daily files dated on or before last_date that the timeline has not read,
+    or that changed (mtime or size) since it read them.
+
+    Returns:
+        File stems like "risk_range_2025-10-14" (empty if none), or None if
+        the state does not record which files were read
+    """
+    if ingested is None:
+        return None
+    cutoff = last_date.strftime("%Y-%m-%d")
+    missed = []
+    for prefix, files in signatures.items():
+        seen = ingested.get(prefix, {})
+        missed.extend(f"{prefix}_{d}" for d, sig in files.items()
+                      if d <= cutoff and seen.get(d) != sig)
+    return missed
+
+
+def _extend_intervals(intervals: pd.DataFrame, new_obs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge observations newer than the timeline into it.
+
+    Closed intervals are untouched; each open interval is replayed as a pair of
+    observations (start and last_seen) together with the new ones.
+    """
+    open_mask = intervals["end_date"].isna()
+    closed = intervals[~open_mask]
+    open_rows = intervals[open_mask]
+
+    seeds = pd.concat([
+        pd.DataFrame({"symbol": open_rows["symbol"], "kind": open_rows["kind"],
+                      "state": open_rows["state"], "date": open_rows["start_date"], "source": "rr"}),
+        pd.DataFrame({"symbol": open_rows["symbol"], "kind": open_rows["kind"],
+                      "state": open_rows["state"], "date": open_rows["last_seen"], "source": "rr"}),
+    ], ignore_index=True)
+
+    rebuilt = build_intervals(pd.concat([seeds, new_obs], ignore_index=True))
+    merged = pd.concat([closed, rebuilt], ignore_index=True)
+    return merged.sort_values(["kind", "symbol", "start_date"]).reset_index(drop=True)
+
+
+def update_trend_timeline(csv_dir: Optional[Path] = None,
+                          timeline_dir: Optional[Path] = None,
+                          rebuild: bool = False) -> "TrendTimeline":
+    """
+    Bring the stored timeline up to date with the daily CSVs.
+
+    Args:
+        csv_dir: Daily CSV directory (default: paths.csv_output_dir)
+        timeline_dir: Where the timeline lives (default: paths.combined_csv_output_dir)
+        rebuild: Ignore the stored timeline and rebuild from all files
+
+    Returns:
+        TrendTimeline over the updated intervals
+    """
+    if csv_dir is None:
+        csv_dir = config_path("csv_output_dir")
+    csv_dir = Path(csv_dir)
+
+    intervals, last_date = (empty_timeline(), None) if rebuild else load_timeline(timeline_dir)
+    # Listed and stat'ed before reading: a file added or rewritten meanwhile is
+    # missing from the record (or recorded with its old signature) and, once
+    # older than the last update, forces a rebuild
+    signatures = _file_signatures(csv_dir)
+    ingested = load_ingested(timeline_dir) if last_date is not None else None
+
+    if last_date is not None:
+        # A file on or before the last update that was not read, or was
+        # rewritten since, means history changed: rebuild
+        missed = _missed_files(signatures, ingested, last_date)
+        if intervals.empty or missed is None:
+            print("⚠️  Timeline state does not record the files read; rebuilding")
+            intervals, last_date = empty_timeline(), None
+        elif missed:
+            print(f"⚠️  {len(missed)} daily file(s) older than the timeline are new or changed "
+                  f"(e.g. {missed[0]}); rebuilding")
+            intervals, last_date = empty_timeline(), None
+
+    new_obs = load_observations(csv_dir, after=last_date)
+    if new_obs.empty:
+        if last_date is not None and ingested != signatures:
+            # New files without observations: record them as read
+            save_timeline(intervals, last_date, timeline_dir, signatures)
+        print(f"✅ Trend timeline up to date ({len(intervals)} intervals)")
+        return TrendTimeline(intervals)
+
+    if last_date is None:
+        intervals = build_intervals(new_obs)
+        action = "Built"
+    else:
+        intervals = _extend_intervals(intervals, new_obs)
+        action = "Updated"
+
+    new_last = pd.Timestamp(new_obs["date"].max())
+    if last_date is not None:
+        new_last = max(new_last, last_date)
+    path = save_timeline(intervals, new_last, timeline_dir, signatures)
+    print(f"✅ {action} trend timeline: {len(intervals)} intervals through "
+          f"{new_last.date()} ({len(new_obs)} new observations) → {path}")
+    return TrendTimeline(intervals)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+class TrendTimeline:
+    """
+    Indexed interval queries over a trend/bucket timeline.
+
+    Per (kind, symbol), intervals are contiguous and sorted by start date, so
+    state_at() is a binary search and current_run() a direct lookup. flips()
+    binary-searches a start-date-sorted copy of all intervals.
+    """
+
+    def __init__(self, intervals: pd.DataFrame):
+        df = intervals.copy()
+        for col in ("start_date", "end_date", "last_seen"):
+            df[col] = pd.to_datetime(df[col])
+        self.intervals = df.sort_values(["kind", "symbol", "start_date"]).reset_index(drop=True)
+
+        self._starts = self.intervals["start_date"].to_numpy()
+        # Compared column by column: pandas drops a "\x00" separator joined onto object columns
+        kinds = self.intervals["kind"].to_numpy()
+        symbols = self.intervals["symbol"].to_numpy()
+        same_key_prev = np.r_[False, (kinds[1:] == kinds[:-1]) & (symbols[1:] == symbols[:-1])][:len(kinds)]
+        self._slices: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        if len(kinds):
+            bounds = np.flatnonzero(np.r_[~same_key_prev, True])
+            for s, e in zip(bounds[:-1], bounds[1:]):
+                self._slices[(kinds[s], symbols[s])] = (int(s), int(e))
+
+        # Interval starts in date order (with the preceding state), for flip queries
+        prev_state = self.intervals["state"].shift().where(same_key_prev)
+        by_start = self.intervals.assign(from_state=prev_state).sort_values("start_date", kind="stable")
+        self._by_start = by_start.reset_index(drop=True)
+        self._by_start_dates = self._by_start["start_date"].to_numpy()
+
+    @classmethod
+    def load(cls, timeline_dir: Optional[Path] = None) -> "TrendTimeline":
+        """Load the stored timeline (does not update it)."""
+        intervals, _ = load_timeline(timeline_dir)
+        return cls(intervals)
+
+    def _bounds(self, symbol: str, kind: str) -> Optional[Tuple[int, int]]:
+        bounds = self._slices.get((kind, symbol))
+        if bounds is None:
+            bounds = self._slices.get((kind, canonicalize_symbol(symbol)))
+        return bounds
+
+    def symbols(self, kind: str = "trend") -> List[str]:
+        return sorted(symbol for k, symbol in self._slices if k == kind)
+
+    def history(self, symbol: str, kind: str = "trend") -> pd.DataFrame:
+        """All intervals for a symbol, oldest first."""
+        bounds = self._bounds(symbol, kind)
+        if bounds is None:
+            return self.intervals.iloc[0:0]
+        return self.intervals.iloc[bounds[0]:bounds[1]]
+
+    def state_at(self, symbol: str, date: DateLike, kind: str = "trend") -> Optional[str]:
+        """
+        State in effect on a date.
+
+        Returns:
+            State name, or None if the date precedes the symbol's history
+        """
+        bounds = self._bounds(symbol, kind)
+        if bounds is None:
+            return None
+        start, end = bounds
+        pos = start + np.searchsorted(self._starts[start:end], np.datetime64(pd.Timestamp(date)), side="right")
+        if pos == start:
+            return None
+        return self.intervals.iat[pos - 1, self.intervals.columns.get_loc("state")]
+
+    def current_run(self, symbol: str, kind: str = "trend",
+                    as_of: Optional[DateLike] = None) -> Optional[Dict]:
+        """
+        The latest interval for a symbol ("how long has X been BULLISH").
+
+        Args:
+            as_of: Date to measure the run length to (default: last_seen)
+
+        Returns:
+            Dict with state, since, last_seen, days — or None if unknown
+        """
+        bounds = self._bounds(symbol, kind)
+        if bounds is None:
+            return None
+        row = self.intervals.iloc[bounds[1] - 1]
+        until = pd.Timestamp(as_of) if as_of is not None else row["last_seen"]
+        return {
+            "symbol": row["symbol"],
+            "state": row["state"],
+            "since": row["start_date"],
+            "last_seen": row["last_seen"],
+            "days": int((until - row["start_date"]).days),
+        }
+
+    def current(self, kind: str = "trend") -> pd.DataFrame:
+        """Open (current) interval for every symbol."""
+        df = self.intervals
+        return df[(df["kind"] == kind) & df["end_date"].isna()].reset_index(drop=True)
+
+    def flips(self, start: DateLike, end: Optional[DateLike] = None,
+              kind: str = "trend") -> pd.DataFrame:
+        """
+        State changes that happened between start and end (inclusive).
+
+        Only real changes are returned: a symbol's first interval is its first
+        appearance, not a flip.
+
+        Returns:
+            DataFrame with symbol, date, from_state, to_state
+        """
+        lo = np.searchsorted(self._by_start_dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = (np.searchsorted(self._by_start_dates, np.datetime64(pd.Timestamp(end)), side="right")
+              if end is not None else len(self._by_start_dates))
+        window = self._by_start.iloc[lo:hi]
+        window = window[(window["kind"] == kind) & window["from_state"].notna()]
+        return pd.DataFrame({
+            "symbol": window["symbol"].to_numpy(),
+            "date": window["start_date"].to_numpy(),
+            "from_state": window["from_state"].to_numpy(),
+            "to_state": window["state"].to_numpy(),
+        })
+
+
+if __name__ == "__main__":
+    timeline = update_trend_timeline()
+    current = timeline.current("trend")
+    print(f"\n{len(current)} symbols with a current trend")
+    week_ago = pd.Timestamp.now().normalize() - pd.Timedelta(days=7)
+    flips = timeline.flips(week_ago)
+    print(f"{len(flips)} trend flips since {week_ago.date()}")
+    if not flips.empty:
+        print(flips.to_string(index=False))
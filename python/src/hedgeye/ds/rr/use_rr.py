@@ -1,34 +1,105 @@
+import numpy as np
 import pandas as pd
+from datetime import datetime
 from pathlib import Path
-import matplotlib.pyplot as plt
-
-from hedgeye.config_loader import load_config
-
-def load_all_risk_range_data() -> pd.DataFrame:
-    config = load_config()
-    csv_dir = Path(config["paths"]["csv_output_dir"])
-    all_files = list(csv_dir.glob("*.csv"))
-    if not all_files:
+from typing import TYPE_CHECKING, Iterable, List, Optional, Union
+
+from hedgeye.config_loader import config_path, get_config
+from hedgeye.ds.dir_manifest import get_manifest
+from hedgeye.ds.file_cache import read_cached
+from hedgeye.ds.rr.rr_schema import read_rr_csv, concat_rr_frames
+from hedgeye.ds.rr.rr_index import RRIndex, as_rr_index
+from hedgeye.ds.rr.symbol_canonicalization import canonicalize_symbol
+from hedgeye.ds.plots.render_engine import PlotJob, arrays_from_frame, render_jobs
+from hedgeye.ds.plots.renderers import draw_rr_basic
+
+if TYPE_CHECKING:  # pyplot is imported when plotting (it is slow to import)
+    import matplotlib.pyplot as plt
+
+RR_PLOT_COLUMNS = ["date", "prev_close", "buy_trade", "sell_trade"]
+
+RR_FILE_PREFIX = "risk_range_"
+
+DateLike = Union[str, datetime, pd.Timestamp]
+
+def _as_timestamp(value: Optional[DateLike]) -> Optional[pd.Timestamp]:
+    return None if value is None else pd.Timestamp(value).normalize()
+
+
+def list_rr_files(csv_dir: Path, start: Optional[DateLike] = None,
+                  end: Optional[DateLike] = None) -> List[Path]:
+    """
+    Daily risk_range_YYYY-MM-DD.csv files whose report date is in [start, end].
+
+    The daily files are the date partitions of the RR history, so a date window
+    is pruned here, before any file is opened. The window is looked up in the
+    directory's manifest (see dir_manifest) rather than by listing it.
+    """
+    start, end = _as_timestamp(start), _as_timestamp(end)
+    return get_manifest(csv_dir, RR_FILE_PREFIX).between(
+        start.strftime("%Y-%m-%d") if start is not None else None,
+        end.strftime("%Y-%m-%d") if end is not None else None)
+
+
+def load_all_risk_range_data(start: Optional[DateLike] = None,
+                             end: Optional[DateLike] = None,
+                             symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Load daily RR CSVs into one frame with the canonical RR schema.
+
+    Only risk_range_*.csv files are read; the change_events_*.csv files that
+    live in the same directory have a different layout.
+
+    Args:
+        start: Earliest report date to load (inclusive); None = no limit
+        end: Latest report date to load (inclusive); None = no limit
+        symbols: Only keep these symbols, in any spelling with the same
+            canonical form (e.g. "Bitcoin" keeps BITCOIN and bitcoin rows);
+            None = all
+
+    Files outside [start, end] are never opened, so load time depends on the
+    window size rather than on the size of the archive. Symbol filtering is
+    applied per file, before the frames are combined, by canonicalizing each
+    file's symbol categories (not its rows).
+    """
+    csv_dir = config_path("csv_output_dir")
+    all_files = list_rr_files(csv_dir, start, end)
+    if not all_files and not len(get_manifest(csv_dir, RR_FILE_PREFIX)):
         raise FileNotFoundError(f"No CSV files found in {csv_dir}")
-    df_list = [pd.read_csv(file) for file in all_files]
-    return pd.concat(df_list, ignore_index=True)
+
+    start, end = _as_timestamp(start), _as_timestamp(end)
+    wanted = None
+    if symbols is not None:
+        wanted = {canonicalize_symbol(s) for s in symbols}
+
+    df_list = []
+    for file in all_files:
+        df = read_cached(file, read_rr_csv)  # shared: filtered/concatenated below, never modified
+        keep = np.ones(len(df), dtype=bool)
+        if start is not None:
+            keep &= (df["date"] >= start).to_numpy()
+        if end is not None:
+            keep &= (df["date"] <= end).to_numpy()
+        if wanted is not None:
+            # One flag per category, plus False for code -1 (missing symbol)
+            category_ok = np.array([canonicalize_symbol(c) in wanted for c in df["index"].cat.categories]
+                                   + [False])
+            keep &= category_ok[df["index"].cat.codes.to_numpy()]
+        df_list.append(df if keep.all() else df[keep])
+    return concat_rr_frames(df_list)
 
 def save_combined_risk_range_df(df: pd.DataFrame) -> None:
-    config = load_config()
-    output_path = Path(config["paths"]["combined_csv_output_dir"]) / "combined_risk_range.csv"
+    output_path = config_path("combined_csv_output_dir") / "combined_risk_range.csv"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    df.to_csv(output_path, index=False, date_format="%Y-%m-%d")
 
-def display_rr_1(df: pd.DataFrame, sym: str) -> None:
-    df_sym = df[df["index"] == sym].copy()
+def display_rr_1(df: Union[pd.DataFrame, RRIndex], sym: str) -> None:
+    import matplotlib.pyplot as plt
+    df_sym = as_rr_index(df).series(sym)
     if df_sym.empty:
         print(f"No data found for index: {sym}")
         return
 
-    # Ensure date is datetime type and sort
-    df_sym["date"] = pd.to_datetime(df_sym["date"])
-    df_sym.sort_values("date", inplace=True)
-
     plt.figure(figsize=(12, 6))
     plt.plot(df_sym["date"], df_sym["prev_close"], label="Prev Close", color="black")
     plt.plot(df_sym["date"], df_sym["buy_trade"], label="Buy Trade", color="green")
@@ -42,44 +113,37 @@ def display_rr_1(df: pd.DataFrame, sym: str) -> None:
     plt.tight_layout()
     plt.show()
 
-def display_rr(df: pd.DataFrame, index_symbol: str) -> plt.Figure:
-    symbol_df = df[df["index"] == index_symbol].copy()
-    symbol_df["date"] = pd.to_datetime(symbol_df["date"])
-    symbol_df.sort_values("date", inplace=True)
-
-    fig, ax = plt.subplots()
-    ax.plot(symbol_df["date"], symbol_df["prev_close"], label="Prev Close", color="black")
-    ax.plot(symbol_df["date"], symbol_df["buy_trade"], label="Buy Trade", color="green")
-    ax.plot(symbol_df["date"], symbol_df["sell_trade"], label="Sell Trade", color="red")
-
-    ax.set_title(f"Risk Range Time Series: {index_symbol}")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price")
-    ax.legend()
-
-    return fig
+def display_rr(df: Union[pd.DataFrame, RRIndex], index_symbol: str) -> "plt.Figure":
+    symbol_df = as_rr_index(df).series(index_symbol)
+    arrays = arrays_from_frame(symbol_df, RR_PLOT_COLUMNS)
+    return draw_rr_basic(arrays, {"title": f"Risk Range Time Series: {index_symbol}"})
 
 def generate_all_plots(df: pd.DataFrame = None):
     """Generate plots for all symbols. If df not provided, loads data internally."""
-    config = load_config()
+    config = get_config().data
 
     if df is None:
         df = load_all_risk_range_data()
-    
-    symbols = sorted(df["index"].unique())
+
+    rr_index = RRIndex(df)
+    symbols = rr_index.symbols()
 
     output_dir = Path(config["paths"]["plots_output_dir"])
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    jobs = []
     for sym in symbols:
-        fig = display_rr(df, sym)  # returns a matplotlib Figure
-
         safe_symbol = sym.replace("/", "-")
-        out_path = output_dir / f"{safe_symbol}.png"
-
-        fig.savefig(out_path, dpi=150)
-        plt.close(fig)
-        print(f"Saved plot: {out_path}")
+        jobs.append(PlotJob(
+            renderer="rr_basic",
+            out_path=output_dir / f"{safe_symbol}.png",
+            label=sym,
+            arrays=arrays_from_frame(rr_index.series(sym), RR_PLOT_COLUMNS),
+            meta={"title": f"Risk Range Time Series: {sym}"},
+        ))
+
+    result = render_jobs(jobs)
+    print(f"Saved {result.successful} plots ({result.cached} unchanged, {result.failed} failed) to {output_dir}")
 
 
 # Using:
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+One resolver for symbol identity.
+
+Which symbol is "the same" as another used to be answered separately by
+each consumer. SymbolResolver answers every question at once, for any
+input ticker:
+
+- canonical: canonicalize_symbol (SYMBOL_CANONICALIZATION_MAP, else upper case)
+- fmp:       FmpSymbol(etype, fmp_symbol) from he_to_fmp.csv, then the
+             manual matches of create_he_fmp_map; exact symbol first, then
+             its canonical form
+- yahoo:     explicit overrides (e.g. IBKR_YF_MAP), then the catalog
+             entity's yahoo_symbol, then YAHOO_FALLBACK_SYMBOLS for the
+             FMP symbol
+- proxy:     PToR(r_sym, proxy_type, inverted) from the p-to-r mapping
+             (exact, then canonical)
+- cid:       fin TickerCatalog canonical id (aliases, cids, bare .us tickers),
+             when a catalog is given
+
+The sources are read once into dicts. Each symbol gets a row id (symbols
+are interned); the answers are kept in one list per field, so a repeated
+resolve() is a dict lookup and list indexing. A symbol seen for the first
+time is resolved from the source dicts and appended.
+
+get_symbol_resolver() returns a process-wide resolver over the configured
+mapping files, rebuilt when either file changes (see mapping_cache).
+
+Usage:
+    from hedgeye.ds.symbol_resolver import get_symbol_resolver
+    resolver = get_symbol_resolver()
+    info = resolver.resolve("Bitcoin")   # SymbolInfo(symbol, canonical, fmp, yahoo, proxy, cid)
+    infos = resolver.resolve_many(["SPX", "AAAU", "NIKKEI"])   # {symbol: SymbolInfo}
+
+    # Portfolio tickers, with catalog aliases and Yahoo overrides
+    resolver = SymbolResolver.build(yahoo_overrides={"TUF": "TUF.V"}, catalog=TickerCatalog())
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from hedgeye.config_loader import get_config
+from hedgeye.ds.mapping_cache import (
+    CompiledMapping, FmpSymbol, PToR, get_he_to_fmp_mapping, get_p_to_r_mapping,
+)
+from hedgeye.ds.rr.symbol_canonicalization import SYMBOL_CANONICALIZATION_MAP, canonicalize_symbol
+
+
+class SymbolInfo(NamedTuple):
+    """Everything known about one input symbol (None where no source maps it)."""
+    symbol: str
+    canonical: str
+    fmp: Optional[FmpSymbol]
+    yahoo: Optional[str]
+    proxy: Optional[PToR]
+    cid: Optional[str]
+
+
+class SymbolResolver:
+    """
+    O(1) symbol lookups over every mapping source.
+
+    Attributes:
+        fmp_map: he_symbol -> FmpSymbol (he_to_fmp.csv over manual matches)
+        proxy_map: p_sym -> PToR
+        yahoo_overrides: ticker -> Yahoo symbol, checked first
+        yahoo_fallbacks: FMP symbol -> Yahoo symbol
+        catalog_map: upper-case ticker/cid -> (cid, yahoo_symbol) from the fin catalog
+    """
+
+    def __init__(self, fmp_map: Optional[Mapping[str, FmpSymbol]] = None,
+                 proxy_map: Optional[Mapping[str, PToR]] = None,
+                 yahoo_overrides: Optional[Mapping[str, str]] = None,
+                 yahoo_fallbacks: Optional[Mapping[str, str]] = None,
+                 catalog_map: Optional[Mapping[str, Tuple[str, Optional[str]]]] = None):
+        self.fmp_map = dict(fmp_map or {})
+        self.proxy_map = dict(proxy_map or {})
+        self.yahoo_overrides = dict(yahoo_overrides or {})
+        self.yahoo_fallbacks = dict(yahoo_fallbacks or {})
+        self.catalog_map = dict(catalog_map or {})
+
+        # symbol -> row; one list per answer
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._canonical: List[str] = []
+        self._fmp: List[Optional[FmpSymbol]] = []
+        self._yahoo: List[Optional[str]] = []
+        self._proxy: List[Optional[PToR]] = []
+        self._cid: List[Optional[str]] = []
+        self._lock = threading.Lock()
+
+        # Every symbol a source knows gets its row up front
+        known = (set(SYMBOL_CANONICALIZATION_MAP) | set(SYMBOL_CANONICALIZATION_MAP.values())
+                 | set(self.fmp_map) | set(self.proxy_map) | set(self.yahoo_overrides))
+        for symbol in sorted(known):
+            self._add(symbol)
+
+    @classmethod
+    def build(cls, he_to_fmp_path: Optional[Path] = None, p_to_r_path: Optional[Path] = None,
+              yahoo_overrides: Optional[Mapping[str, str]] = None, catalog: Any = None) -> "SymbolResolver":
+        """
+        Resolver over the configured (or given) mapping files.
+
+        Missing mapping files are skipped.
+
+        Args:
+            he_to_fmp_path: he_to_fmp.csv (default: config paths.fmp_mapping_file)
+            p_to_r_path: p-to-r mapping (default: config paths.p_to_r_mapping_file)
+            yahoo_overrides: ticker -> Yahoo symbol (e.g. IBKR_YF_MAP)
+            catalog: fin.catalog.TickerCatalog whose aliases to include
+        """
+        he_to_fmp, p_to_r = _load_mappings(he_to_fmp_path, p_to_r_path)
+        return cls(fmp_map=_fmp_map(he_to_fmp),
+                   proxy_map=p_to_r.by_key if p_to_r is not None else None,
+                   yahoo_overrides=yahoo_overrides,
+                   yahoo_fallbacks=_yahoo_fallbacks(),
+                   catalog_map=catalog.ticker_map() if catalog is not None else None)
+
+    # --- Resolution ---
+
+    def _lookup(self, mapping: Mapping[str, Any], symbol: str, canonical: str) -> Any:
+        found = mapping.get(symbol)
+        return found if found is not None else mapping.get(canonical)
+
+    def _add(self, symbol: str) -> int:
+        """Resolve a symbol from the sources and append its row."""
+        symbol = sys.intern(symbol)
+        canonical = sys.intern(canonicalize_symbol(symbol))
+        fmp = self._lookup(self.fmp_map, symbol, canonical)
+        catalog = self.catalog_map.get(symbol.upper().strip())
+        yahoo = self._lookup(self.yahoo_overrides, symbol, canonical)
+        if yahoo is None and catalog is not None:
+            yahoo = catalog[1]
+        if yahoo is None and fmp is not None:
+            yahoo = self.yahoo_fallbacks.get(fmp.fmp_symbol)
+
+        row = len(self._symbols)
+        self._symbols.append(symbol)
+        self._canonical.append(canonical)
+        self._fmp.append(fmp)
+        self._yahoo.append(yahoo)
+        self._proxy.append(self._lookup(self.proxy_map, symbol, canonical))
+        self._cid.append(catalog[0] if catalog is not None else None)
+        self._ids[symbol] = row
+        return row
+
+    def _row(self, symbol: str) -> int:
+        row = self._ids.get(symbol)
+        if row is None:
+            with self._lock:
+                row = self._ids.get(symbol)
+                if row is None:
+                    row = self._add(symbol)
+        return row
+
+    def resolve(self, symbol: str) -> SymbolInfo:
+        """Everything known about a symbol."""
+        row = self._row(symbol)
+        return SymbolInfo(self._symbols[row], self._canonical[row], self._fmp[row],
+                          self._yahoo[row], self._proxy[row], self._cid[row])
+
+    def resolve_many(self, symbols: Iterable[str]) -> Dict[str, SymbolInfo]:
+        """resolve() for each distinct symbol, keyed by symbol (input order)."""
+        return {s: self.resolve(s) for s in dict.fromkeys(symbols)}
+
+    # Single-answer shortcuts
+
+    def canonical(self, symbol: str) -> str:
+        return self._canonical[self._row(symbol)]
+
+    def fmp(self, symbol: str) -> Optional[FmpSymbol]:
+        return self._fmp[self._row(symbol)]
+
+    def yahoo(self, symbol: str) -> Optional[str]:
+        return self._yahoo[self._row(symbol)]
+
+    def proxy(self, symbol: str) -> Optional[PToR]:
+        return self._proxy[self._row(symbol)]
+
+    def cid(self, symbol: str) -> Optional[str]:
+        return self._cid[self._row(symbol)]
+
+    def canonical_many(self, symbols: Iterable[str]) -> List[str]:
+        """Canonical form of each symbol, in order."""
+        canonical, row = self._canonical, self._row
+        return [canonical[row(s)] for s in symbols]
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+# --- Sources ---
+
+def _load_mappings(he_to_fmp_path: Optional[Path], p_to_r_path: Optional[Path]
+                   ) -> Tuple[Optional[CompiledMapping], Optional[CompiledMapping]]:
+    """The compiled mapping files that exist (None for missing ones)."""
+    paths = get_config().paths
+    he_to_fmp_path = he_to_fmp_path or paths.get("fmp_mapping_file")
+    p_to_r_path = p_to_r_path or paths.get("p_to_r_mapping_file")
+    he_to_fmp = get_he_to_fmp_mapping(he_to_fmp_path) if he_to_fmp_path and Path(he_to_fmp_path).exists() else None
+    p_to_r = get_p_to_r_mapping(p_to_r_path) if p_to_r_path and Path(p_to_r_path).exists() else None
+    return he_to_fmp, p_to_r
+
+
+def _fmp_map(he_to_fmp: Optional[CompiledMapping]) -> Dict[str, FmpSymbol]:
+    """Manual matches, overridden by the generated he_to_fmp.csv."""
+    from hedgeye.ds.fmp.create_he_fmp_map import get_manual_matches
+
+    fmp_map = {m['he_symbol']: FmpSymbol(m['fmp_etype'], m['fmp_symbol']) for m in get_manual_matches()}
+    if he_to_fmp is not None:
+        fmp_map.update(he_to_fmp.by_key)
+    return fmp_map
+
+
+def _yahoo_fallbacks() -> Dict[str, str]:
+    from hedgeye.ds.yf.yahoo_fallback import YAHOO_FALLBACK_SYMBOLS
+    return dict(YAHOO_FALLBACK_SYMBOLS)
+
+
+# Process-wide resolver and the compiled mappings it was built from
+_resolver: Dict[str, Any] = {"resolver": None, "sources": None}
+_resolver_lock = threading.Lock()
+
+
+def get_symbol_resolver() -> SymbolResolver:
+    """
+    The shared resolver over the configured mapping files.
+
+    Costs a stat of each mapping file per call; rebuilt when one changes.
+    """
+    sources = _load_mappings(None, None)
+    with _resolver_lock:
+        cached = _resolver["sources"]
+        if (_resolver["resolver"] is None or cached is None
+                or any(a is not b for a, b in zip(cached, sources))):
+            he_to_fmp, p_to_r = sources
+            _resolver["resolver"] = SymbolResolver(
+                fmp_map=_fmp_map(he_to_fmp),
+                proxy_map=p_to_r.by_key if p_to_r is not None else None,
+                yahoo_fallbacks=_yahoo_fallbacks())
+            _resolver["sources"] = sources
+        return _resolver["resolver"]
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Watch directories for new files.
+
+DirWatcher reports files that appear in a set of directories (matching a
+glob pattern such as "*.eml"), once each file has stopped changing:
+
+- On Linux it uses inotify (through ctypes, no extra dependency): the
+  kernel reports created, written, closed and moved-in files, so nothing is
+  rescanned and a new file is seen immediately.
+- Elsewhere (or if inotify is unavailable) it polls. Each tick stats the
+  directories and re-lists only those whose mtime changed (a file was
+  created, renamed or removed); files still being written are re-stat'ed
+  individually. A full rescan every `rescan_interval` catches changes that
+  coarse directory mtimes could hide.
+
+Debounce: a file is ready when its (mtime, size) has been unchanged for
+`settle_seconds` since the last event or change, so partially written
+files are never reported. Files already present when the watcher starts
+are not reported; neither are files that are rewritten in place after
+being reported (a file replaced under the same name is new), nor reported
+files renamed within a watched directory (same inode, mtime and size; e.g.
+the RR parser renaming "RISK RANGE ….eml" to risk_range_<date>.eml).
+
+Usage:
+    from hedgeye.ds.watcher import DirWatcher
+    watcher = DirWatcher({"rr": rr_dir, "ep": ep_dir}, pattern="*.eml")
+    watcher.start(lambda key, paths: print(key, paths))   # background thread
+    ...
+    watcher.stop()
+
+    # or step it yourself
+    for key, paths in watcher.poll(timeout=1.0).items(): ...
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_SETTLE_SECONDS = 0.25
+DEFAULT_POLL_INTERVAL = 0.25
+DEFAULT_RESCAN_INTERVAL = 30.0
+INOTIFY_WAIT = 1.0  # longest wait for events (bounds how long stop() takes)
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows)
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch  # noqa: B018
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+_libc = _load_inotify()
+INOTIFY_AVAILABLE = _libc is not None
+
+Signature = Tuple[int, int]  # (mtime_ns, size)
+
+
+def _signature(path: Path) -> Optional[Signature]:
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class DirWatcher:
+    """
+    Reports new files in watched directories once they stop changing.
+
+    Attributes:
+        dirs: Key -> directory (keys label the batches passed to the callback)
+        pattern: File name glob (fnmatch) of files to report
+        settle_seconds: How long a file must stay unchanged before it is reported
+        poll_interval: Seconds between polling ticks (polling backend)
+        backend: "inotify" or "polling"
+    """
+
+    def __init__(self, dirs: Dict[str, Path], pattern: str = "*.eml",
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 rescan_interval: float = DEFAULT_RESCAN_INTERVAL,
+                 use_inotify: Optional[bool] = None):
+        self.dirs = {key: Path(d) for key, d in dirs.items()}
+        self.pattern = pattern
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+
+        self._key_of = {d: key for key, d in self.dirs.items()}
+        # Reported (or pre-existing) files -> (inode, signature)
+        self._known: Dict[Path, Tuple[int, Signature]] = {}
+        self._dir_mtimes: Dict[Path, Optional[int]] = {}
+        # path -> (signature at last change, monotonic time of last change)
+        self._pending: Dict[Path, Tuple[Optional[Signature], float]] = {}
+        self._last_rescan = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._fd: Optional[int] = None
+        self._wds: Dict[int, Path] = {}
+        if use_inotify is not False and INOTIFY_AVAILABLE:
+            fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            elif use_inotify:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        elif use_inotify:
+            raise OSError("inotify is not available on this platform")
+
+        for directory in self.dirs.values():
+            self._scan(directory, report=False)
+            self._add_watch(directory)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    # --- Scanning ---
+
+    def _matches(self, name: str) -> bool:
+        return fnmatch.fnmatch(name, self.pattern)
+
+    def _scan(self, directory: Path, report: bool = True, dir_changed: bool = False) -> None:
+        """
+        List a directory; files not seen before become pending (or known if not reporting).
+
+        A known name counts as a new file if its inode changed, or, when the
+        directory itself changed (dir_changed), if its mtime/size changed: the
+        file was replaced, and the filesystem may have reused the inode.
+        """
+        self._dir_mtimes[directory] = (_signature(directory) or (None, None))[0]
+        if not directory.is_dir():
+            return
+        now = time.monotonic()
+        seen = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not self._matches(entry.name):
+                    continue
+                path = directory / entry.name
+                seen.add(path)
+                try:
+                    inode = entry.inode()
+                except FileNotFoundError:
+                    continue
+                if path in self._pending:
+                    continue
+                sig = _signature(path)
+                if sig is None:
+                    continue
+                known = self._known.get(path)
+                if known is not None and known[0] == inode and (known[1] == sig or not dir_changed):
+                    continue
+                if report:
+                    self._known.pop(path, None)
+                    if not self._take_renamed(path, inode, sig):
+                        self._pending[path] = (sig, now)
+                else:
+                    self._known[path] = (inode, sig)
+        # Forget files that are gone, so a file recreated under the same name is new again
+        for path in [p for p in self._known if p.parent == directory and p not in seen]:
+            del self._known[path]
+
+    def _take_renamed(self, path: Path, inode: int, sig: Signature) -> bool:
+        """
+        If path is a known file under a new name, record it under the new name.
+
+        A rename keeps the inode, mtime and size; the old name must be gone.
+        """
+        for old, known in self._known.items():
+            if known == (inode, sig) and old != path and not old.exists():
+                del self._known[old]
+                self._known[path] = known
+                return True
+        return False
+
+    def _add_watch(self, directory: Path) -> None:
+        if self._fd is None or directory in self._wds.values() or not directory.is_dir():
+            return
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self._wds[wd] = directory
+
+    def _touch(self, path: Path, created: bool) -> None:
+        """Record activity on a file (new, or still being written)."""
+        if created:
+            self._known.pop(path, None)  # replaced by a new file of the same name
+        elif path in self._known:
+            return  # rewritten in place after it was reported
+        self._pending[path] = (_signature(path), time.monotonic())
+
+    # --- Event sources ---
+
+    def _read_inotify(self, timeout: float) -> None:
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not ready:
+            return
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size: offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:  # events were dropped: fall back to listing
+                for directory in self.dirs.values():
+                    self._scan(directory, dir_changed=True)
+                continue
+            directory = self._wds.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                self._wds.pop(wd, None)  # directory went away; re-added when it reappears
+                continue
+            filename = os.fsdecode(name)
+            if filename and self._matches(filename):
+                self._touch(directory / filename, created=bool(mask & (IN_CREATE | IN_MOVED_TO)))
+
+    def _poll_dirs(self, timeout: float) -> None:
+        self._stop.wait(max(0.0, timeout))
+        for directory in self.dirs.values():
+            mtime = (_signature(directory) or (None, None))[0]
+            if mtime != self._dir_mtimes.get(directory):
+                self._scan(directory, dir_changed=True)
+
+    # --- Public API ---
+
+    def poll(self, timeout: Optional[float] = None) -> Dict[str, List[Path]]:
+        """
+        Wait up to timeout for events, then return the files that are ready.
+
+        Args:
+            timeout: Seconds to wait (default: poll_interval, or less while
+                files are settling)
+
+        Returns:
+            Key -> new files (sorted) for directories with ready files
+        """
+        if timeout is None:
+            timeout = self.poll_interval if self._fd is None else INOTIFY_WAIT
+            if self._pending:
+                timeout = min(timeout, self.settle_seconds)
+        if self._fd is not None:
+            self._read_inotify(timeout)
+        else:
+            self._poll_dirs(timeout)
+
+        now = time.monotonic()
+        if now - self._last_rescan >= self.rescan_interval:
+            self._last_rescan = now
+            for directory in self.dirs.values():
+                self._add_watch(directory)  # directories created since start
+                self._scan(directory)
+
+        ready: Dict[str, List[Path]] = {}
+        for path, (sig, changed) in list(self._pending.items()):
+            current = _signature(path)
+            if current is None:  # removed or renamed away before it settled
+                del self._pending[path]
+            elif current != sig:
+                self._pending[path] = (current, now)
+            elif now - changed >= self.settle_seconds:
+                del self._pending[path]
+                try:
+                    inode = path.stat().st_ino
+                except FileNotFoundError:
+                    continue
+                if self._take_renamed(path, inode, current):
+                    continue
+                self._known[path] = (inode, current)
+                ready.setdefault(self._key_of[path.parent], []).append(path)
+        return {key: sorted(paths) for key, paths in ready.items()}
+
+    def run(self, callback: Callable[[str, List[Path]], None]) -> None:
+        """Call callback(key, paths) for every batch of ready files until stop()."""
+        while not self._stop.is_set():
+            for key, paths in self.poll().items():
+                callback(key, paths)
+
+    def start(self, callback: Callable[[str, List[Path]], None]) -> threading.Thread:
+        """Run the watcher in a daemon thread."""
+        self._thread = threading.Thread(target=self.run, args=(callback,), name="dir-watcher", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release the inotify descriptor."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=max(self.poll_interval, self.settle_seconds, INOTIFY_WAIT) + 1)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._wds.clear()
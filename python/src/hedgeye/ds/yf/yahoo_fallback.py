@@ -4,11 +4,12 @@ Yahoo Finance fallback for commodity symbols that fail on FMP.
 Used as a last resort to avoid rate limits on Yahoo.
 """
 
-import yfinance as yf
 from typing import Optional, Dict, Any
 from datetime import datetime
 import pandas as pd
 
+from hedgeye.ds import metrics
+
 # Yahoo symbol mappings for problematic FMP symbols
 YAHOO_FALLBACK_SYMBOLS = {
     'HGUSD': 'HG=F',  # Copper
@@ -29,6 +30,7 @@ def get_yahoo_price(fmp_symbol: str, latest: bool = True) -> Optional[Dict[str,
     Returns:
         Dict with price data or None if failed
     """
+    import yfinance as yf
     if fmp_symbol not in YAHOO_FALLBACK_SYMBOLS:
         return None
     
@@ -36,6 +38,7 @@ def get_yahoo_price(fmp_symbol: str, latest: bool = True) -> Optional[Dict[str,
     
     try:
         ticker = yf.Ticker(yahoo_symbol)
+        metrics.count("net_requests")
         
         if latest:
             # Get latest price (1 day history)
@@ -1,41 +1,34 @@
 """
 Shared configuration loading utilities for the Syndicate project.
 """
+import copy
 import os
 import re
+import threading
 import yaml
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
-def load_config(config_path: Path) -> Dict[str, Any]:
-    """
-    Loads a YAML configuration file and resolves internal variable references.
+_REF_RE = re.compile(r'\$\{(.*?)\}')
 
-    This loader supports `${paths.some_path}` syntax for referencing other
-    values within the same file.
+# Per resolved path: (mtime_ns, size, raw text, env-expanded text, resolved config)
+_cache: Dict[str, Tuple[int, int, str, str, Dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
 
-    Args:
-        config_path: The Path object pointing to the YAML configuration file.
 
-    Returns:
-        A dictionary containing the loaded and resolved configuration.
-    """
-    with open(config_path, 'r') as f:
-        raw_content = f.read()
-
-    # First, expand any environment variables (e.g., $HOME)
-    expanded_content = os.path.expandvars(raw_content)
+def _resolve(expanded_content: str) -> Dict[str, Any]:
+    """Resolve `${a.b}` references in env-expanded YAML text and parse it."""
+    # The references are looked up in the document itself, parsed once
+    data = yaml.safe_load(expanded_content)
 
     # Use a regular expression to find all `${...}` references
     def replacer(match):
         # The key path is inside the match group, e.g., "paths.prod_root"
         key_path = match.group(1)
         keys = key_path.split('.')
-        
+
         # Walk the data dictionary to find the replacement value
-        # We need to load the YAML first to know the values
-        temp_data = yaml.safe_load(expanded_content)
-        value = temp_data
+        value = data
         try:
             for key in keys:
                 value = value[key]
@@ -49,9 +42,55 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     # graph-based resolver might be needed, but this is robust for most cases.
     resolved_content = expanded_content
     for _ in range(5): # Limit iterations to prevent infinite loops
-        new_content = re.sub(r'\$\{(.*?)\}', replacer, resolved_content)
+        new_content = _REF_RE.sub(replacer, resolved_content)
         if new_content == resolved_content:
             break # No more substitutions found
         resolved_content = new_content
 
     return yaml.safe_load(resolved_content)
+
+
+def load_config(config_path: Path) -> Dict[str, Any]:
+    """
+    Loads a YAML configuration file and resolves internal variable references.
+
+    This loader supports `${paths.some_path}` syntax for referencing other
+    values within the same file.
+
+    The resolved config is cached per file and reused until the file's
+    mtime or size changes (or an environment variable it expands changes).
+    Each call returns a copy, so callers may modify it.
+
+    Args:
+        config_path: The Path object pointing to the YAML configuration file.
+
+    Returns:
+        A dictionary containing the loaded and resolved configuration.
+    """
+    key = str(Path(config_path).resolve())
+    st = os.stat(key)
+    with _cache_lock:
+        cached = _cache.get(key)
+
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        raw_content = cached[2]
+    else:
+        with open(config_path, 'r') as f:
+            raw_content = f.read()
+
+    # First, expand any environment variables (e.g., $HOME)
+    expanded_content = os.path.expandvars(raw_content)
+
+    if cached and cached[2] == raw_content and cached[3] == expanded_content:
+        return copy.deepcopy(cached[4])
+
+    config = _resolve(expanded_content)
+    with _cache_lock:
+        _cache[key] = (st.st_mtime_ns, st.st_size, raw_content, expanded_content, config)
+    return copy.deepcopy(config)
+
+
+def clear_config_cache() -> None:
+    """Forget all cached configs (the next load_config() re-reads its file)."""
+    with _cache_lock:
+        _cache.clear()
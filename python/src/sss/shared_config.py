@@ -8,10 +8,20 @@ Python and JavaScript components.
 
 import json
 import os
+import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
 
+# Parsed (not yet env-substituted) config files: path -> (mtime_ns, size, data)
+_json_cache: Dict[str, Tuple[int, int, Any]] = {}
+_json_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
 def get_project_root() -> Path:
     """
     Find the project root directory by looking for syndicate-specific markers.
@@ -36,6 +46,9 @@ def load_shared_config(config_name: str) -> Dict[str, Any]:
     """
     Load a shared configuration file from the project root config/ directory.
     
+    The parsed JSON is cached until the file's mtime or size changes;
+    environment variables are substituted on every call, into a fresh copy.
+    
     Args:
         config_name: Name of the config file (e.g., "mcp-config.json")
         
@@ -52,13 +65,29 @@ def load_shared_config(config_name: str) -> Dict[str, Any]:
     if not config_path.exists():
         raise FileNotFoundError(f"Shared config file not found: {config_path}")
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config_data = json.load(f)
+    st = config_path.stat()
+    key = str(config_path)
+    with _json_cache_lock:
+        cached = _json_cache.get(key)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        config_data = cached[2]
+    else:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_data = json.load(f)
+        with _json_cache_lock:
+            _json_cache[key] = (st.st_mtime_ns, st.st_size, config_data)
     
-    # Substitute environment variables if needed
+    # Substitute environment variables if needed (builds new containers,
+    # so the cached data is never handed out)
     return _substitute_env_vars(config_data)
 
 
+def clear_shared_config_cache() -> None:
+    """Forget cached config files (the next load re-reads them)."""
+    with _json_cache_lock:
+        _json_cache.clear()
+
+
 def _substitute_env_vars(data: Any) -> Any:
     """
     Recursively substitute ${VAR_NAME:-default} patterns with environment variables.
@@ -75,8 +104,6 @@ def _substitute_env_vars(data: Any) -> Any:
         return [_substitute_env_vars(item) for item in data]
     elif isinstance(data, str):
         # Handle ${VAR_NAME:-default_value} patterns
-        import re
-        
         def replace_env_var(match):
             var_expr = match.group(1)
             if ':-' in var_expr:
@@ -86,7 +113,7 @@ def _substitute_env_vars(data: Any) -> Any:
             
             return os.environ.get(var_name, default_value)
         
-        return re.sub(r'\$\{([^}]+)\}', replace_env_var, data)
+        return _ENV_VAR_RE.sub(replace_env_var, data)
     else:
         return data
 
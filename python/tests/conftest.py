@@ -0,0 +1,31 @@
+"""
+Shared fixtures.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def hedgeye_cache_dir(tmp_path, monkeypatch):
+    """
+    Point the hedgeye config's cache_dir at a temp directory.
+
+    Also drops the in-memory directory manifests, so nothing leaks between tests.
+    """
+    import hedgeye.config_loader as config_loader
+    from hedgeye.ds.dir_manifest import clear_manifests
+
+    cache_dir = tmp_path / "cache"
+    read_config = config_loader._read_config
+
+    def read_test_config(path):
+        config = read_config(path)
+        config["paths"]["cache_dir"] = str(cache_dir)
+        return config
+
+    monkeypatch.setattr(config_loader, "_read_config", read_test_config)
+    config_loader.clear_config_cache()
+    clear_manifests()
+    yield cache_dir
+    config_loader.clear_config_cache()
+    clear_manifests()
@@ -0,0 +1,156 @@
+"""
+Tests for the CR merge (hedgeye.ds.cr.cr_merge_ranges).
+
+The r_sym hash join is checked against the per-position lookup it replaced
+(get_latest_rr_for_symbol for each row).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hedgeye.ds.cr.cr_merge_ranges import (
+    cr_merge_all_sources, get_latest_rr_for_symbol, latest_rr_table, load_mapping_table,
+)
+from hedgeye.ds.rr.rr_index import RRIndex
+
+MAPPING_YAML = """\
+mappings:
+- p_sym: AAAU
+  r_sym: GOLD
+  mapping_type: inferred
+  confidence: medium
+  proxy_type: tight
+  inverted: false
+- p_sym: BBN
+  r_sym: UST10Y
+  mapping_type: inferred
+  confidence: low
+  proxy_type: loose
+  inverted: true
+- p_sym: AQWA
+  r_sym: null
+  mapping_type: no_coverage
+  confidence: low
+  proxy_type: na
+  inverted: false
+- p_sym: QQQ
+  r_sym: NDX
+  mapping_type: manual
+  confidence: high
+  proxy_type: tight
+  inverted: false
+"""
+
+RR_COLUMNS = ["trade_low", "trade_high", "rr_prev_close", "rr_date", "rr_trend"]
+
+
+def rr_frame():
+    rows = [
+        ("2025-10-01", "GOLD", "BULLISH", 3900.0, 4100.0, 4000.0),
+        ("2025-10-03", "GOLD", "BULLISH", 3950.0, 4150.0, 4100.0),
+        ("2025-10-02", "GOLD", "NEUTRAL", 3920.0, 4120.0, 4050.0),
+        ("2025-10-01", "UST10Y", "BEARISH", 4.00, 4.30, 4.20),
+        # Same-date tie: the last row in file order wins
+        ("2025-10-03", "UST10Y", "BEARISH", 4.05, 4.35, 4.25),
+        ("2025-10-03", "UST10Y", "BULLISH", 4.10, 4.40, 4.30),
+        ("2025-10-03", "SPX", "BULLISH", 6600.0, 6800.0, 6700.0),
+    ]
+    df = pd.DataFrame(rows, columns=["date", "index", "trend", "buy_trade", "sell_trade", "prev_close"])
+    df["bucket"] = "IN"
+    return df
+
+
+def epp_frame():
+    # AAAU mapped, BBN inverted, AQWA no_coverage, XYZ unmapped, QQQ mapped to a symbol without RR
+    tickers = ["AAAU", "BBN", "AQWA", "XYZ", "QQQ"]
+    return pd.DataFrame({
+        "report_date": "2025-10-03",
+        "position_type": ["LONG", "SHORT", "LONG", "LONG", "SHORT"],
+        "ticker": tickers,
+        "description": [f"{t} fund" for t in tickers],
+        "date_added": "2025-09-01",
+        "recent_price": [40.0, 20.0, 15.0, 10.0, 500.0],
+        "trend_low": [38.0, 19.0, 14.0, 9.0, 480.0],
+        "trend_high": [42.0, 21.0, 16.0, 11.0, 520.0],
+        "asset_class": "ETF",
+    })
+
+
+def ps_frame():
+    return pd.DataFrame({"report_date": "2025-10-03", "rank": [1, 2],
+                         "ticker": ["AAAU", "XYZ"], "name": ["Gold", "Xyz"]})
+
+
+@pytest.fixture
+def mapping_df(tmp_path, hedgeye_cache_dir):
+    path = tmp_path / "p-to-r-mapping.yaml"
+    path.write_text(MAPPING_YAML)
+    return load_mapping_table(path)
+
+
+def per_row_rr(merged, rr):
+    """RR columns as the old per-position lookup produced them."""
+    rr_index = RRIndex(rr)
+    rows = []
+    for r_sym in merged["r_sym"]:
+        rr_row = get_latest_rr_for_symbol(rr_index, r_sym) if pd.notna(r_sym) else None
+        if rr_row is None:
+            rows.append({c: np.nan for c in RR_COLUMNS})
+        else:
+            rows.append({"trade_low": rr_row["buy_trade"], "trade_high": rr_row["sell_trade"],
+                         "rr_prev_close": rr_row["prev_close"], "rr_date": rr_row["date"],
+                         "rr_trend": rr_row["trend"]})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("as_index", [False, True], ids=["frame", "rr_index"])
+def test_join_matches_per_row_lookup(mapping_df, as_index):
+    rr = rr_frame()
+    merged = cr_merge_all_sources(epp_frame(), ps_frame(), RRIndex(rr) if as_index else rr, mapping_df)
+
+    expected = per_row_rr(merged, rr)
+    for col in ["trade_low", "trade_high", "rr_prev_close"]:
+        np.testing.assert_array_equal(merged[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float))
+    assert list(pd.to_datetime(merged["rr_date"])) == list(pd.to_datetime(expected["rr_date"]))
+    assert [t if isinstance(t, str) else None for t in merged["rr_trend"]] == \
+           [t if isinstance(t, str) else None for t in expected["rr_trend"]]
+
+
+def test_merged_base_rows(mapping_df):
+    merged = cr_merge_all_sources(epp_frame(), ps_frame(), rr_frame(), mapping_df).set_index("p_sym")
+
+    assert list(merged.index) == ["AAAU", "BBN", "AQWA", "XYZ", "QQQ"]
+    assert merged.loc["AAAU", "rank"] == 1 and merged.loc["XYZ", "rank"] == 2
+    assert merged["rank"].isna().sum() == 3
+
+    gold = merged.loc["AAAU"]
+    assert (gold["r_sym"], gold["proxy_type"]) == ("GOLD", "tight")
+    assert (gold["trade_low"], gold["trade_high"], gold["rr_prev_close"]) == (3950.0, 4150.0, 4100.0)
+    assert gold["rr_date"] == pd.Timestamp("2025-10-03") and gold["rr_trend"] == "BULLISH"
+
+    # Inverted proxies keep the raw RR band; translation happens later
+    bbn = merged.loc["BBN"]
+    assert (bbn["r_sym"], bbn["proxy_type"]) == ("UST10Y", "loose")
+    assert (bbn["trade_low"], bbn["trade_high"], bbn["rr_trend"]) == (4.10, 4.40, "BULLISH")
+
+    # no_coverage maps to an empty r_sym; unmapped has none; NDX has no RR rows
+    assert merged.loc["AQWA", "r_sym"] == "" and merged.loc["AQWA", "proxy_type"] == "na"
+    assert pd.isna(merged.loc["XYZ", "r_sym"])
+    assert merged.loc["QQQ", "r_sym"] == "NDX"
+    for p_sym in ["AQWA", "XYZ", "QQQ"]:
+        assert merged.loc[p_sym, RR_COLUMNS].isna().all()
+
+    # Plain strings, not the RR categorical
+    assert not isinstance(merged["rr_trend"].dtype, pd.CategoricalDtype)
+
+
+def test_latest_rr_table_frame_and_index_agree():
+    rr = rr_frame()
+    from_frame = latest_rr_table(rr).sort_values("index").reset_index(drop=True)
+    from_index = latest_rr_table(RRIndex(rr)).sort_values("index").reset_index(drop=True)
+
+    assert list(from_frame["index"]) == ["GOLD", "SPX", "UST10Y"]
+    for col in ["date", "buy_trade", "sell_trade", "prev_close"]:
+        assert from_frame[col].tolist() == from_index[col].tolist()
+    assert from_frame["trend"].astype(str).tolist() == from_index["trend"].astype(str).tolist()
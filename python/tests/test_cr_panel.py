@@ -0,0 +1,119 @@
+"""
+Tests for the CR panel (hedgeye.ds.cr.cr_panel).
+
+The panel window ends today, so the inputs are dated relative to today.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hedgeye.ds.cr import cr_panel
+from hedgeye.ds.cr.cr_panel import PANEL_COLUMNS, build_cr_panel, load_cr_panel, save_cr_panel
+from hedgeye.ds.ep.ep_history import EPHistory
+from hedgeye.ds.rr.rr_index import RRIndex
+
+TODAY = pd.Timestamp(datetime.now().date())
+DAYS = [TODAY - pd.Timedelta(days=n) for n in (3, 2, 1, 0)]
+
+
+def ep_history():
+    # The report dated DAYS[2] replaces the older one from then on
+    old, new = TODAY - pd.Timedelta(days=10), DAYS[2]
+    rows = [
+        ("AAA", old, 9.0, 11.0, 10.0), ("BBB", old, 19.0, 21.0, 20.0), ("CCC", old, 29.0, 31.0, 30.0),
+        ("AAA", new, 9.5, 11.5, 10.5), ("BBB", new, 19.0, 21.0, 20.0), ("CCC", new, 29.0, 31.0, 31.0),
+    ]
+    return EPHistory(pd.DataFrame(rows, columns=["ticker", "report_date", "trend_low", "trend_high",
+                                                 "recent_price"]))
+
+
+def rr_index():
+    rows = [
+        (DAYS[0], "GOLD", 90.0, 110.0, 100.0),
+        (DAYS[1], "GOLD", 90.0, 110.0, 100.0),
+        (DAYS[3], "GOLD", 120.0, 130.0, 125.0),
+        (DAYS[1], "UST10Y", 4.0, 4.4, 4.2),
+    ]
+    df = pd.DataFrame(rows, columns=["date", "index", "buy_trade", "sell_trade", "prev_close"])
+    df["trend"] = "BULLISH"
+    df["bucket"] = "IN"
+    return RRIndex(df)
+
+
+def mapping_df():
+    # CCC has no mapping
+    return pd.DataFrame({"p_sym": ["AAA", "BBB"], "r_sym": ["GOLD", "UST10Y"], "inverted": [False, True]})
+
+
+def prices_df():
+    # AAA has no close for today yet; CCC has no daily prices at all
+    return pd.DataFrame({
+        "ticker": ["AAA"] * 3 + ["BBB"] * 4,
+        "date": DAYS[:3] + DAYS,
+        "price": [10.0, 10.2, 10.4, 20.0, 20.0, 21.0, 22.0],
+    })
+
+
+@pytest.fixture
+def panel(tmp_path, monkeypatch):
+    # No enriched CSV to fill today's prices from
+    monkeypatch.setattr(cr_panel, "config_path", lambda key: tmp_path / key)
+    return build_cr_panel(days_back=3, mapping_df=mapping_df(), prices_df=prices_df(),
+                          current_prices={"AAA": 10.6}, rr_index=rr_index(), ep_history=ep_history())
+
+
+def rows_for(panel, p_sym):
+    return panel[panel["p_sym"] == p_sym].reset_index(drop=True)
+
+
+def test_panel_layout(panel):
+    assert list(panel.columns) == PANEL_COLUMNS
+    assert len(panel) == 12
+    assert list(panel["p_sym"].unique()) == ["AAA", "BBB", "CCC"]
+    assert list(rows_for(panel, "AAA")["date"]) == DAYS
+
+
+def test_trade_band_translation(panel):
+    aaa = rows_for(panel, "AAA")
+    np.testing.assert_allclose(aaa["price"], [10.0, 10.2, 10.4, 10.6])
+    np.testing.assert_allclose(aaa["trend_low"], [9.0, 9.0, 9.5, 9.5])
+    # p_trade = price * rr_trade / rr_prev_close; no RR row on DAYS[2]
+    np.testing.assert_allclose(aaa["p_trade_low"], [9.0, 9.18, np.nan, 10.6 * 120 / 125])
+    np.testing.assert_allclose(aaa["p_trade_high"], [11.0, 11.22, np.nan, 10.6 * 130 / 125])
+    np.testing.assert_allclose(aaa["trend_pct_from_low"], [(10 - 9) / 9 * 100, (10.2 - 9) / 9 * 100,
+                                                          (10.4 - 9.5) / 9.5 * 100, (10.6 - 9.5) / 9.5 * 100])
+    np.testing.assert_allclose(aaa["p_trade_pct_from_low"], [100 / 9, 100 / 9, np.nan, (125 / 120 - 1) * 100])
+
+    # Inverted proxy: sell_trade becomes the low edge
+    bbb = rows_for(panel, "BBB")
+    assert bbb["inverted"].all() and not aaa["inverted"].any()
+    assert bbb.loc[1, "p_trade_low"] == pytest.approx(20.0 * 4.4 / 4.2)
+    assert bbb.loc[1, "p_trade_high"] == pytest.approx(20.0 * 4.0 / 4.2)
+    assert bbb.loc[[0, 2, 3], "p_trade_low"].isna().all()
+    assert bbb["prev_close"].notna().tolist() == [False, True, False, False]
+
+
+def test_unmapped_ticker_uses_ep_price(panel):
+    ccc = rows_for(panel, "CCC")
+    assert ccc["r_sym"].isna().all()
+    np.testing.assert_allclose(ccc["price"], [30.0, 30.0, 31.0, 31.0])
+    assert ccc[["p_trade_low", "p_trade_high", "p_trade_pct_from_low"]].isna().all().all()
+    assert ccc.loc[2, "trend_pct_from_high"] == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_save_load_round_trip(panel, tmp_path, suffix):
+    if suffix == ".parquet" and not cr_panel.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+    path = save_cr_panel(panel, tmp_path / f"panel{suffix}")
+
+    loaded = load_cr_panel(path)
+    pd.testing.assert_frame_equal(loaded, panel, check_dtype=False)
+
+    only = load_cr_panel(path, tickers=["BBB"])
+    pd.testing.assert_frame_equal(only.reset_index(drop=True), rows_for(panel, "BBB"), check_dtype=False)
+
+    assert list(load_cr_panel(tmp_path / "missing.csv").columns) == PANEL_COLUMNS
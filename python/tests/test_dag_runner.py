@@ -0,0 +1,69 @@
+"""
+Tests for the incremental DAG runner (hedgeye.ds.dag_runner).
+"""
+
+import sys
+import types
+from functools import partial
+
+from hedgeye.ds import pipeline_dag
+from hedgeye.ds.dag_runner import DagRunner, Stage
+
+
+def parse(raw_dir, out_dir, late_name=None):
+    """Stand-in parse stage; optionally an email lands while it runs."""
+    out_dir.mkdir(exist_ok=True)
+    for eml in sorted(raw_dir.glob("*.eml")):
+        (out_dir / f"{eml.stem}.csv").write_text("x\n")
+    if late_name:
+        (raw_dir / late_name).write_text("late\n")
+
+
+def runner_for(tmp_path, late_name=None):
+    raw_dir, out_dir = tmp_path / "raw", tmp_path / "out"
+    stage = Stage("parse", partial(parse, raw_dir, out_dir, late_name),
+                  inputs=[(raw_dir, "*.eml")], outputs=[out_dir])
+    return DagRunner([stage], tmp_path / "state.json")
+
+
+def test_unchanged_inputs_are_skipped(tmp_path):
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "raw" / "a.eml").write_text("a\n")
+
+    assert runner_for(tmp_path).run(workers=1).names("ran") == ["parse"]
+    assert runner_for(tmp_path).run(workers=1).names("skipped") == ["parse"]
+
+
+def test_input_arriving_during_run_is_not_recorded_as_handled(tmp_path):
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "raw" / "a.eml").write_text("a\n")
+
+    runner_for(tmp_path, late_name="b.eml").run(workers=1)
+    assert not (tmp_path / "out" / "b.csv").exists()
+
+    assert runner_for(tmp_path).run(workers=1).names("ran") == ["parse"]
+    assert (tmp_path / "out" / "b.csv").exists()
+
+
+def test_parse_new_files_records_fingerprint_from_before_parsing(tmp_path, monkeypatch):
+    raw_dir, out_dir = tmp_path / "raw", tmp_path / "out"
+    raw_dir.mkdir()
+    (raw_dir / "a.eml").write_text("a\n")
+    runner_for(tmp_path).run(workers=1)
+
+    def process_files(files):
+        for eml in files:
+            (out_dir / f"{eml.stem}.csv").write_text("x\n")
+        (raw_dir / "c.eml").write_text("late\n")
+
+    monkeypatch.setitem(sys.modules, "fake_parser", types.SimpleNamespace(process_files=process_files))
+    monkeypatch.setitem(pipeline_dag.PARSE_STAGES, "parse", ("raw_eml_dir", "fake_parser"))
+
+    new = raw_dir / "b.eml"
+    new.write_text("b\n")
+    assert pipeline_dag.parse_new_files({"parse": [new]}, runner_for(tmp_path)) == ["parse"]
+    assert (out_dir / "b.csv").exists() and not (out_dir / "c.csv").exists()
+
+    # c.eml arrived while b.eml was parsed, so the stage is not current
+    assert runner_for(tmp_path).run(workers=1).names("ran") == ["parse"]
+    assert (out_dir / "c.csv").exists()
@@ -0,0 +1,84 @@
+"""
+Tests for dated-file manifests (hedgeye.ds.dir_manifest).
+"""
+
+import os
+
+from hedgeye.ds.dir_manifest import (
+    DATE_TIME_KEY, DirManifest, clear_manifests, get_manifest, latest_file, record_file,
+)
+
+
+def touch(path):
+    path.write_text("x\n")
+    return path
+
+
+def test_manifest_lookups(tmp_path):
+    for name in ["ps_daily_2025-01-03.csv", "ps_daily_2025-01-01.csv", "ps_daily_2025-01-02.csv",
+                 "ps_daily_2025-01-02_enriched.csv", "other_2025-01-04.csv"]:
+        touch(tmp_path / name)
+    manifest = DirManifest(tmp_path, "ps_daily_")
+    manifest.rebuild()
+
+    assert manifest.keys() == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert manifest.latest() == tmp_path / "ps_daily_2025-01-03.csv"
+    assert manifest.get("2025-01-02") == tmp_path / "ps_daily_2025-01-02.csv"
+    assert manifest.get("2025-01-04") is None
+    assert "2025-01-01" in manifest and len(manifest) == 3
+    assert manifest.between("2025-01-02", "2025-01-03") == [
+        tmp_path / "ps_daily_2025-01-02.csv", tmp_path / "ps_daily_2025-01-03.csv"]
+    assert manifest.between(end="2025-01-01") == [tmp_path / "ps_daily_2025-01-01.csv"]
+
+
+def test_between_includes_times_on_end_date(tmp_path):
+    for name in ["ham_holdings_2025-01-01_0900.csv", "ham_holdings_2025-01-02_1630.csv"]:
+        touch(tmp_path / name)
+    manifest = DirManifest(tmp_path, "ham_holdings_", key_pattern=DATE_TIME_KEY)
+    manifest.rebuild()
+
+    assert manifest.between("2025-01-02", "2025-01-02") == [tmp_path / "ham_holdings_2025-01-02_1630.csv"]
+
+
+def test_external_changes_are_detected(tmp_path, hedgeye_cache_dir):
+    touch(tmp_path / "ps_daily_2025-01-01.csv")
+    assert latest_file(tmp_path, "ps_daily_").name == "ps_daily_2025-01-01.csv"
+
+    touch(tmp_path / "ps_daily_2025-01-02.csv")
+    assert latest_file(tmp_path, "ps_daily_").name == "ps_daily_2025-01-02.csv"
+
+    os.remove(tmp_path / "ps_daily_2025-01-02.csv")
+    assert latest_file(tmp_path, "ps_daily_").name == "ps_daily_2025-01-01.csv"
+
+
+def test_saved_manifest_is_reused(tmp_path, hedgeye_cache_dir):
+    touch(tmp_path / "ps_daily_2025-01-01.csv")
+    get_manifest(tmp_path, "ps_daily_")
+    assert list((hedgeye_cache_dir / "manifests").glob("ps_daily_*.json"))
+
+    clear_manifests()
+    manifest = get_manifest(tmp_path, "ps_daily_")
+    assert manifest.keys() == ["2025-01-01"]
+
+
+def test_record_file_picks_up_files_written_by_others(tmp_path, hedgeye_cache_dir):
+    touch(tmp_path / "ps_daily_2025-01-02.csv")
+    assert latest_file(tmp_path, "ps_daily_").name == "ps_daily_2025-01-02.csv"
+
+    # Another process writes a newer file, then this one writes and records an older one
+    touch(tmp_path / "ps_daily_2025-01-05.csv")
+    record_file(touch(tmp_path / "ps_daily_2025-01-03.csv"), "ps_daily_")
+
+    assert latest_file(tmp_path, "ps_daily_").name == "ps_daily_2025-01-05.csv"
+    assert get_manifest(tmp_path, "ps_daily_").keys() == ["2025-01-02", "2025-01-03", "2025-01-05"]
+
+    # The saved manifest is right as well
+    clear_manifests()
+    assert latest_file(tmp_path, "ps_daily_").name == "ps_daily_2025-01-05.csv"
+
+
+def test_record_file_ignores_other_names(tmp_path, hedgeye_cache_dir):
+    touch(tmp_path / "ps_daily_2025-01-01.csv")
+    record_file(touch(tmp_path / "ps_daily_2025-01-02_enriched.csv"), "ps_daily_")
+
+    assert get_manifest(tmp_path, "ps_daily_").keys() == ["2025-01-01"]
@@ -0,0 +1,100 @@
+"""
+Tests for the unified RR email parser (hedgeye.ds.rr.parse_rr).
+"""
+
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import pytest
+
+from hedgeye.ds.rr.parse_rr import parse_rr_batch, parse_rr_email
+from hedgeye.ds.rr.rr_batch import CHANGE_FIELDS, ENTRY_FIELDS, RRDayBatch
+
+HTML_BODY = """\
+<html><body>
+<div class="headline">RISK RANGE&trade; SIGNALS: NOVEMBER 28, 2025</div>
+<p>TREND CHANGES</p>
+<p>NIKKEI changed from Bullish to Neutral</p>
+<p>Bitcoin moved to the #OutBucket</p>
+<p>GOLD added back to Risk Ranges</p>
+<table>
+<tr><td>SPX (Bullish)</td><td>6,650</td><td>6,900</td><td>6,812.41</td></tr>
+<tr><td>NIKKEI (Neutral)</td><td>48,100</td><td>50,950</td><td>50,167</td></tr>
+<tr><td>Bitcoin (Bearish)</td><td>84,001</td><td>95,999</td><td>91,011</td></tr>
+<tr><td>GOLD (Bullish)</td><td>4,011</td><td>4,222</td><td>4,190.50</td></tr>
+</table>
+</body></html>
+"""
+
+PLAIN_BODY = """\
+RISK RANGE SIGNALS: November 28, 2025
+NIKKEI changed from Bullish to Neutral
+Bitcoin moved to the #OutBucket
+SPX S&P 500 (Bullish) 6,650 6,900 6,812.41
+Bitcoin (Bearish) 84,001 95,999 91,011
+"""
+
+
+def html_email() -> bytes:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = "RISK RANGE SIGNALS: NOVEMBER 28, 2025"
+    msg.attach(MIMEText(HTML_BODY, "html"))
+    return msg.as_bytes()
+
+
+def plain_email() -> bytes:
+    msg = MIMEText(PLAIN_BODY, "plain")
+    msg["Subject"] = "RISK RANGE SIGNALS"
+    return msg.as_bytes()
+
+
+def pasted_email() -> bytes:
+    return b"November 28, 2025\nSPX (Bullish)\nS&P 500 6,650 6,900 6,812.41\n"
+
+
+def model_rows(entries):
+    return [(e.date, e.index, e.trend.name, e.buy_trade, e.sell_trade, e.prev_close, e.bucket.name)
+            for e in entries]
+
+
+def model_changes(changes):
+    """ChangeEvents as batch rows (RecordBatch.iter_rows gives missing values as "")."""
+    def name(value):
+        return value.name if value is not None else ""
+    return [(c.date, c.index, name(c.trend_from), name(c.trend_to),
+             name(c.bucket_from), name(c.bucket_to), c.notes or "") for c in changes]
+
+
+@pytest.mark.parametrize("raw", [html_email(), plain_email(), pasted_email()],
+                         ids=["html", "plain", "pasted"])
+def test_batch_matches_models(raw):
+    report_date, entries, changes = parse_rr_email(raw)
+    batch = parse_rr_batch(raw)
+
+    assert batch.report_date == report_date == "2025-11-28"
+    assert list(batch.entries.iter_rows(["date", *ENTRY_FIELDS])) == model_rows(entries)
+    assert list(batch.changes.iter_rows(["date", *CHANGE_FIELDS])) == model_changes(changes)
+
+    from_models = RRDayBatch.from_models(report_date, entries, changes)
+    assert batch.to_frame().equals(from_models.to_frame())
+
+
+def test_html_email_contents(tmp_path):
+    path = tmp_path / "risk_range_2025-11-28.eml"
+    path.write_bytes(html_email())
+    report_date, entries, changes = parse_rr_email(path)
+
+    # Symbols are canonicalized (NIKKEI -> NIKK, Bitcoin -> BITCOIN)
+    assert report_date == "2025-11-28"
+    assert model_rows(entries) == [
+        ("2025-11-28", "SPX", "BULLISH", 6650.0, 6900.0, 6812.41, "IN"),
+        ("2025-11-28", "NIKK", "NEUTRAL", 48100.0, 50950.0, 50167.0, "IN"),
+        ("2025-11-28", "BITCOIN", "BEARISH", 84001.0, 95999.0, 91011.0, "OUT"),
+        ("2025-11-28", "GOLD", "BULLISH", 4011.0, 4222.0, 4190.5, "IN"),
+    ]
+    assert model_changes(changes) == [
+        ("2025-11-28", "NIKK", "BULLISH", "NEUTRAL", "", "", ""),
+        ("2025-11-28", "BITCOIN", "", "", "IN", "OUT", ""),
+        ("2025-11-28", "GOLD", "", "", "OUT", "IN", ""),
+    ]
+    assert list(parse_rr_batch(path).entries.iter_rows(["date", *ENTRY_FIELDS])) == model_rows(entries)
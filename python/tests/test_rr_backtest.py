@@ -0,0 +1,116 @@
+"""
+Tests for the vectorized RR band-touch backtest (hedgeye.ds.rr.rr_backtest).
+
+Expected values are worked out by hand for two symbols; BBB is not reported
+on 10-03 and 10-06, so its next report after 10-02 is 10-07.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hedgeye.ds.rr.rr_backtest import build_rr_panel, run_rr_backtest
+
+DATES = ["2025-10-01", "2025-10-02", "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08"]
+
+
+def rr_frame():
+    rows = [
+        # date, symbol, trend, buy, sell, prev_close
+        ("2025-10-01", "AAA", "BULLISH", 99.0, 110.0, 100.0),
+        ("2025-10-02", "AAA", "BULLISH", 96.0, 105.0, 98.0),
+        ("2025-10-03", "AAA", "BULLISH", 94.0, 100.0, 95.0),
+        ("2025-10-06", "AAA", "BEARISH", 95.0, 103.0, 99.0),
+        ("2025-10-07", "AAA", "BEARISH", 95.0, 108.0, 104.0),
+        ("2025-10-08", "AAA", "BEARISH", 95.0, 108.0, 102.0),
+        ("2025-10-01", "BBB", "BULLISH", 51.0, 55.0, 50.0),
+        ("2025-10-02", "BBB", "BEARISH", 45.0, 47.5, 52.0),
+        ("2025-10-07", "BBB", "BEARISH", 47.5, 52.0, 48.0),
+        ("2025-10-08", "BBB", "BEARISH", 45.0, 52.0, 47.0),
+    ]
+    df = pd.DataFrame(rows, columns=["date", "index", "trend", "buy_trade", "sell_trade", "prev_close"])
+    df["bucket"] = "IN"
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+# Closes (next report's prev_close) per report date:
+#   AAA: 98, 95, 99, 104, 102, NaN
+#   BBB: 52 (10-01), 48 (10-02), 47 (10-07), NaN (10-08)
+# Signals at tolerance 0:
+#   AAA long 10-01 (98 <= 99), long 10-02 (95 <= 96), short 10-06 (104 >= 103)
+#   BBB short 10-02 (48 >= 47.5), long 10-07 (47 <= 47.5)
+AAA_LONG_1 = 95 / 98 - 1
+AAA_LONG_2 = 99 / 95 - 1
+AAA_SHORT = -(102 / 104 - 1)
+BBB_SHORT = -(47 / 48 - 1)
+
+
+def test_panel_close_is_symbols_next_report():
+    panel = build_rr_panel(rr_frame())
+    assert list(panel.symbols) == ["AAA", "BBB"]
+    assert [str(d)[:10] for d in panel.dates] == DATES
+
+    np.testing.assert_array_equal(panel.close[0], [98, 95, 99, 104, 102, np.nan])
+    np.testing.assert_array_equal(panel.close[1], [52, 48, np.nan, np.nan, 47, np.nan])
+    assert panel.reported[1].tolist() == [True, True, False, False, True, True]
+
+
+def test_one_report_holding_period():
+    result = run_rr_backtest(rr_frame(), holding_periods=[1])
+    per_symbol = result.per_symbol.set_index("symbol")
+
+    aaa = per_symbol.loc["AAA"]
+    assert (aaa["trades"], aaa["longs"], aaa["shorts"]) == (3, 2, 1)
+    assert aaa["hit_rate"] == pytest.approx(2 / 3)
+    assert aaa["total_return"] == pytest.approx(AAA_LONG_1 + AAA_LONG_2 + AAA_SHORT)
+
+    # The 10-02 short exits on BBB's next report (10-07), not on 10-03;
+    # the 10-07 long has no later close
+    bbb = per_symbol.loc["BBB"]
+    assert (bbb["trades"], bbb["longs"], bbb["shorts"]) == (1, 0, 1)
+    assert bbb["hit_rate"] == 1.0
+    assert bbb["total_return"] == pytest.approx(BBB_SHORT)
+
+    summary = result.summary.iloc[0]
+    assert (summary["symbols_traded"], summary["trades"], summary["longs"], summary["shorts"]) == (2, 4, 2, 2)
+    assert summary["hit_rate"] == 0.75
+    assert summary["mean_return"] == pytest.approx((AAA_LONG_1 + AAA_LONG_2 + AAA_SHORT + BBB_SHORT) / 4)
+
+
+def test_two_report_holding_period():
+    result = run_rr_backtest(rr_frame(), holding_periods=[2])
+    per_symbol = result.per_symbol.set_index("symbol")
+
+    # AAA longs exit two reports later; the 10-06 short runs past the end
+    aaa = per_symbol.loc["AAA"]
+    assert (aaa["trades"], aaa["longs"], aaa["shorts"]) == (2, 2, 0)
+    assert aaa["total_return"] == pytest.approx((99 / 98 - 1) + (104 / 95 - 1))
+    assert aaa["hit_rate"] == 1.0
+
+    # BBB's 10-02 short would exit on 10-08, which has no close yet
+    bbb = per_symbol.loc["BBB"]
+    assert bbb["trades"] == 0
+    assert np.isnan(bbb["hit_rate"])
+
+    summary = result.summary.iloc[0]
+    assert (summary["symbols_traded"], summary["trades"]) == (1, 2)
+
+
+def test_trend_filters_and_tolerance():
+    result = run_rr_backtest(rr_frame(), tolerances=[0.0, 0.02],
+                             trend_filters=["long_only", "short_only"], holding_periods=[1])
+    summary = result.summary.set_index(["tolerance", "trend_filter"])
+
+    assert summary.loc[(0.0, "long_only"), "trades"] == 2
+    assert summary.loc[(0.0, "short_only"), "trades"] == 2
+    # Within 2%: BBB's 10-01 close (52) counts as touching buy 51 (52.02)
+    assert summary.loc[(0.02, "long_only"), "trades"] == 3
+    bbb = result.per_symbol.set_index(["tolerance", "trend_filter", "symbol"]).loc[(0.02, "long_only", "BBB")]
+    assert bbb["total_return"] == pytest.approx(48 / 52 - 1)
+
+
+def test_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        run_rr_backtest(rr_frame(), trend_filters=["sideways"])
+    with pytest.raises(ValueError):
+        run_rr_backtest(rr_frame(), holding_periods=[0])
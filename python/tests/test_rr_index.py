@@ -0,0 +1,110 @@
+"""
+Tests for the per-symbol RR index (hedgeye.ds.rr.rr_index).
+
+Each lookup is compared with the boolean-mask filter it replaced.
+"""
+
+import pandas as pd
+import pytest
+
+from hedgeye.ds.rr.rr_index import RRIndex, as_rr_index
+
+
+def rr_frame():
+    # Unsorted, interleaved symbols; BITCOIN's history is split across spellings
+    rows = [
+        ("2025-10-03", "SPX", "BULLISH", 6600.0, 6750.0, 6700.0),
+        ("2025-10-01", "SPX", "BULLISH", 6550.0, 6700.0, 6650.0),
+        ("2025-10-02", "UST10Y", "BEARISH", 4.05, 4.20, 4.12),
+        ("2025-10-02", "SPX", "BULLISH", 6580.0, 6720.0, 6690.0),
+        ("2025-10-01", "BITCOIN", "BULLISH", 110000.0, 118000.0, 115000.0),
+        ("2025-10-03", "UST10Y", "BEARISH", 4.00, 4.18, 4.10),
+        ("2025-10-03", "BITCOIN", "NEUTRAL", 112000.0, 121000.0, 119000.0),
+        ("2025-10-02", "Bitcoin", "BULLISH", 111000.0, 119000.0, 117000.0),
+    ]
+    df = pd.DataFrame(rows, columns=["date", "index", "trend", "buy_trade", "sell_trade", "prev_close"])
+    df["bucket"] = "IN"
+    return df
+
+
+def mask_rows(df, symbol, start=None, end=None):
+    """The old lookup: exact-symbol mask, optional date window, sorted by date."""
+    mask = df["index"] == symbol
+    if start is not None:
+        mask &= df["date"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df["date"] <= pd.Timestamp(end)
+    return df[mask].sort_values("date", kind="stable")
+
+
+def assert_same_rows(actual, expected):
+    columns = ["date", "index", "trend", "buy_trade", "sell_trade", "prev_close"]
+    pd.testing.assert_frame_equal(
+        actual[columns].astype({"index": str, "trend": str}).reset_index(drop=True),
+        expected[columns].astype({"index": str, "trend": str}).reset_index(drop=True),
+    )
+
+
+@pytest.fixture
+def indexed():
+    rr_index = RRIndex(rr_frame())
+    return rr_index, rr_index.frame
+
+
+def test_series_matches_mask(indexed):
+    rr_index, df = indexed
+    for symbol in ["SPX", "UST10Y", "BITCOIN", "Bitcoin"]:
+        assert_same_rows(rr_index.series(symbol), mask_rows(df, symbol))
+    assert_same_rows(rr_index.series("SPX", start="2025-10-02"), mask_rows(df, "SPX", start="2025-10-02"))
+    assert_same_rows(rr_index.series("SPX", end="2025-10-02"), mask_rows(df, "SPX", end="2025-10-02"))
+    assert_same_rows(rr_index.series("SPX", "2025-10-02", "2025-10-02"),
+                     mask_rows(df, "SPX", "2025-10-02", "2025-10-02"))
+    assert rr_index.series("SPX", start="2025-10-04").empty
+    assert rr_index.series("NOPE").empty
+
+
+def test_latest_matches_mask(indexed):
+    rr_index, df = indexed
+    for symbol in ["SPX", "UST10Y", "BITCOIN"]:
+        expected = mask_rows(df, symbol).iloc[-1]
+        assert rr_index.latest(symbol).equals(expected)
+    assert rr_index.latest("NOPE") is None
+
+    latest = rr_index.latest_frame().set_index("index")
+    assert latest.loc["SPX", "prev_close"] == 6700.0
+    assert latest.loc["UST10Y", "prev_close"] == 4.10
+
+
+def test_as_of_before_on_and_after_reports(indexed):
+    rr_index, df = indexed
+    for date in ["2025-09-30", "2025-10-01", "2025-10-02", "2025-10-02 15:00", "2025-10-03", "2025-12-31"]:
+        for symbol in ["SPX", "UST10Y", "BITCOIN"]:
+            expected = mask_rows(df, symbol, end=date)
+            found = rr_index.as_of(symbol, date)
+            if expected.empty:
+                assert found is None
+            else:
+                assert found.equals(expected.iloc[-1])
+
+    # UST10Y has no report on 10-01, so nothing is in effect yet
+    assert rr_index.as_of("UST10Y", "2025-10-01") is None
+    assert rr_index.as_of("SPX", "2025-10-02 15:00")["prev_close"] == 6690.0
+
+
+def test_resolve_exact_then_canonical(indexed):
+    rr_index, _ = indexed
+    assert rr_index.resolve("Bitcoin") == "Bitcoin"
+    assert rr_index.resolve("bitcoin") == "BITCOIN"
+    assert rr_index.resolve("spx") == "SPX"
+    assert rr_index.resolve("NOPE") is None
+    assert "bitcoin" in rr_index and "NOPE" not in rr_index
+    assert rr_index.symbols() == ["BITCOIN", "Bitcoin", "SPX", "UST10Y"]
+
+    # A variant spelling with no exact slice reads the canonical symbol's rows
+    assert_same_rows(rr_index.series("bitcoin"), mask_rows(rr_index.frame, "BITCOIN"))
+
+
+def test_as_rr_index_reuses_index(indexed):
+    rr_index, _ = indexed
+    assert as_rr_index(rr_index) is rr_index
+    assert len(as_rr_index(rr_frame())) == len(rr_index)
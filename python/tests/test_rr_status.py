@@ -0,0 +1,119 @@
+"""
+Tests for the vectorized RR status table (hedgeye.ds.rr.rr_status).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hedgeye.ds.rr.rr_status import (
+    STATUS_BUY, STATUS_COLUMNS, STATUS_IN, STATUS_NO_PRICE, STATUS_SELL,
+    compute_rr_status, trend_run_starts,
+)
+
+
+def rr_frame():
+    rows = [
+        # SPX: BULLISH, flips to BEARISH on 10-03, stays BEARISH
+        ("2025-10-01", "SPX", "BULLISH", 100.0, 110.0),
+        ("2025-10-02", "SPX", "BULLISH", 101.0, 111.0),
+        ("2025-10-03", "SPX", "BEARISH", 102.0, 112.0),
+        ("2025-10-06", "SPX", "BEARISH", 100.0, 110.0),
+        # GOLD: BEARISH -> BULLISH -> BEARISH; the current run starts 10-06
+        ("2025-10-01", "GOLD", "BEARISH", 50.0, 60.0),
+        ("2025-10-02", "GOLD", "BULLISH", 50.0, 60.0),
+        ("2025-10-06", "GOLD", "BEARISH", 50.0, 60.0),
+        # OIL: one trend throughout
+        ("2025-10-01", "OIL", "NEUTRAL", 70.0, 80.0),
+        ("2025-10-06", "OIL", "NEUTRAL", 70.0, 80.0),
+        # BITCOIN: quoted under a variant spelling; no history before 10-06
+        ("2025-10-06", "BITCOIN", "BULLISH", 100000.0, 120000.0),
+    ]
+    df = pd.DataFrame(rows, columns=["date", "index", "trend", "buy_trade", "sell_trade"])
+    df["prev_close"] = (df["buy_trade"] + df["sell_trade"]) / 2
+    df["bucket"] = "IN"
+    # Row order must not matter
+    return df.sample(frac=1.0, random_state=7).reset_index(drop=True)
+
+
+def quotes(prices):
+    return pd.DataFrame({"he_symbol": list(prices), "price": list(prices.values())})
+
+
+def test_trend_run_starts():
+    starts = trend_run_starts(rr_frame())
+    assert starts["SPX"] == pd.Timestamp("2025-10-03")
+    assert starts["GOLD"] == pd.Timestamp("2025-10-06")
+    assert starts["OIL"] == pd.Timestamp("2025-10-01")
+    assert starts["BITCOIN"] == pd.Timestamp("2025-10-06")
+
+
+def test_status_bands_and_distances():
+    # SPX in range, GOLD at the buy band, OIL above the sell band, BITCOIN below buy
+    prices = quotes({"SPX": 105.0, "GOLD": 50.0, "OIL": 85.0, "Bitcoin": 95000.0})
+    status = compute_rr_status(rr_frame(), prices).set_index("symbol")
+
+    assert list(status.reset_index().columns) == STATUS_COLUMNS
+    assert list(status.index) == ["BITCOIN", "GOLD", "OIL", "SPX"]
+    assert status["status"].astype(str).to_dict() == {
+        "BITCOIN": STATUS_BUY, "GOLD": STATUS_BUY, "OIL": STATUS_SELL, "SPX": STATUS_IN,
+    }
+
+    spx = status.loc["SPX"]
+    assert spx["price"] == 105.0
+    assert spx["pct_to_buy"] == pytest.approx((105 - 100) / 105 * 100)
+    assert spx["pct_to_sell"] == pytest.approx((110 - 105) / 105 * 100)
+    assert spx["range_width_pct"] == pytest.approx(10 / 105 * 100)
+
+    # Beyond a band the distance to it is negative
+    assert status.loc["OIL", "pct_to_sell"] == pytest.approx((80 - 85) / 85 * 100)
+    assert status.loc["BITCOIN", "pct_to_buy"] == pytest.approx((95000 - 100000) / 95000 * 100)
+    assert status.loc["GOLD", "pct_to_buy"] == 0.0
+
+
+def test_missing_quotes():
+    status = compute_rr_status(rr_frame(), quotes({"SPX": 105.0})).set_index("symbol")
+    assert status.loc["SPX", "status"] == STATUS_IN
+    for symbol in ["GOLD", "OIL", "BITCOIN"]:
+        assert status.loc[symbol, "status"] == STATUS_NO_PRICE
+        assert np.isnan(status.loc[symbol, "pct_to_buy"])
+
+    no_quotes = compute_rr_status(rr_frame())
+    assert (no_quotes["status"] == STATUS_NO_PRICE).all()
+
+
+def test_exact_quote_wins_over_canonical():
+    prices = quotes({"Bitcoin": 95000.0, "BITCOIN": 110000.0})
+    status = compute_rr_status(rr_frame(), prices).set_index("symbol")
+    assert status.loc["BITCOIN", "price"] == 110000.0
+    assert status.loc["BITCOIN", "status"] == STATUS_IN
+
+
+def test_trend_change_days_and_latest_row():
+    status = compute_rr_status(rr_frame(), quotes({"SPX": 105.0})).set_index("symbol")
+
+    spx = status.loc["SPX"]
+    assert spx["date"] == pd.Timestamp("2025-10-06")
+    assert spx["trend"] == "BEARISH"
+    assert (spx["buy_trade"], spx["sell_trade"]) == (100.0, 110.0)
+    assert spx["trend_since"] == pd.Timestamp("2025-10-03")
+    assert spx["days_since_trend_change"] == 3
+
+    assert status.loc["GOLD", "days_since_trend_change"] == 0
+    assert status.loc["OIL", "days_since_trend_change"] == 5
+
+
+def test_run_starts_override():
+    # E.g. the trend timeline knows of runs older than the rows passed in
+    latest_only = rr_frame().query("date == '2025-10-06'")
+    run_starts = pd.Series({"SPX": pd.Timestamp("2025-10-03"), "OIL": pd.Timestamp("2025-09-01")})
+    status = compute_rr_status(latest_only, run_starts=run_starts).set_index("symbol")
+
+    assert status.loc["SPX", "days_since_trend_change"] == 3
+    assert status.loc["OIL", "days_since_trend_change"] == 35
+    assert pd.isna(status.loc["GOLD", "trend_since"])
+    assert pd.isna(status.loc["GOLD", "days_since_trend_change"])
+
+    # Without the override only the rows given are seen
+    derived = compute_rr_status(latest_only).set_index("symbol")
+    assert (derived["days_since_trend_change"] == 0).all()
@@ -0,0 +1,94 @@
+"""
+Tests for the incremental trend timeline (hedgeye.ds.rr.trend_timeline).
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from hedgeye.ds.rr.trend_timeline import STATE_FILE, update_trend_timeline
+
+
+def write_rr(csv_dir, date, trends):
+    """Write a risk_range_<date>.csv with one row per symbol."""
+    rows = [{"date": date, "index": symbol, "trend": trend, "buy_trade": 1.0,
+             "sell_trade": 2.0, "prev_close": 1.5, "bucket": "IN"}
+            for symbol, trend in trends.items()]
+    pd.DataFrame(rows).to_csv(csv_dir / f"risk_range_{date}.csv", index=False)
+
+
+def test_incremental_update_extends_timeline(tmp_path, hedgeye_cache_dir):
+    csv_dir, timeline_dir = tmp_path / "csv", tmp_path / "timeline"
+    csv_dir.mkdir()
+    write_rr(csv_dir, "2025-10-01", {"SPX": "BULLISH"})
+    update_trend_timeline(csv_dir, timeline_dir)
+
+    write_rr(csv_dir, "2025-10-02", {"SPX": "BEARISH"})
+    timeline = update_trend_timeline(csv_dir, timeline_dir)
+
+    assert timeline.state_at("SPX", "2025-10-01") == "BULLISH"
+    assert timeline.state_at("SPX", "2025-10-02") == "BEARISH"
+    state = json.loads((timeline_dir / STATE_FILE).read_text())
+    assert list(state["ingested"]["risk_range"]) == ["2025-10-01", "2025-10-02"]
+    st = (csv_dir / "risk_range_2025-10-02.csv").stat()
+    assert state["ingested"]["risk_range"]["2025-10-02"] == [st.st_mtime_ns, st.st_size]
+
+
+def test_mid_range_file_triggers_rebuild(tmp_path, hedgeye_cache_dir, capsys):
+    csv_dir, timeline_dir = tmp_path / "csv", tmp_path / "timeline"
+    csv_dir.mkdir()
+    write_rr(csv_dir, "2025-10-01", {"SPX": "BULLISH"})
+    write_rr(csv_dir, "2025-10-03", {"SPX": "BULLISH"})
+    timeline = update_trend_timeline(csv_dir, timeline_dir)
+    assert timeline.state_at("SPX", "2025-10-02") == "BULLISH"
+
+    # A late email for a day inside the timeline
+    write_rr(csv_dir, "2025-10-02", {"SPX": "BEARISH"})
+    timeline = update_trend_timeline(csv_dir, timeline_dir)
+
+    assert "rebuilding" in capsys.readouterr().out
+    assert timeline.state_at("SPX", "2025-10-02") == "BEARISH"
+    assert timeline.state_at("SPX", "2025-10-03") == "BULLISH"
+    assert len(timeline.history("SPX")) == 3
+
+
+def test_rewritten_file_triggers_rebuild(tmp_path, hedgeye_cache_dir, capsys):
+    csv_dir, timeline_dir = tmp_path / "csv", tmp_path / "timeline"
+    csv_dir.mkdir()
+    write_rr(csv_dir, "2025-10-01", {"SPX": "BULLISH"})
+    write_rr(csv_dir, "2025-10-02", {"SPX": "BULLISH"})
+    update_trend_timeline(csv_dir, timeline_dir)
+
+    # A re-parse rewrites a day already in the timeline (same name, same size)
+    path = csv_dir / "risk_range_2025-10-01.csv"
+    st = path.stat()
+    write_rr(csv_dir, "2025-10-01", {"SPX": "BEARISH"})
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    timeline = update_trend_timeline(csv_dir, timeline_dir)
+
+    assert "rebuilding" in capsys.readouterr().out
+    assert timeline.state_at("SPX", "2025-10-01") == "BEARISH"
+    assert timeline.state_at("SPX", "2025-10-02") == "BULLISH"
+
+    # Nothing changed since: incremental again
+    update_trend_timeline(csv_dir, timeline_dir)
+    assert "rebuilding" not in capsys.readouterr().out
+
+
+def test_state_without_ingested_files_rebuilds(tmp_path, hedgeye_cache_dir, capsys):
+    csv_dir, timeline_dir = tmp_path / "csv", tmp_path / "timeline"
+    csv_dir.mkdir()
+    write_rr(csv_dir, "2025-10-01", {"SPX": "BULLISH"})
+    update_trend_timeline(csv_dir, timeline_dir)
+
+    # State written before the files read were recorded
+    state_path = timeline_dir / STATE_FILE
+    state = json.loads(state_path.read_text())
+    del state["ingested"]
+    state_path.write_text(json.dumps(state))
+    write_rr(csv_dir, "2025-09-30", {"SPX": "BEARISH"})
+    timeline = update_trend_timeline(csv_dir, timeline_dir)
+
+    assert "rebuilding" in capsys.readouterr().out
+    assert timeline.state_at("SPX", "2025-09-30") == "BEARISH"
@@ -0,0 +1,51 @@
+"""
+Tests for the new-file watcher (hedgeye.ds.watcher).
+"""
+
+import time
+
+import pytest
+
+from hedgeye.ds.watcher import INOTIFY_AVAILABLE, DirWatcher
+
+BACKENDS = [False] + ([True] if INOTIFY_AVAILABLE else [])
+
+
+def collect(watcher, seconds=0.6):
+    """Names reported by watcher.poll() over a few settle periods."""
+    names = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for paths in watcher.poll(timeout=0.05).values():
+            names.extend(p.name for p in paths)
+    return names
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_reports_new_files_once(tmp_path, use_inotify):
+    (tmp_path / "old.eml").write_text("old\n")
+    watcher = DirWatcher({"rr": tmp_path}, settle_seconds=0.1, poll_interval=0.05,
+                         use_inotify=use_inotify)
+    try:
+        (tmp_path / "new.eml").write_text("new\n")
+        (tmp_path / "notes.txt").write_text("ignored\n")
+        assert collect(watcher) == ["new.eml"]
+        assert collect(watcher, 0.3) == []
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_renamed_reported_file_is_not_new(tmp_path, use_inotify):
+    watcher = DirWatcher({"rr": tmp_path}, settle_seconds=0.1, poll_interval=0.05,
+                         use_inotify=use_inotify)
+    try:
+        (tmp_path / "RISK RANGE 2025-10-01.eml").write_text("rr\n")
+        assert collect(watcher) == ["RISK RANGE 2025-10-01.eml"]
+
+        # What the RR parser does after parsing a non-standard name
+        (tmp_path / "RISK RANGE 2025-10-01.eml").rename(tmp_path / "risk_range_2025-10-01.eml")
+        (tmp_path / "risk_range_2025-10-02.eml").write_text("rr 2\n")
+        assert collect(watcher) == ["risk_range_2025-10-02.eml"]
+    finally:
+        watcher.stop()